@@ -0,0 +1,7 @@
+"""
+Configuración de pytest para los tests de la raíz
+Los servicios de study_platform se prueban desde aquí, importados a través de
+platform_bridge (que añade study_platform al final de sys.path, igual que para
+las apps de la raíz).
+"""
+import platform_bridge  # noqa: F401
@@ -1,6 +1,7 @@
 import csv
 import os
 import random
+import sys
 
 def load_questions(file_path):
     questions = []
@@ -124,8 +125,10 @@ def show_second_question(question):
         print("✗ Verificación incorrecta")
     print(f"\033[90mExplicación: {question['second_explanation']}\033[0m")
 
-def main():
-    file_path = 'dp700_implement_a_lakehouse_with_microsoft_fabric_fixed.csv'
+FILE_PATH = 'dp700_implement_a_lakehouse_with_microsoft_fabric_fixed.csv'
+
+def interactive_main():
+    file_path = FILE_PATH
     if not os.path.exists(file_path):
         print(f"Archivo {file_path} no encontrado.")
         return
@@ -170,5 +173,14 @@ def main():
                 show_second_question(question)
             input("Presiona Enter para continuar...")
 
+def main(argv=None):
+    # El modo batch reutiliza el motor de consola_estudio sobre el archivo de este drill
+    from consola_estudio import build_batch_parser, batch_main
+    parser = build_batch_parser('Estudio DP-700 por consola', [FILE_PATH])
+    args = parser.parse_args(argv)
+    if args.batch:
+        sys.exit(batch_main(args))
+    interactive_main()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,11 @@
+import argparse
 import csv
 import os
 import random
 import glob
+import json
+import sys
+import time
 
 def load_questions(file_path):
     questions = []
@@ -121,7 +125,254 @@ def show_second_question(question):
         print("✗ Verificación incorrecta")
     print(f"\033[90mExplicación: {question['second_explanation']}\033[0m")
 
-def main():
+# ==== MODO BATCH (no interactivo) ====
+# question_bank se importa solo aquí: el modo interactivo no lo necesita
+
+def parse_answer_line(line):
+    """Parsea una línea del flujo de respuestas: '2', '1;3' o '1,3', opcionalmente '|<verificación>'"""
+    from question_bank import parse_answer_list
+    main_part, _, second_part = line.partition('|')
+    answer = parse_answer_list(main_part.replace(',', ';'))
+    second = parse_answer_list(second_part.replace(',', ';')) if second_part else ()
+    return answer, second
+
+
+def iter_answer_stream(stream):
+    """Genera respuestas desde un archivo/stdin, ignorando líneas vacías y comentarios (#)"""
+    for line in stream:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        yield parse_answer_line(line)
+
+
+def simulate_answer(correct, options_count, accuracy, rng):
+    """Genera una respuesta acertada con probabilidad `accuracy`, si no una distinta a la correcta"""
+    correct = tuple(correct)
+    if rng.random() < accuracy:
+        return correct
+    wrong_options = [i for i in range(1, options_count + 1) if i not in correct]
+    if len(correct) > 1:
+        # Multi-respuesta: omitir una correcta o añadir una incorrecta
+        if wrong_options and rng.random() < 0.5:
+            return correct + (rng.choice(wrong_options),)
+        return correct[:-1]
+    if wrong_options:
+        return (rng.choice(wrong_options),)
+    return ()
+
+
+def load_batch_banks(files, sections=None):
+    """Carga cada CSV una sola vez y retorna [(archivo, pregunta)] de las secciones pedidas"""
+    from question_bank import ModuleBank
+    wanted = set(sections) if sections else None
+    selected = []
+    for file in files:
+        try:
+            bank = ModuleBank.from_csv(file)
+        except Exception as e:
+            print(f"Error al cargar {file}: {e}", file=sys.stderr)
+            continue
+        for q in bank.questions:
+            if wanted is None or q.section in wanted:
+                selected.append((file, q))
+    return selected
+
+
+def run_batch(files, sections=None, repetitions=1, answers=None, simulate=None,
+              seed=None, shuffle=True, verification=False, details=True):
+    """
+    Ejecuta el drill sin interacción y retorna un dict serializable a JSON.
+    `answers` es un iterable de (respuesta, verificación); si es None se usa `simulate`.
+    """
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    selected = load_batch_banks(files, sections)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    answer_iter = iter(answers) if answers is not None else None
+    results = []
+    per_section = {}
+    answered = correct_count = 0
+    multi_answered = multi_correct = 0
+    verif_answered = verif_correct = 0
+    exhausted = False
+    max_answer_us = 0.0
+
+    drill_start = time.perf_counter()
+    for rep in range(1, repetitions + 1):
+        order = selected.copy()
+        if shuffle:
+            rng.shuffle(order)
+        for file, q in order:
+            q_start = time.perf_counter()
+            if answer_iter is not None:
+                try:
+                    answer, second_answer = next(answer_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+            else:
+                answer = simulate_answer(q.correct, len(q.options), simulate, rng)
+                second_answer = ()
+                if verification and q.second_question:
+                    second_answer = simulate_answer(q.second_correct, len(q.second_options), simulate, rng)
+
+            is_correct = q.is_correct_answer(answer)
+            second_ok = None
+            if verification and q.second_question and second_answer:
+                second_ok = bool(q.second_correct) and set(second_answer) == set(q.second_correct)
+                verif_answered += 1
+                verif_correct += int(second_ok)
+            elapsed_us = (time.perf_counter() - q_start) * 1_000_000
+            max_answer_us = max(max_answer_us, elapsed_us)
+
+            answered += 1
+            correct_count += int(is_correct)
+            if q.multi:
+                multi_answered += 1
+                multi_correct += int(is_correct)
+            sec = per_section.setdefault(q.section, {'answered': 0, 'correct': 0})
+            sec['answered'] += 1
+            sec['correct'] += int(is_correct)
+
+            if details:
+                result = {
+                    'repetition': rep,
+                    'file': os.path.basename(file),
+                    'section': q.section,
+                    'id': q.id,
+                    'multi': q.multi,
+                    'answer': list(answer),
+                    'expected': list(q.correct),
+                    'correct': is_correct,
+                    'elapsed_us': round(elapsed_us, 2),
+                }
+                if second_ok is not None:
+                    result['verification_correct'] = second_ok
+                results.append(result)
+        if exhausted:
+            break
+    drill_s = time.perf_counter() - drill_start
+    total_ms = (time.perf_counter() - start) * 1000
+
+    for sec in per_section.values():
+        sec['accuracy'] = round(sec['correct'] / sec['answered'] * 100, 2) if sec['answered'] else 0.0
+
+    report = {
+        'mode': 'answers' if answer_iter is not None else 'simulate',
+        'files': [os.path.basename(f) for f in files],
+        'sections': sorted(per_section.keys()),
+        'repetitions': repetitions,
+        'seed': seed,
+        'questions_loaded': len(selected),
+        'summary': {
+            'answered': answered,
+            'correct': correct_count,
+            'incorrect': answered - correct_count,
+            'accuracy': round(correct_count / answered * 100, 2) if answered else 0.0,
+            'multi_answered': multi_answered,
+            'multi_correct': multi_correct,
+            'verification_answered': verif_answered,
+            'verification_correct': verif_correct,
+            'answers_exhausted': exhausted,
+        },
+        'per_section': per_section,
+        'timings': {
+            'load_ms': round(load_ms, 3),
+            'drill_ms': round(drill_s * 1000, 3),
+            'total_ms': round(total_ms, 3),
+            'questions_per_sec': round(answered / drill_s, 1) if drill_s > 0 else 0.0,
+            'mean_answer_us': round(drill_s * 1_000_000 / answered, 2) if answered else 0.0,
+            'max_answer_us': round(max_answer_us, 2),
+        },
+    }
+    if details:
+        report['results'] = results
+    return report
+
+
+def build_batch_parser(description, default_files):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--batch', action='store_true',
+                        help='Modo no interactivo: lee o simula respuestas y emite JSON')
+    parser.add_argument('--files', nargs='+', default=default_files,
+                        help='CSV de preguntas (admite patrones glob)')
+    parser.add_argument('--sections', nargs='+',
+                        help='Secciones a incluir (por defecto todas)')
+    parser.add_argument('--repetitions', type=int, default=1,
+                        help='Veces que se repiten todas las preguntas')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--answers',
+                        help="Archivo de respuestas, una por línea ('-' = stdin)")
+    source.add_argument('--simulate', type=float, metavar='ACCURACY',
+                        help='Simula respuestas con la precisión dada (0-1)')
+    parser.add_argument('--verification', action='store_true',
+                        help='Evalúa también las preguntas de verificación')
+    parser.add_argument('--seed', type=int, help='Semilla para orden y simulación')
+    parser.add_argument('--no-shuffle', action='store_true',
+                        help='Mantiene el orden del CSV (útil con archivos de respuestas)')
+    parser.add_argument('--summary-only', action='store_true',
+                        help='Omite el detalle por pregunta en el JSON')
+    parser.add_argument('--output', help='Archivo JSON de salida (por defecto stdout)')
+    parser.add_argument('--fail-under', type=float, metavar='PCT',
+                        help='Sale con código 1 si la precisión queda por debajo de PCT')
+    return parser
+
+
+def batch_main(args):
+    """Ejecuta el modo batch a partir de los argumentos parseados. Retorna el código de salida"""
+    files = []
+    for pattern in args.files:
+        matches = sorted(glob.glob(pattern))
+        files.extend(matches if matches else [pattern])
+    files = [f for f in dict.fromkeys(files) if os.path.exists(f)]
+    if not files:
+        print("No se encontraron archivos CSV.", file=sys.stderr)
+        return 2
+    if args.repetitions < 1:
+        print("El número de repeticiones debe ser mayor a 0.", file=sys.stderr)
+        return 2
+
+    answers = None
+    stream = None
+    if args.answers:
+        stream = sys.stdin if args.answers == '-' else open(args.answers, 'r', encoding='utf-8')
+        answers = iter_answer_stream(stream)
+    simulate = args.simulate if args.simulate is not None else 1.0
+    if not 0.0 <= simulate <= 1.0:
+        print("La precisión simulada debe estar entre 0 y 1.", file=sys.stderr)
+        return 2
+
+    try:
+        report = run_batch(
+            files,
+            sections=args.sections,
+            repetitions=args.repetitions,
+            answers=answers,
+            simulate=simulate,
+            seed=args.seed,
+            shuffle=not args.no_shuffle,
+            verification=args.verification,
+            details=not args.summary_only,
+        )
+    finally:
+        if stream is not None and stream is not sys.stdin:
+            stream.close()
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.fail_under is not None and report['summary']['accuracy'] < args.fail_under:
+        return 1
+    return 0
+
+
+def interactive_main():
     files = glob.glob('*.csv')
     if not files:
         print("No se encontraron archivos CSV.")
@@ -185,5 +436,12 @@ def main():
 
     print("\nEstudio completado.")
 
+def main(argv=None):
+    parser = build_batch_parser('Estudio múltiple DP-700 por consola', ['*.csv'])
+    args = parser.parse_args(argv)
+    if args.batch:
+        sys.exit(batch_main(args))
+    interactive_main()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,4 @@
 import sys
-import csv
 import os
 import random
 from datetime import datetime
@@ -10,8 +9,13 @@ from PyQt5.QtWidgets import (
     QTableWidgetItem, QHeaderView
 )
 from PyQt5.QtGui import QColor, QPalette, QFont, QCursor
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
+from platform_bridge import ProfileRegistry
 from stats_manager import StatsManager
+from question_bank import (
+    ModuleBank,
+    BUCKET_MASTERED, BUCKET_PRACTICE, BUCKET_NEW
+)
 
 class ClickableLabel(QLabel):
     """Label clickeable que puede emitir eventos al hacer clic"""
@@ -117,38 +121,23 @@ class QuestionDetailsDialog(QDialog):
         
         for i, q in enumerate(questions):
             # ID
-            id_item = QTableWidgetItem(str(q['id']))
+            id_item = QTableWidgetItem(str(q.id))
             id_item.setTextAlignment(Qt.AlignCenter)
             table.setItem(i, 0, id_item)
             
             # Sección
-            section_item = QTableWidgetItem(q['section'])
+            section_item = QTableWidgetItem(q.section)
             table.setItem(i, 1, section_item)
             
             # Pregunta (truncada)
-            question_text = q['question'][:80] + '...' if len(q['question']) > 80 else q['question']
+            question_text = q.question[:80] + '...' if len(q.question) > 80 else q.question
             question_item = QTableWidgetItem(question_text)
             table.setItem(i, 2, question_item)
             
-            # Métricas
-            metrics = q.get('metrics', '')
-            if metrics:
-                try:
-                    parts = metrics.split(';')
-                    correct = int(parts[0])
-                    incorrect = int(parts[1]) if len(parts) > 1 else 0
-                    attempts = correct + incorrect
-                    accuracy = (correct / attempts * 100) if attempts > 0 else 0
-                except:
-                    correct = 0
-                    incorrect = 0
-                    attempts = 0
-                    accuracy = 0
-            else:
-                correct = 0
-                incorrect = 0
-                attempts = 0
-                accuracy = 0
+            # Métricas (ya parseadas al cargar el módulo)
+            correct = q.times_correct
+            attempts = q.attempts
+            accuracy = q.accuracy
             
             # Dominio (mostrar porcentaje)
             mastery_item = QTableWidgetItem(f'{accuracy:.0f}%')
@@ -255,6 +244,10 @@ class EstudioModulos(QWidget):
         # ==== ESTADO ====
         # Inicializar gestor de estadísticas
         self.stats_manager = StatsManager()
+        # Métricas de preguntas en el perfil activo de study_platform (los CSV son solo contenido)
+        profiles = ProfileRegistry()
+        self.metrics_shards = profiles.shards(profiles.active_id)
+        self.seed_metrics = profiles.active.seed_from_content
         self.session_id = None
         self.session_start = None
         
@@ -267,6 +260,13 @@ class EstudioModulos(QWidget):
         self.correct_answers = 0
         self.total_answered = 0
         self.current_csv_file = None  # Para rastrear el archivo CSV actual
+        self.bank = ModuleBank([])    # Preguntas tipificadas del módulo actual
+        
+        # Escritura diferida de métricas: se agrupan respuestas y se vuelcan al perfil una vez
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(5000)
+        self.flush_timer.timeout.connect(self.flush_metrics)
         
         # ==== LAYOUT PRINCIPAL ====
         main_layout = QVBoxLayout()
@@ -628,21 +628,7 @@ class EstudioModulos(QWidget):
         """Muestra solo las preguntas dominadas (>= 80% aciertos)"""
         if not self.questions:
             return
-        mastered_questions = []
-        for q in self.questions:
-            metrics = q.get('metrics', '')
-            if metrics:
-                try:
-                    parts = metrics.split(';')
-                    correct = int(parts[0])
-                    incorrect = int(parts[1]) if len(parts) > 1 else 0
-                    total = correct + incorrect
-                    if total > 0:
-                        accuracy = correct / total
-                        if accuracy >= 0.8:  # >= 80%
-                            mastered_questions.append(q)
-                except:
-                    pass
+        mastered_questions = self.bank.questions_in(BUCKET_MASTERED)
         dialog = QuestionDetailsDialog('Preguntas Dominadas (≥80%)', mastered_questions, self)
         dialog.exec_()
     
@@ -650,21 +636,7 @@ class EstudioModulos(QWidget):
         """Muestra preguntas que necesitan práctica (40-79% aciertos)"""
         if not self.questions:
             return
-        practice_questions = []
-        for q in self.questions:
-            metrics = q.get('metrics', '')
-            if metrics:
-                try:
-                    parts = metrics.split(';')
-                    correct = int(parts[0])
-                    incorrect = int(parts[1]) if len(parts) > 1 else 0
-                    total = correct + incorrect
-                    if total > 0:
-                        accuracy = correct / total
-                        if 0.4 <= accuracy < 0.8:  # 40-79%
-                            practice_questions.append(q)
-                except:
-                    pass
+        practice_questions = self.bank.questions_in(BUCKET_PRACTICE)
         dialog = QuestionDetailsDialog('Preguntas para Practicar (40-79%)', practice_questions, self)
         dialog.exec_()
     
@@ -672,77 +644,23 @@ class EstudioModulos(QWidget):
         """Muestra preguntas nuevas (sin métricas o < 40% aciertos)"""
         if not self.questions:
             return
-        new_questions = []
-        for q in self.questions:
-            metrics = q.get('metrics', '')
-            if not metrics:
-                new_questions.append(q)
-            else:
-                try:
-                    parts = metrics.split(';')
-                    correct = int(parts[0])
-                    incorrect = int(parts[1]) if len(parts) > 1 else 0
-                    total = correct + incorrect
-                    if total > 0:
-                        accuracy = correct / total
-                        if accuracy < 0.4:  # < 40%
-                            new_questions.append(q)
-                    else:
-                        new_questions.append(q)
-                except:
-                    new_questions.append(q)
+        new_questions = self.bank.questions_in(BUCKET_NEW)
         dialog = QuestionDetailsDialog('Preguntas Nuevas (<40%)', new_questions, self)
         dialog.exec_()
     
     def calculate_module_stats(self):
-        """Calcula estadísticas de dominio del módulo actual"""
+        """Muestra las estadísticas de dominio del módulo actual (contadores incrementales)"""
         if not self.questions:
             return
         
-        total = len(self.questions)
-        mastered = 0   # >= 80% aciertos
-        practice = 0   # 40-79% aciertos
-        new = 0        # < 40% o sin métricas
-        
-        total_correct = 0
-        total_attempts = 0
-        
-        for q in self.questions:
-            metrics = q.get('metrics', '')
-            if metrics:
-                try:
-                    parts = metrics.split(';')
-                    correct = int(parts[0])
-                    incorrect = int(parts[1]) if len(parts) > 1 else 0
-                    attempts = correct + incorrect
-                    
-                    total_correct += correct
-                    total_attempts += attempts
-                    
-                    if attempts > 0:
-                        accuracy = correct / attempts
-                        if accuracy >= 0.8:
-                            mastered += 1
-                        elif accuracy >= 0.4:
-                            practice += 1
-                        else:
-                            new += 1
-                    else:
-                        new += 1
-                except:
-                    new += 1
-            else:
-                new += 1
-        
-        # Calcular porcentaje de dominio general
-        domain_percentage = int((total_correct / total_attempts * 100)) if total_attempts > 0 else 0
+        stats = self.bank.stats()
         
         # Actualizar UI
-        self.total_questions_label.setText(f'Total\n{total}')
-        self.mastered_label.setText(f'✓ Dominadas\n{mastered}')
-        self.practice_label.setText(f'⚡ Practicar\n{practice}')
-        self.new_label.setText(f'★ Nuevas\n{new}')
-        self.domain_bar.setValue(domain_percentage)
+        self.total_questions_label.setText(f'Total\n{stats.total}')
+        self.mastered_label.setText(f'✓ Dominadas\n{stats.mastered}')
+        self.practice_label.setText(f'⚡ Practicar\n{stats.practice}')
+        self.new_label.setText(f'★ Nuevas\n{stats.new}')
+        self.domain_bar.setValue(stats.domain_percentage)
         
         self.domain_frame.show()
     
@@ -756,20 +674,22 @@ class EstudioModulos(QWidget):
             return
         
         file_path = self.csv_files[idx]
+        
+        # Volcar métricas pendientes del módulo anterior antes de cambiar
+        self.flush_metrics()
         self.current_csv_file = file_path  # Guardar referencia
-        self.questions = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    self.questions.append(row)
+            # Parseo único: métricas a enteros y contadores de dominio
+            self.bank = ModuleBank.from_csv(file_path, self.metrics_shards, seed=self.seed_metrics)
         except Exception as e:
+            self.bank = ModuleBank([])
+            self.questions = []
             QMessageBox.critical(self, 'Error', f'No se pudo cargar el módulo:\n{e}')
             return
         
-        # Extraer secciones únicas
-        self.sections = sorted(set(q['section'] for q in self.questions))
+        self.questions = self.bank.questions
+        self.sections = self.bank.sections
         
         # Actualizar combo de secciones
         self.section_combo.clear()
@@ -793,10 +713,10 @@ class EstudioModulos(QWidget):
         # Filtrar por sección
         section_idx = self.section_combo.currentIndex()
         if section_idx == 0:  # Todas las secciones
-            self.filtered_questions = self.questions.copy()
+            self.filtered_questions = self.bank.questions_in_section(None)
         else:
             selected_section = self.sections[section_idx - 1]
-            self.filtered_questions = [q for q in self.questions if q['section'] == selected_section]
+            self.filtered_questions = self.bank.questions_in_section(selected_section)
         
         if not self.filtered_questions:
             QMessageBox.warning(self, 'Advertencia', 'No hay preguntas en esta sección.')
@@ -854,6 +774,7 @@ class EstudioModulos(QWidget):
             return
         
         self.current_question = self.filtered_questions[self.current_question_index]
+        question = self.current_question
         
         # Actualizar progreso
         progress = int((self.current_question_index / len(self.filtered_questions)) * 100)
@@ -873,7 +794,7 @@ class EstudioModulos(QWidget):
                 widget.deleteLater()
         
         # Sección
-        section_label = QLabel(f'SECCIÓN: {self.current_question["section"]}')
+        section_label = QLabel(f'SECCIÓN: {question.section}')
         section_label.setStyleSheet('''
             color: #00FFFF;
             font-size: 11px;
@@ -886,48 +807,40 @@ class EstudioModulos(QWidget):
         section_label.setWordWrap(True)
         self.question_layout.addWidget(section_label)
         
-        # Métricas de la pregunta
-        metrics = self.current_question.get('metrics', '')
-        if metrics:
-            try:
-                parts = metrics.split(';')
-                correct = int(parts[0])
-                incorrect = int(parts[1]) if len(parts) > 1 else 0
-                attempts = correct + incorrect
-                
-                # Calcular porcentaje de aciertos
-                accuracy = (correct / attempts * 100) if attempts > 0 else 0
-                
-                # Determinar color y etiqueta según porcentaje
-                if accuracy >= 80:
-                    status = '✓ DOMINADA'
-                    color = '#00FF00'
-                    bg = '#0a1a0a'
-                elif accuracy >= 40:
-                    status = '⚡ PRACTICAR'
-                    color = '#FFFF00'
-                    bg = '#1a1a00'
-                else:
-                    status = '★ NUEVA'
-                    color = '#FF8800'
-                    bg = '#1a0a00'
-                
-                metrics_label = QLabel(
-                    f'{status} | Aciertos: {accuracy:.0f}% ({correct}/{attempts}) | Total: {attempts}'
-                )
-                metrics_label.setStyleSheet(f'''
-                    color: {color};
-                    font-size: 10px;
-                    font-weight: bold;
-                    padding: 6px;
-                    background: {bg};
-                    border: 1px solid {color};
-                    border-radius: 3px;
-                ''')
-                metrics_label.setAlignment(Qt.AlignCenter)
-                self.question_layout.addWidget(metrics_label)
-            except:
-                pass
+        # Métricas de la pregunta (contadores enteros parseados al cargar)
+        if question.attempts > 0:
+            correct = question.times_correct
+            attempts = question.attempts
+            accuracy = question.accuracy
+            
+            # Determinar color y etiqueta según la categoría de dominio
+            if question.bucket == BUCKET_MASTERED:
+                status = '✓ DOMINADA'
+                color = '#00FF00'
+                bg = '#0a1a0a'
+            elif question.bucket == BUCKET_PRACTICE:
+                status = '⚡ PRACTICAR'
+                color = '#FFFF00'
+                bg = '#1a1a00'
+            else:
+                status = '★ NUEVA'
+                color = '#FF8800'
+                bg = '#1a0a00'
+            
+            metrics_label = QLabel(
+                f'{status} | Aciertos: {accuracy:.0f}% ({correct}/{attempts}) | Total: {attempts}'
+            )
+            metrics_label.setStyleSheet(f'''
+                color: {color};
+                font-size: 10px;
+                font-weight: bold;
+                padding: 6px;
+                background: {bg};
+                border: 1px solid {color};
+                border-radius: 3px;
+            ''')
+            metrics_label.setAlignment(Qt.AlignCenter)
+            self.question_layout.addWidget(metrics_label)
         else:
             # Sin métricas previas
             new_label = QLabel('★ PREGUNTA NUEVA - Aún no has respondido')
@@ -944,7 +857,7 @@ class EstudioModulos(QWidget):
             self.question_layout.addWidget(new_label)
         
         # Pregunta
-        question_label = QLabel(f'PREGUNTA {self.current_question["id"]}: {self.current_question["question"]}')
+        question_label = QLabel(f'PREGUNTA {question.id}: {question.question}')
         question_label.setStyleSheet('''
             color: #00FF00;
             font-size: 14px;
@@ -970,7 +883,7 @@ class EstudioModulos(QWidget):
         options_layout = QVBoxLayout()
         options_layout.setSpacing(10)
         
-        options = self.current_question['options'].split(';')
+        options = question.options
         
         # Crear lista de opciones con sus índices originales (1-based)
         indexed_options = [(i+1, option) for i, option in enumerate(options)]
@@ -1037,15 +950,14 @@ class EstudioModulos(QWidget):
         selected_original_idx = self.shuffled_mapping[selected_display_pos]
         
         # Obtener la respuesta correcta (índice original)
-        correct_answer = int(self.current_question['correct'])
-        is_correct = (selected_original_idx == correct_answer)
+        question = self.current_question
+        is_correct = question.is_correct_answer(selected_original_idx)
         
-        # Encontrar la posición de visualización de la respuesta correcta para el feedback
-        correct_display_pos = None
-        for display_pos, original_idx in self.shuffled_mapping.items():
-            if original_idx == correct_answer:
-                correct_display_pos = display_pos
-                break
+        # Encontrar la(s) posición(es) de visualización de la respuesta correcta para el feedback
+        correct_display_pos = ', '.join(
+            str(display_pos) for display_pos, original_idx in sorted(self.shuffled_mapping.items())
+            if original_idx in question.correct
+        )
         
         self.total_answered += 1
         if is_correct:
@@ -1053,7 +965,7 @@ class EstudioModulos(QWidget):
         
         # Registrar respuesta en estadísticas globales
         module_name = self.module_combo.currentText()
-        question_id = self.current_question.get('id', 'unknown')
+        question_id = question.id or 'unknown'
         self.stats_manager.record_module_answer(module_name, question_id, is_correct)
         
         # Actualizar métricas en el CSV
@@ -1100,7 +1012,7 @@ class EstudioModulos(QWidget):
         feedback_layout.addWidget(result_label)
         
         # Notas
-        notes_label = QLabel(f'NOTAS: {self.current_question["notas"]}')
+        notes_label = QLabel(f'NOTAS: {question.notas}')
         notes_label.setStyleSheet('''
             color: #00FFFF;
             font-size: 12px;
@@ -1113,8 +1025,8 @@ class EstudioModulos(QWidget):
         feedback_layout.addWidget(notes_label)
         
         # Pregunta de verificación (si existe)
-        if self.current_question.get('second_question'):
-            second_q_label = QLabel(f'VERIFICACIÓN: {self.current_question["second_question"]}')
+        if question.second_question:
+            second_q_label = QLabel(f'VERIFICACIÓN: {question.second_question}')
             second_q_label.setStyleSheet('''
                 color: #FFFF00;
                 font-size: 12px;
@@ -1127,8 +1039,8 @@ class EstudioModulos(QWidget):
             second_q_label.setWordWrap(True)
             feedback_layout.addWidget(second_q_label)
             
-            if self.current_question.get('second_explanation'):
-                expl_label = QLabel(f'→ {self.current_question["second_explanation"]}')
+            if question.second_explanation:
+                expl_label = QLabel(f'→ {question.second_explanation}')
                 expl_label.setStyleSheet('''
                     color: #DDDD00;
                     font-size: 11px;
@@ -1156,72 +1068,34 @@ class EstudioModulos(QWidget):
         self.show_question()
     
     def update_metrics(self, is_correct):
-        """Actualiza las métricas de la pregunta en el CSV"""
+        """Actualiza las métricas de la pregunta (en memoria; el perfil se escribe en lote)"""
         if not self.current_csv_file or not self.current_question:
             return
         
+        # Ajustar la pregunta y los contadores del módulo sin recorrerlo
+        self.bank.record_answer(self.current_question, is_correct)
+        
+        # Escritura diferida: al llenar el lote o tras unos segundos sin responder
+        if self.bank.should_flush():
+            self.flush_metrics()
+        else:
+            self.flush_timer.start()
+        
+        # Refrescar panel de dominio (O(1))
+        self.calculate_module_stats()
+    
+    def flush_metrics(self):
+        """Escribe en el perfil las métricas pendientes del módulo actual"""
+        self.flush_timer.stop()
         try:
-            # Leer el CSV actual
-            rows = []
-            with open(self.current_csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                fieldnames = reader.fieldnames
-                for row in reader:
-                    rows.append(row)
-            
-            # Encontrar y actualizar la pregunta actual
-            question_id = self.current_question['id']
-            section = self.current_question['section']
-            
-            for row in rows:
-                if row['id'] == question_id and row['section'] == section:
-                    # Obtener métricas actuales
-                    metrics = row.get('metrics', '')
-                    if metrics:
-                        try:
-                            parts = metrics.split(';')
-                            correct = int(parts[0])
-                            incorrect = int(parts[1]) if len(parts) > 1 else 0
-                        except:
-                            correct = 0
-                            incorrect = 0
-                    else:
-                        correct = 0
-                        incorrect = 0
-                    
-                    # Actualizar métricas
-                    if is_correct:
-                        correct += 1
-                    else:
-                        incorrect += 1
-                    
-                    # Guardar nuevas métricas
-                    row['metrics'] = f'{correct};{incorrect}'
-                    
-                    # Actualizar también en el objeto actual
-                    self.current_question['metrics'] = row['metrics']
-                    break
-            
-            # Escribir de vuelta al CSV
-            with open(self.current_csv_file, 'w', encoding='utf-8', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(rows)
-            
-            # Actualizar la pregunta en la lista actual sin recargar todo
-            for q in self.questions:
-                if q['id'] == question_id and q['section'] == section:
-                    q['metrics'] = self.current_question['metrics']
-                    break
-            
-            # Recalcular estadísticas del módulo
-            self.calculate_module_stats()
-            
+            self.bank.flush()
         except Exception as e:
             print(f'Error al actualizar métricas: {e}')
     
     def finish_study(self):
         """Finaliza la sesión de estudio"""
+        self.flush_metrics()
+        
         # Guardar estadísticas de sesión
         if self.session_id:
             session_stats = {
@@ -1344,6 +1218,11 @@ class EstudioModulos(QWidget):
         
         # Recalcular estadísticas del módulo
         self.calculate_module_stats()
+    
+    def closeEvent(self, event):
+        """Guarda las métricas pendientes antes de cerrar"""
+        self.flush_metrics()
+        super().closeEvent(event)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
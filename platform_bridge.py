@@ -0,0 +1,25 @@
+"""
+Puente de las apps clásicas hacia la capa de persistencia de study_platform
+Es el único módulo de la raíz que conoce la estructura interna de study_platform
+(su paquete `src` y su `config`): las apps importan desde aquí los perfiles, el
+motor de estadísticas y la escritura con bloqueo entre procesos, y así los
+nombres internos no aparecen en su código.
+"""
+
+import os
+import sys
+
+STUDY_PLATFORM_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'study_platform')
+
+# Al final de sys.path: un módulo de la raíz con el mismo nombre tiene prioridad
+if STUDY_PLATFORM_DIR not in sys.path:
+    sys.path.append(STUDY_PLATFORM_DIR)
+
+from src.core.file_store import CounterDelta, file_lock, locked_update_csv, parse_counts  # noqa: E402
+from src.core.stats_tracker import StatsEngine  # noqa: E402
+from src.services.profiles import ProfileRegistry  # noqa: E402
+
+__all__ = [
+    'STUDY_PLATFORM_DIR', 'CounterDelta', 'file_lock', 'locked_update_csv', 'parse_counts',
+    'StatsEngine', 'ProfileRegistry',
+]
@@ -0,0 +1,274 @@
+"""
+Banco de preguntas tipificado para el Estudio de Módulos DP-700
+Parsea cada CSV una sola vez y mantiene contadores de dominio incrementales.
+Con los fragmentos de métricas de un perfil (MetricsShards) el CSV es solo
+contenido: las respuestas se guardan en el perfil, igual que en study_platform.
+"""
+
+import csv
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Capa de escritura compartida con study_platform (bloqueo entre procesos)
+from platform_bridge import CounterDelta, locked_update_csv, parse_counts
+
+
+# Umbrales de dominio (proporción de aciertos)
+MASTERED_THRESHOLD = 0.8
+PRACTICE_THRESHOLD = 0.4
+
+BUCKET_MASTERED = 'mastered'
+BUCKET_PRACTICE = 'practice'
+BUCKET_NEW = 'new'
+BUCKETS = (BUCKET_MASTERED, BUCKET_PRACTICE, BUCKET_NEW)
+
+
+def format_metrics(correct: int, incorrect: int) -> str:
+    """Serializa las métricas al formato del CSV"""
+    return f'{correct};{incorrect}'
+
+
+def parse_answer_list(value: str) -> Tuple[int, ...]:
+    """Parsea respuestas 1-based separadas por ';' (ej: '1;2;3')"""
+    answers = []
+    for part in (value or '').split(';'):
+        part = part.strip()
+        if part.isdigit():
+            answers.append(int(part))
+    return tuple(answers)
+
+
+def classify(correct: int, incorrect: int) -> str:
+    """Determina la categoría de dominio a partir de los contadores"""
+    attempts = correct + incorrect
+    if attempts == 0:
+        return BUCKET_NEW
+    accuracy = correct / attempts
+    if accuracy >= MASTERED_THRESHOLD:
+        return BUCKET_MASTERED
+    if accuracy >= PRACTICE_THRESHOLD:
+        return BUCKET_PRACTICE
+    return BUCKET_NEW
+
+
+@dataclass
+class ModuleQuestion:
+    """Pregunta de un módulo con métricas ya parseadas a enteros"""
+    section: str
+    id: str
+    question: str
+    options: List[str]
+    correct: Tuple[int, ...]          # Índices 1-based
+    multi: bool = False
+    notas: str = ''
+    second_question: str = ''
+    second_options: List[str] = field(default_factory=list)
+    second_correct: Tuple[int, ...] = ()
+    second_explanation: str = ''
+    times_correct: int = 0
+    times_incorrect: int = 0
+    platform_id: str = ''             # Id en study_platform (<archivo>_q<fila>), clave en el perfil
+
+    @classmethod
+    def from_row(cls, row: Dict[str, str], platform_id: str = '') -> 'ModuleQuestion':
+        """Crea la pregunta desde una fila de csv.DictReader"""
+        times_correct, times_incorrect = parse_counts(row.get('metrics', ''))
+        second_options = row.get('second_options') or ''
+        return cls(
+            section=row.get('section', ''),
+            id=row.get('id', ''),
+            question=row.get('question', ''),
+            options=(row.get('options') or '').split(';'),
+            correct=parse_answer_list(row.get('correct', '')),
+            multi=(row.get('multi') or '').strip().lower() == 'true',
+            notas=row.get('notas') or '',
+            second_question=row.get('second_question') or '',
+            second_options=second_options.split(';') if second_options else [],
+            second_correct=parse_answer_list(row.get('second_correct', '')),
+            second_explanation=row.get('second_explanation') or '',
+            times_correct=times_correct,
+            times_incorrect=times_incorrect,
+            platform_id=platform_id,
+        )
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """Clave única dentro de un módulo: (id, sección)"""
+        return self.id, self.section
+
+    @property
+    def attempts(self) -> int:
+        return self.times_correct + self.times_incorrect
+
+    @property
+    def accuracy(self) -> float:
+        """Porcentaje de aciertos (0-100)"""
+        attempts = self.attempts
+        return (self.times_correct / attempts * 100) if attempts > 0 else 0.0
+
+    @property
+    def bucket(self) -> str:
+        return classify(self.times_correct, self.times_incorrect)
+
+    @property
+    def metrics(self) -> str:
+        return format_metrics(self.times_correct, self.times_incorrect)
+
+    def is_correct_answer(self, answers) -> bool:
+        """Compara la(s) respuesta(s) 1-based del usuario con las correctas"""
+        if isinstance(answers, int):
+            answers = (answers,)
+        return bool(self.correct) and set(answers) == set(self.correct)
+
+
+@dataclass
+class ModuleStats:
+    """Resumen de dominio de un módulo"""
+    total: int
+    mastered: int
+    practice: int
+    new: int
+    domain_percentage: int
+
+
+class ModuleBank:
+    """Preguntas de un módulo con contadores de dominio por categoría"""
+
+    # Número de respuestas pendientes que fuerza una escritura inmediata
+    FLUSH_BATCH_SIZE = 20
+
+    def __init__(self, questions: List[ModuleQuestion], file_path: Optional[str] = None, shards=None):
+        self.questions = questions
+        self.file_path = file_path
+        # Fragmentos de métricas del perfil (None: las métricas viven en la columna del CSV)
+        self.shards = shards
+        self.sections = sorted(set(q.section for q in questions))
+        self._bucket_counts = {bucket: 0 for bucket in BUCKETS}
+        self.total_correct = 0
+        self.total_attempts = 0
+        for q in questions:
+            self._bucket_counts[q.bucket] += 1
+            self.total_correct += q.times_correct
+            self.total_attempts += q.attempts
+
+        # Preguntas sin escribir con sus métricas antes de la primera respuesta pendiente
+        self._dirty: Dict[Tuple[str, str], Tuple[ModuleQuestion, Tuple[int, int]]] = {}
+
+    @classmethod
+    def from_csv(cls, file_path: str, shards=None, seed: bool = False) -> 'ModuleBank':
+        """
+        Carga y parsea un CSV de módulo una única vez. Con `shards` las métricas son
+        las del perfil; con `seed` el perfil adopta las del CSV si aún no tiene las
+        de este archivo (perfil migrado, como DataLoader.use_profile).
+        """
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        with open(file_path, 'r', encoding='utf-8') as f:
+            questions = [ModuleQuestion.from_row(row, f"{stem}_q{n}")
+                         for n, row in enumerate(csv.DictReader(f), 1)]
+        if shards is not None:
+            if seed:
+                shards.seed_source(file_path, {q.platform_id: (q.times_correct, q.times_incorrect)
+                                               for q in questions})
+            for q in questions:
+                q.times_correct, q.times_incorrect = shards.counts(file_path, q.platform_id)
+        return cls(questions, file_path=file_path, shards=shards)
+
+    def record_answer(self, question: ModuleQuestion, is_correct: bool):
+        """Aplica una respuesta a la pregunta y ajusta los contadores en O(1)"""
+        self._dirty.setdefault(question.key, (question, (question.times_correct, question.times_incorrect)))
+        self._bucket_counts[question.bucket] -= 1
+        if is_correct:
+            question.times_correct += 1
+            self.total_correct += 1
+        else:
+            question.times_incorrect += 1
+        self.total_attempts += 1
+        self._bucket_counts[question.bucket] += 1
+
+    @property
+    def pending_writes(self) -> int:
+        """Preguntas con métricas aún no escritas a disco"""
+        return len(self._dirty)
+
+    def should_flush(self) -> bool:
+        return len(self._dirty) >= self.FLUSH_BATCH_SIZE
+
+    def flush(self) -> int:
+        """
+        Escribe en un único paso las métricas pendientes (en el fragmento del perfil o
+        en el CSV). El archivo se relee bajo bloqueo y se suman los deltas de esta
+        sesión: otra app puede haberlo modificado.
+        Retorna preguntas actualizadas
+        """
+        if not self._dirty or not self.file_path:
+            return 0
+
+        dirty, self._dirty = self._dirty, {}
+        deltas = {
+            key: CounterDelta(question.platform_id, (question.times_correct, question.times_incorrect), baseline)
+            for key, (question, baseline) in dirty.items()
+        }
+
+        def merge_rows(fieldnames, rows):
+            if 'metrics' not in fieldnames:
+                fieldnames.append('metrics')
+            index = {}
+            for row in rows:
+                index.setdefault((row.get('id', ''), row.get('section', '')), row)
+            for key, delta in deltas.items():
+                row = index.get(key)
+                if row is not None:
+                    row['metrics'] = format_metrics(*delta.merge(parse_counts(row.get('metrics', ''))))
+            return fieldnames
+
+        try:
+            if self.shards is not None:
+                written = self.shards.write(self.file_path, list(deltas.values()))
+            else:
+                locked_update_csv(self.file_path, merge_rows)
+                written = True
+        except Exception:
+            # Se reintentará en el próximo flush desde los valores anteriores
+            self._dirty.update(dirty)
+            raise
+        if not written:
+            # MetricsShards.write ya informó del error
+            self._dirty.update(dirty)
+            return 0
+
+        # Incorporar las respuestas escritas por otros procesos
+        for key, (question, _) in dirty.items():
+            merged = deltas[key].merged
+            if merged is not None and merged != (question.times_correct, question.times_incorrect):
+                self._bucket_counts[question.bucket] -= 1
+                self.total_correct += merged[0] - question.times_correct
+                self.total_attempts += sum(merged) - question.attempts
+                question.times_correct, question.times_incorrect = merged
+                self._bucket_counts[question.bucket] += 1
+        return len(dirty)
+
+    def count(self, bucket: str) -> int:
+        return self._bucket_counts[bucket]
+
+    def questions_in(self, bucket: str) -> List[ModuleQuestion]:
+        """Preguntas de una categoría de dominio"""
+        return [q for q in self.questions if q.bucket == bucket]
+
+    def questions_in_section(self, section: Optional[str]) -> List[ModuleQuestion]:
+        """Preguntas de una sección (None = todas)"""
+        if section is None:
+            return list(self.questions)
+        return [q for q in self.questions if q.section == section]
+
+    def stats(self) -> ModuleStats:
+        """Estadísticas de dominio actuales (sin recorrer las preguntas)"""
+        domain = int(self.total_correct / self.total_attempts * 100) if self.total_attempts > 0 else 0
+        return ModuleStats(
+            total=len(self.questions),
+            mastered=self._bucket_counts[BUCKET_MASTERED],
+            practice=self._bucket_counts[BUCKET_PRACTICE],
+            new=self._bucket_counts[BUCKET_NEW],
+            domain_percentage=domain,
+        )
+
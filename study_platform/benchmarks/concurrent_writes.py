@@ -0,0 +1,201 @@
+"""
+Prueba de estrés de escrituras concurrentes (src/core/file_store.py)
+Lanza N procesos que responden preguntas a la vez sobre copias temporales de los
+mismos archivos, como varias apps abiertas desde launch.py:
+
+- DataLoader (write-behind al CSV) + PersistenceService (user_stats.json del perfil)
+- ModuleBank de estudio_modulos + StatsManager (user_stats.json del perfil), sobre
+  los fragmentos de métricas del perfil
+- DataLoader con perfil (los mismos fragmentos de métricas)
+
+Al terminar comprueba que los archivos contienen exactamente la suma de los
+incrementos de todos los procesos (ninguno perdido, ningún archivo truncado).
+
+Uso (desde study_platform/):
+    python -m benchmarks.concurrent_writes --processes 8 --answers 200 --batch 5
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT.parent))
+
+from config import Config  # noqa: E402
+
+KINDS = ('loader', 'legacy', 'profile')
+CSV_NAME = 'dp700_concurrency.csv'
+QUESTIONS = 30
+
+
+def make_fixture(directory: Path):
+    """CSV de módulo con métricas iniciales no nulas"""
+    questions_dir = directory / 'questions'
+    questions_dir.mkdir(parents=True)
+    with open(questions_dir / CSV_NAME, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['section', 'id', 'question', 'options', 'correct', 'multi', 'notas', 'metrics'])
+        for n in range(1, QUESTIONS + 1):
+            writer.writerow([f'Sección {n % 3}', n, f'Pregunta {n}', 'A;B;C;D', 1, 'false', '', f'{n};{n % 4}'])
+    (directory / 'packs').mkdir()
+
+
+def read_csv_metrics(path: Path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return [tuple(int(v) for v in row['metrics'].split(';')) for row in csv.DictReader(f)]
+
+
+def run_worker(kind: str, number: int, directory: str, answers: int, batch: int, seed: int):
+    """Un proceso: responde `answers` preguntas y retorna los incrementos que aplicó"""
+    directory = Path(directory)
+    Config.STORAGE_DIR = directory / 'storage'
+    rng = random.Random(seed * 1000 + number)
+    counts = defaultdict(lambda: [0, 0])  # fila -> [correctas, incorrectas]
+    totals = {'answers': 0, 'correct': 0}
+
+    if kind == 'legacy':
+        from question_bank import ModuleBank
+        from stats_manager import StatsManager
+        from src.services.profiles import MetricsShards
+
+        bank = ModuleBank.from_csv(str(directory / 'questions' / CSV_NAME),
+                                   MetricsShards(directory / 'profile' / 'metrics'))
+        bank.FLUSH_BATCH_SIZE = batch
+        stats = StatsManager(str(directory / 'user_stats.json'))
+        for _ in range(answers):
+            row = rng.randrange(len(bank.questions))
+            is_correct = rng.random() < 0.6
+            bank.record_answer(bank.questions[row], is_correct)
+            stats.record_module_answer('concurrency', bank.questions[row].id, is_correct)
+            counts[row][0 if is_correct else 1] += 1
+            if bank.should_flush():
+                bank.flush()
+        bank.flush()
+        totals['answers'] = answers
+        totals['correct'] = sum(c for c, _ in counts.values())
+        return kind, dict(counts), totals
+
+    from src.services.data_loader import DataLoader
+    from src.services.persistence import PersistenceService
+    from src.services.profiles import MetricsShards
+
+    loader = DataLoader()
+    loader.questions_dir = directory / 'questions'
+    loader.packs_dir = directory / 'packs'
+    questions = loader.load_all_questions()
+    if kind == 'profile':
+        loader.use_profile('shared', MetricsShards(directory / 'profile' / 'metrics'), questions)
+    persistence = PersistenceService(directory / 'profile')
+
+    for n in range(answers):
+        question = rng.choice(questions)
+        row = int(question.id.rsplit('_q', 1)[1]) - 1
+        is_correct = rng.random() < 0.6
+        loader.record_answer(question, is_correct)
+        counts[row][0 if is_correct else 1] += 1
+        if kind == 'loader':
+            persistence.record_command_attempt(f'cmd{row % 5}', is_correct, save=False)
+        if (n + 1) % batch == 0:
+            loader.flush_pending()
+            persistence.commit()
+    loader.flush_pending()
+    persistence.commit()
+    if kind == 'loader':
+        totals['answers'] = answers
+        totals['correct'] = sum(c for c, _ in counts.values())
+    return kind, dict(counts), totals
+
+
+def verify(directory: Path, initial, results) -> list:
+    problems = []
+    expected_csv = [list(values) for values in initial]
+    expected_shard = defaultdict(lambda: [0, 0])
+    sums = defaultdict(lambda: {'answers': 0, 'correct': 0})
+    for kind, counts, totals in results:
+        for row, (correct, incorrect) in counts.items():
+            target = expected_csv[row] if kind == 'loader' else expected_shard[row]
+            target[0] += correct
+            target[1] += incorrect
+        sums[kind]['answers'] += totals['answers']
+        sums[kind]['correct'] += totals['correct']
+
+    final = read_csv_metrics(directory / 'questions' / CSV_NAME)
+    if len(final) != len(initial):
+        problems.append(f"CSV has {len(final)} rows, expected {len(initial)}")
+    for row, (values, expected) in enumerate(zip(final, expected_csv)):
+        if list(values) != expected:
+            problems.append(f"CSV row {row + 1}: {list(values)} != {expected}")
+
+    shard_file = directory / 'profile' / 'metrics' / f'{Path(CSV_NAME).stem}.json'
+    shard = json.loads(shard_file.read_text(encoding='utf-8')) if shard_file.exists() else {}
+    for row, expected in expected_shard.items():
+        stored = shard.get(f'{Path(CSV_NAME).stem}_q{row + 1}', [0, 0])
+        if stored != expected:
+            problems.append(f"profile shard row {row + 1}: {stored} != {expected}")
+
+    legacy = json.loads((directory / 'user_stats.json').read_text(encoding='utf-8'))['module_study']
+    if (legacy['questions_answered'], legacy['correct_answers']) != (sums['legacy']['answers'], sums['legacy']['correct']):
+        problems.append(f"user_stats.json module_study {legacy['questions_answered']}/{legacy['correct_answers']} "
+                        f"!= {sums['legacy']['answers']}/{sums['legacy']['correct']}")
+
+    profile = json.loads((directory / 'profile' / 'user_stats.json').read_text(encoding='utf-8'))['matrix_trainer']
+    attempts = profile['total_attempts']
+    correct = attempts - profile['total_errors']
+    if (attempts, correct) != (sums['loader']['answers'], sums['loader']['correct']):
+        problems.append(f"profile user_stats.json commands {attempts}/{correct} "
+                        f"!= {sums['loader']['answers']}/{sums['loader']['correct']}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=8)
+    parser.add_argument('--answers', type=int, default=200, help="respuestas por proceso")
+    parser.add_argument('--batch', type=int, default=5, help="respuestas por escritura")
+    parser.add_argument('--seed', type=int, default=700)
+    parser.add_argument('--keep', action='store_true', help="conservar el directorio temporal")
+    args = parser.parse_args(argv)
+
+    directory = Path(tempfile.mkdtemp(prefix='dp700_concurrency_'))
+    try:
+        make_fixture(directory)
+        initial = read_csv_metrics(directory / 'questions' / CSV_NAME)
+
+        # spawn en todas las plataformas: cada proceso arranca como una app independiente
+        context = multiprocessing.get_context('spawn')
+        jobs = [(KINDS[n % len(KINDS)], n, str(directory), args.answers, args.batch, args.seed)
+                for n in range(args.processes)]
+        started = time.perf_counter()
+        with context.Pool(args.processes) as pool:
+            results = pool.starmap(run_worker, jobs)
+        elapsed = time.perf_counter() - started
+
+        total = args.processes * args.answers
+        print(f"{args.processes} procesos, {total:,} respuestas en {elapsed:.1f} s "
+              f"(lotes de {args.batch})")
+        problems = verify(directory, initial, results)
+        if problems:
+            print(f"FALLO: {len(problems)} diferencias")
+            for problem in problems[:20]:
+                print(f"  {problem}")
+            return 1
+        print("OK: ningún incremento perdido")
+        return 0
+    finally:
+        if args.keep:
+            print(f"Archivos en {directory}")
+        else:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""
+Prueba de carga del servidor JSON (server.py)
+Cada cliente abre una conexión keep-alive, crea una sesión y repite el ciclo
+"pedir preguntas -> responderlas" (y de vez en cuando consulta stats).
+Reporta peticiones/s y latencias p50/p90/p99/máx por endpoint.
+
+Uso (desde study_platform/):
+    python -m benchmarks.load_test --clients 50 --duration 10
+    python -m benchmarks.load_test --mode persist       # solo la pasada con persistencia
+    python -m benchmarks.load_test --port 8700          # contra una instancia ya iniciada
+Sin --port se lanzan servidores temporales, uno por modo (por defecto ambos):
+- memory: --no-persist, mide solo el servidor
+- persist: escribe métricas y estadísticas de verdad sobre una copia temporal de
+  data/ y un storage/ vacío (no toca los CSV ni el progreso reales)
+"""
+import argparse
+import asyncio
+import json
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODE_MEMORY = 'memory'
+MODE_PERSIST = 'persist'
+
+
+class Client:
+    """Cliente HTTP/1.1 keep-alive mínimo"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method: str, path: str, payload: Optional[dict] = None) -> Tuple[int, dict]:
+        if self.writer is None:
+            await self.connect()
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        self.writer.write(head.encode('latin-1') + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('connection closed by server')
+        status = int(status_line.split()[1])
+        length, close = 0, False
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name = name.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'connection' and value.strip().lower() == 'close':
+                close = True
+        data = await self.reader.readexactly(length) if length else b''
+        if close:
+            self.close()
+        return status, json.loads(data) if data else {}
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class Results:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Counter = Counter()
+        self.errors = 0
+
+    def record(self, endpoint: str, seconds: float, status: int):
+        self.latencies[endpoint].append(seconds * 1000)
+        self.statuses[status] += 1
+
+
+async def timed(client: Client, results: Results, endpoint: str, method: str, path: str,
+                payload: Optional[dict] = None) -> Tuple[int, dict]:
+    started = time.perf_counter()
+    status, data = await client.request(method, path, payload)
+    results.record(endpoint, time.perf_counter() - started, status)
+    return status, data
+
+
+async def run_client(host: str, port: int, deadline: float, count: int, results: Results, rng: random.Random):
+    client = Client(host, port)
+    try:
+        status, data = await timed(client, results, 'sessions', 'POST', '/api/sessions', {})
+        if status != 200:
+            return
+        session = data['session']
+        while time.perf_counter() < deadline:
+            status, data = await timed(client, results, 'next', 'GET',
+                                       f'/api/questions/next?session={session}&count={count}')
+            if status != 200:
+                await asyncio.sleep(0.05)
+                continue
+            for question in data['questions']:
+                choice = rng.randrange(len(question['options'])) if question['options'] else 0
+                await timed(client, results, 'answers', 'POST', '/api/answers',
+                            {'session': session, 'question_id': question['id'], 'choice': choice})
+            if rng.random() < 0.1:
+                await timed(client, results, 'stats', 'GET', f'/api/stats?session={session}')
+    except (ConnectionError, asyncio.IncompleteReadError, OSError):
+        results.errors += 1
+    finally:
+        client.close()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def report(results: Results, elapsed: float, clients: int) -> Tuple[float, float]:
+    """Imprime la tabla por endpoint y retorna (req/s, p99 global en ms)"""
+    total = sum(len(v) for v in results.latencies.values())
+    print(f"\n{clients} clientes, {elapsed:.1f} s, {total:,} peticiones -> {total / elapsed:,.0f} req/s")
+    print(f"{'endpoint':<10} {'n':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'máx':>8}  (ms)")
+    everything = []
+    for endpoint, values in sorted(results.latencies.items()):
+        values.sort()
+        everything.extend(values)
+        print(f"{endpoint:<10} {len(values):>8,} {percentile(values, 50):8.2f} {percentile(values, 90):8.2f} "
+              f"{percentile(values, 99):8.2f} {values[-1]:8.2f}")
+    everything.sort()
+    if everything:
+        print(f"{'total':<10} {len(everything):>8,} {percentile(everything, 50):8.2f} {percentile(everything, 90):8.2f} "
+              f"{percentile(everything, 99):8.2f} {everything[-1]:8.2f}")
+    print(f"estados: {dict(results.statuses)}  errores de conexión: {results.errors}")
+    return (total / elapsed if elapsed else 0.0), percentile(everything, 99)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def wait_ready(host: str, port: int, timeout: float = 30.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            client = Client(host, port)
+            status, _ = await client.request('GET', '/api/health')
+            client.close()
+            if status == 200:
+                return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {host}:{port} did not start")
+
+
+def start_server(host: str, port: int, mode: str, workdir: Path) -> subprocess.Popen:
+    command = [sys.executable, str(ROOT / 'server.py'), '--host', host, '--port', str(port)]
+    if mode == MODE_MEMORY:
+        command.append('--no-persist')
+    else:
+        # Perfil temporal: copia del contenido y progreso vacío
+        data_dir, storage_dir = workdir / 'data', workdir / 'storage'
+        shutil.copytree(ROOT / 'data', data_dir, ignore=shutil.ignore_patterns('user_notes.json'))
+        storage_dir.mkdir()
+        command += ['--data-dir', str(data_dir), '--storage-dir', str(storage_dir)]
+    return subprocess.Popen(command, cwd=str(ROOT), stdout=subprocess.DEVNULL)
+
+
+async def run_load(args, port: int) -> Tuple[float, float]:
+    await wait_ready(args.host, port)
+    results = Results()
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(
+        run_client(args.host, port, deadline, args.count, results, random.Random(rng.random()))
+        for _ in range(args.clients)
+    ))
+    return report(results, time.perf_counter() - started, args.clients)
+
+
+async def main_async(args) -> int:
+    if args.port is not None:
+        await run_load(args, args.port)
+        return 0
+
+    modes = [MODE_MEMORY, MODE_PERSIST] if args.mode == 'both' else [args.mode]
+    summary = {}
+    for mode in modes:
+        print(f"\n== {mode} ==")
+        with tempfile.TemporaryDirectory(prefix='dp700_load_') as workdir:
+            port = free_port()
+            process = start_server(args.host, port, mode, Path(workdir))
+            try:
+                summary[mode] = await run_load(args, port)
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+
+    if len(summary) > 1:
+        print(f"\n{'modo':<10} {'req/s':>10} {'p99 (ms)':>10}")
+        for mode, (rps, p99) in summary.items():
+            print(f"{mode:<10} {rps:>10,.0f} {p99:>10.2f}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help="servidor ya iniciado (si no, se lanza uno por modo)")
+    parser.add_argument('--mode', choices=(MODE_MEMORY, MODE_PERSIST, 'both'), default='both',
+                        help="servidores temporales: sin persistencia, con persistencia o ambos")
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--count', type=int, default=5, help="preguntas por petición de /next")
+    parser.add_argument('--seed', type=int, default=700)
+    args = parser.parse_args(argv)
+    return asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
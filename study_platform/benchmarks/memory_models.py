@@ -0,0 +1,164 @@
+"""
+Benchmark de memoria de los modelos Question y SQLCommand
+Compara bytes por objeto del modelo actual (slots + strings internados + partes
+únicas) con la representación anterior (dataclass con __dict__ y listas paralelas).
+
+Uso (desde study_platform/):
+    python -m benchmarks.memory_models --questions 100000 --commands 10000
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models.question import Question, SQLCommand, DifficultyLevel  # noqa: E402
+from src.services.data_loader import DataLoader  # noqa: E402
+
+
+# ==== Representación anterior (referencia) ====
+
+@dataclass
+class LegacyQuestion:
+    id: str
+    module: str
+    section: str
+    difficulty: DifficultyLevel
+    question_text: str
+    options: List[str]
+    correct_answer: int
+    explanation: str
+    tags: List[str] = field(default_factory=list)
+    times_seen: int = 0
+    times_correct: int = 0
+    times_incorrect: int = 0
+    source_file: str = ""
+    average_time_seconds: float = 0.0
+    last_seen: Optional[str] = None
+
+
+@dataclass
+class LegacySQLCommand:
+    id: str
+    title: str
+    description: str
+    category: str
+    difficulty: DifficultyLevel
+    full_command: str
+    hints: List[str] = field(default_factory=list)
+    keywords: List[str] = field(default_factory=list)
+    explanation_parts: List[dict] = field(default_factory=list)
+    attempts: int = 0
+    completions: int = 0
+    fastest_time_seconds: Optional[float] = None
+    average_errors: float = 0.0
+    last_attempted: Optional[str] = None
+
+
+def fresh(text: str) -> str:
+    """Copia nueva del string (como la que produce csv.DictReader en cada fila)"""
+    return ''.join(list(text)) if text else text
+
+
+def question_kwargs(template: Question, i: int) -> dict:
+    """Campos de la i-ésima pregunta sintética: texto único, categorías repetidas"""
+    section = fresh(template.section)
+    return dict(
+        id=f"{template.id}_{i}",
+        module=fresh(template.module),
+        section=section,
+        difficulty=template.difficulty,
+        question_text=f"{template.question_text} #{i}",
+        options=[f"{opt} " for opt in template.options],
+        correct_answer=template.correct_answer,
+        explanation=fresh(template.explanation),
+        tags=section.split(','),
+        times_seen=template.times_seen,
+        times_correct=template.times_correct,
+        times_incorrect=template.times_incorrect,
+        source_file=fresh(template.source_file),
+    )
+
+
+def command_kwargs(template: SQLCommand, i: int, legacy: bool) -> dict:
+    parts = [(fresh(p.fragment), fresh(p.explanation)) for p in template.parts]
+    data = dict(
+        id=f"{template.id}_{i}",
+        title=fresh(template.title),
+        description=fresh(template.description),
+        category=fresh(template.category),
+        difficulty=template.difficulty,
+        full_command=fresh(template.full_command),
+    )
+    if legacy:
+        data['hints'] = [e for _, e in parts if e]
+        data['keywords'] = [f for f, _ in parts if f]
+        data['explanation_parts'] = [{'fragment': f, 'explanation': e} for f, e in parts]
+    else:
+        data['explanation_parts'] = [{'fragment': f, 'explanation': e} for f, e in parts]
+    return data
+
+
+def measure(build) -> int:
+    """Bytes retenidos por lo que construye `build`"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = build()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del objects
+    return retained
+
+
+def report(label: str, count: int, legacy_bytes: int, current_bytes: int):
+    saved = (1 - current_bytes / legacy_bytes) * 100 if legacy_bytes else 0.0
+    print(f"\n{label} ({count:,} objetos)")
+    print(f"  anterior: {legacy_bytes / 1048576:8.1f} MB  {legacy_bytes / count:8.0f} B/objeto")
+    print(f"  actual:   {current_bytes / 1048576:8.1f} MB  {current_bytes / count:8.0f} B/objeto")
+    print(f"  ahorro:   {saved:7.1f} %")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', type=int, default=100_000)
+    parser.add_argument('--commands', type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    loader = DataLoader()
+    question_templates = loader.load_all_questions()
+    command_templates = loader.load_all_commands()
+    if not question_templates or not command_templates:
+        print("No hay datos de ejemplo en data/questions o data/commands")
+        return 1
+
+    def build_questions(cls):
+        return [cls(**question_kwargs(question_templates[i % len(question_templates)], i))
+                for i in range(args.questions)]
+
+    legacy = measure(lambda: build_questions(LegacyQuestion))
+    current = measure(lambda: build_questions(Question))
+    report("Question", args.questions, legacy, current)
+
+    def build_legacy_commands():
+        return [LegacySQLCommand(**command_kwargs(command_templates[i % len(command_templates)], i, True))
+                for i in range(args.commands)]
+
+    def build_commands():
+        return [SQLCommand.from_dict(command_kwargs(command_templates[i % len(command_templates)], i, False))
+                for i in range(args.commands)]
+
+    legacy = measure(build_legacy_commands)
+    current = measure(build_commands)
+    report("SQLCommand", args.commands, legacy, current)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
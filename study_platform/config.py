@@ -11,7 +11,11 @@ class Config:
     SRC_DIR = BASE_DIR / 'src'
     DATA_DIR = BASE_DIR / 'data'
     STORAGE_DIR = BASE_DIR / 'storage'
+    CACHE_DIR = STORAGE_DIR / 'cache'
+    PACKS_DIR = DATA_DIR / 'packs'  # Paquetes de contenido .dp700pack
+    PROFILES_DIR = STORAGE_DIR / 'profiles'  # Progreso por estudiante
     ASSETS_DIR = BASE_DIR / 'assets'
+    LEGACY_DIR = BASE_DIR.parent  # Apps clásicas (matrix_trainer_v2.py, estudio_modulos.py...)
     
     # Configuración de ventana
     WINDOW_TITLE = "DP-700 Study Platform"
@@ -29,13 +33,32 @@ class Config:
     MAX_ERRORS_PER_COMMAND = 3
     RECENT_ACHIEVEMENTS_COUNT = 6
     
+    # Carga de preguntas: índice ligero al inicio y texto bajo demanda
+    LAZY_QUESTION_BODIES = True
+    
+    # Servidor JSON local (server.py)
+    SERVER_HOST = '127.0.0.1'
+    SERVER_PORT = 8700
+    
     # Tema por defecto
     DEFAULT_THEME = 'light'  # 'light' o 'dark'
     
+    @classmethod
+    def use_directories(cls, data_dir: Path = None, storage_dir: Path = None):
+        """Redirige el contenido y/o el progreso a otras carpetas (p. ej. un servidor de pruebas)"""
+        if data_dir is not None:
+            cls.DATA_DIR = Path(data_dir)
+            cls.PACKS_DIR = cls.DATA_DIR / 'packs'
+        if storage_dir is not None:
+            cls.STORAGE_DIR = Path(storage_dir)
+            cls.CACHE_DIR = cls.STORAGE_DIR / 'cache'
+            cls.PROFILES_DIR = cls.STORAGE_DIR / 'profiles'
+    
     @classmethod
     def ensure_directories(cls):
         """Crea directorios necesarios si no existen"""
         cls.STORAGE_DIR.mkdir(exist_ok=True)
+        cls.CACHE_DIR.mkdir(exist_ok=True)
         (cls.DATA_DIR / 'questions').mkdir(parents=True, exist_ok=True)
         (cls.DATA_DIR / 'commands').mkdir(parents=True, exist_ok=True)
         (cls.DATA_DIR / 'achievements').mkdir(parents=True, exist_ok=True)
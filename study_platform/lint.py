@@ -0,0 +1,60 @@
+"""
+Validación del contenido antes de publicar
+
+Uso (desde study_platform/):
+    python lint.py                      # data/questions y data/commands
+    python lint.py data/questions/dp700_x.csv --jobs 4
+    python lint.py --strict             # los avisos también fallan
+    python lint.py --update-baseline    # acepta los problemas actuales como conocidos
+Sale con código 1 si hay errores que no están en la línea base (lint_baseline.json).
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from config import Config
+from src.services.content_linter import apply_baseline, content_files, lint_paths, load_baseline, save_baseline
+from src.services.data_cache import DataCache
+
+
+BASELINE_FILE = Config.BASE_DIR / 'lint_baseline.json'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='*', type=Path, help="archivos a validar (por defecto todo data/)")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="procesos (por defecto uno por CPU)")
+    parser.add_argument('--no-cache', action='store_true', help="revalida también los archivos sin cambios")
+    parser.add_argument('--strict', action='store_true', help="falla también con avisos")
+    parser.add_argument('--quiet', '-q', action='store_true', help="no lista los avisos")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE, help="problemas conocidos que no fallan")
+    parser.add_argument('--no-baseline', action='store_true', help="reporta también los problemas conocidos")
+    parser.add_argument('--update-baseline', action='store_true', help="reescribe la línea base con los problemas actuales")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or content_files(Config.DATA_DIR)
+    started = time.perf_counter()
+    report = lint_paths(paths, jobs=args.jobs, cache=None if args.no_cache else DataCache())
+    elapsed = time.perf_counter() - started
+
+    if args.update_baseline:
+        save_baseline(args.baseline, report.issues, Config.BASE_DIR)
+        print(f"{len(report.issues)} problemas guardados en {args.baseline}")
+        return 0
+    if not args.no_baseline:
+        report = apply_baseline(report, load_baseline(args.baseline), Config.BASE_DIR)
+
+    for issue in report.issues:
+        if args.quiet and issue.severity != 'error':
+            continue
+        print(issue.format())
+    print(f"\n{report.checked + report.skipped} archivos ({report.skipped} sin cambios) en {elapsed:.2f}s: "
+          f"{report.errors} errores, {report.warnings} avisos"
+          + (f" ({len(report.baselined)} conocidos en la línea base)" if report.baselined else ""))
+
+    failed = report.errors or (args.strict and report.warnings)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,18 +3,19 @@ DP-700 Study Platform
 Punto de entrada principal con navegación entre vistas
 """
 import sys
-from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QSpacerItem, QSizePolicy
-from PyQt5.QtCore import Qt
+import time
+_STARTUP_T0 = time.perf_counter()
+
+from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget, QWidget, QFrame, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QSpacerItem, QSizePolicy, QShortcut, QComboBox, QInputDialog
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QKeySequence
 
 from config import Config
-from src.ui.themes.colors import ModernColors, BorderRadius
-from src.ui.themes.modern_light import ModernLightTheme
-from src.ui.views.dashboard_view import DashboardView
-from src.ui.views.study_selection_view import StudySelectionView
-from src.ui.views.quiz_view import QuizView
-from src.ui.views.sql_trainer_view import SQLTrainerView
-from src.ui.views.statistics_view import StatisticsView
-from src.ui.components.notepad_view import NotepadView
+from src.core.event_bus import event_bus, AchievementUnlocked, ProfileSwitched
+from src.ui.themes import theme_manager
+from src.ui.view_manager import ViewManager
+from src.utils import startup_profiler, tracing
+# Las vistas (también el dashboard) y el notepad se importan al construirlos
 
 
 class MainWindow(QMainWindow):
@@ -38,9 +39,10 @@ class MainWindow(QMainWindow):
         self.move(x, y)
     
     def apply_theme(self):
-        """Aplica el tema visual"""
-        theme = ModernLightTheme()
-        self.setStyleSheet(theme.get_stylesheet())
+        """Aplica el tema visual a toda la aplicación (Ctrl+Shift+T alterna claro/oscuro)"""
+        theme_manager.apply_theme(Config.DEFAULT_THEME)
+        QShortcut(QKeySequence("Ctrl+Shift+T"), self, activated=theme_manager.toggle_theme)
+        QShortcut(QKeySequence("Ctrl+Shift+R"), self, activated=self.show_trace_summary)
     
     def setup_ui(self):
         """Configura la interfaz con barra superior y stack de vistas"""
@@ -51,15 +53,15 @@ class MainWindow(QMainWindow):
         main_layout.setSpacing(0)
         
         # --- Barra Superior (Header) ---
-        self.header = QWidget()
+        self.header = QFrame()
         self.header.setFixedHeight(60)
-        self.header.setStyleSheet(f"background-color: {ModernColors.LIGHT['bg_primary']}; border-bottom: 1px solid {ModernColors.LIGHT['border']};")
+        self.header.setProperty("frameType", "header")
         header_layout = QHBoxLayout(self.header)
         header_layout.setContentsMargins(20, 0, 20, 0)
         
         # Logo/Título
         app_title = QLabel(Config.WINDOW_TITLE)
-        app_title.setStyleSheet(f"color: {ModernColors.LIGHT['primary']}; font-weight: bold; font-size: 18px;")
+        app_title.setProperty("labelType", "appTitle")
         header_layout.addWidget(app_title)
         
         header_layout.addStretch()
@@ -67,44 +69,127 @@ class MainWindow(QMainWindow):
         # Botón Notas (Siempre visible)
         self.btn_notes = QPushButton("📝 Notas")
         self.btn_notes.setCursor(Qt.PointingHandCursor)
-        self.btn_notes.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {ModernColors.LIGHT['surface']};
-                color: {ModernColors.LIGHT['text_primary']};
-                border: 1px solid {ModernColors.LIGHT['border']};
-                border-radius: {BorderRadius.MD}px;
-                padding: 8px 16px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {ModernColors.LIGHT['surface_elevated']};
-                border-color: {ModernColors.LIGHT['primary']};
-                color: {ModernColors.LIGHT['primary']};
-            }}
-        """)
+        self.btn_notes.setProperty("buttonType", "header")
         self.btn_notes.clicked.connect(self.toggle_notepad)
+        
+        # Botón Rendimiento (overlay de métricas en vivo)
+        self.btn_perf = QPushButton("⚡ Rendimiento")
+        self.btn_perf.setCursor(Qt.PointingHandCursor)
+        self.btn_perf.setProperty("buttonType", "header")
+        self.btn_perf.clicked.connect(self.toggle_perf_overlay)
+        header_layout.addWidget(self.btn_perf)
         header_layout.addWidget(self.btn_notes)
         
+        # Selector de perfil (se rellena y habilita tras construir el dashboard)
+        self.profile_combo = QComboBox()
+        self.profile_combo.setMinimumWidth(160)
+        self.profile_combo.setToolTip("Perfil de estudiante")
+        self.profile_combo.setEnabled(False)
+        self.btn_new_profile = QPushButton("＋ Perfil")
+        self.btn_new_profile.setCursor(Qt.PointingHandCursor)
+        self.btn_new_profile.setProperty("buttonType", "header")
+        self.btn_new_profile.setEnabled(False)
+        self.btn_new_profile.clicked.connect(self.create_profile)
+        header_layout.addWidget(QLabel("👤"))
+        header_layout.addWidget(self.profile_combo)
+        header_layout.addWidget(self.btn_new_profile)
+        
         main_layout.addWidget(self.header)
         
         # --- Stack Central ---
         self.stack = QStackedWidget()
         
-        # Dashboard como vista principal
-        self.dashboard = DashboardView()
-        self.dashboard.parent_window = self
-        self.stack.addWidget(self.dashboard)
+        # Gestor de vistas: reutiliza dashboard/selección/estadísticas y elimina las desechables
+        self.views = ViewManager(self.stack)
+        
+        # El dashboard (y la carga de datos) se construye tras el primer pintado;
+        # hasta entonces se muestra un aviso ligero
+        self.dashboard = None
+        self._dashboard_scheduled = False
+        loading = QLabel("Cargando…")
+        loading.setAlignment(Qt.AlignCenter)
+        loading.setProperty("labelType", "subtitle")
+        self.views.show_disposable(loading)
         
         main_layout.addWidget(self.stack)
         
         self.setCentralWidget(main_container)
         
-        # Inicializar Notepad oculto
-        self.notepad = NotepadView(self)
-        self.notepad.hide()
+        # El Notepad y el overlay de rendimiento se construyen la primera vez que se abren
+        self.notepad = None
+        self.perf_overlay = None
+        # Aviso de logros (también el primero se construye al desbloquearse)
+        self.achievement_toast = None
+        event_bus.subscribe(AchievementUnlocked, self.on_achievement_unlocked)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._dashboard_scheduled:
+            self._dashboard_scheduled = True
+            QTimer.singleShot(0, self.build_dashboard)
+
+    def build_dashboard(self):
+        """Construye el dashboard y carga los datos (después de mostrar la ventana)"""
+        from src.ui.views.dashboard_view import DashboardView
+        with tracing.span('DashboardView.build', cat='ui'):
+            self.dashboard = DashboardView()
+        self.dashboard.parent_window = self
+        # El dashboard se mantiene al día con los eventos del bus (sin refresco al volver)
+        self.views.register('dashboard', self.dashboard)
+        self.views.show('dashboard')
+        self.populate_profiles()
+        self.profile_combo.currentIndexChanged.connect(self.on_profile_selected)
+        self.profile_combo.setEnabled(True)
+        self.btn_new_profile.setEnabled(True)
+        event_bus.subscribe(ProfileSwitched, self.on_profile_switched)
+
+    def populate_profiles(self):
+        profiles = self.dashboard.profiles
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        for profile in profiles.list_profiles():
+            self.profile_combo.addItem(profile.name, profile.id)
+        self.profile_combo.setCurrentIndex(self.profile_combo.findData(profiles.active_id))
+        self.profile_combo.blockSignals(False)
+
+    def on_profile_selected(self, index: int):
+        profile_id = self.profile_combo.itemData(index)
+        if profile_id:
+            self.dashboard.switch_profile(profile_id)
+
+    def create_profile(self):
+        name, ok = QInputDialog.getText(self, "Nuevo perfil", "Nombre del estudiante:")
+        if ok and name.strip():
+            profile = self.dashboard.profiles.create(name)
+            self.populate_profiles()
+            self.profile_combo.setCurrentIndex(self.profile_combo.findData(profile.id))
+
+    def on_profile_switched(self, event):
+        """Perfil cambiado (sin recargar el contenido): vistas y notas del nuevo perfil"""
+        # Las vistas reutilizables guardan estadísticas del perfil anterior
+        self.views.invalidate('statistics')
+        self.views.invalidate('selection')
+        self.views.show('dashboard')
+        self.populate_profiles()
+        if self.notepad is not None:
+            self.notepad.use_notes(self.profile_notes())
+
+    def profile_notes(self):
+        """Notas del perfil activo (el perfil por defecto importa las notas globales anteriores)"""
+        from src.services.notes_service import NotesService
+        if self.dashboard is not None:
+            profiles = self.dashboard.profiles
+        else:
+            from src.services.profiles import ProfileRegistry
+            profiles = ProfileRegistry()  # Notepad abierto antes de terminar la carga
+        return NotesService(profiles.path(profiles.active_id), profiles.notes_sources(profiles.active_id))
 
     def toggle_notepad(self):
         """Muestra u oculta el notepad"""
+        if self.notepad is None:
+            from src.ui.components.notepad_view import NotepadView
+            self.notepad = NotepadView(self.profile_notes(), self)
+            self.notepad.hide()
         if self.notepad.isVisible():
             self.notepad.hide()
         else:
@@ -112,21 +197,66 @@ class MainWindow(QMainWindow):
             self.notepad.show()
             self.notepad.raise_()
     
+    def toggle_perf_overlay(self):
+        """Muestra u oculta el overlay de métricas de rendimiento"""
+        if self.perf_overlay is None:
+            from src.ui.components.perf_overlay import PerfOverlay
+            self.perf_overlay = PerfOverlay(self, self.perf_snapshot)
+        self.perf_overlay.toggle()
+    
+    def perf_snapshot(self) -> dict:
+        """Métricas de la app para el overlay de rendimiento"""
+        widgets = self.views.widget_counts()['app_widgets']
+        if self.dashboard is None:
+            return {'widgets': widgets}  # Dashboard aún sin construir
+        data_loader = self.dashboard.data_loader
+        return {
+            'load_ms': getattr(self.dashboard, 'last_load_ms', None),
+            'pending_writes': data_loader.pending_writes,
+            'flush_ms': data_loader.last_flush_ms,
+            'save_ms': self.dashboard.persistence.last_save_ms,
+            'widgets': widgets,
+        }
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.perf_overlay is not None and self.perf_overlay.isVisible():
+            self.perf_overlay.reposition()
+        if self.achievement_toast is not None and self.achievement_toast.isVisible():
+            self.achievement_toast.reposition()
+    
+    def on_achievement_unlocked(self, event):
+        """Muestra el logro recién desbloqueado"""
+        if self.achievement_toast is None:
+            from src.ui.components.achievement_toast import AchievementToast
+            self.achievement_toast = AchievementToast(self)
+        self.achievement_toast.notify(event.title, event.description)
+    
+    def show_trace_summary(self):
+        """Diálogo con los spans más lentos (Ctrl+Shift+R)"""
+        from src.ui.components.trace_summary import TraceSummaryDialog
+        TraceSummaryDialog(self).exec_()
+    
     def show_study_selection(self):
         """Muestra la vista de selección de estudio"""
-        questions = self.dashboard.questions
-        data_loader = self.dashboard.data_loader
-        persistence = self.dashboard.persistence
+        def build():
+            from src.ui.views.study_selection_view import StudySelectionView
+            selection_view = StudySelectionView(
+                self.dashboard.questions, self.dashboard.data_loader, self.dashboard.persistence,
+                search_service=self.dashboard.search_service
+            )
+            selection_view.back_to_dashboard.connect(self.show_dashboard)
+            selection_view.start_quiz_signal.connect(self.show_quiz)
+            return selection_view
         
-        selection_view = StudySelectionView(questions, data_loader, persistence)
-        selection_view.back_to_dashboard.connect(self.show_dashboard)
-        selection_view.start_quiz_signal.connect(self.show_quiz)
-        
-        self.stack.addWidget(selection_view)
-        self.stack.setCurrentWidget(selection_view)
+        self.views.show_cached(
+            'selection', build,
+            refresh=lambda view: view.refresh(self.dashboard.questions, self.dashboard.search_service)
+        )
 
     def show_sql_trainer(self):
         """Muestra la vista de SQL Trainer"""
+        from src.ui.views.sql_trainer_view import SQLTrainerView
         commands = self.dashboard.commands
         data_loader = self.dashboard.data_loader
         persistence = self.dashboard.persistence
@@ -134,39 +264,73 @@ class MainWindow(QMainWindow):
         trainer_view = SQLTrainerView(commands, data_loader, persistence)
         trainer_view.back_to_dashboard.connect(self.show_dashboard)
         
-        self.stack.addWidget(trainer_view)
-        self.stack.setCurrentWidget(trainer_view)
+        self.views.show_disposable(trainer_view)
 
     def show_statistics(self):
         """Muestra la vista de Estadísticas"""
-        questions = self.dashboard.questions
-        user_stats = self.dashboard.user_stats
-        persistence = self.dashboard.persistence
+        def build():
+            from src.ui.views.statistics_view import StatisticsView
+            stats_view = StatisticsView(
+                self.dashboard.questions, self.current_user_stats(), self.dashboard.persistence,
+                commands=self.dashboard.commands, aggregates=self.dashboard.aggregates
+            )
+            stats_view.back_to_dashboard.connect(self.show_dashboard)
+            return stats_view
         
-        commands = self.dashboard.commands
-        
-        stats_view = StatisticsView(questions, user_stats, persistence, commands=commands)
-        stats_view.back_to_dashboard.connect(self.show_dashboard)
-        
-        self.stack.addWidget(stats_view)
-        self.stack.setCurrentWidget(stats_view)
+        self.views.show_cached(
+            'statistics', build,
+            refresh=lambda view: view.refresh(self.current_user_stats())
+        )
+
+    def current_user_stats(self):
+        """Estadísticas actuales en memoria (el SQL Trainer y el Pomodoro las mantienen al día)"""
+        self.dashboard.user_stats = self.dashboard.persistence.get_user_stats()
+        return self.dashboard.user_stats
 
     def show_quiz(self, questions, title="Quiz Mode"):
         """Muestra la vista de Quiz con preguntas filtradas"""
+        from src.ui.views.quiz_view import QuizView
         data_loader = self.dashboard.data_loader
         persistence = self.dashboard.persistence
         
         quiz_view = QuizView(questions, data_loader, persistence, title=title)
         quiz_view.back_to_dashboard.connect(self.show_dashboard)
-        self.stack.addWidget(quiz_view)
-        self.stack.setCurrentWidget(quiz_view)
+        self.views.show_disposable(quiz_view)
 
     def show_dashboard(self):
-        """Vuelve al Dashboard"""
-        self.stack.setCurrentWidget(self.dashboard)
+        """Vuelve al Dashboard (escribiendo las métricas y estadísticas pendientes del quiz)"""
+        self.dashboard.data_loader.flush_pending()
+        self.dashboard.persistence.commit()
+        self.views.show('dashboard')
+
+    def closeEvent(self, event):
+        """Registra la fase Pomodoro en curso, las métricas pendientes y los agregados antes de cerrar"""
+        if self.dashboard is None:
+            super().closeEvent(event)
+            return
+        self.dashboard.pomodoro_timer.pause()
+        self.dashboard.data_loader.close()
+        self.dashboard.persistence.commit()
+        if self.dashboard.aggregates is not None and self.dashboard.aggregates.dirty:
+            self.dashboard.aggregates.save()
+        if tracing.is_enabled():
+            path = tracing.export_chrome_trace(Config.STORAGE_DIR / 'traces' / f"trace_{int(time.time())}.json")
+            if path:
+                print(f"📈 Traza exportada: {path}")
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":
+    # --profile-startup: relanza la app con -X importtime y mide el primer pintado
+    if '--profile-startup' in sys.argv:
+        sys.exit(startup_profiler.run_profiled(__file__))
+    if '--trace' in sys.argv:
+        tracing.enable()
+    profiling_child = startup_profiler.CHILD_FLAG in sys.argv
+    if profiling_child:
+        startup_profiler.set_origin(_STARTUP_T0)
+        startup_profiler.mark('imports')
+    
     # Configurar escalado para pantallas HDPI
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
@@ -179,6 +343,14 @@ if __name__ == "__main__":
     # app.setFont(font)
     
     window = MainWindow()
+    if profiling_child:
+        startup_profiler.mark('main_window')
+        
+        def on_first_paint():
+            startup_profiler.emit_marks()
+            QTimer.singleShot(0, app.quit)
+        
+        startup_profiler.watch_first_paint(window, on_first_paint)
     window.show()
     
     sys.exit(app.exec_())
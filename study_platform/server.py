@@ -0,0 +1,40 @@
+"""
+Servidor JSON local para practicar desde navegadores o tablets
+
+Uso (desde study_platform/):
+    python server.py                        # http://127.0.0.1:8700
+    python server.py --host 0.0.0.0         # accesible desde la red del aula
+    python server.py --no-persist           # sin escribir métricas (pruebas de carga)
+    python server.py --data-dir X --storage-dir Y   # contenido y progreso en otras carpetas
+    python server.py --profile aula-3       # progreso en otro perfil (por defecto, el activo)
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from config import Config
+from src.services.api_server import serve
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=Config.SERVER_HOST)
+    parser.add_argument('--port', type=int, default=Config.SERVER_PORT)
+    parser.add_argument('--no-persist', action='store_true', help="no escribe métricas ni estadísticas")
+    parser.add_argument('--data-dir', type=Path, default=None, help="carpeta de contenido (por defecto data/)")
+    parser.add_argument('--storage-dir', type=Path, default=None, help="carpeta de progreso (por defecto storage/)")
+    parser.add_argument('--profile', default=None, help="guarda el progreso en este perfil (storage/profiles/<id>; por defecto, el activo)")
+    args = parser.parse_args(argv)
+
+    Config.use_directories(args.data_dir, args.storage_dir)
+    Config.ensure_directories()
+    try:
+        asyncio.run(serve(args.host, args.port, persist=not args.no_persist, profile_id=args.profile))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Motor de logros declarativo del motor de estadísticas (src/core/stats_tracker.py),
+compartido por las apps clásicas y study_platform
+Cada regla declara las métricas que lee; el motor las indexa por métrica y al
+registrar un cambio solo evalúa las reglas pendientes que dependen de las métricas
+modificadas. Una regla desbloqueada sale del índice: añadir logros no encarece
+cada respuesta.
+
+Las métricas tienen nombres comunes ('commands_completed', 'study_minutes'...);
+stats_tracker.STATS_METRICS aporta sus getters sobre el esquema unificado.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Set, Tuple
+
+
+@dataclass(frozen=True)
+class AchievementRule:
+    id: str
+    depends_on: Tuple[str, ...]
+    predicate: Callable[[Mapping[str, Any]], bool]
+    title: str
+    description: str
+
+    @classmethod
+    def at_least(cls, id: str, metric: str, value, title: str, description: str) -> 'AchievementRule':
+        """Regla de umbral sobre una sola métrica (la forma más común)"""
+        return cls(id, (metric,), lambda m: (m[metric] or 0) >= value, title, description)
+
+
+def _fast_command(m) -> bool:
+    return m['fastest_command_seconds'] is not None and m['fastest_command_seconds'] < 30
+
+
+def _accurate(m) -> bool:
+    answered = m['questions_answered']
+    return answered >= 20 and m['correct_answers'] / answered * 100 >= 90
+
+
+ACHIEVEMENTS: Tuple[AchievementRule, ...] = (
+    # Matrix Trainer / SQL Trainer
+    AchievementRule.at_least('first_command', 'commands_completed', 1,
+                             '🎯 Primer Comando', 'Completaste tu primer comando SQL'),
+    AchievementRule.at_least('command_master_10', 'commands_completed', 10,
+                             '⚡ Maestro SQL I', 'Completaste 10 comandos'),
+    AchievementRule.at_least('command_master_50', 'commands_completed', 50,
+                             '🏆 Maestro SQL II', 'Completaste 50 comandos'),
+    AchievementRule.at_least('perfect_streak_5', 'command_streak', 5,
+                             '🔥 Racha Perfecta', '5 comandos sin errores'),
+    AchievementRule('speed_demon', ('fastest_command_seconds',), _fast_command,
+                    '⚡ Velocista', 'Comando completado en menos de 30 segundos'),
+
+    # Estudio de módulos / Quiz
+    AchievementRule.at_least('first_answer', 'questions_answered', 1,
+                             '📚 Primera Respuesta', 'Respondiste tu primera pregunta'),
+    AchievementRule.at_least('knowledge_seeker', 'questions_answered', 100,
+                             '🎓 Buscador de Conocimiento', '100 preguntas respondidas'),
+    AchievementRule('accuracy_master', ('questions_answered', 'correct_answers'), _accurate,
+                    '🎯 Precisión Maestra', '90% de aciertos con 20+ preguntas'),
+
+    # Generales
+    AchievementRule.at_least('dedicated_student', 'study_minutes', 60,
+                             '⏰ Estudiante Dedicado', '1 hora de estudio acumulada'),
+    AchievementRule.at_least('marathon_runner', 'study_minutes', 600,
+                             '🏃 Maratonista', '10 horas de estudio acumuladas'),
+    AchievementRule.at_least('consistent_learner', 'study_streak_days', 7,
+                             '📅 Aprendiz Constante', '7 días de racha de estudio'),
+)
+
+
+class MetricsView(Mapping):
+    """Métricas calculadas bajo demanda: una regla solo paga por las que lee"""
+
+    def __init__(self, getters: Dict[str, Callable[[Any], Any]], source):
+        self.getters = getters
+        self.source = source
+
+    def __getitem__(self, name: str):
+        return self.getters[name](self.source)
+
+    def __iter__(self):
+        return iter(self.getters)
+
+    def __len__(self) -> int:
+        return len(self.getters)
+
+
+class AchievementEngine:
+    """Reglas pendientes indexadas por métrica y conjunto de ids desbloqueados"""
+
+    def __init__(self, rules: Iterable[AchievementRule] = ACHIEVEMENTS, unlocked: Iterable[str] = ()):
+        self.rules: Dict[str, AchievementRule] = {rule.id: rule for rule in rules}
+        self.unlocked: Set[str] = set()
+        self._by_metric: Dict[str, List[AchievementRule]] = {}
+        for rule in self.rules.values():
+            for metric in rule.depends_on:
+                self._by_metric.setdefault(metric, []).append(rule)
+        for achievement_id in unlocked:
+            self.mark_unlocked(achievement_id)
+
+    def mark_unlocked(self, achievement_id: str):
+        """Registra un logro ya desbloqueado (p.ej. por otro proceso) y lo saca del índice"""
+        if achievement_id in self.unlocked:
+            return
+        self.unlocked.add(achievement_id)
+        rule = self.rules.get(achievement_id)
+        if rule is not None:
+            for metric in rule.depends_on:
+                self._by_metric[metric].remove(rule)
+
+    def evaluate(self, metrics: Mapping[str, Any], changed: Iterable[str]) -> List[AchievementRule]:
+        """Evalúa solo las reglas pendientes que leen alguna métrica de `changed`"""
+        candidates: Dict[str, AchievementRule] = {}
+        for metric in changed:
+            for rule in self._by_metric.get(metric, ()):
+                candidates.setdefault(rule.id, rule)
+        return self._unlock(metrics, candidates.values())
+
+    def evaluate_all(self, metrics: Mapping[str, Any]) -> List[AchievementRule]:
+        """Todas las reglas pendientes (al cargar o tras cambios externos)"""
+        pending = [rule for rule in self.rules.values() if rule.id not in self.unlocked]
+        return self._unlock(metrics, pending)
+
+    def _unlock(self, metrics, rules: Iterable[AchievementRule]) -> List[AchievementRule]:
+        unlocked = [rule for rule in rules if rule.predicate(metrics)]
+        for rule in unlocked:
+            self.mark_unlocked(rule.id)
+        return unlocked
+
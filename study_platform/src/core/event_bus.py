@@ -0,0 +1,119 @@
+"""
+Bus de eventos en proceso (publish/subscribe tipado)
+Los servicios publican cambios y las vistas se suscriben para actualizar
+solo los widgets afectados, sin releer archivos ni reconstruir vistas.
+"""
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+
+# ==== Eventos ====
+
+@dataclass(frozen=True)
+class QuestionAnswered:
+    """Una pregunta del quiz fue respondida (métricas y agregados ya actualizados)"""
+    question: Any
+    is_correct: bool
+
+
+@dataclass(frozen=True)
+class CommandAttempted:
+    """Intento en el SQL Trainer (estadísticas de usuario ya actualizadas)"""
+    command_id: str
+    success: bool
+    stats: Any
+
+
+@dataclass(frozen=True)
+class SessionEnded:
+    """Una fase Pomodoro terminó o se pausó y quedó registrada en el ledger"""
+    phase: str          # 'work' o 'break'
+    seconds: float
+    completed: bool
+    stats: Any
+
+
+@dataclass(frozen=True)
+class AchievementUnlocked:
+    """Se desbloqueó un logro (ya añadido a las estadísticas de usuario)"""
+    achievement_id: str
+    title: str
+    description: str
+
+
+@dataclass(frozen=True)
+class MetricsFlushed:
+    """Métricas pendientes escritas a disco"""
+    files: Tuple[str, ...] = field(default_factory=tuple)
+    questions: int = 0
+
+
+@dataclass(frozen=True)
+class ProfileSwitched:
+    """Cambió el perfil activo (métricas, agregados y estadísticas ya recargados)"""
+    profile_id: str
+    stats: Any
+
+
+# ==== Bus ====
+
+class EventBus:
+    """
+    Despacho síncrono por tipo de evento (todo ocurre en el hilo de la UI).
+    Los métodos enlazados se guardan como referencias débiles: una vista
+    destruida deja de recibir eventos sin tener que desuscribirse.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[Type, List[Callable[[], Any]]] = {}
+        self.published: Dict[str, int] = {}
+
+    @staticmethod
+    def _make_ref(handler: Callable) -> Callable[[], Any]:
+        if hasattr(handler, '__self__') and hasattr(handler, '__func__'):
+            return weakref.WeakMethod(handler)
+        return lambda: handler
+
+    def subscribe(self, event_type: Type, handler: Callable) -> Callable[[], None]:
+        """Suscribe `handler` a `event_type`. Retorna una función para desuscribir"""
+        self._subscribers.setdefault(event_type, []).append(self._make_ref(handler))
+        return lambda: self.unsubscribe(event_type, handler)
+
+    def unsubscribe(self, event_type: Type, handler: Callable):
+        refs = self._subscribers.get(event_type, [])
+        self._subscribers[event_type] = [ref for ref in refs if ref() is not None and ref() != handler]
+
+    def publish(self, event: Any):
+        """Entrega el evento a los suscriptores de su tipo"""
+        event_type = type(event)
+        self.published[event_type.__name__] = self.published.get(event_type.__name__, 0) + 1
+        refs = self._subscribers.get(event_type)
+        if not refs:
+            return
+
+        dead = []
+        for ref in list(refs):
+            handler = ref()
+            if handler is None:
+                dead.append(ref)
+                continue
+            try:
+                handler(event)
+            except RuntimeError as e:
+                # Widget de Qt ya destruido: se descarta el suscriptor
+                if 'deleted' in str(e):
+                    dead.append(ref)
+                else:
+                    print(f"Error handling {event_type.__name__}: {e}")
+            except Exception as e:
+                print(f"Error handling {event_type.__name__}: {e}")
+        if dead:
+            self._subscribers[event_type] = [ref for ref in self._subscribers[event_type] if ref not in dead]
+
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+
+# Bus compartido por toda la aplicación
+event_bus = EventBus()
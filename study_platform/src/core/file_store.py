@@ -0,0 +1,189 @@
+"""
+Escrituras seguras entre procesos para los archivos compartidos
+launch.py abre cada app en su propio proceso y todas escriben los mismos CSV de
+métricas y JSON de estadísticas. Cada escritura pasa por aquí:
+
+- file_lock(ruta): bloqueo advisory (fcntl / msvcrt) sobre '<ruta>.lock', tomado
+  solo durante el ciclo releer-fusionar-escribir (sección crítica corta).
+- atomic_write_text(ruta, texto): temporal en el mismo directorio + os.replace;
+  ningún lector ve un archivo truncado.
+- CounterDelta: los contadores se escriben como deltas sobre lo que hay en disco,
+  así no se pierden los incrementos de otro proceso hechos entre medias.
+
+Los lotes (write-behind de métricas) se siguen escribiendo en una sola pasada por
+archivo: un bloqueo y una reescritura por lote, no por respuesta.
+"""
+import csv
+import io
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+LOCK_SUFFIX = '.lock'
+
+
+def lock_path(path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + LOCK_SUFFIX)
+
+
+@contextmanager
+def file_lock(path, shared: bool = False) -> Iterator[None]:
+    """
+    Bloqueo advisory de `path` entre procesos (y entre hilos: cada llamada abre su
+    propio descriptor). Se bloquea un archivo auxiliar porque os.replace cambia el
+    inodo del archivo de datos en cada escritura.
+    """
+    lock_file = lock_path(path)
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_file, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            # msvcrt no tiene bloqueo compartido; LK_LOCK reintenta ~10 s y luego falla
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def atomic_write_text(path, text: str, newline: Optional[str] = None):
+    """Escribe a un temporal del mismo directorio y lo renombra sobre `path`"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline=newline) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
+# ==== JSON ====
+
+def read_json(path, default: Callable[[], object] = dict):
+    path = Path(path)
+    if not path.exists():
+        return default()
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json(path, data, **dump_kwargs):
+    """Escritura atómica de un JSON (el llamador debe tener el bloqueo)"""
+    dump_kwargs.setdefault('ensure_ascii', False)
+    atomic_write_text(path, json.dumps(data, **dump_kwargs))
+
+
+@contextmanager
+def locked_json(path, default: Callable[[], object] = dict, **dump_kwargs) -> Iterator[object]:
+    """
+    Relee el JSON bajo bloqueo, cede el objeto para modificarlo en el sitio y lo
+    guarda de forma atómica al salir (si el bloque lanza, no se escribe nada).
+    """
+    with file_lock(path):
+        data = read_json(path, default)
+        yield data
+        write_json(path, data, **dump_kwargs)
+
+
+# ==== Contadores ====
+
+@dataclass
+class CounterDelta:
+    """
+    Métricas (correctas, incorrectas) de una pregunta pendientes de escribir.
+    baseline: valores al primer registro desde la última escritura (None: escritura absoluta)
+    snapshot: valores al retirar el lote; se escribe stored + (snapshot - baseline)
+    merged:   valores resultantes en disco, para actualizar la memoria tras escribir
+    """
+    key: str
+    snapshot: Tuple[int, int]
+    baseline: Optional[Tuple[int, int]] = None
+    merged: Optional[Tuple[int, int]] = None
+
+    def merge(self, stored: Tuple[int, int]) -> Tuple[int, int]:
+        if self.baseline is None:
+            self.merged = self.snapshot
+        else:
+            self.merged = (
+                max(0, stored[0] + self.snapshot[0] - self.baseline[0]),
+                max(0, stored[1] + self.snapshot[1] - self.baseline[1]),
+            )
+        return self.merged
+
+
+def merge_counters(stored: Dict[str, List[int]], deltas: List[CounterDelta]):
+    """
+    Fusiona deltas en un dict {clave: [correctas, incorrectas]} (fragmentos JSON).
+    Una clave aún sin guardar parte del valor de referencia del delta: las métricas
+    con que se cargó la pregunta (p. ej. las incluidas en el CSV de un pack).
+    """
+    for delta in deltas:
+        values = stored.get(delta.key) or delta.baseline or (0, 0)
+        stored[delta.key] = list(delta.merge((values[0], values[1])))
+
+
+def locked_update_csv(path, update: Callable[[List[str], List[Dict[str, str]]], Optional[List[str]]]):
+    """
+    Relee el CSV bajo bloqueo, aplica `update(fieldnames, rows)` (que puede retornar
+    nuevas columnas) y lo reescribe de forma atómica.
+    """
+    with file_lock(path):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            fieldnames = list(reader.fieldnames or [])
+            rows = list(reader)
+        fieldnames = update(fieldnames, rows) or fieldnames
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+        atomic_write_text(path, out.getvalue(), newline='')
+        return rows
+
+
+def parse_counts(metrics: str) -> Tuple[int, int]:
+    """
+    Campo metrics del CSV ('correctas;incorrectas'). Único parser de las métricas
+    de contenido: tolera vacíos, la segunda parte ausente y valores corruptos.
+    """
+    if not metrics:
+        return (0, 0)
+    parts = metrics.split(';')
+    try:
+        correct = int(parts[0])
+        incorrect = int(parts[1]) if len(parts) > 1 and parts[1].strip() else 0
+    except ValueError:
+        return (0, 0)
+    return (max(correct, 0), max(incorrect, 0))
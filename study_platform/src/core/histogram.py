@@ -0,0 +1,112 @@
+"""
+Histogramas logarítmicos de cubetas fijas para tiempos de respuesta
+Cada histograma ocupa como mucho BUCKETS contadores, sin importar cuántas
+respuestas registre: no se guardan las muestras. Las cubetas crecen en un factor
+2^(1/4) (~19 %), así p50/p90 tienen un error relativo acotado (~9 %) tanto para
+respuestas de 2 s como de 2 min.
+
+    cubeta 0               < BASE_SECONDS
+    cubeta i (1..N-2)      [BASE·2^((i-1)/4), BASE·2^(i/4))
+    cubeta N-1             >= BASE·2^((N-2)/4)  (~4 min)
+
+Los histogramas se suman cubeta a cubeta: fusionar los de varios procesos (o un
+lote pendiente con el archivo) no pierde precisión.
+"""
+import math
+from typing import Dict, Optional
+
+
+BASE_SECONDS = 0.25
+BUCKETS_PER_DOUBLING = 4
+BUCKETS = 42
+
+
+def bucket_index(seconds: float) -> int:
+    if seconds < BASE_SECONDS:
+        return 0
+    index = 1 + int(math.log2(seconds / BASE_SECONDS) * BUCKETS_PER_DOUBLING)
+    return min(index, BUCKETS - 1)
+
+
+def bucket_value(index: int) -> float:
+    """Valor representativo de una cubeta (punto medio geométrico)"""
+    if index == 0:
+        return BASE_SECONDS / 2
+    return BASE_SECONDS * 2 ** ((index - 0.5) / BUCKETS_PER_DOUBLING)
+
+
+class LogHistogram:
+    """Conteos por cubeta más n, suma, mínimo y máximo exactos"""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}  # Disperso: solo cubetas con muestras
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float):
+        seconds = max(0.0, float(seconds))
+        index = bucket_index(seconds)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other: 'LogHistogram'):
+        """Suma otro histograma (cubeta a cubeta)"""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Cuantil aproximado (q en 0..1), None sin muestras"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                # El mínimo y el máximo exactos acotan la cubeta de los extremos
+                return min(max(bucket_value(index), self.min), self.max)
+        return self.max
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.quantile(0.5)
+
+    @property
+    def p90(self) -> Optional[float]:
+        return self.quantile(0.9)
+
+    def to_dict(self) -> dict:
+        return {
+            'n': self.count,
+            's': round(self.total, 2),
+            'min': self.min,
+            'max': self.max,
+            'b': {str(index): count for index, count in sorted(self.counts.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LogHistogram':
+        hist = cls()
+        hist.counts = {int(index): count for index, count in data.get('b', {}).items()}
+        hist.count = data.get('n', sum(hist.counts.values()))
+        hist.total = data.get('s', 0.0)
+        hist.min = data.get('min')
+        hist.max = data.get('max')
+        return hist
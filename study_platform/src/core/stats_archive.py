@@ -0,0 +1,158 @@
+"""
+Archivo mensual de sesiones e historial de comandos (ver src/core/stats_tracker.py)
+user_stats.json (archivo "caliente") guarda solo las sesiones abiertas, las más
+recientes, los últimos comandos y agregados móviles de tamaño fijo; todo lo demás
+se añade aquí, una línea JSON por registro:
+
+    stats_archive/
+        index.json                  {"sessions": {"2026-10": 12}, "commands": {...}, "months": {"2026-10": {...}}}
+        sessions-2026-10.jsonl      sesiones cerradas
+        commands-2026-10.jsonl      comandos del Matrix Trainer
+
+index.json cuenta los registros de cada mes y guarda los agregados mensuales que
+salen de la ventana móvil del archivo caliente.
+"""
+
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from src.core.file_store import file_lock, locked_json
+
+
+ARCHIVE_DIRNAME = 'stats_archive'
+SESSIONS = 'sessions'
+COMMANDS = 'commands'
+
+# Ventanas de los agregados móviles del archivo caliente
+DAILY_KEEP = 62
+WEEKLY_KEEP = 26
+MONTHLY_KEEP = 24
+
+
+def period_keys(when: datetime) -> Dict[str, str]:
+    """Claves de día, semana ISO y mes de un instante"""
+    year, week, _ = when.isocalendar()
+    return {
+        'daily': when.strftime('%Y-%m-%d'),
+        'weekly': f'{year}-W{week:02d}',
+        'monthly': when.strftime('%Y-%m'),
+    }
+
+
+def add_to_aggregates(aggregates: dict, when: datetime, **deltas) -> Dict[str, dict]:
+    """
+    Suma `deltas` a las cubetas diaria/semanal/mensual y descarta las más antiguas.
+    Retorna las cubetas mensuales descartadas (para guardarlas en el índice).
+    """
+    evicted = {}
+    for period, key in period_keys(when).items():
+        buckets = aggregates.setdefault(period, {})
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {}
+            keep = {'daily': DAILY_KEEP, 'weekly': WEEKLY_KEEP, 'monthly': MONTHLY_KEEP}[period]
+            if len(buckets) > keep:
+                for old in sorted(buckets)[:-keep]:
+                    removed = buckets.pop(old)
+                    if period == 'monthly':
+                        evicted[old] = removed
+        for field, value in deltas.items():
+            bucket[field] = bucket.get(field, 0) + value
+    return evicted
+
+
+class StatsArchive:
+    """Archivos JSONL por mes (solo se añaden líneas) y su índice"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.index_file = self.directory / 'index.json'
+
+    def _path(self, kind: str, month: str) -> Path:
+        return self.directory / f'{kind}-{month}.jsonl'
+
+    @contextmanager
+    def writer(self, kind: str, when_field: str):
+        """
+        Escritor en streaming: cada registro va directo al archivo de su mes (un
+        descriptor abierto por mes) y el índice se actualiza una vez al cerrar.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = {}
+        counts: Dict[str, int] = {}
+
+        def write(record: dict):
+            month = record[when_field][:7]
+            f = files.get(month)
+            if f is None:
+                f = files[month] = open(self._path(kind, month), 'a', encoding='utf-8')
+            f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+            counts[month] = counts.get(month, 0) + 1
+
+        try:
+            yield write
+        finally:
+            for f in files.values():
+                f.close()
+            if counts:
+                with locked_json(self.index_file, indent=2) as index:
+                    stored = index.setdefault(kind, {})
+                    for month, count in counts.items():
+                        stored[month] = stored.get(month, 0) + count
+
+    def append(self, kind: str, records: Iterable[dict], when_field: str):
+        """Añade registros a los archivos de su mes (según `when_field`) bajo bloqueo"""
+        records = list(records)
+        if not records:
+            return
+        with file_lock(self.directory / kind):
+            with self.writer(kind, when_field) as write:
+                for record in records:
+                    write(record)
+
+    def store_month_totals(self, buckets: Dict[str, dict]):
+        """Guarda agregados mensuales que salieron de la ventana del archivo caliente"""
+        if not buckets:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with locked_json(self.index_file, indent=2) as index:
+            months = index.setdefault('months', {})
+            for month, bucket in buckets.items():
+                stored = months.setdefault(month, {})
+                for field, value in bucket.items():
+                    stored[field] = stored.get(field, 0) + value
+
+    def index(self) -> dict:
+        if not self.index_file.exists():
+            return {}
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error leyendo índice del archivo: {e}")
+            return {}
+
+    def months(self, kind: str) -> List[str]:
+        """Meses con registros de `kind`, del más reciente al más antiguo"""
+        return sorted(self.index().get(kind, {}), reverse=True)
+
+    def iter_months(self, kind: str) -> Iterator[Tuple[str, List[dict]]]:
+        """(mes, registros) del mes más reciente al más antiguo, leyendo un archivo cada vez"""
+        for month in self.months(kind):
+            path = self._path(kind, month)
+            if not path.exists():
+                continue
+            records = []
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # Línea truncada por un cierre abrupto
+            yield month, records
@@ -0,0 +1,620 @@
+"""
+Motor de estadísticas único para las apps clásicas (stats_manager.py) y study_platform
+Las dos pilas escriben el mismo user_stats.json (versión 3.0) del perfil activo:
+
+    storage/profiles/<id>/user_stats.json      archivo caliente de tamaño acotado
+    storage/profiles/<id>/stats_archive/       sesiones y comandos por mes
+
+El esquema es el de StatsManager ('matrix_trainer', 'module_study', sesiones,
+racha, agregados móviles, logros) más los campos que solo tenía study_platform
+(métricas por comando, ids completados, sesiones Pomodoro, XP).
+
+Los archivos anteriores (user_stats.json 2.0/2.1 de las apps clásicas y
+user_progress.json de study_platform) se migran una vez, en una pasada: las
+sesiones y el historial de comandos se escriben en streaming al archivo mensual
+mientras se calculan racha y agregados.
+
+Cada cambio es una función sobre el diccionario en memoria. Al guardar se toma el
+bloqueo del archivo; si otro proceso lo reemplazó se relee y se reaplican los
+cambios pendientes (ver src/core/file_store.py). Los efectos fuera del archivo
+caliente (líneas del archivo mensual) esperan en una bandeja de salida que se
+vacía al escribir, así reaplicar un cambio no los duplica.
+"""
+import heapq
+import json
+import os
+import shutil
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+from src.core.achievement_system import AchievementEngine, AchievementRule, MetricsView
+from src.core.file_store import file_lock, write_json
+from src.core.stats_archive import ARCHIVE_DIRNAME, COMMANDS, SESSIONS, StatsArchive, add_to_aggregates
+
+
+STATS_VERSION = '3.0'
+STATS_FILENAME = 'user_stats.json'
+
+
+def _source_name(path: Path) -> str:
+    """Ruta relativa al repositorio (o solo el nombre): no guarda rutas de la máquina"""
+    try:
+        return path.resolve().relative_to(Config.LEGACY_DIR.resolve()).as_posix()
+    except ValueError:
+        return path.name
+
+
+def default_stats() -> dict:
+    """Estructura de estadísticas por defecto (versión actual)"""
+    now = datetime.now().isoformat()
+    return {
+        'version': STATS_VERSION,
+        'created_at': now,
+        'last_access': now,
+        'total_study_time_minutes': 0,
+        'total_xp': 0,
+        'sessions': [],
+        'session_count': 0,
+        'study_streak': {'current': 0, 'longest': 0, 'last_day': None},
+        'aggregates': {'daily': {}, 'weekly': {}, 'monthly': {}},
+        'pomodoro': {'completed_sessions': 0, 'last_study_date': ''},
+        'matrix_trainer': {
+            'commands_completed': 0,
+            'total_attempts': 0,
+            'total_errors': 0,
+            'fastest_command_seconds': None,
+            'current_streak': 0,
+            'longest_streak': 0,
+            'last_session': None,
+            'command_history': [],
+            'completed_ids': [],
+            'command_metrics': {},  # {cmd_id: {'attempts': 0, 'correct': 0, 'errors': 0[, 'fastest': s]}}
+        },
+        'module_study': {
+            'questions_answered': 0,
+            'correct_answers': 0,
+            'modules_completed': [],
+            'current_streak': 0,
+            'longest_streak': 0,
+            'last_session': None
+        },
+        'achievements': [],
+        'preferences': {
+            'theme': 'matrix',  # matrix, cyberpunk, classic
+            'sound_enabled': False,
+            'show_hints': True,
+            'auto_advance': False
+        }
+    }
+
+
+def advance_streak(stats: dict, day: date):
+    """Racha de días (hasta el último día con estudio) en O(1) por día nuevo"""
+    streak = stats['study_streak']
+    last = date.fromisoformat(streak['last_day']) if streak['last_day'] else None
+    if last is not None and day <= last:
+        return  # Mismo día (o reloj atrasado): la racha no cambia
+    streak['current'] = streak['current'] + 1 if last == day - timedelta(days=1) else 1
+    streak['longest'] = max(streak['longest'], streak['current'])
+    streak['last_day'] = day.isoformat()
+
+
+# ==== Migración ====
+
+def _fill_defaults(stats: dict, defaults: dict):
+    """Añade las claves que faltan (recursivo en las secciones), sin tocar las existentes"""
+    for key, value in defaults.items():
+        if key not in stats:
+            stats[key] = value
+        elif isinstance(value, dict) and isinstance(stats[key], dict) and key != 'aggregates':
+            _fill_defaults(stats[key], value)
+
+
+def _upgrade_2_0(stats: dict, archive: StatsArchive):
+    """
+    2.0 -> 2.1: sesiones e historial de comandos al archivo mensual, en una pasada
+    que a la vez calcula días de estudio y agregados
+    """
+    _fill_defaults(stats, {k: v for k, v in default_stats().items()
+                           if k in ('session_count', 'study_streak', 'aggregates')})
+    sessions = stats.get('sessions', [])
+    stats['session_count'] = max(stats['session_count'], len(sessions))
+
+    def aggregate(when: datetime, **deltas):
+        # Los meses que salen de la ventana móvil van al índice del archivo
+        archive.store_month_totals(add_to_aggregates(stats['aggregates'], when, **deltas))
+
+    days = set()
+    closed: List[dict] = []
+    open_sessions: List[dict] = []
+    with archive.writer(SESSIONS, 'start_time') as write:
+        for session in sessions:
+            start = datetime.fromisoformat(session['start_time'])
+            days.add(start.date())
+            if session.get('end_time'):
+                write(session)
+                aggregate(start, sessions=1, minutes=session.get('duration_minutes', 0))
+                closed.append(session)
+            else:
+                open_sessions.append(session)
+    for day in sorted(days):
+        advance_streak(stats, day)
+
+    history = stats['matrix_trainer'].get('command_history', [])
+    with archive.writer(COMMANDS, 'timestamp') as write:
+        for entry in history:
+            write(entry)
+            aggregate(datetime.fromisoformat(entry['timestamp']),
+                      commands=int(bool(entry.get('completed'))), command_errors=entry.get('errors', 0))
+    # Ya archivados: el archivo caliente conserva las sesiones abiertas y lo más reciente
+    recent = heapq.nlargest(StatsEngine.RECENT_SESSIONS, closed, key=lambda s: s['start_time'])
+    stats['sessions'] = sorted(recent + open_sessions, key=lambda s: s['start_time'])
+    stats['matrix_trainer']['command_history'] = history[-StatsEngine.COMMAND_HISTORY:]
+
+
+def _upgrade_2_1(stats: dict, archive: StatsArchive):
+    """2.1 -> 3.0: campos de study_platform (por defecto vacíos)"""
+    _fill_defaults(stats, default_stats())
+
+
+# versión -> (siguiente versión, paso)
+UPGRADES: Dict[str, Tuple[str, Callable[[dict, StatsArchive], None]]] = {
+    '2.0': ('2.1', _upgrade_2_0),
+    '2.1': ('3.0', _upgrade_2_1),
+}
+
+
+def upgrade(stats: dict, archive: StatsArchive) -> bool:
+    """Aplica los pasos de migración hasta STATS_VERSION. Retorna si hubo cambios"""
+    changed = False
+    while stats.get('version', '2.0') != STATS_VERSION:
+        version = stats.get('version', '2.0')
+        if version not in UPGRADES:
+            print(f"Unknown stats version {version}, using defaults for missing fields")
+            _fill_defaults(stats, default_stats())
+            stats['version'] = STATS_VERSION
+            return True
+        next_version, step = UPGRADES[version]
+        step(stats, archive)
+        stats['version'] = next_version
+        changed = True
+    return changed
+
+
+def merge_user_progress(stats: dict, progress: dict):
+    """
+    Suma el user_progress.json de study_platform (SQL Trainer, Pomodoro y quiz) a
+    las estadísticas unificadas; los logros se unen y las rachas toman el máximo.
+    """
+    mt = stats['matrix_trainer']
+    mt['commands_completed'] += progress.get('sql_commands_completed', 0)
+    mt['total_attempts'] += progress.get('sql_total_attempts', 0)
+    mt['total_errors'] += progress.get('sql_total_errors', 0)
+    mt['current_streak'] = max(mt['current_streak'], progress.get('sql_current_streak', 0))
+    mt['longest_streak'] = max(mt['longest_streak'], progress.get('sql_best_streak', 0))
+    for cmd_id in progress.get('sql_completed_ids', []):
+        if cmd_id not in mt['completed_ids']:
+            mt['completed_ids'].append(cmd_id)
+    for cmd_id, metrics in progress.get('sql_command_metrics', {}).items():
+        target = mt['command_metrics'].setdefault(cmd_id, {'attempts': 0, 'correct': 0, 'errors': 0})
+        for key in target:
+            target[key] += metrics.get(key, 0)
+
+    ms = stats['module_study']
+    ms['questions_answered'] += progress.get('quiz_questions_answered', 0)
+    ms['correct_answers'] += progress.get('quiz_correct_answers', 0)
+    ms['current_streak'] = max(ms['current_streak'], progress.get('quiz_current_streak', 0))
+    ms['longest_streak'] = max(ms['longest_streak'], progress.get('quiz_best_streak', 0))
+
+    stats['total_study_time_minutes'] += progress.get('total_study_time_minutes', 0)
+    stats['total_xp'] += progress.get('total_xp', 0)
+    stats['pomodoro']['completed_sessions'] += progress.get('total_sessions', 0)
+    stats['pomodoro']['last_study_date'] = max(stats['pomodoro']['last_study_date'],
+                                               progress.get('last_study_date', '') or '')
+    streak = stats['study_streak']
+    streak['longest'] = max(streak['longest'], progress.get('longest_streak_days', 0))
+    if progress.get('last_study_date') and progress['last_study_date'] >= (streak['last_day'] or ''):
+        streak['current'] = max(streak['current'], progress.get('current_streak_days', 0))
+        streak['last_day'] = progress['last_study_date']
+
+    unlocked = {a['id'] for a in stats['achievements']}
+    for achievement_id in progress.get('achievements_unlocked', []):
+        if achievement_id not in unlocked:
+            unlocked.add(achievement_id)
+            stats['achievements'].append({'id': achievement_id, 'title': achievement_id, 'description': '',
+                                          'unlocked_at': datetime.now().isoformat()})
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading stats from {path}: {e}")
+        return None
+
+
+# ==== Motor ====
+
+# Métricas del esquema unificado con los nombres de las reglas de logros
+STATS_METRICS: Dict[str, Callable[['StatsEngine'], Any]] = {
+    'commands_completed': lambda e: e.stats['matrix_trainer']['commands_completed'],
+    'command_streak': lambda e: e.stats['matrix_trainer']['current_streak'],
+    'fastest_command_seconds': lambda e: e.stats['matrix_trainer']['fastest_command_seconds'],
+    'questions_answered': lambda e: e.stats['module_study']['questions_answered'],
+    'correct_answers': lambda e: e.stats['module_study']['correct_answers'],
+    'study_minutes': lambda e: e.stats['total_study_time_minutes'],
+    'study_streak_days': lambda e: e.stats['study_streak']['current'],
+}
+
+
+class StatsEngine:
+    """
+    Estadísticas de un perfil en un único archivo caliente de tamaño acotado.
+    `legacy_sources`: archivos anteriores que se adoptan si el archivo aún no existe.
+    """
+
+    RECENT_SESSIONS = 20
+    COMMAND_HISTORY = 100
+    # Una sesión sin cerrar más antigua que esto se archiva como abandonada
+    OPEN_SESSION_TTL = timedelta(days=2)
+
+    def __init__(self, path, legacy_sources: Iterable = ()):
+        self.path = Path(path)
+        self.archive = StatsArchive(self.path.parent / ARCHIVE_DIRNAME)
+        self.legacy_sources = [Path(p) for p in legacy_sources]
+        # Identidad del archivo tras nuestra última lectura o escritura
+        self._disk_stat: Optional[Tuple[int, int, int]] = None
+        # Cambios aplicados en memoria y aún no guardados (se reaplican si otro proceso escribió)
+        self._pending: List[Callable[[], Any]] = []
+        with file_lock(self.path):
+            self._reload()
+
+    # ==== Carga y escritura ====
+
+    def _file_stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _reload(self):
+        """Carga (con el bloqueo tomado), adoptando o migrando archivos anteriores"""
+        self._disk_stat = self._file_stat()
+        self._outbox: Dict[str, list] = {SESSIONS: [], COMMANDS: [], 'months': []}
+        stats = _read_json(self.path) if self._disk_stat else None
+        changed = False
+        if stats is None:
+            stats = self._adopt_legacy()
+            changed = True
+        changed = upgrade(stats, self.archive) or changed
+        self.stats = stats
+        if changed:
+            self._write()
+
+        self._sessions_by_id: Dict[str, dict] = {}
+        for session in self.stats['sessions']:
+            self._sessions_by_id.setdefault(session['id'], session)
+        self._achievements = AchievementEngine(unlocked=(a['id'] for a in self.stats['achievements']))
+        # Tras cargar se evalúan todas las reglas una vez (en el próximo cambio)
+        self._recheck_achievements = True
+
+    def _adopt_legacy(self) -> dict:
+        """Primer arranque del perfil: une los archivos de las dos apps en una pasada"""
+        stats = None
+        progress_files = []
+        for source in self.legacy_sources:
+            if not source.exists() or source.resolve() == self.path.resolve():
+                continue
+            data = _read_json(source)
+            if data is None:
+                continue
+            if 'version' in data and stats is None:
+                # user_stats.json de las apps clásicas: base de la migración
+                stats = data
+                legacy_archive = source.parent / ARCHIVE_DIRNAME
+                if legacy_archive.is_dir() and legacy_archive != self.archive.directory:
+                    shutil.copytree(legacy_archive, self.archive.directory, dirs_exist_ok=True)
+            elif 'sql_total_attempts' in data or 'total_sessions' in data:
+                progress_files.append(data)
+        if stats is None:
+            stats = default_stats()
+        upgrade(stats, self.archive)
+        for progress in progress_files:
+            merge_user_progress(stats, progress)
+        stats['migrated_from'] = [_source_name(p) for p in self.legacy_sources if p.exists()]
+        return stats
+
+    def _flush_outbox(self):
+        """Efectos fuera del archivo caliente (con el bloqueo tomado)"""
+        outbox = self._outbox
+        try:
+            if outbox[SESSIONS]:
+                self.archive.append(SESSIONS, outbox[SESSIONS], 'start_time')
+            if outbox[COMMANDS]:
+                self.archive.append(COMMANDS, outbox[COMMANDS], 'timestamp')
+            for evicted in outbox['months']:
+                self.archive.store_month_totals(evicted)
+        except Exception as e:
+            print(f"Error writing stats archive: {e}")
+        self._outbox = {SESSIONS: [], COMMANDS: [], 'months': []}
+
+    def _write(self):
+        """Escritura atómica (el llamador tiene el bloqueo)"""
+        self._flush_outbox()
+        try:
+            self.stats['last_access'] = datetime.now().isoformat()
+            write_json(self.path, self.stats, indent=2)
+            self._disk_stat = self._file_stat()
+        except Exception as e:
+            print(f"Error saving stats: {e}")
+
+    def _mutate(self, change: Callable[[], Any], save: bool = True):
+        """
+        Aplica un cambio. Con save=False queda pendiente hasta commit(); al guardar,
+        si otro proceso reemplazó el archivo se relee y se reaplican los pendientes.
+        """
+        if not save:
+            self._pending.append(change)
+            return change()
+        with file_lock(self.path):
+            if self._file_stat() != self._disk_stat:
+                self._reload()
+                for pending in self._pending:
+                    pending()
+            result = change()
+            self._pending = []
+            self._write()
+        return result
+
+    def commit(self):
+        """Guarda los cambios pendientes (save=False)"""
+        if self._pending:
+            self._mutate(lambda: None)
+
+    def save(self):
+        """Guarda el estado en memoria tal cual"""
+        with file_lock(self.path):
+            self._pending = []
+            self._write()
+
+    def reload_if_changed(self) -> bool:
+        """Relee si otro proceso escribió el archivo (sin cambios pendientes)"""
+        if self._pending or self._file_stat() == self._disk_stat:
+            return False
+        with file_lock(self.path):
+            self._reload()
+        return True
+
+    # ==== Helpers ====
+
+    def _aggregate(self, when: datetime, **deltas):
+        evicted = add_to_aggregates(self.stats['aggregates'], when, **deltas)
+        if evicted:
+            self._outbox['months'].append(evicted)
+
+    def _trim_sessions(self):
+        """Deja en el archivo caliente las sesiones abiertas y las cerradas más recientes"""
+        sessions = self.stats['sessions']
+        cutoff = (datetime.now() - self.OPEN_SESSION_TTL).isoformat()
+        open_sessions = [s for s in sessions if not s.get('end_time') and s['start_time'] >= cutoff]
+        abandoned = [s for s in sessions if not s.get('end_time') and s['start_time'] < cutoff]
+        closed = [s for s in sessions if s.get('end_time')]
+        if len(closed) <= self.RECENT_SESSIONS and not abandoned:
+            return
+        self._outbox[SESSIONS].extend(abandoned)
+        # Las cerradas ya están archivadas: aquí solo queda una copia de las recientes
+        recent = heapq.nlargest(self.RECENT_SESSIONS, closed, key=lambda s: s['start_time'])
+        self.stats['sessions'] = sorted(recent + open_sessions, key=lambda s: s['start_time'])
+        self._sessions_by_id = {s['id']: s for s in self.stats['sessions']}
+
+    def _check_achievements(self, *changed: str) -> List[AchievementRule]:
+        """Desbloquea los logros cuyas reglas dependen de las métricas modificadas"""
+        metrics = MetricsView(STATS_METRICS, self)
+        if self._recheck_achievements:
+            self._recheck_achievements = False
+            unlocked = self._achievements.evaluate_all(metrics)
+        else:
+            unlocked = self._achievements.evaluate(metrics, changed)
+        for rule in unlocked:
+            self.stats['achievements'].append({
+                'id': rule.id,
+                'title': rule.title,
+                'description': rule.description,
+                'unlocked_at': datetime.now().isoformat()
+            })
+        return unlocked
+
+    # ==== Cambios ====
+
+    def start_session(self, session_type: str) -> str:
+        """Inicia una sesión de estudio (se guarda ya: el siguiente cambio puede releer)"""
+        def change() -> str:
+            now = datetime.now()
+            session_id = now.strftime('%Y%m%d_%H%M%S')
+            if session_id in self._sessions_by_id:
+                # Otra app empezó una sesión en el mismo segundo
+                n = 2
+                while f'{session_id}_{n}' in self._sessions_by_id:
+                    n += 1
+                session_id = f'{session_id}_{n}'
+            session = {
+                'id': session_id,
+                'type': session_type,  # 'matrix_trainer' o 'module_study'
+                'start_time': now.isoformat(),
+                'end_time': None,
+                'duration_minutes': 0,
+                'stats': {}
+            }
+            self.stats['sessions'].append(session)
+            self._sessions_by_id[session_id] = session
+            self.stats['session_count'] += 1
+            advance_streak(self.stats, now.date())
+            self._check_achievements('study_streak_days')
+            return session_id
+
+        return self._mutate(change)
+
+    def end_session(self, session_id: str, session_stats: dict):
+        """Cierra una sesión: tiempo total, archivo mensual y agregados"""
+        def change():
+            session = self._sessions_by_id.get(session_id)
+            if session is None:
+                return
+            session['end_time'] = datetime.now().isoformat()
+            start = datetime.fromisoformat(session['start_time'])
+            end = datetime.fromisoformat(session['end_time'])
+            session['duration_minutes'] = (end - start).total_seconds() / 60
+            session['stats'] = session_stats
+
+            self.stats['total_study_time_minutes'] += session['duration_minutes']
+            self._outbox[SESSIONS].append(session)
+            self._aggregate(start, sessions=1, minutes=session['duration_minutes'])
+            self._trim_sessions()
+            self._check_achievements('study_minutes')
+
+        self._mutate(change)
+
+    def record_command(self, command: str, attempts: int, errors: int, completed: bool,
+                       time_seconds: Optional[float] = None, save: bool = True) -> List[AchievementRule]:
+        """
+        Ejecución de un comando (Matrix Trainer: varios intentos por comando;
+        SQL Trainer: un intento). Retorna los logros desbloqueados.
+        """
+        def change() -> List[AchievementRule]:
+            mt = self.stats['matrix_trainer']
+            now = datetime.now()
+            if completed:
+                mt['commands_completed'] += 1
+                mt['current_streak'] += 1
+                if mt['current_streak'] > mt['longest_streak']:
+                    mt['longest_streak'] = mt['current_streak']
+                if command not in mt['completed_ids']:
+                    mt['completed_ids'].append(command)
+                # Actualizar tiempo más rápido
+                if time_seconds is not None and (mt['fastest_command_seconds'] is None
+                                                 or time_seconds < mt['fastest_command_seconds']):
+                    mt['fastest_command_seconds'] = time_seconds
+            else:
+                mt['current_streak'] = 0
+
+            mt['total_attempts'] += attempts
+            mt['total_errors'] += errors
+            mt['last_session'] = now.isoformat()
+            metrics = mt['command_metrics'].setdefault(command, {'attempts': 0, 'correct': 0, 'errors': 0})
+            metrics['attempts'] += attempts
+            metrics['correct'] += int(completed)
+            metrics['errors'] += errors
+            if completed and time_seconds is not None:
+                metrics['fastest'] = min(metrics.get('fastest', time_seconds), time_seconds)
+
+            # Historial completo en el archivo mensual; en el caliente solo los últimos
+            entry = {
+                'command': command,
+                'timestamp': now.isoformat(),
+                'attempts': attempts,
+                'errors': errors,
+                'time_seconds': time_seconds,
+                'completed': completed
+            }
+            self._outbox[COMMANDS].append(entry)
+            self._aggregate(now, commands=int(completed), command_errors=errors)
+            mt['command_history'].append(entry)
+            if len(mt['command_history']) > self.COMMAND_HISTORY:
+                mt['command_history'] = mt['command_history'][-self.COMMAND_HISTORY:]
+
+            if completed:
+                return self._check_achievements('commands_completed', 'command_streak', 'fastest_command_seconds')
+            return self._check_achievements()
+
+        return self._mutate(change, save)
+
+    def record_answer(self, module: str, question_id: str, correct: bool,
+                      save: bool = True) -> List[AchievementRule]:
+        """Respuesta del estudio de módulos o del quiz"""
+        def change() -> List[AchievementRule]:
+            ms = self.stats['module_study']
+            ms['questions_answered'] += 1
+            if correct:
+                ms['correct_answers'] += 1
+                ms['current_streak'] += 1
+                if ms['current_streak'] > ms['longest_streak']:
+                    ms['longest_streak'] = ms['current_streak']
+            else:
+                ms['current_streak'] = 0
+            now = datetime.now()
+            ms['last_session'] = now.isoformat()
+            self._aggregate(now, answers=1, correct=int(correct))
+            return self._check_achievements('questions_answered', 'correct_answers')
+
+        return self._mutate(change, save)
+
+    def record_study_time(self, minutes: float, completed: bool, save: bool = True) -> List[AchievementRule]:
+        """Fase de trabajo Pomodoro: tiempo de estudio, sesiones completadas y racha"""
+        def change() -> List[AchievementRule]:
+            now = datetime.now()
+            self.stats['total_study_time_minutes'] += minutes
+            pomodoro = self.stats['pomodoro']
+            if completed:
+                pomodoro['completed_sessions'] += 1
+            pomodoro['last_study_date'] = now.date().isoformat()
+            advance_streak(self.stats, now.date())
+            self._aggregate(now, minutes=minutes)
+            return self._check_achievements('study_minutes', 'study_streak_days')
+
+        return self._mutate(change, save)
+
+    # ==== Consultas ====
+
+    def get_accuracy(self, mode: str = 'both') -> float:
+        """Porcentaje de aciertos: 'matrix_trainer', 'module_study' o 'both'"""
+        mt = self.stats['matrix_trainer']
+        ms = self.stats['module_study']
+        if mode == 'matrix_trainer':
+            correct, total = mt['total_attempts'] - mt['total_errors'], mt['total_attempts']
+        elif mode == 'module_study':
+            correct, total = ms['correct_answers'], ms['questions_answered']
+        else:
+            correct = (mt['total_attempts'] - mt['total_errors']) + ms['correct_answers']
+            total = mt['total_attempts'] + ms['questions_answered']
+        return (correct / total) * 100 if total else 0.0
+
+    def get_study_streak_days(self) -> int:
+        """Racha de días consecutivos estudiando (hasta el último día con estudio)"""
+        return self.stats['study_streak']['current']
+
+    def get_longest_study_streak_days(self) -> int:
+        return self.stats['study_streak']['longest']
+
+    def get_total_sessions(self) -> int:
+        return self.stats['session_count']
+
+    def get_recent_sessions(self, count: int = 5) -> List[dict]:
+        """Últimas N sesiones (del archivo caliente y, si no bastan, del archivo mensual)"""
+        sessions = heapq.nlargest(count, self.stats['sessions'], key=lambda x: x['start_time'])
+        if len(sessions) < count and self.stats['session_count'] > len(sessions):
+            seen = {s['id'] for s in sessions}
+            # Meses completos: dentro de un mes las líneas siguen el orden de cierre
+            for _, archived in self.archive.iter_months(SESSIONS):
+                for session in archived:
+                    if session['id'] not in seen:
+                        seen.add(session['id'])
+                        sessions.append(session)
+                if len(sessions) >= count:
+                    break
+            sessions.sort(key=lambda x: x['start_time'], reverse=True)
+        return sessions[:count]
+
+    def get_aggregates(self, period: str = 'daily') -> Dict[str, dict]:
+        """Agregados móviles: 'daily', 'weekly' o 'monthly' -> {clave: {sessions, minutes, answers, ...}}"""
+        return self.stats['aggregates'].get(period, {})
+
+    def get_achievements(self) -> List[dict]:
+        """Logros desbloqueados, del más reciente al más antiguo"""
+        return sorted(self.stats['achievements'], key=lambda x: x['unlocked_at'], reverse=True)
+
+    def get_latest_achievements(self, count: int = 3) -> List[dict]:
+        return self.get_achievements()[:count]
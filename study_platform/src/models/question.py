@@ -1,11 +1,28 @@
 """
 Modelos de datos tipificados para la aplicación
 """
-from dataclasses import dataclass, field
-from typing import List, Optional
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 from datetime import datetime
 
+# Modelos sin __dict__ por instancia donde el intérprete lo permite (3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Tuplas de tags compartidas: casi todas las preguntas usan su sección como único tag
+_TAGS_CACHE: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def intern_str(value: Optional[str]) -> Optional[str]:
+    """Comparte una única copia de strings categóricos (módulo, sección, categoría...)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def shared_tags(tags) -> Tuple[str, ...]:
+    key = tuple(intern_str(t) for t in tags)
+    return _TAGS_CACHE.setdefault(key, key)
+
 
 class DifficultyLevel(Enum):
     """Niveles de dificultad"""
@@ -21,20 +38,22 @@ class MasteryLevel(Enum):
     MASTERED = "mastered"   # >= 80% accuracy
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Question:
     """
     Modelo de pregunta con tracking de métricas
+    module, section, tags y source_file son strings internados compartidos entre
+    preguntas; options y tags se guardan como tuplas.
     """
     id: str
     module: str
     section: str
     difficulty: DifficultyLevel
     question_text: str
-    options: List[str]
+    options: Tuple[str, ...]
     correct_answer: int  # Índice 0-based
     explanation: str
-    tags: List[str] = field(default_factory=list)
+    tags: Tuple[str, ...] = ()
     
     # Métricas
     times_seen: int = 0
@@ -44,6 +63,13 @@ class Question:
     average_time_seconds: float = 0.0
     last_seen: Optional[str] = None  # ISO timestamp
     
+    def __post_init__(self):
+        self.module = intern_str(self.module)
+        self.section = intern_str(self.section)
+        self.source_file = intern_str(self.source_file)
+        self.options = tuple(self.options)
+        self.tags = shared_tags(self.tags)
+    
     @property
     def accuracy(self) -> float:
         """Calcula el porcentaje de aciertos"""
@@ -67,10 +93,10 @@ class Question:
             'section': self.section,
             'difficulty': self.difficulty.value,
             'question_text': self.question_text,
-            'options': self.options,
+            'options': list(self.options),
             'correct_answer': self.correct_answer,
             'explanation': self.explanation,
-            'tags': self.tags,
+            'tags': list(self.tags),
             'times_seen': self.times_seen,
             'times_correct': self.times_correct,
             'times_incorrect': self.times_incorrect,
@@ -85,10 +111,19 @@ class Question:
         return cls(**data)
 
 
-@dataclass
+@dataclass(**_SLOTS)
+class CommandPart:
+    """Fragmento de un comando con su explicación (texto guardado una sola vez)"""
+    fragment: str
+    explanation: str = ""
+
+
+@dataclass(**_SLOTS)
 class SQLCommand:
     """
     Modelo de comando SQL con tracking
+    hints, keywords y explanation_parts se derivan de `parts`, así el texto de
+    cada fragmento no se repite en listas paralelas.
     """
     id: str
     title: str
@@ -96,9 +131,7 @@ class SQLCommand:
     category: str  # DDL, DML, DQL, etc.
     difficulty: DifficultyLevel
     full_command: str
-    hints: List[str] = field(default_factory=list)
-    keywords: List[str] = field(default_factory=list)
-    explanation_parts: List[dict] = field(default_factory=list)
+    parts: Tuple[CommandPart, ...] = ()
     
     # Métricas
     attempts: int = 0
@@ -107,6 +140,24 @@ class SQLCommand:
     average_errors: float = 0.0
     last_attempted: Optional[str] = None
     
+    def __post_init__(self):
+        self.category = intern_str(self.category)
+        self.parts = tuple(self.parts)
+    
+    @property
+    def hints(self) -> List[str]:
+        """Descripciones de las partes (solo las que tienen texto)"""
+        return [p.explanation for p in self.parts if p.explanation]
+    
+    @property
+    def keywords(self) -> List[str]:
+        """Fragmentos del comando usados como palabras clave"""
+        return [p.fragment for p in self.parts if p.fragment]
+    
+    @property
+    def explanation_parts(self) -> List[dict]:
+        return [{'fragment': p.fragment, 'explanation': p.explanation} for p in self.parts]
+    
     @property
     def success_rate(self) -> float:
         """Calcula tasa de éxito"""
@@ -123,6 +174,7 @@ class SQLCommand:
             'full_command': self.full_command,
             'hints': self.hints,
             'keywords': self.keywords,
+            'explanation_parts': self.explanation_parts,
             'attempts': self.attempts,
             'completions': self.completions,
             'fastest_time_seconds': self.fastest_time_seconds,
@@ -132,6 +184,16 @@ class SQLCommand:
     
     @classmethod
     def from_dict(cls, data: dict) -> 'SQLCommand':
-        """Crea instancia desde diccionario"""
+        """Crea instancia desde diccionario (acepta el formato antiguo con hints/keywords)"""
+        data = dict(data)
         data['difficulty'] = DifficultyLevel(data.get('difficulty', 'medium'))
+        hints = data.pop('hints', None) or []
+        keywords = data.pop('keywords', None) or []
+        explanation_parts = data.pop('explanation_parts', None)
+        if explanation_parts is not None:
+            parts = [CommandPart(p.get('fragment', ''), p.get('explanation', '')) for p in explanation_parts]
+        else:
+            parts = [CommandPart(kw, hints[i] if i < len(hints) else '') for i, kw in enumerate(keywords)]
+            parts += [CommandPart('', hint) for hint in hints[len(keywords):]]
+        data['parts'] = tuple(parts)
         return cls(**data)
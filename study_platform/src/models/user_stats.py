@@ -74,6 +74,7 @@ class UserStatistics:
             'sql_total_errors': self.sql_total_errors,
             'sql_current_streak': self.sql_current_streak,
             'sql_best_streak': self.sql_best_streak,
+            'sql_completed_ids': self.sql_completed_ids,
             'sql_command_metrics': self.sql_command_metrics, # New field
             'quiz_questions_answered': self.quiz_questions_answered,
             'quiz_correct_answers': self.quiz_correct_answers,
@@ -0,0 +1,181 @@
+"""
+Agregados materializados por módulo y sección
+Se calculan una vez (o se leen de la caché) y se ajustan en O(1) con cada respuesta
+"""
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+from src.core.event_bus import event_bus, MetricsFlushed
+from src.models.question import Question
+from src.services.content_pack import metrics_sources
+from src.services.data_cache import DataCache
+
+
+BUCKET_NEW = 'new'
+BUCKET_LEARNING = 'learning'
+BUCKET_MASTERED = 'mastered'
+
+
+def classify(times_correct: int, times_incorrect: int) -> str:
+    """Categoría de dominio según los umbrales de Config (sin intentos = nueva)"""
+    attempts = times_correct + times_incorrect
+    if attempts == 0:
+        return BUCKET_NEW
+    accuracy = times_correct / attempts * 100
+    if accuracy >= Config.MASTERY_THRESHOLD:
+        return BUCKET_MASTERED
+    if accuracy >= Config.LEARNING_THRESHOLD:
+        return BUCKET_LEARNING
+    return BUCKET_NEW
+
+
+@dataclass
+class Counters:
+    """Contadores de un grupo de preguntas (global, módulo o sección)"""
+    total: int = 0
+    seen: int = 0
+    mastered: int = 0
+    learning: int = 0
+    new: int = 0
+    correct: int = 0
+    incorrect: int = 0
+
+    @property
+    def attempts(self) -> int:
+        return self.correct + self.incorrect
+
+    @property
+    def accuracy(self) -> float:
+        return (self.correct / self.attempts * 100) if self.attempts > 0 else 0.0
+
+    def add(self, times_correct: int, times_incorrect: int, sign: int = 1):
+        """Suma (sign=1) o resta (sign=-1) la contribución de una pregunta"""
+        self.total += sign
+        if times_correct + times_incorrect > 0:
+            self.seen += sign
+        bucket = classify(times_correct, times_incorrect)
+        setattr(self, bucket, getattr(self, bucket) + sign)
+        self.correct += sign * times_correct
+        self.incorrect += sign * times_incorrect
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data['accuracy'] = self.accuracy
+        return data
+
+
+class AggregatesService:
+    """Mantiene Counters globales, por módulo y por (módulo, sección)"""
+
+    CACHE_NAME = 'aggregates'
+
+    def __init__(self, questions: List[Question], state: Optional[dict] = None,
+                 cache: Optional[DataCache] = None, cache_name: Optional[str] = None,
+                 sources: Optional[Callable[[], Iterable[Path]]] = None):
+        self.questions = questions
+        self.cache = cache
+        self.cache_name = cache_name or self.CACHE_NAME
+        self.sources = sources
+        self.dirty = False
+        if state is None:
+            state = self._build(questions)
+            self.dirty = True
+        self.totals: Counters = state['totals']
+        self._modules: Dict[str, Counters] = state['modules']
+        self._sections: Dict[Tuple[str, str], Counters] = state['sections']
+
+    @staticmethod
+    def _build(questions: List[Question]) -> dict:
+        totals = Counters()
+        modules: Dict[str, Counters] = {}
+        sections: Dict[Tuple[str, str], Counters] = {}
+        for q in questions:
+            for counters in (
+                totals,
+                modules.setdefault(q.module, Counters()),
+                sections.setdefault((q.module, q.section), Counters()),
+            ):
+                counters.add(q.times_correct, q.times_incorrect)
+        return {'totals': totals, 'modules': modules, 'sections': sections}
+
+    # ==== Persistencia ====
+
+    @staticmethod
+    def _fingerprint(questions: List[Question], sources: Optional[Callable[[], Iterable[Path]]] = None) -> str:
+        """
+        Huella de los archivos de donde salen las métricas: los CSV/packs o, con
+        `sources`, los archivos que retorna (p. ej. los fragmentos de un perfil)
+        """
+        if sources is not None:
+            paths = list(sources())
+        else:
+            files = {q.source_file for q in questions if q.source_file}
+            paths = [p for s in files for p in metrics_sources(s)]
+        return f"{len(questions)}:{DataCache.fingerprint_files(paths)}"
+
+    @classmethod
+    def load_or_build(cls, questions: List[Question], cache: Optional[DataCache] = None,
+                      cache_name: Optional[str] = None,
+                      sources: Optional[Callable[[], Iterable[Path]]] = None) -> 'AggregatesService':
+        """Lee los agregados de la caché si las métricas no cambiaron desde que se guardaron"""
+        cache = cache or DataCache()
+        cache_name = cache_name or cls.CACHE_NAME
+        state = cache.load(cache_name, cls._fingerprint(questions, sources))
+        service = cls(questions, state=state, cache=cache, cache_name=cache_name, sources=sources)
+        if state is None:
+            service.save()
+        # La huella depende de los CSV: se vuelve a guardar cada vez que se escriben
+        event_bus.subscribe(MetricsFlushed, service.on_metrics_flushed)
+        return service
+
+    def save(self):
+        """Persiste los agregados con la huella actual de los CSV (tras escribir las métricas)"""
+        if self.cache is None:
+            self.cache = DataCache()
+        state = {'totals': self.totals, 'modules': self._modules, 'sections': self._sections}
+        self.cache.save(self.cache_name, self._fingerprint(self.questions, self.sources), state)
+        self.dirty = False
+
+    def on_metrics_flushed(self, event: MetricsFlushed):
+        if self.dirty:
+            self.save()
+
+    # ==== Deltas ====
+
+    def apply_change(self, question: Question, old_correct: int, old_incorrect: int):
+        """Mueve la contribución de una pregunta de sus métricas anteriores a las actuales (O(1))"""
+        groups = (
+            self.totals,
+            self._modules.setdefault(question.module, Counters()),
+            self._sections.setdefault((question.module, question.section), Counters()),
+        )
+        for counters in groups:
+            counters.add(old_correct, old_incorrect, sign=-1)
+            counters.add(question.times_correct, question.times_incorrect)
+        self.dirty = True
+
+    def record_answer(self, question: Question, is_correct: bool):
+        """Aplica una respuesta a la pregunta y a los agregados"""
+        old_correct, old_incorrect = question.times_correct, question.times_incorrect
+        if is_correct:
+            question.times_correct += 1
+        else:
+            question.times_incorrect += 1
+        question.times_seen += 1
+        self.apply_change(question, old_correct, old_incorrect)
+
+    # ==== Lectura ====
+
+    def modules(self) -> Dict[str, Counters]:
+        return dict(sorted(self._modules.items()))
+
+    def module(self, module: str) -> Counters:
+        return self._modules.get(module, Counters())
+
+    def section(self, module: str, section: str) -> Counters:
+        return self._sections.get((module, section), Counters())
+
+    def sections_of(self, module: str) -> Dict[str, Counters]:
+        return {s: c for (m, s), c in sorted(self._sections.items()) if m == module}
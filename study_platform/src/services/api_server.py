@@ -0,0 +1,461 @@
+"""
+Servidor HTTP/JSON (asyncio, sin dependencias) sobre el banco de preguntas
+Permite practicar desde navegadores o tablets contra el banco de una sola máquina.
+
+- Banco compartido en memoria (DataLoader) y sesiones por cliente
+- Persistencia por lotes en el perfil activo (o --profile): las métricas se escriben
+  cada FLUSH_INTERVAL segundos o al acumular FLUSH_BATCH respuestas, con los
+  fragmentos del perfil reescritos en un hilo aparte
+- Contrapresión: límite de conexiones (503 + Retry-After), de tamaño de cuerpo,
+  timeouts de lectura, drain() en cada respuesta y, si la cola de escritura se
+  llena, las respuestas esperan al flush
+
+Endpoints
+    GET  /api/health
+    GET  /api/modules                           {módulo: [secciones]}
+    POST /api/sessions                          -> {"session": id}
+    GET  /api/questions/next?session=&mode=random|topic|weak&module=&section=&count=
+    POST /api/answers      {"session", "question_id", "choice"[, "seconds"]}  (choice 0-based)
+    GET  /api/commands
+    POST /api/commands/attempt {"command_id", "success"}
+    GET  /api/stats[?session=]
+"""
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.core.event_bus import event_bus, MetricsFlushed
+from src.services.data_loader import DataLoader
+from src.services.persistence import PersistenceService
+from src.services.profiles import ProfileRegistry
+from src.services.question_filters import MODES, MODE_RANDOM, filter_questions
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[dict] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+REASONS = {
+    200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 408: 'Request Timeout', 413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+
+@dataclass
+class ClientSession:
+    """Estado de un cliente: cola de preguntas servidas y aciertos de la sesión"""
+    id: str
+    mode: str = MODE_RANDOM
+    module: str = 'all'
+    section: str = 'all'
+    queue: List[str] = field(default_factory=list)
+    answered: int = 0
+    correct: int = 0
+    created: float = field(default_factory=time.monotonic)
+    last_seen: float = field(default_factory=time.monotonic)
+
+    def to_dict(self) -> dict:
+        return {
+            'session': self.id, 'mode': self.mode, 'module': self.module, 'section': self.section,
+            'answered': self.answered, 'correct': self.correct,
+            'accuracy': round(self.correct / self.answered * 100, 1) if self.answered else 0.0,
+        }
+
+
+class StudyAPIServer:
+    """Servidor asyncio que envuelve DataLoader, los filtros y PersistenceService"""
+
+    MAX_CONNECTIONS = 256
+    MAX_BODY_BYTES = 64 * 1024
+    MAX_HEADERS = 64
+    READ_TIMEOUT = 15.0          # s esperando una petición en una conexión keep-alive
+    MAX_SESSIONS = 1000
+    SESSION_TTL = 2 * 3600       # s de inactividad antes de descartar una sesión
+    FLUSH_INTERVAL = 2.0         # s entre escrituras por lotes
+    FLUSH_BATCH = 200            # respuestas pendientes que disparan un flush
+    MAX_PENDING = 2000           # respuestas pendientes que bloquean nuevas respuestas
+    MAX_COUNT = 50               # preguntas por petición de /next
+
+    def __init__(self, data_loader: Optional[DataLoader] = None,
+                 persistence: Optional[PersistenceService] = None, persist: bool = True,
+                 profile_id: Optional[str] = None):
+        self.data_loader = data_loader or DataLoader()
+        self.persist = persist
+        # Carga completa: los cuerpos perezosos se leen del CSV que el flush reescribe en otro hilo
+        self.questions = self.data_loader.load_all_questions(lazy=False)
+        # Progreso en los fragmentos del perfil (el contenido queda de solo lectura);
+        # sin perfil explícito, el activo: el mismo almacenamiento que la app y StatsManager
+        profiles = ProfileRegistry()
+        profile_id = profile_id or profiles.active_id
+        if profile_id not in profiles.profiles:
+            raise KeyError(f"unknown profile '{profile_id}'")
+        profile = profiles.profiles[profile_id]
+        self.profile_id = profile_id
+        self.data_loader.use_profile(profile_id, profiles.shards(profile_id), self.questions,
+                                     seed=profile.seed_from_content)
+        profiles.mark_seeded(profile_id)
+        self.persistence = persistence or PersistenceService(profiles.path(profile_id),
+                                                             profiles.stats_sources(profile_id))
+        self.by_id = {q.id: q for q in self.questions}
+        self.commands = self.data_loader.load_all_commands()
+        self.commands_by_id = {c.id: c for c in self.commands}
+        self.data_loader.load_aggregates(self.questions)
+        self.course_structure = self.data_loader.get_course_structure(self.questions)
+
+        self.sessions: Dict[str, ClientSession] = {}
+        self.rng = random.Random()
+        self.connections = 0
+        self.requests = 0
+        self.rejected = 0
+        self.unflushed = 0             # respuestas sin persistir (también con persist=False)
+        self._stats_dirty = False
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flush_wakeup: Optional[asyncio.Event] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+        self.routes = {
+            ('GET', '/api/health'): self.handle_health,
+            ('GET', '/api/modules'): self.handle_modules,
+            ('POST', '/api/sessions'): self.handle_create_session,
+            ('GET', '/api/questions/next'): self.handle_next_questions,
+            ('POST', '/api/answers'): self.handle_answer,
+            ('GET', '/api/commands'): self.handle_commands,
+            ('POST', '/api/commands/attempt'): self.handle_command_attempt,
+            ('GET', '/api/stats'): self.handle_stats,
+        }
+
+    # ==== Ciclo de vida ====
+
+    async def start(self, host: str, port: int):
+        # Primitivas creadas dentro del loop (Python < 3.10 las liga al loop al construirlas)
+        self._flush_lock = asyncio.Lock()
+        self._flush_wakeup = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle_connection, host, port,
+                                                  limit=self.MAX_BODY_BYTES)
+        self._flusher = asyncio.create_task(self._flush_loop())
+        return self._server
+
+    @property
+    def port(self) -> Optional[int]:
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    # ==== Persistencia por lotes ====
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), self.FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Error flushing server state: {e}")
+            self._expire_sessions()
+
+    async def flush(self):
+        """Escribe las métricas pendientes (CSV en un hilo) y las estadísticas de usuario"""
+        async with self._flush_lock:
+            self.unflushed = 0
+            if not self.persist:
+                return
+            pending = self.data_loader.take_pending()
+            if pending:
+                loop = asyncio.get_running_loop()
+                written, count = await loop.run_in_executor(None, self.data_loader.write_pending, pending)
+                self.data_loader.apply_merged(pending)
+                if written:
+                    # En el hilo del event loop: los suscriptores (agregados) no compiten con las respuestas
+                    event_bus.publish(MetricsFlushed(tuple(written), count))
+            if self._stats_dirty:
+                self._stats_dirty = False
+                self.persistence.commit()
+
+    def _record_answer(self, question, is_correct: bool, seconds: Optional[float] = None):
+        if self.persist:
+            self.data_loader.record_answer(question, is_correct)
+            self.persistence.record_question_answer(question, is_correct, seconds, save=False)
+            self._stats_dirty = True
+        else:
+            # Sin persistencia (pruebas de carga): solo memoria
+            if self.data_loader.aggregates is not None:
+                self.data_loader.aggregates.record_answer(question, is_correct)
+        self.unflushed += 1
+        if self.unflushed >= self.FLUSH_BATCH:
+            self._flush_wakeup.set()
+
+    def _expire_sessions(self):
+        cutoff = time.monotonic() - self.SESSION_TTL
+        for session_id in [s.id for s in self.sessions.values() if s.last_seen < cutoff]:
+            del self.sessions[session_id]
+
+    # ==== HTTP ====
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if self.connections >= self.MAX_CONNECTIONS:
+            self.rejected += 1
+            await self._send(writer, 503, {'error': 'server busy'}, keep_alive=False, headers={'Retry-After': '1'})
+            writer.close()
+            return
+
+        self.connections += 1
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.READ_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as e:
+                    await self._send(writer, e.status, {'error': e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self.requests += 1
+                status, payload, extra = await self._dispatch(method, target, body)
+                await self._send(writer, status, payload, keep_alive, extra)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        try:
+            line = await reader.readline()
+        except (asyncio.LimitOverrunError, ValueError):
+            raise HTTPError(431, 'request line too long')
+        if not line:
+            return None
+        parts = line.decode('latin-1').split()
+        if len(parts) != 3:
+            raise HTTPError(400, 'malformed request line')
+        method, target, _ = parts
+
+        headers = {}
+        while True:
+            try:
+                line = await reader.readline()
+            except (asyncio.LimitOverrunError, ValueError):
+                raise HTTPError(431, 'header too long')
+            if line in (b'\r\n', b'\n', b''):
+                break
+            if len(headers) >= self.MAX_HEADERS:
+                raise HTTPError(431, 'too many headers')
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        body = b''
+        length = headers.get('content-length')
+        if length:
+            if not length.isdigit():
+                raise HTTPError(400, 'invalid content-length')
+            if int(length) > self.MAX_BODY_BYTES:
+                raise HTTPError(413, 'body too large')
+            body = await reader.readexactly(int(length))
+        return method.upper(), target, headers, body
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, object, dict]:
+        if method == 'OPTIONS':
+            return 204, None, {'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+                               'Access-Control-Allow-Headers': 'Content-Type'}
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self.routes):
+                return 405, {'error': 'method not allowed'}, {}
+            return 404, {'error': 'not found'}, {}
+
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise HTTPError(400, 'JSON body must be an object')
+            result = handler(query, data)
+            if asyncio.iscoroutine(result):
+                result = await result
+            return 200, result, {}
+        except json.JSONDecodeError:
+            return 400, {'error': 'invalid JSON'}, {}
+        except HTTPError as e:
+            return e.status, {'error': e.message}, e.headers
+        except Exception as e:
+            print(f"Error handling {method} {url.path}: {e}")
+            return 500, {'error': 'internal error'}, {}
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool,
+                    headers: Optional[dict] = None):
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        lines = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            "Access-Control-Allow-Origin: *",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        try:
+            await writer.drain()  # Respeta el control de flujo del cliente
+        except ConnectionError:
+            pass
+
+    # ==== Handlers ====
+
+    def _session(self, session_id: Optional[str]) -> ClientSession:
+        session = self.sessions.get(session_id or '')
+        if session is None:
+            raise HTTPError(404, 'unknown session')
+        session.last_seen = time.monotonic()
+        return session
+
+    def handle_health(self, query, data):
+        return {
+            'status': 'ok', 'questions': len(self.questions), 'commands': len(self.commands),
+            'sessions': len(self.sessions), 'connections': self.connections,
+            'requests': self.requests, 'rejected': self.rejected,
+            'pending_writes': self.data_loader.pending_writes,
+        }
+
+    def handle_modules(self, query, data):
+        return self.course_structure
+
+    def handle_create_session(self, query, data):
+        if len(self.sessions) >= self.MAX_SESSIONS:
+            self._expire_sessions()
+            if len(self.sessions) >= self.MAX_SESSIONS:
+                raise HTTPError(503, 'too many sessions', {'Retry-After': '30'})
+        session = ClientSession(id=uuid.uuid4().hex)
+        self.sessions[session.id] = session
+        return {'session': session.id}
+
+    def handle_next_questions(self, query, data):
+        session = self._session(query.get('session'))
+        mode = query.get('mode', session.mode)
+        if mode not in MODES:
+            raise HTTPError(400, f"mode must be one of {', '.join(MODES)}")
+        module = query.get('module', session.module if mode == session.mode else 'all')
+        section = query.get('section', session.section if mode == session.mode else 'all')
+        try:
+            count = max(1, min(int(query.get('count', 5)), self.MAX_COUNT))
+        except ValueError:
+            raise HTTPError(400, 'count must be an integer')
+
+        if (mode, module, section) != (session.mode, session.module, session.section):
+            session.mode, session.module, session.section = mode, module, section
+            session.queue = []
+
+        batch = []
+        while len(batch) < count:
+            if not session.queue:
+                pool = filter_questions(self.questions, mode, module, section, rng=self.rng)
+                session.queue = [q.id for q in self.rng.sample(pool, len(pool))]
+                if not session.queue:
+                    break
+            batch.append(self.by_id[session.queue.pop()])
+
+        return {'questions': [
+            {'id': q.id, 'module': q.module, 'section': q.section,
+             'question': q.question_text, 'options': list(q.options)}
+            for q in batch
+        ]}
+
+    async def handle_answer(self, query, data):
+        session = self._session(data.get('session'))
+        question = self.by_id.get(str(data.get('question_id', '')))
+        if question is None:
+            raise HTTPError(404, 'unknown question')
+        choice = data.get('choice')
+        if not isinstance(choice, int) or not 0 <= choice < len(question.options):
+            raise HTTPError(400, 'choice must be an option index')
+
+        # Contrapresión: si la cola de escritura está llena, esperar al flush
+        if self.unflushed >= self.MAX_PENDING:
+            await self.flush()
+
+        # Tiempo de respuesta medido por el cliente (opcional)
+        seconds = data.get('seconds')
+        if seconds is not None and (isinstance(seconds, bool) or not isinstance(seconds, (int, float))
+                                    or seconds < 0):
+            raise HTTPError(400, 'seconds must be a non-negative number')
+
+        is_correct = choice == question.correct_answer
+        self._record_answer(question, is_correct, seconds)
+        session.answered += 1
+        session.correct += int(is_correct)
+        return {
+            'correct': is_correct,
+            'correct_answer': question.correct_answer,
+            'explanation': question.explanation,
+            'session': session.to_dict(),
+        }
+
+    def handle_commands(self, query, data):
+        return {'commands': [
+            {'id': c.id, 'title': c.title, 'category': c.category,
+             'description': c.description, 'hints': list(c.hints)}
+            for c in self.commands
+        ]}
+
+    def handle_command_attempt(self, query, data):
+        command_id = str(data.get('command_id', ''))
+        if command_id not in self.commands_by_id:
+            raise HTTPError(404, 'unknown command')
+        success = bool(data.get('success'))
+        if self.persist:
+            stats = self.persistence.record_command_attempt(command_id, success, save=False)
+            self._stats_dirty = True
+        else:
+            stats = self.persistence.get_user_stats()
+        return {'command_id': command_id, 'success': success,
+                'sql_commands_completed': stats.sql_commands_completed,
+                'sql_current_streak': stats.sql_current_streak}
+
+    def handle_stats(self, query, data):
+        result = {
+            'questions': self.data_loader.calculate_questions_stats(self.questions),
+            'user': self.persistence.get_user_stats().to_dict(),
+        }
+        if query.get('session'):
+            result['session'] = self._session(query['session']).to_dict()
+        return result
+
+
+async def serve(host: str, port: int, persist: bool = True, profile_id: Optional[str] = None):
+    server = StudyAPIServer(persist=persist, profile_id=profile_id)
+    await server.start(host, port)
+    print(f"DP-700 API en http://{host}:{server.port} "
+          f"({len(server.questions)} preguntas, {len(server.commands)} comandos"
+          f"{', sin persistencia' if not persist else ''})", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
@@ -0,0 +1,327 @@
+"""
+Validación del contenido (CSV de preguntas y XML de comandos) antes de publicar
+En tiempo de ejecución los errores solo se imprimen y la fila o el comando se
+descarta (o la respuesta correcta cae en la opción 1); aquí se reportan todos.
+
+Los archivos se validan en un pool de procesos y los que ya pasaron sin errores con
+el mismo hash de contenido se omiten (caché en storage/cache).
+
+Los problemas ya conocidos del contenido publicado se registran en una línea base
+(lint_baseline.json) y no hacen fallar la validación: solo los nuevos.
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.services.data_cache import DataCache
+
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# Subir al cambiar las reglas: invalida los resultados limpios cacheados
+RULES_VERSION = 1
+CACHE_NAME = 'lint_results'
+
+REQUIRED_COLUMNS = ('question', 'options', 'correct')
+MULTI_VALUES = ('true', 'false', '')
+
+_METRICS_RE = re.compile(r'^\d+;\d+$')
+_WS_RE = re.compile(r'\s+')
+_ELLIPSIS_RE = re.compile(r'\.\.\.|…')
+
+
+@dataclass
+class LintIssue:
+    path: str
+    line: int
+    severity: str
+    code: str
+    message: str
+
+    def format(self) -> str:
+        location = f"{self.path}:{self.line}" if self.line else self.path
+        return f"{location}: {self.severity} [{self.code}] {self.message}"
+
+
+# ==== Reglas CSV ====
+
+def _split(value: str) -> List[str]:
+    return [part.strip() for part in (value or '').split(';') if part.strip()]
+
+
+def _check_answer(issues, path, line, prefix, options_str, correct_str, multi=None):
+    """Opciones y respuestas (1-based) de una pregunta o de su segunda parte"""
+    options = _split(options_str)
+    if len(options) < 2:
+        issues.append(LintIssue(path, line, ERROR, f'{prefix}options', f"needs at least 2 options, found {len(options)}"))
+
+    answers = _split(correct_str)
+    if not answers:
+        issues.append(LintIssue(path, line, ERROR, f'{prefix}correct', "missing correct answer"))
+        return
+    for answer in answers:
+        if not answer.isdigit():
+            issues.append(LintIssue(path, line, ERROR, f'{prefix}correct', f"correct value '{answer}' is not a number"))
+        elif not 1 <= int(answer) <= len(options):
+            issues.append(LintIssue(path, line, ERROR, f'{prefix}correct',
+                                    f"correct index {answer} out of range 1..{len(options)}"))
+    if len(set(answers)) != len(answers):
+        issues.append(LintIssue(path, line, WARNING, f'{prefix}correct', f"repeated correct indices '{correct_str}'"))
+
+    if multi is not None:
+        if multi == 'true' and len(answers) < 2:
+            issues.append(LintIssue(path, line, ERROR, 'multi', "multi=true but only one correct answer"))
+        elif multi in ('false', '') and len(answers) > 1:
+            issues.append(LintIssue(path, line, ERROR, 'multi', f"{len(answers)} correct answers but multi is not true"))
+
+
+def lint_csv_text(text: str, path: str) -> List[LintIssue]:
+    issues: List[LintIssue] = []
+    reader = csv.DictReader(io.StringIO(text, newline=''))
+    header = reader.fieldnames or []
+    missing = [col for col in REQUIRED_COLUMNS if col not in header]
+    if missing:
+        return [LintIssue(path, 1, ERROR, 'header', f"missing columns: {', '.join(missing)}")]
+
+    seen_questions: Dict[str, int] = {}
+    for row in reader:
+        line = reader.line_num
+        if None in row:
+            issues.append(LintIssue(path, line, ERROR, 'columns', f"{len(header) + len(row[None])} fields, header has {len(header)}"))
+        question = (row.get('question') or '').strip()
+        if not question:
+            issues.append(LintIssue(path, line, ERROR, 'question', "empty question text"))
+        elif question in seen_questions:
+            issues.append(LintIssue(path, line, WARNING, 'duplicate', f"same question as line {seen_questions[question]}"))
+        else:
+            seen_questions[question] = line
+
+        multi = (row.get('multi') or '').strip().lower()
+        if multi not in MULTI_VALUES:
+            issues.append(LintIssue(path, line, ERROR, 'multi', f"multi must be true/false, found '{row.get('multi')}'"))
+            multi = None
+        _check_answer(issues, path, line, '', row.get('options'), row.get('correct'), multi)
+
+        metrics = (row.get('metrics') or '').strip()
+        if metrics and not _METRICS_RE.match(metrics):
+            issues.append(LintIssue(path, line, ERROR, 'metrics', f"metrics must be 'correct;incorrect', found '{metrics}'"))
+
+        if (row.get('second_question') or '').strip():
+            _check_answer(issues, path, line, 'second_', row.get('second_options'), row.get('second_correct'))
+        elif (row.get('second_options') or row.get('second_correct') or '').strip():
+            issues.append(LintIssue(path, line, WARNING, 'second_question', "second options/correct without second question"))
+    return issues
+
+
+# ==== Reglas XML ====
+
+def _normalize(text: str) -> str:
+    return _WS_RE.sub(' ', text or '').strip()
+
+
+def _compact(text: str) -> str:
+    """Sin espacios ni mayúsculas: las partes y <full> pueden partir las líneas de forma distinta"""
+    return _WS_RE.sub('', text or '').casefold()
+
+
+def _find_fragment(full: str, fragment: str, start: int) -> int:
+    """
+    Posición donde empieza el fragmento en `full` a partir de `start`, o -1.
+    Los '...' del fragmento (código omitido en la explicación) aceptan cualquier texto.
+    """
+    first = -1
+    position = start
+    for piece in _ELLIPSIS_RE.split(fragment):
+        if not piece:
+            continue
+        found = full.find(piece, position)
+        if found < 0:
+            return -1
+        if first < 0:
+            first = found
+        position = found + len(piece)
+    return first
+
+
+def _child_text(element: ET.Element, tag: str, attr: str) -> str:
+    child = element.find(tag)
+    if child is not None and child.text:
+        return child.text.strip()
+    return element.get(attr, '')
+
+
+def lint_xml_bytes(data: bytes, path: str) -> List[LintIssue]:
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError as e:
+        return [LintIssue(path, e.position[0], ERROR, 'xml', f"malformed XML: {e}")]
+
+    issues: List[LintIssue] = []
+    if root.find('title') is None or not (root.find('title').text or '').strip():
+        issues.append(LintIssue(path, 0, WARNING, 'title', "missing <title> (the file name is used)"))
+
+    parts = root.findall('.//part')
+    full = _compact(root.findtext('full'))
+    if not parts and not full:
+        issues.append(LintIssue(path, 0, ERROR, 'parts', "no <part> elements and no <full> command"))
+
+    position = 0
+    for number, part in enumerate(parts, 1):
+        fragment = _normalize(_child_text(part, 'text', 'text'))
+        if not fragment:
+            issues.append(LintIssue(path, 0, ERROR, 'part', f"part {number} has no text"))
+            continue
+        if not _child_text(part, 'desc', 'description'):
+            issues.append(LintIssue(path, 0, WARNING, 'part', f"part {number} has no description"))
+        if full:
+            # Las partes deben aparecer en <full> y en el mismo orden
+            # (solo se exige el orden de inicio: un '...' puede abarcar la parte siguiente)
+            found = _find_fragment(full, _compact(fragment), position)
+            if found < 0:
+                where = "out of order in" if _find_fragment(full, _compact(fragment), 0) >= 0 else "not found in"
+                issues.append(LintIssue(path, 0, ERROR, 'full', f"part {number} '{fragment[:40]}' {where} <full>"))
+            else:
+                position = found + 1
+    return issues
+
+
+# ==== Ejecución ====
+
+def lint_file(path: str) -> Tuple[str, List[LintIssue]]:
+    """Valida un archivo (ejecutado en los procesos del pool)"""
+    try:
+        data = Path(path).read_bytes()
+        if path.endswith('.xml'):
+            return path, lint_xml_bytes(data, path)
+        return path, lint_csv_text(data.decode('utf-8'), path)
+    except UnicodeDecodeError as e:
+        return path, [LintIssue(path, 0, ERROR, 'encoding', f"not valid UTF-8: {e}")]
+    except Exception as e:
+        return path, [LintIssue(path, 0, ERROR, 'read', str(e))]
+
+
+def content_files(data_dir: Path) -> List[Path]:
+    data_dir = Path(data_dir)
+    return sorted((data_dir / 'questions').glob('*.csv')) + sorted((data_dir / 'commands').rglob('*.xml'))
+
+
+def _hash(path: Path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+@dataclass
+class LintReport:
+    issues: List[LintIssue]
+    checked: int
+    skipped: int
+    # Problemas omitidos por estar en la línea base
+    baselined: List[LintIssue] = field(default_factory=list)
+
+    @property
+    def errors(self) -> int:
+        return sum(1 for issue in self.issues if issue.severity == ERROR)
+
+    @property
+    def warnings(self) -> int:
+        return sum(1 for issue in self.issues if issue.severity == WARNING)
+
+
+def _run(pending: List[str], jobs: Optional[int]) -> Iterable[Tuple[str, List[LintIssue]]]:
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(pending)))
+    if workers == 1:
+        return [lint_file(path) for path in pending]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(pending) // (workers * 4))
+        return list(pool.map(lint_file, pending, chunksize=chunksize))
+
+
+def lint_paths(paths: Iterable[Path], jobs: Optional[int] = None,
+               cache: Optional[DataCache] = None) -> LintReport:
+    """
+    Valida los archivos en paralelo. Con `cache` se omiten los que ya pasaron sin
+    errores con el mismo hash (sus avisos se reportan desde la caché).
+    """
+    paths = [Path(p) for p in paths]
+    # {ruta: (hash, avisos)} de los archivos sin errores
+    clean: Dict[str, Tuple[str, List[LintIssue]]] = (cache.load(CACHE_NAME, str(RULES_VERSION)) or {}) if cache else {}
+
+    issues: List[LintIssue] = []
+    hashes: Dict[str, str] = {}
+    for path in paths:
+        if path.exists():
+            hashes[str(path)] = _hash(path)
+        else:
+            issues.append(LintIssue(str(path), 0, ERROR, 'read', "file not found"))
+
+    pending = []
+    for path, digest in hashes.items():
+        cached = clean.get(path)
+        if cached and cached[0] == digest:
+            issues.extend(cached[1])
+        else:
+            pending.append(path)
+
+    if pending:
+        for path, file_issues in _run(pending, jobs):
+            issues.extend(file_issues)
+            if any(issue.severity == ERROR for issue in file_issues):
+                clean.pop(path, None)
+            else:
+                clean[path] = (hashes[path], file_issues)
+        if cache:
+            cache.save(CACHE_NAME, str(RULES_VERSION), clean)
+
+    issues.sort(key=lambda i: (i.path, i.line))
+    return LintReport(issues, checked=len(pending), skipped=len(hashes) - len(pending))
+
+
+# ==== Línea base ====
+
+def baseline_key(issue: LintIssue, root: Path) -> str:
+    """Clave de un problema sin número de línea: sobrevive a filas añadidas o borradas"""
+    path = Path(issue.path)
+    try:
+        path = path.resolve().relative_to(Path(root).resolve())
+    except ValueError:
+        pass
+    return f"{path.as_posix()}|{issue.severity}|{issue.code}|{issue.message}"
+
+
+def load_baseline(path: Path) -> Counter:
+    """{clave: veces} de la línea base (vacía si no existe)"""
+    if not Path(path).exists():
+        return Counter()
+    with open(path, 'r', encoding='utf-8') as f:
+        return Counter(json.load(f).get('issues', {}))
+
+
+def save_baseline(path: Path, issues: Iterable[LintIssue], root: Path):
+    counts = Counter(baseline_key(issue, root) for issue in issues)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'rules_version': RULES_VERSION, 'issues': dict(sorted(counts.items()))},
+                  f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def apply_baseline(report: LintReport, baseline: Counter, root: Path) -> LintReport:
+    """Separa los problemas conocidos (hasta tantas veces como figuran en la línea base)"""
+    remaining = Counter(baseline)
+    issues, known = [], []
+    for issue in report.issues:
+        key = baseline_key(issue, root)
+        if remaining[key] > 0:
+            remaining[key] -= 1
+            known.append(issue)
+        else:
+            issues.append(issue)
+    return LintReport(issues, report.checked, report.skipped, known)
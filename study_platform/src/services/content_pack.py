@@ -0,0 +1,244 @@
+"""
+Paquetes de contenido .dp700pack
+Un zip con manifest.json, un CSV por módulo y un XML por comando, leído
+directamente con zipfile (un solo descriptor) y cacheado por hash del archivo.
+
+    manifest.json
+    {
+        "format": 1,
+        "name": "dp700-core",
+        "version": "2024.10",
+        "questions": ["questions/dp700_modulo.csv", ...],
+        "commands": ["commands/KQL/comando.xml", ...]
+    }
+
+Las métricas de las preguntas de un pack no se escriben dentro del zip (así el
+pack se puede reemplazar de forma atómica) sino en storage/pack_metrics/<pack>.json.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from src.core.file_store import CounterDelta, file_lock, merge_counters, read_json, write_json
+from src.models.question import Question, SQLCommand
+from src.services.data_cache import DataCache
+from src.utils.tracing import traced
+
+
+PACK_SUFFIX = '.dp700pack'
+MANIFEST_NAME = 'manifest.json'
+PACK_FORMAT = 1
+# Separador entre la ruta del pack y el miembro en Question.source_file
+MEMBER_SEP = '!'
+
+
+def is_pack_member(source_file: str) -> bool:
+    return PACK_SUFFIX + MEMBER_SEP in source_file
+
+
+def split_member(source_file: str) -> Tuple[Path, str]:
+    pack_path, member = source_file.split(MEMBER_SEP, 1)
+    return Path(pack_path), member
+
+
+def metrics_path(pack_path: Path) -> Path:
+    return Config.STORAGE_DIR / 'pack_metrics' / f'{Path(pack_path).stem}.json'
+
+
+def metrics_sources(source_file: str) -> List[Path]:
+    """Archivos de los que dependen las métricas de una pregunta (para huellas de caché)"""
+    if is_pack_member(source_file):
+        pack_path, _ = split_member(source_file)
+        return [pack_path, metrics_path(pack_path)]
+    return [Path(source_file)]
+
+
+# ==== Métricas de preguntas de packs ====
+
+def load_pack_metrics(pack_path: Path) -> Dict[str, List[int]]:
+    """{question_id: [correctas, incorrectas]}"""
+    path = metrics_path(pack_path)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading pack metrics {path.name}: {e}")
+        return {}
+
+
+def save_pack_metrics(pack_path: Path, deltas: List[CounterDelta]) -> bool:
+    """Fusiona las métricas de varias preguntas de un pack (bajo bloqueo, escritura atómica)"""
+    path = metrics_path(pack_path)
+    try:
+        with file_lock(path):
+            metrics = read_json(path)
+            merge_counters(metrics, deltas)
+            write_json(path, metrics, ensure_ascii=True)
+        return True
+    except Exception as e:
+        print(f"Error saving pack metrics {path.name}: {e}")
+        return False
+
+
+# ==== Lectura ====
+
+def archive_hash(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ContentPack:
+    """Un archivo .dp700pack abierto para lectura"""
+
+    CACHE_PREFIX = 'pack_'
+    MAX_WORKERS = 8
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.manifest: dict = {}
+        self.fingerprint: Optional[str] = None  # Hash del archivo, tras load()
+
+    @property
+    def name(self) -> str:
+        return self.manifest.get('name') or self.path.stem
+
+    def _read_manifest(self, zf: zipfile.ZipFile) -> dict:
+        names = zf.namelist()
+        manifest = {}
+        if MANIFEST_NAME in names:
+            manifest = json.loads(zf.read(MANIFEST_NAME).decode('utf-8'))
+            if manifest.get('format', PACK_FORMAT) > PACK_FORMAT:
+                raise ValueError(f"unsupported pack format {manifest.get('format')}")
+        # Sin listas en el manifiesto se toman todos los miembros por extensión
+        manifest.setdefault('questions', sorted(n for n in names if n.endswith('.csv')))
+        manifest.setdefault('commands', sorted(n for n in names if n.endswith('.xml')))
+        return manifest
+
+    @traced(cat='pack')
+    def load(self, loader, cache: Optional[DataCache] = None) -> Tuple[List[Question], List[SQLCommand]]:
+        """
+        Preguntas y comandos del pack. Si el hash del archivo coincide con la caché no
+        se abre el zip; si no, los miembros se leen y parsean en paralelo.
+        """
+        cache = cache or DataCache()
+        cache_name = f'{self.CACHE_PREFIX}{self.path.stem}'
+        fingerprint = self.fingerprint = archive_hash(self.path)
+
+        content = cache.load(cache_name, fingerprint)
+        if content is None:
+            content = self._parse(loader)
+            cache.save(cache_name, fingerprint, content)
+        self.manifest = content['manifest']
+        questions, commands = content['questions'], content['commands']
+
+        # Las métricas guardadas fuera del pack tienen prioridad sobre las del CSV
+        metrics = load_pack_metrics(self.path)
+        for question in questions:
+            stored = metrics.get(question.id)
+            if stored:
+                question.times_correct, question.times_incorrect = stored
+                question.times_seen = question.times_correct + question.times_incorrect
+        return questions, commands
+
+    def _parse(self, loader) -> dict:
+        with zipfile.ZipFile(self.path) as zf:
+            manifest = self._read_manifest(zf)
+
+            def parse_csv(member: str) -> List[Question]:
+                text = io.TextIOWrapper(io.BytesIO(zf.read(member)), encoding='utf-8', newline='')
+                source_file = f"{self.path}{MEMBER_SEP}{member}"
+                return loader.parse_questions_csv(text, PurePosixPath(member).stem, source_file)
+
+            def parse_xml(member: str) -> SQLCommand:
+                member_path = PurePosixPath(member)
+                root = ET.fromstring(zf.read(member))
+                return loader.parse_command_xml(root, member_path.stem, member_path.parent.name)
+
+            # ZipFile serializa las lecturas del archivo; la descompresión y el
+            # parseo de cada miembro se reparten entre hilos
+            workers = min(self.MAX_WORKERS, os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                csv_results = pool.map(self._guard(parse_csv, []), manifest['questions'])
+                xml_results = pool.map(self._guard(parse_xml, None), manifest['commands'])
+                questions = [q for batch in csv_results for q in batch]
+                commands = [c for c in xml_results if c is not None]
+
+        return {'manifest': manifest, 'questions': questions, 'commands': commands}
+
+    def _guard(self, func, default):
+        def run(member: str):
+            try:
+                return func(member)
+            except Exception as e:
+                print(f"Error loading {member} from {self.path.name}: {e}")
+                return default
+        return run
+
+
+def find_packs(directory: Path) -> List[Path]:
+    if not directory.exists():
+        return []
+    return sorted(directory.glob(f'*{PACK_SUFFIX}'))
+
+
+# ==== Construcción ====
+
+def build_pack(data_dir: Path, out_path: Path, name: str, version: str = '') -> Path:
+    """
+    Empaqueta data/questions/*.csv y data/commands/**/*.xml en un .dp700pack.
+    Se escribe a un temporal y se renombra, así la app nunca ve un pack a medias.
+    """
+    data_dir, out_path = Path(data_dir), Path(out_path)
+    csv_files = sorted((data_dir / 'questions').glob('*.csv'))
+    xml_files = sorted((data_dir / 'commands').rglob('*.xml'))
+    members = [(p, p.relative_to(data_dir).as_posix()) for p in csv_files + xml_files]
+    manifest = {
+        'format': PACK_FORMAT,
+        'name': name,
+        'version': version,
+        'questions': [m for p, m in members if p.suffix == '.csv'],
+        'commands': [m for p, m in members if p.suffix == '.xml'],
+    }
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(out_path.suffix + '.tmp')
+    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2, ensure_ascii=False))
+        for path, member in members:
+            zf.write(path, member)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def main(argv=None):
+    """python -m src.services.content_pack data storage/dp700-core.dp700pack --name dp700-core"""
+    parser = argparse.ArgumentParser(description="Crea un paquete de contenido .dp700pack")
+    parser.add_argument('data_dir', type=Path)
+    parser.add_argument('output', type=Path)
+    parser.add_argument('--name', default=None)
+    parser.add_argument('--version', default='')
+    args = parser.parse_args(argv)
+
+    output = args.output if args.output.suffix == PACK_SUFFIX else args.output.with_suffix(PACK_SUFFIX)
+    path = build_pack(args.data_dir, output, args.name or output.stem, args.version)
+    with zipfile.ZipFile(path) as zf:
+        print(f"{path}: {len(zf.namelist()) - 1} archivos, {path.stat().st_size / 1024:.0f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
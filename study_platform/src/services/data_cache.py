@@ -0,0 +1,79 @@
+"""
+Caché en disco de estructuras derivadas de los datos (índices, agregados...)
+Cada entrada se guarda con una huella de sus fuentes y se descarta si no coincide
+"""
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from config import Config
+
+
+class DataCache:
+    """Guarda artefactos serializados en storage/cache validados por huella"""
+
+    # Subir al cambiar el formato de cualquier artefacto cacheado
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Config.CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, name: str) -> Path:
+        return self.cache_dir / f'{name}.pickle'
+
+    def load(self, name: str, fingerprint: str) -> Optional[Any]:
+        """Retorna el artefacto si existe y su huella coincide, si no None"""
+        path = self._path(name)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            if entry.get('version') != self.CACHE_VERSION or entry.get('fingerprint') != fingerprint:
+                return None
+            return entry.get('payload')
+        except Exception as e:
+            print(f"Error loading cache '{name}': {e}")
+            return None
+
+    def save(self, name: str, fingerprint: str, payload: Any):
+        """Escribe el artefacto de forma atómica (archivo temporal + rename)"""
+        path = self._path(name)
+        tmp_path = path.with_suffix('.tmp')
+        entry = {'version': self.CACHE_VERSION, 'fingerprint': fingerprint, 'payload': payload}
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error saving cache '{name}': {e}")
+
+    def invalidate(self, name: str):
+        try:
+            self._path(name).unlink()
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def fingerprint_files(paths: Iterable[Path]) -> str:
+        """Huella barata de un conjunto de archivos (ruta, tamaño y mtime)"""
+        digest = hashlib.sha1()
+        for path in sorted(str(p) for p in paths):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f'{path}|{st.st_size}|{st.st_mtime_ns}\n'.encode('utf-8'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def fingerprint_texts(texts: Iterable[str]) -> str:
+        """Huella del contenido (independiente de métricas y fechas de modificación)"""
+        digest = hashlib.sha1()
+        for text in texts:
+            digest.update(text.encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
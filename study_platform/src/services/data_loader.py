@@ -2,13 +2,24 @@
 Servicio para cargar datos desde CSV y XML
 """
 import csv
+import hashlib
+import time
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import json
 
 from config import Config
-from src.models.question import Question, SQLCommand, DifficultyLevel
+from src.utils.tracing import traced
+from src.models.question import Question, SQLCommand, CommandPart, DifficultyLevel
+from src.core.event_bus import event_bus, QuestionAnswered, MetricsFlushed
+from src.core.file_store import CounterDelta, locked_update_csv, parse_counts
+from src.services.aggregates import AggregatesService
+from src.services.content_pack import ContentPack, find_packs, is_pack_member, save_pack_metrics, split_member
+from src.services.profiles import MetricsShards
+from src.services.question_index import (
+    BodyStore, QuestionIndex, parse_body, parse_difficulty
+)
 
 
 class DataLoader:
@@ -17,7 +28,22 @@ class DataLoader:
     def __init__(self):
         self.questions_dir = Config.DATA_DIR / 'questions'
         self.commands_dir = Config.DATA_DIR / 'commands'
+        self.packs_dir = Config.PACKS_DIR
+        self._pack_content = None
+        self.pack_fingerprints: Dict[str, str] = {}  # ruta del pack -> hash del archivo
+        self.aggregates = None
+        self.last_flush_ms = None
+        # Carga en dos niveles: índice por CSV + cuerpos bajo demanda (LRU)
+        self.body_store = BodyStore()
+        self.indexes: Dict[str, QuestionIndex] = {}
+        # Métricas del perfil activo (None: se escriben en los CSV, modo de un solo usuario)
+        self.metrics_shards: Optional[MetricsShards] = None
+        self.profile_id: Optional[str] = None
+        # Preguntas con métricas sin escribir, agrupadas por archivo CSV, con sus
+        # valores antes de la primera respuesta sin escribir (se escribe el delta)
+        self._pending: Dict[str, Dict[str, Tuple[Question, Tuple[int, int]]]] = {}
     
+    @traced(cat='xml')
     def load_all_commands(self) -> List[SQLCommand]:
         """Carga todos los comandos SQL desde XML"""
         commands = []
@@ -32,15 +58,43 @@ class DataLoader:
             except Exception as e:
                 print(f"Error loading {xml_file.name}: {e}")
         
-        return commands
+        return self._merge(commands, self.load_packs()[1])
     
+    def load_packs(self):
+        """(preguntas, comandos) de los .dp700pack de Config.PACKS_DIR (se leen una vez)"""
+        if self._pack_content is None:
+            questions, commands = [], []
+            self.pack_fingerprints = {}
+            for pack_path in find_packs(self.packs_dir):
+                try:
+                    pack = ContentPack(pack_path)
+                    pack_questions, pack_commands = pack.load(self)
+                    self.pack_fingerprints[str(pack_path)] = pack.fingerprint
+                    questions.extend(pack_questions)
+                    commands.extend(pack_commands)
+                except Exception as e:
+                    print(f"Error loading pack {pack_path.name}: {e}")
+            self._pack_content = (questions, commands)
+        return self._pack_content
+    
+    @staticmethod
+    def _merge(items: list, extra: list) -> list:
+        """Añade los elementos de los packs cuyo id no esté ya cargado (las carpetas tienen prioridad)"""
+        if not extra:
+            return items
+        seen = {item.id for item in items}
+        items.extend(item for item in extra if item.id not in seen)
+        return items
+    
+    @traced(cat='xml')
     def load_command_from_xml(self, xml_path: Path) -> SQLCommand:
         """Carga un comando desde archivo XML"""
         tree = ET.parse(xml_path)
-        root = tree.getroot()
-        
+        return self.parse_command_xml(tree.getroot(), xml_path.stem, xml_path.parent.name)
+    
+    def parse_command_xml(self, root: ET.Element, command_id: str, parent_folder: str) -> SQLCommand:
+        """Construye el comando desde el XML ya parseado (archivo suelto o miembro de un pack)"""
         # Extraer información
-        command_id = xml_path.stem
         title = root.find('title').text if root.find('title') is not None else command_id
         description = root.find('description').text if root.find('description') is not None else ""
         
@@ -49,9 +103,6 @@ class DataLoader:
         full_command = full_command_element.text.strip() if full_command_element is not None and full_command_element.text else ""
         
         parts = []
-        explanation_parts = []
-        hints = []
-        keywords = []
         
         for part in root.findall('.//part'):
             # Leer texto del tag hijo <text> o fallback al atributo 'text'
@@ -61,31 +112,19 @@ class DataLoader:
             else:
                 part_text = part.get('text', '')
             
-            parts.append(part_text)
-            
             # Leer descripción del tag hijo <desc> o atributo 'description'
             desc_elem = part.find('desc')
             if desc_elem is not None and desc_elem.text:
                 desc = desc_elem.text.strip()
             else:
                 desc = part.get('description', '')
-                
-            if desc:
-                hints.append(desc)
-            
-            # Guardamos la parte con su explicación
-            explanation_parts.append({
-                'fragment': part_text,
-                'explanation': desc
-            })
             
-            if part_text:
-                # Añadir palabras clave relevantes de los fragmentos
-                keywords.append(part_text)
+            # Guardamos la parte con su explicación (de ella se derivan pistas y palabras clave)
+            parts.append(CommandPart(part_text, desc))
         
         # Si no había tag <full>, construirlo desde las partes
         if not full_command:
-            full_command = ' '.join(parts).strip()
+            full_command = ' '.join(p.fragment for p in parts).strip()
         
         # Determinar categoría basándose en la carpeta padre
         folder_category_map = {
@@ -100,7 +139,6 @@ class DataLoader:
             'Microsoft_Fabric_Command_Library': 'Fabric Commands'
         }
         
-        parent_folder = xml_path.parent.name
         category = folder_category_map.get(parent_folder, self._detect_category(full_command))
         
         return SQLCommand(
@@ -110,148 +148,277 @@ class DataLoader:
             category=category,
             difficulty=DifficultyLevel.MEDIUM,
             full_command=full_command,
-            hints=hints,
-            keywords=keywords,
-            explanation_parts=explanation_parts
+            parts=tuple(parts)
         )
     
-    def load_all_questions(self) -> List[Question]:
-        """Carga todas las preguntas desde CSV"""
+    @traced(cat='csv')
+    def load_all_questions(self, lazy: bool = None) -> List[Question]:
+        """
+        Carga todas las preguntas desde CSV.
+        Con `lazy` (por defecto Config.LAZY_QUESTION_BODIES) solo se indexan ids,
+        secciones y métricas; el texto se lee al mostrar cada pregunta.
+        """
+        if lazy is None:
+            lazy = Config.LAZY_QUESTION_BODIES
         questions = []
-        csv_files = self.questions_dir.glob('dp700_*.csv')
+        # Orden estable: los índices de búsqueda guardan posiciones de preguntas
+        csv_files = sorted(self.questions_dir.glob('dp700_*.csv'))
         
         for csv_file in csv_files:
             try:
-                module_questions = self.load_questions_from_csv(csv_file)
+                if lazy:
+                    index = QuestionIndex(csv_file, self.body_store)
+                    self.indexes[index.path] = index
+                    module_questions = index.questions()
+                else:
+                    module_questions = self.load_questions_from_csv(csv_file)
                 questions.extend(module_questions)
             except Exception as e:
                 print(f"Error loading {csv_file.name}: {e}")
         
-        return questions
+        return self._merge(questions, self.load_packs()[0])
     
+    def content_fingerprint(self, questions: Optional[List[Question]] = None):
+        """
+        Huella del contenido de las preguntas (sin métricas), o None si no hay índices:
+        CSV indexados, packs cargados y, con `questions`, el orden final de los ids
+        (el índice de búsqueda guarda posiciones).
+        """
+        if not self.indexes:
+            return None
+        parts = [f"{path}:{idx.content_hash}" for path, idx in sorted(self.indexes.items())]
+        parts += [f"{path}:{digest}" for path, digest in sorted(self.pack_fingerprints.items())]
+        if questions is not None:
+            parts.append(hashlib.sha1('\n'.join(q.id for q in questions).encode('utf-8')).hexdigest())
+        return '|'.join(parts)
+    
+    @traced(cat='csv')
     def load_questions_from_csv(self, csv_path: Path) -> List[Question]:
         """Carga preguntas desde un archivo CSV con métricas"""
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            return self.parse_questions_csv(f, csv_path.stem, str(csv_path))
+    
+    def parse_questions_csv(self, f, stem: str, source_file: str) -> List[Question]:
+        """Preguntas de un CSV abierto en modo texto (archivo suelto o miembro de un pack)"""
         questions = []
         
         # Extraer nombre del módulo del archivo
-        module_name = csv_path.stem.replace('dp700_', '').replace('_', ' ').title()
+        module_name = stem.replace('dp700_', '').replace('_', ' ').title()
         
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter=',')
-            
-            for idx, row in enumerate(reader):
-                try:
-                    # Crear ID único
-                    question_id = f"{csv_path.stem}_q{idx+1}"
-                    
-                    # Extraer opciones desde campo 'options' separado por ;
-                    options_str = row.get('options', '')
-                    if options_str:
-                        options = [opt.strip() for opt in options_str.split(';') if opt.strip()]
-                    else:
-                        options = []
-                    
-                    # Respuesta correcta (puede ser múltiple: "1;2;3") -> Convertir a 0-based index
-                    correct_str = row.get('correct', '1') # Default a 1 si vacío para evitar crash
-                    if ';' in correct_str:
-                        # Múltiples respuestas, tomar la primera
-                        val = int(correct_str.split(';')[0])
-                    else:
-                        val = int(correct_str) if correct_str.strip().isdigit() else 1
-                    
-                    correct_answer = max(0, val - 1) # Asegurar >= 0
-                    
-                    # Explicación/notas
-                    explanation = row.get('notas', row.get('second_explanation', ''))
-                    
-                    # PARSEAR MÉTRICAS EXISTENTES
-                    metrics_str = row.get('metrics', '0;0')
-                    times_correct, times_incorrect = self._parse_metrics(metrics_str)
-                    times_seen = times_correct + times_incorrect
-                    
-                    question = Question(
-                        id=question_id,
-                        module=module_name,
-                        section=row.get('section', 'General'),
-                        difficulty=self._parse_difficulty(row.get('difficulty', 'medium')),
-                        question_text=row.get('question', ''),
-                        options=options,
-                        correct_answer=correct_answer,
-                        explanation=explanation,
-                        tags=row.get('section', 'General').split(','),
-                        # Métricas del CSV
-                        times_seen=times_seen,
-                        times_correct=times_correct,
-                        times_incorrect=times_incorrect,
-                        source_file=str(csv_path) # Guardamos ruta
-                    )
-                    
-                    if not question.id: # Validar que se creó bien
-                         continue
-                         
-                    questions.append(question)
-                    
-                except Exception as e:
-                    print(f"Error parsing row {idx} in {csv_path}: {e}")
-                    continue
+        reader = csv.DictReader(f, delimiter=',')
+        
+        for idx, row in enumerate(reader):
+            try:
+                # Crear ID único
+                question_id = f"{stem}_q{idx+1}"
+                
+                # Opciones, respuesta correcta (0-based) y explicación
+                body = parse_body(row)
+                
+                # PARSEAR MÉTRICAS EXISTENTES
+                metrics_str = row.get('metrics', '0;0')
+                times_correct, times_incorrect = parse_counts(metrics_str)
+                times_seen = times_correct + times_incorrect
+                
+                question = Question(
+                    id=question_id,
+                    module=module_name,
+                    section=row.get('section', 'General'),
+                    difficulty=self._parse_difficulty(row.get('difficulty', 'medium')),
+                    question_text=body.question_text,
+                    options=body.options,
+                    correct_answer=body.correct_answer,
+                    explanation=body.explanation,
+                    tags=row.get('section', 'General').split(','),
+                    # Métricas del CSV
+                    times_seen=times_seen,
+                    times_correct=times_correct,
+                    times_incorrect=times_incorrect,
+                    source_file=source_file # Guardamos ruta
+                )
+                
+                if not question.id: # Validar que se creó bien
+                     continue
+                     
+                questions.append(question)
+                
+            except Exception as e:
+                print(f"Error parsing row {idx} in {source_file}: {e}")
+                continue
         
         return questions
 
-    def update_question_stats(self, question: Question):
-        """Actualiza las métricas de una pregunta en su archivo CSV original"""
-        if not question.source_file:
+    @traced(cat='cache')
+    def load_aggregates(self, questions: List[Question]) -> AggregatesService:
+        """Agregados por módulo/sección (desde la caché si las métricas no cambiaron)"""
+        if self.metrics_shards is not None:
+            self.aggregates = AggregatesService.load_or_build(
+                questions, cache_name=f'aggregates_{self.profile_id}', sources=self.metrics_shards.paths
+            )
+        else:
+            self.aggregates = AggregatesService.load_or_build(questions)
+        return self.aggregates
+
+    @traced(cat='json')
+    def use_profile(self, profile_id: str, shards: MetricsShards, questions: List[Question],
+                    seed: bool = False):
+        """
+        Activa las métricas de un perfil sobre las preguntas ya cargadas (sin releer el
+        contenido). Las respuestas pendientes se escriben antes en el perfil anterior.
+        Con `seed` el perfil adopta como punto de partida las métricas actuales.
+        """
+        self.flush_pending()
+        self.metrics_shards = shards
+        self.profile_id = profile_id
+        if seed:
+            shards.seed(questions)
+        # También tras sembrar: las fuentes que ya tenían fragmento conservan sus métricas
+        shards.apply(questions)
+        if self.aggregates is not None:
+            self.load_aggregates(questions)
+
+    def record_answer(self, question: Question, is_correct: bool):
+        """
+        Registra una respuesta: métricas de la pregunta y agregados (O(1)).
+        La escritura al CSV se difiere hasta flush_pending().
+        """
+        if question.source_file:
+            self._pending.setdefault(question.source_file, {}).setdefault(
+                question.id, (question, (question.times_correct, question.times_incorrect))
+            )
+        else:
             print("Warning: Question has no source file!")
-            return
 
-        # Leemos todo el archivo, modificamos la línea y reescribimos
-        # Esto no es eficiente para DB grandes, pero para CSV pequeños está bien
-        rows = []
-        target_idx = -1
-        
-        # El ID es "filename_q{idx}". Extraemos el índice original
-        try:
-            # Asumimos que el ID termina en "_q123"
-            parts = question.id.split('_q')
-            if len(parts) < 2: return
-            target_idx = int(parts[-1]) - 1 # 0-based index del CSV original
-        except:
+        if self.aggregates is not None:
+            self.aggregates.record_answer(question, is_correct)
+        else:
+            if is_correct:
+                question.times_correct += 1
+            else:
+                question.times_incorrect += 1
+            question.times_seen += 1
+        event_bus.publish(QuestionAnswered(question, is_correct))
+
+    def close(self):
+        """Escribe las métricas pendientes y libera los manejadores de lectura de los índices"""
+        self.flush_pending()
+        for index in self.indexes.values():
+            index.close()
+
+    @property
+    def pending_writes(self) -> int:
+        return sum(len(questions) for questions in self._pending.values())
+
+    @traced(cat='csv')
+    def flush_pending(self):
+        """Escribe las métricas pendientes: una reescritura por archivo CSV modificado"""
+        if not self._pending:
             return
+        pending = self.take_pending()
+        written, count = self.write_pending(pending)
+        self.apply_merged(pending)
+        if written:
+            event_bus.publish(MetricsFlushed(tuple(written), count))
+
+    def take_pending(self) -> Dict[str, Dict[str, Tuple[Question, CounterDelta]]]:
+        """
+        Retira el lote de métricas pendientes (para escribirlo fuera del hilo principal).
+        Cada pregunta lleva el delta a escribir, fijado en este momento.
+        """
+        pending, self._pending = self._pending, {}
+        return {
+            source_file: {
+                qid: (question, CounterDelta(qid, (question.times_correct, question.times_incorrect), baseline))
+                for qid, (question, baseline) in questions.items()
+            }
+            for source_file, questions in pending.items()
+        }
+
+    def write_pending(self, pending: Dict[str, Dict[str, Tuple[Question, CounterDelta]]]):
+        """
+        Escribe un lote retirado con take_pending(); los archivos que fallan vuelven a
+        la cola. Retorna (archivos escritos, preguntas escritas) sin publicar eventos.
+        """
+        started = time.perf_counter()
+        written = []
+        count = 0
+        for source_file, entries in pending.items():
+            if self._write_metrics(source_file, [delta for _, delta in entries.values()]):
+                written.append(source_file)
+                count += len(entries)
+            else:
+                # Se reintentará en el próximo flush (desde los valores anteriores al lote)
+                queue = self._pending.setdefault(source_file, {})
+                for qid, (question, delta) in entries.items():
+                    queue[qid] = (question, delta.baseline)
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        return written, count
+
+    def apply_merged(self, pending: Dict[str, Dict[str, Tuple[Question, CounterDelta]]]):
+        """
+        Tras write_pending (en el hilo principal): incorpora a las preguntas en memoria
+        las respuestas que otros procesos escribieron en los mismos archivos.
+        """
+        for entries in pending.values():
+            for question, delta in entries.values():
+                if delta.merged is None or delta.merged == delta.snapshot:
+                    continue
+                old_correct, old_incorrect = question.times_correct, question.times_incorrect
+                question.times_correct = max(0, old_correct + delta.merged[0] - delta.snapshot[0])
+                question.times_incorrect = max(0, old_incorrect + delta.merged[1] - delta.snapshot[1])
+                question.times_seen = question.times_correct + question.times_incorrect
+                # Las respuestas posteriores al lote ya tienen su propio valor de partida
+                queued = self._pending.get(question.source_file, {}).get(question.id)
+                if queued is not None:
+                    baseline = queued[1]
+                    self._pending[question.source_file][question.id] = (question, (
+                        baseline[0] + question.times_correct - old_correct,
+                        baseline[1] + question.times_incorrect - old_incorrect,
+                    ))
+                if self.aggregates is not None:
+                    self.aggregates.apply_change(question, old_correct, old_incorrect)
+
+    @traced(cat='csv')
+    def _write_metrics(self, source_file: str, deltas: List[CounterDelta]) -> bool:
+        """
+        Fusiona las métricas de varias preguntas de un mismo archivo en una pasada,
+        bajo bloqueo entre procesos (ver src.core.file_store)
+        """
+        updates = {}
+        for delta in deltas:
+            # El ID es "filename_q{idx}": el índice es la fila (1-based) del CSV original
+            parts = delta.key.split('_q')
+            if len(parts) < 2 or not parts[-1].isdigit():
+                continue
+            updates[int(parts[-1]) - 1] = delta
+        if not updates:
+            return True
+        if self.metrics_shards is not None:
+            # Con perfiles el contenido es de solo lectura
+            return self.metrics_shards.write(source_file, deltas)
+        if is_pack_member(source_file):
+            return save_pack_metrics(split_member(source_file)[0], deltas)
+
+        def merge_rows(fieldnames, rows):
+            for target_idx, delta in updates.items():
+                if 0 <= target_idx < len(rows):
+                    correct, incorrect = delta.merge(parse_counts(rows[target_idx].get('metrics')))
+                    rows[target_idx]['metrics'] = f"{correct};{incorrect}"
 
         try:
-            with open(question.source_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                fieldnames = reader.fieldnames
-                rows = list(reader)
-            
-            if 0 <= target_idx < len(rows):
-                # Actualizar métricas: "correct;incorrect"
-                new_metrics = f"{question.times_correct};{question.times_incorrect}"
-                rows[target_idx]['metrics'] = new_metrics
-                
-                # Escribir de vuelta
-                with open(question.source_file, 'w', encoding='utf-8', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(rows)
-                    
+            # El índice suelta su manejador de lectura antes del os.replace y, con el
+            # archivo reescrito, recalcula los offsets (y lo reabre)
+            index = self.indexes.get(source_file)
+            if index is not None:
+                index.close()
+            locked_update_csv(source_file, merge_rows)
+            if index is not None:
+                index.rescan_offsets()
+            return True
         except Exception as e:
-            print(f"Error updating stats for {question.id}: {e}")
-    
-    def _parse_metrics(self, metrics_str: str) -> tuple:
-        """Parsea el campo metrics del CSV (formato: correcto;incorrecto)"""
-        try:
-            if not metrics_str or metrics_str.strip() == '':
-                return (0, 0)
-            
-            parts = metrics_str.split(';')
-            if len(parts) >= 2:
-                correct = int(parts[0]) if parts[0].isdigit() else 0
-                incorrect = int(parts[1]) if parts[1].isdigit() else 0
-                return (correct, incorrect)
-            return (0, 0)
-        except:
-            return (0, 0)
-    
+            print(f"Error updating stats in {source_file}: {e}")
+            return False
+
     def _detect_category(self, command: str) -> str:
         """Detecta la categoría del comando SQL"""
         command_upper = command.upper()
@@ -267,12 +434,7 @@ class DataLoader:
     
     def _parse_difficulty(self, diff_str: str) -> DifficultyLevel:
         """Parsea nivel de dificultad"""
-        diff_lower = diff_str.lower()
-        if 'hard' in diff_lower or 'difícil' in diff_lower:
-            return DifficultyLevel.HARD
-        elif 'easy' in diff_lower or 'fácil' in diff_lower:
-            return DifficultyLevel.EASY
-        return DifficultyLevel.MEDIUM
+        return parse_difficulty(diff_str)
     
     def get_modules_summary(self) -> Dict[str, int]:
         """Retorna resumen de módulos disponibles"""
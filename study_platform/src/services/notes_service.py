@@ -1,51 +1,160 @@
 import json
+import shutil
+from array import array
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
-from config import Config
+from typing import Iterable, List, Dict, Optional
+from src.utils.tracing import traced
 
 class NotesService:
-    def __init__(self):
-        self.notes_file = Config.DATA_DIR / 'user_notes.json'
-        # Ensure data dir exists
+    """
+    Notas en un JSONL de solo anexado (una nota por línea, en orden de creación)
+    más un índice binario de offsets (uint64 por nota) para leer las N más
+    recientes sin parsear el archivo completo.
+    Las notas son del estudiante: viven en storage/ con su progreso, no en data/
+    (el contenido); `legacy_files` son las notas anteriores que se importan.
+    """
+
+    def __init__(self, directory: Path, legacy_files: Iterable[Path] = ()):
+        self.notes_file = Path(directory) / 'user_notes.jsonl'
+        self.index_file = Path(directory) / 'user_notes.idx'
+        self.legacy_files = [Path(p) for p in legacy_files]
         self.notes_file.parent.mkdir(parents=True, exist_ok=True)
-        
-    def get_notes(self) -> List[Dict]:
-        """Loads notes sorted by date (newest first)"""
+
+        self._offsets = array('Q')
+        self._migrate_legacy()
+        self._load_index()
+
+    # ==== Índice ====
+
+    def _migrate_legacy(self):
+        """
+        Importa la primera vez las notas anteriores: un JSONL se copia tal cual y el
+        antiguo user_notes.json (lista completa) se convierte. Gana el primero que exista.
+        """
+        if self.notes_file.exists():
+            return
+        legacy = next((p for p in self.legacy_files if p.exists()), None)
+        if legacy is None:
+            return
+        try:
+            if legacy.suffix == '.jsonl':
+                shutil.copy2(legacy, self.notes_file)
+                return
+            with open(legacy, 'r', encoding='utf-8') as f:
+                notes = json.load(f)
+            notes.sort(key=lambda x: x.get('timestamp', ''))
+            with open(self.notes_file, 'wb') as f:
+                for note in notes:
+                    f.write(self._encode(note))
+        except Exception as e:
+            print(f"Error migrating notes: {e}")
+
+    def _load_index(self):
+        """Carga el índice de offsets; lo reconstruye si no cuadra con el JSONL"""
+        self._offsets = array('Q')
         if not self.notes_file.exists():
+            return
+        try:
+            if self.index_file.exists():
+                with open(self.index_file, 'rb') as f:
+                    self._offsets.frombytes(f.read())
+            if not self._index_matches():
+                self._rebuild_index()
+        except Exception as e:
+            print(f"Error loading notes index: {e}")
+            self._rebuild_index()
+
+    def _index_matches(self) -> bool:
+        """Comprueba que la última entrada del índice termina justo al final del JSONL"""
+        size = self.notes_file.stat().st_size
+        if not self._offsets:
+            return size == 0
+        last = self._offsets[-1]
+        if last >= size:
+            return False
+        with open(self.notes_file, 'rb') as f:
+            f.seek(last)
+            f.readline()
+            return f.tell() == size
+
+    @traced(cat='notes')
+    def _rebuild_index(self):
+        """Recorre el JSONL línea a línea (sin parsear JSON) para regenerar los offsets"""
+        offsets = array('Q')
+        try:
+            with open(self.notes_file, 'rb') as f:
+                pos = 0
+                for line in f:
+                    if line.strip():
+                        offsets.append(pos)
+                    pos += len(line)
+            with open(self.index_file, 'wb') as f:
+                f.write(offsets.tobytes())
+        except Exception as e:
+            print(f"Error rebuilding notes index: {e}")
+        self._offsets = offsets
+
+    @staticmethod
+    def _encode(note: Dict) -> bytes:
+        return (json.dumps(note, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+    # ==== Lectura ====
+
+    def count(self) -> int:
+        return len(self._offsets)
+
+    @traced(cat='notes')
+    def get_notes(self, limit: Optional[int] = None, start: int = 0) -> List[Dict]:
+        """Loads notes sorted by date (newest first), `limit` notes from position `start`"""
+        total = len(self._offsets)
+        first = total - 1 - start
+        if first < 0:
             return []
-            
+        last = -1 if limit is None else max(first - limit, -1)
+
+        notes = []
         try:
-            with open(self.notes_file, 'r', encoding='utf-8') as f:
-                notes = json.load(f)
-            # Sort by timestamp descending
-            notes.sort(key=lambda x: x['timestamp'], reverse=True)
-            return notes
+            with open(self.notes_file, 'rb') as f:
+                for i in range(first, last, -1):
+                    f.seek(self._offsets[i])
+                    try:
+                        notes.append(json.loads(f.readline()))
+                    except json.JSONDecodeError:
+                        continue
         except Exception as e:
             print(f"Error loading notes: {e}")
-            return []
-            
-    def add_note(self, content: str):
-        """Adds a new note with current timestamp"""
-        notes = self.get_notes()
-        
+        return notes
+
+    # ==== Escritura ====
+
+    @traced(cat='notes')
+    def add_note(self, content: str) -> Dict:
+        """Adds a new note with current timestamp (un append al JSONL y 8 bytes al índice)"""
+        now = datetime.now()
         new_note = {
-            'timestamp': datetime.now().isoformat(),
-            'display_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'timestamp': now.isoformat(),
+            'display_time': now.strftime("%Y-%m-%d %H:%M:%S"),
             'content': content
         }
-        
-        notes.append(new_note)
-        
+
         try:
-            with open(self.notes_file, 'w', encoding='utf-8') as f:
-                json.dump(notes, f, indent=4, ensure_ascii=False)
+            with open(self.notes_file, 'ab') as f:
+                offset = f.tell()
+                f.write(self._encode(new_note))
+            with open(self.index_file, 'ab') as f:
+                f.write(array('Q', [offset]).tobytes())
+            self._offsets.append(offset)
         except Exception as e:
             print(f"Error saving note: {e}")
-            
+        return new_note
+
+    @traced(cat='notes')
     def clear_notes(self):
         try:
-            with open(self.notes_file, 'w', encoding='utf-8') as f:
-                json.dump([], f)
-        except:
-            pass
+            for path in (self.notes_file, self.index_file):
+                with open(path, 'wb'):
+                    pass
+            self._offsets = array('Q')
+        except Exception as e:
+            print(f"Error clearing notes: {e}")
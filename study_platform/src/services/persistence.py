@@ -2,79 +2,207 @@
 Servicio de persistencia de datos de usuario
 """
 import json
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, List, Optional
 
 from config import Config
+from src.utils.tracing import traced
+from src.core.achievement_system import AchievementRule
+from src.core.event_bus import event_bus, AchievementUnlocked, CommandAttempted, SessionEnded
+from src.core.stats_tracker import STATS_FILENAME, StatsEngine
 from src.models.user_stats import UserStatistics
+from src.services.response_times import QUESTION, ResponseTimes
+
+
+def user_statistics(stats: dict) -> UserStatistics:
+    """Vista UserStatistics de las estadísticas unificadas (listas y métricas compartidas)"""
+    mt = stats['matrix_trainer']
+    ms = stats['module_study']
+    return UserStatistics(
+        total_study_time_minutes=stats['total_study_time_minutes'],
+        total_sessions=stats['pomodoro']['completed_sessions'],
+        current_streak_days=stats['study_streak']['current'],
+        longest_streak_days=stats['study_streak']['longest'],
+        last_study_date=stats['study_streak']['last_day'] or '',
+        sql_commands_completed=mt['commands_completed'],
+        sql_total_attempts=mt['total_attempts'],
+        sql_total_errors=mt['total_errors'],
+        sql_current_streak=mt['current_streak'],
+        sql_best_streak=mt['longest_streak'],
+        sql_completed_ids=mt['completed_ids'],
+        quiz_questions_answered=ms['questions_answered'],
+        quiz_correct_answers=ms['correct_answers'],
+        quiz_current_streak=ms['current_streak'],
+        quiz_best_streak=ms['longest_streak'],
+        achievements_unlocked=[a['id'] for a in stats['achievements']],
+        total_xp=stats['total_xp'],
+        sql_command_metrics=mt['command_metrics'],
+    )
 
 
 class PersistenceService:
-    """Maneja la persistencia de datos de usuario"""
+    """
+    Maneja la persistencia de datos de usuario.
+    Las estadísticas viven en el user_stats.json del perfil, el mismo que escriben
+    las apps clásicas (src/core/stats_tracker.py); aquí se exponen como
+    UserStatistics. Al guardar, los cambios se reaplican sobre la versión en disco
+    bajo bloqueo, así otro proceso que use el mismo perfil no pierde sus incrementos.
+    `legacy_sources`: archivos anteriores a migrar (por defecto el user_progress.json del perfil).
+    """
+    
+    def __init__(self, profile_dir: Optional[Path] = None, legacy_sources: Optional[Iterable[Path]] = None):
+        self.last_save_ms: Optional[float] = None
+        self.use_profile(profile_dir, legacy_sources)
     
-    def __init__(self):
-        self.user_stats_file = Config.STORAGE_DIR / 'user_progress.json'
+    def use_profile(self, profile_dir: Optional[Path] = None, legacy_sources: Optional[Iterable[Path]] = None):
+        """Apunta a los archivos de un perfil (None: archivos globales de storage/)"""
+        if getattr(self, 'response_times', None) is not None:
+            self.commit()  # Los cambios sin guardar pertenecen al perfil anterior
+        self.storage_dir = Path(profile_dir) if profile_dir else Config.STORAGE_DIR
+        self.user_stats_file = self.storage_dir / STATS_FILENAME
+        self.sessions_ledger_file = self.storage_dir / 'study_sessions.jsonl'
+        self.response_times = ResponseTimes(self.storage_dir / 'response_times.json')
+        if legacy_sources is None:
+            legacy_sources = [self.storage_dir / 'user_progress.json']
+        self.legacy_sources = list(legacy_sources)
+        self._engine: Optional[StatsEngine] = None
+        self._user_stats: Optional[UserStatistics] = None
         self.ensure_storage()
     
     def ensure_storage(self):
         """Asegura que el directorio de storage exista"""
-        Config.STORAGE_DIR.mkdir(exist_ok=True)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def engine(self) -> StatsEngine:
+        """Motor de estadísticas del perfil (se carga, y migra, la primera vez)"""
+        if self._engine is None:
+            self._engine = StatsEngine(self.user_stats_file, self.legacy_sources)
+        return self._engine
     
+    @traced(cat='json')
     def load_user_stats(self) -> UserStatistics:
-        """Carga estadísticas de usuario"""
-        if self.user_stats_file.exists():
-            try:
-                with open(self.user_stats_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                return UserStatistics.from_dict(data)
-            except Exception as e:
-                print(f"Error loading user stats: {e}")
-                return UserStatistics()
-        
-        return UserStatistics()
+        """Carga estadísticas de usuario (relee si otro proceso las modificó)"""
+        self.engine.reload_if_changed()
+        return user_statistics(self.engine.stats)
     
-    def save_user_stats(self, stats: UserStatistics):
-        """Guarda estadísticas de usuario"""
-        try:
-            with open(self.user_stats_file, 'w', encoding='utf-8') as f:
-                json.dump(stats.to_dict(), f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving user stats: {e}")
+    def get_user_stats(self) -> UserStatistics:
+        """Estadísticas en memoria (se leen de disco solo la primera vez)"""
+        if self._user_stats is None:
+            self._user_stats = user_statistics(self.engine.stats)
+        return self._user_stats
+
+    def _refresh(self) -> UserStatistics:
+        """Se actualiza en el sitio: vistas y eventos guardan la referencia"""
+        stats = self.get_user_stats()
+        stats.__dict__.update(user_statistics(self.engine.stats).__dict__)
+        return stats
+
+    def _publish_unlocked(self, unlocked: List[AchievementRule]):
+        for rule in unlocked:
+            event_bus.publish(AchievementUnlocked(rule.id, rule.title, rule.description))
+
+    def _timed(self, save: bool, write):
+        """Ejecuta un cambio midiendo la escritura (si la hay)"""
+        started = time.perf_counter()
+        result = write()
+        if save:
+            self.last_save_ms = (time.perf_counter() - started) * 1000
+        return result
     
-    def migrate_old_stats(self, old_stats_path: Path) -> Optional[UserStatistics]:
-        """Migra estadísticas del sistema anterior"""
-        if not old_stats_path.exists():
-            return None
-        
+    @traced(cat='json')
+    def commit(self):
+        """Relee el archivo bajo bloqueo, reaplica los cambios pendientes y lo reescribe"""
+        self.response_times.flush()
+        if self._engine is None:
+            return
+        self._timed(True, self._engine.commit)
+        self._refresh()
+    
+    @traced(cat='json')
+    def record_study_session(self, phase: str, seconds: float, completed: bool) -> Optional[UserStatistics]:
+        """
+        Registra una fase Pomodoro en el ledger (una línea JSON compacta) y
+        actualiza el tiempo total y el número de sesiones del usuario.
+        phase: 'work' o 'break'. Solo el trabajo cuenta como tiempo de estudio.
+        """
+        entry = {'t': int(time.time()), 'p': phase[0], 's': round(seconds, 1), 'c': int(completed)}
         try:
-            with open(old_stats_path, 'r', encoding='utf-8') as f:
-                old_data = json.load(f)
-            
-            # Mapear datos antiguos al nuevo formato
-            stats = UserStatistics()
-            
-            # Mapeo de campos (adaptable según tu formato anterior)
-            stats.total_study_time_minutes = old_data.get('global_stats', {}).get('total_study_time_minutes', 0)
-            stats.total_sessions = old_data.get('global_stats', {}).get('total_sessions', 0)
-            stats.current_streak_days = old_data.get('achievements', {}).get('current_streak', 0)
-            
-            # SQL Trainer
-            matrix_stats = old_data.get('matrix_trainer', {})
-            stats.sql_commands_completed = matrix_stats.get('commands_completed', 0)
-            stats.sql_total_attempts = matrix_stats.get('total_attempts', 0)
-            stats.sql_total_errors = matrix_stats.get('total_errors', 0)
-            stats.sql_best_streak = matrix_stats.get('best_streak', 0)
-            
-            # Module Study
-            module_stats = old_data.get('module_study', {})
-            stats.quiz_questions_answered = module_stats.get('total_answered', 0)
-            stats.quiz_correct_answers = module_stats.get('correct_answers', 0)
-            
-            # Achievements
-            stats.achievements_unlocked = old_data.get('achievements', {}).get('unlocked', [])
-            
-            return stats
-            
+            with open(self.sessions_ledger_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
         except Exception as e:
-            print(f"Error migrating old stats: {e}")
+            print(f"Error writing session ledger: {e}")
             return None
+
+        if phase == 'work':
+            self._publish_unlocked(self._timed(True, lambda: self.engine.record_study_time(seconds / 60, completed)))
+        stats = self._refresh()
+
+        event_bus.publish(SessionEnded(phase, seconds, completed, stats))
+        return stats
+
+    @traced(cat='json')
+    def record_command_attempt(self, command_id: str, success: bool, save: bool = True,
+                               seconds: Optional[float] = None) -> UserStatistics:
+        """
+        Registra un intento del SQL Trainer: totales, métricas por comando y racha.
+        Con save=False el llamador agrupa los guardados (commit() más tarde).
+        seconds: duración del intento (reloj monótono); va al histograma del comando.
+        """
+        cmd_id = str(command_id)  # Ensure string key
+        if seconds is not None:
+            self.response_times.record_command(cmd_id, seconds)
+        unlocked = self._timed(save, lambda: self.engine.record_command(
+            cmd_id, attempts=1, errors=0 if success else 1, completed=success,
+            time_seconds=seconds, save=save))
+        self._publish_unlocked(unlocked)
+        stats = self._refresh()
+        event_bus.publish(CommandAttempted(cmd_id, success, stats))
+        return stats
+
+    @traced(cat='json')
+    def record_question_answer(self, question, correct: bool, seconds: Optional[float] = None,
+                               save: bool = True) -> UserStatistics:
+        """
+        Registra una respuesta del quiz (totales, racha y logros del perfil).
+        seconds: tiempo hasta responder; va a los histogramas de pregunta y sección.
+        """
+        if seconds is not None and self.response_times.record_question(question, seconds):
+            question.average_time_seconds = self.response_times.get(QUESTION, question.id).mean
+        unlocked = self._timed(save, lambda: self.engine.record_answer(
+            question.module, question.id, correct, save=save))
+        self._publish_unlocked(unlocked)
+        return self._refresh()
+
+    def apply_command_metrics(self, commands: Iterable):
+        """Rellena las métricas de los SQLCommand con las del perfil (intentos, errores y mejor tiempo)"""
+        metrics_by_id = self.get_user_stats().sql_command_metrics
+        for cmd in commands:
+            metrics = metrics_by_id.get(str(cmd.id))
+            if not metrics:
+                continue
+            cmd.attempts = metrics['attempts']
+            cmd.completions = metrics['correct']
+            cmd.average_errors = metrics['errors'] / metrics['attempts'] if metrics['attempts'] else 0.0
+            cmd.fastest_time_seconds = metrics.get('fastest')
+
+    def apply_question_times(self, questions: Iterable):
+        """Rellena average_time_seconds de cada pregunta con la media de su histograma del perfil"""
+        for question in questions:
+            hist = self.response_times.get(QUESTION, question.id)
+            question.average_time_seconds = hist.mean if hist is not None else 0.0
+
+    def iter_study_sessions(self) -> Iterator[dict]:
+        """Recorre el ledger de sesiones en orden cronológico"""
+        if not self.sessions_ledger_file.exists():
+            return
+        with open(self.sessions_ledger_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Línea truncada por un cierre abrupto
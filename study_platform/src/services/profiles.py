@@ -0,0 +1,287 @@
+"""
+Perfiles de estudiante: almacenamiento separado por learner id
+El contenido (CSV, XML, packs) es compartido y de solo lectura; cada perfil tiene
+
+    storage/profiles/<id>/user_stats.json          estadísticas de todas las apps (src/core/stats_tracker.py)
+    storage/profiles/<id>/stats_archive/           sesiones y comandos por mes
+    storage/profiles/<id>/study_sessions.jsonl
+    storage/profiles/<id>/user_notes.jsonl (+.idx)  notas rápidas
+    storage/profiles/<id>/response_times.json      histogramas de tiempos de respuesta
+    storage/profiles/<id>/metrics/<fuente>.json     {question_id: [correctas, incorrectas]}
+
+Las métricas se fragmentan por archivo de contenido: un flush reescribe solo los
+fragmentos de los módulos respondidos, nunca el perfil completo.
+"""
+import json
+import os
+import re
+import shutil
+import unicodedata
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+from src.core.file_store import CounterDelta, file_lock, merge_counters, read_json, write_json
+from src.core.stats_tracker import STATS_FILENAME
+from src.models.question import Question
+from src.services.content_pack import is_pack_member, split_member
+
+
+DEFAULT_PROFILE = 'default'
+
+# Archivos globales anteriores a los perfiles (se copian al perfil por defecto)
+LEGACY_FILES = ('user_progress.json', 'study_sessions.jsonl')
+
+
+def _write_json_atomic(path: Path, data):
+    with file_lock(path):
+        write_json(path, data, separators=(',', ':'))
+
+
+def slugify(name: str) -> str:
+    """Id de carpeta a partir del nombre: minúsculas, sin acentos ni símbolos"""
+    text = unicodedata.normalize('NFKD', name.strip().lower())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    slug = re.sub(r'[^a-z0-9]+', '-', text).strip('-')
+    return slug[:40] or 'perfil'
+
+
+@dataclass
+class Profile:
+    id: str
+    name: str
+    created: str = ''
+    # El perfil migrado hereda las métricas que ya tenían los CSV
+    seed_from_content: bool = False
+
+
+class MetricsShards:
+    """
+    Métricas de preguntas de un perfil, un archivo JSON por fuente de contenido.
+    Cada fragmento en memoria recuerda el estado del archivo al leerlo: si otro
+    proceso del mismo perfil lo reescribió, se relee (como StatsEngine.reload_if_changed).
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._shards: Dict[str, Dict[str, List[int]]] = {}
+        self._disk_stats: Dict[str, Optional[Tuple[int, int, int]]] = {}
+
+    @staticmethod
+    def shard_key(source_file: str) -> str:
+        if is_pack_member(source_file):
+            pack_path, member = split_member(source_file)
+            return f"{pack_path.stem}__{Path(member).stem}"
+        return Path(source_file).stem
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.json'
+
+    @staticmethod
+    def _file_stat(path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _load(self, key: str) -> Dict[str, List[int]]:
+        """Fragmento en memoria, releído si el archivo cambió desde la última lectura"""
+        path = self._path(key)
+        disk_stat = self._file_stat(path)
+        shard = self._shards.get(key)
+        if shard is None or disk_stat != self._disk_stats.get(key):
+            shard = {}
+            if disk_stat is not None:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        shard = json.load(f)
+                except Exception as e:
+                    print(f"Error loading metrics shard {path.name}: {e}")
+            self._shards[key] = shard
+            self._disk_stats[key] = disk_stat
+        return shard
+
+    def counts(self, source_file: str, question_id: str) -> Tuple[int, int]:
+        values = self._load(self.shard_key(source_file)).get(question_id)
+        return (values[0], values[1]) if values else (0, 0)
+
+    def get(self, question: Question) -> Tuple[int, int]:
+        if not question.source_file:
+            return (0, 0)
+        return self.counts(question.source_file, question.id)
+
+    def apply(self, questions: Iterable[Question]):
+        """
+        Carga las métricas del perfil en las preguntas compartidas (sin releer contenido).
+        Cada fragmento se comprueba una vez por llamada y se relee solo si cambió.
+        """
+        shards: Dict[str, Dict[str, List[int]]] = {}
+        for question in questions:
+            if not question.source_file:
+                continue
+            key = self.shard_key(question.source_file)
+            shard = shards.get(key)
+            if shard is None:
+                shard = shards[key] = self._load(key)
+            values = shard.get(question.id)
+            correct, incorrect = (values[0], values[1]) if values else (0, 0)
+            if (correct, incorrect) != (question.times_correct, question.times_incorrect):
+                question.times_correct = correct
+                question.times_incorrect = incorrect
+                question.times_seen = correct + incorrect
+
+    def write(self, source_file: str, deltas: List[CounterDelta]) -> bool:
+        """
+        Fusiona los deltas y reescribe solo el fragmento de `source_file`. El
+        fragmento se relee bajo bloqueo: otro proceso puede usar el mismo perfil.
+        """
+        key = self.shard_key(source_file)
+        path = self._path(key)
+        try:
+            with file_lock(path):
+                shard = read_json(path)
+                merge_counters(shard, deltas)
+                write_json(path, shard, separators=(',', ':'))
+            self._shards[key] = shard
+            self._disk_stats[key] = self._file_stat(path)
+            return True
+        except Exception as e:
+            print(f"Error saving metrics shard {key}: {e}")
+            return False
+
+    def seed(self, questions: Iterable[Question]):
+        """
+        Guarda como punto de partida las métricas actuales de las preguntas con intentos.
+        Las fuentes que ya tienen fragmento se omiten: otra app del perfil (p. ej. el
+        estudio de módulos de la raíz) puede haberlas sembrado y seguido escribiendo.
+        """
+        by_source: Dict[str, List[Question]] = {}
+        for question in questions:
+            if question.source_file and question.times_seen:
+                by_source.setdefault(question.source_file, []).append(question)
+        for source_file, group in by_source.items():
+            self.seed_source(source_file, {q.id: (q.times_correct, q.times_incorrect) for q in group})
+
+    def seed_source(self, source_file: str, counts: Dict[str, Tuple[int, int]]) -> bool:
+        """Siembra el fragmento de una fuente con {question_id: (correctas, incorrectas)} si aún no existe"""
+        if self._path(self.shard_key(source_file)).exists():
+            return False
+        deltas = [CounterDelta(key, values) for key, values in counts.items() if any(values)]
+        return bool(deltas) and self.write(source_file, deltas)
+
+    def paths(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob('*.json'))
+
+
+class ProfileRegistry:
+    """Índice de perfiles (storage/profiles/index.json) y perfil activo"""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else Config.PROFILES_DIR
+        self.index_file = self.root / 'index.json'
+        self.profiles: Dict[str, Profile] = {}
+        self.active_id = DEFAULT_PROFILE
+        self._load()
+
+    def _load(self):
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.profiles = {pid: Profile(id=pid, **entry) for pid, entry in data.get('profiles', {}).items()}
+                self.active_id = data.get('active', DEFAULT_PROFILE)
+            except Exception as e:
+                print(f"Error loading profiles: {e}")
+        if not self.profiles:
+            self._migrate_legacy()
+        if self.active_id not in self.profiles:
+            self.active_id = next(iter(self.profiles))
+
+    def _migrate_legacy(self):
+        """Primer arranque con perfiles: el progreso global pasa al perfil por defecto"""
+        profile = Profile(DEFAULT_PROFILE, 'Principal', datetime.now().isoformat(timespec='seconds'),
+                          seed_from_content=True)
+        directory = self.path(profile.id)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in LEGACY_FILES:
+            legacy = Config.STORAGE_DIR / name
+            if legacy.exists() and not (directory / name).exists():
+                shutil.copy2(legacy, directory / name)
+        self.profiles = {profile.id: profile}
+        self.active_id = profile.id
+        self.save()
+
+    def save(self):
+        data = {
+            'active': self.active_id,
+            'profiles': {pid: {k: v for k, v in asdict(p).items() if k != 'id'} for pid, p in self.profiles.items()},
+        }
+        try:
+            _write_json_atomic(self.index_file, data)
+        except Exception as e:
+            print(f"Error saving profiles: {e}")
+
+    # ==== Consulta ====
+
+    @property
+    def active(self) -> Profile:
+        return self.profiles[self.active_id]
+
+    def list_profiles(self) -> List[Profile]:
+        return sorted(self.profiles.values(), key=lambda p: p.name.lower())
+
+    def path(self, profile_id: str) -> Path:
+        return self.root / profile_id
+
+    def stats_file(self, profile_id: str) -> Path:
+        return self.path(profile_id) / STATS_FILENAME
+
+    def stats_sources(self, profile_id: str) -> List[Path]:
+        """
+        Archivos anteriores que se migran a las estadísticas unificadas del perfil:
+        su user_progress.json y, en el perfil por defecto, el user_stats.json de las apps clásicas
+        """
+        sources = [self.path(profile_id) / 'user_progress.json']
+        if profile_id == DEFAULT_PROFILE:
+            sources.append(Config.LEGACY_DIR / STATS_FILENAME)
+        return sources
+
+    def notes_sources(self, profile_id: str) -> List[Path]:
+        """Notas globales anteriores a los perfiles, que hereda el perfil por defecto"""
+        if profile_id != DEFAULT_PROFILE:
+            return []
+        return [Config.STORAGE_DIR / 'user_notes.jsonl', Config.DATA_DIR / 'user_notes.json']
+
+    def shards(self, profile_id: str) -> MetricsShards:
+        return MetricsShards(self.path(profile_id) / 'metrics')
+
+    # ==== Cambios ====
+
+    def create(self, name: str) -> Profile:
+        base = slugify(name)
+        profile_id, n = base, 2
+        while profile_id in self.profiles:
+            profile_id, n = f"{base}-{n}", n + 1
+        profile = Profile(profile_id, name.strip() or profile_id, datetime.now().isoformat(timespec='seconds'))
+        self.path(profile_id).mkdir(parents=True, exist_ok=True)
+        self.profiles[profile_id] = profile
+        self.save()
+        return profile
+
+    def set_active(self, profile_id: str):
+        if profile_id not in self.profiles:
+            raise KeyError(profile_id)
+        if profile_id != self.active_id:
+            self.active_id = profile_id
+            self.save()
+
+    def mark_seeded(self, profile_id: str):
+        profile = self.profiles[profile_id]
+        if profile.seed_from_content:
+            profile.seed_from_content = False
+            self.save()
@@ -0,0 +1,52 @@
+"""
+Filtros de preguntas por modo de estudio (compartidos por la UI y el servidor)
+"""
+import random
+from typing import List, Optional
+
+from src.models.question import Question
+
+
+MODE_RANDOM = 'random'
+MODE_TOPIC = 'topic'
+MODE_WEAK = 'weak'
+MODES = (MODE_RANDOM, MODE_TOPIC, MODE_WEAK)
+
+# Repaso cuando no queda ninguna pregunta débil
+REVIEW_SAMPLE_SIZE = 10
+
+
+def filter_topic(questions: List[Question], module: str = 'all', section: str = 'all') -> List[Question]:
+    return [
+        q for q in questions
+        if (module == 'all' or q.module == module) and (section == 'all' or q.section == section)
+    ]
+
+
+def filter_weak(questions: List[Question], rng: Optional[random.Random] = None) -> List[Question]:
+    """
+    Estrategia Escalona:
+    1. Prioridad Máxima: Nuevas o Críticas (< 50%)
+    2. Prioridad Media: En aprendizaje (50-79%)
+    """
+    critical = [q for q in questions if q.times_seen == 0 or q.accuracy < 50]
+    learning = [q for q in questions if 50 <= q.accuracy < 80 and q.times_seen > 0]
+    weak = critical + learning
+    if weak:
+        return weak
+
+    # Si no hay NINGUNA pregunta débil (todo masterizado): algunas dominadas para repaso
+    passed = [q for q in questions if q.accuracy >= 80]
+    return (rng or random).sample(passed, min(len(passed), REVIEW_SAMPLE_SIZE))
+
+
+def filter_questions(questions: List[Question], mode: str, module: str = 'all', section: str = 'all',
+                     rng: Optional[random.Random] = None) -> List[Question]:
+    """Preguntas del modo pedido; si el filtro queda vacío, todo el banco"""
+    if mode == MODE_TOPIC:
+        filtered = filter_topic(questions, module, section)
+    elif mode == MODE_WEAK:
+        filtered = filter_weak(questions, rng)
+    else:
+        filtered = list(questions)
+    return filtered or list(questions)
@@ -0,0 +1,370 @@
+"""
+Carga en dos niveles de los CSV de preguntas
+- QuestionIndex: un recorrido por archivo que guarda en columnas (arrays) el
+  offset en bytes de cada fila, su sección codificada y sus métricas
+- BodyStore: enunciado, opciones y explicación se leen con seek al mostrarse,
+  con un LRU de los cuerpos usados recientemente
+- iter_bodies: lectura secuencial para recorridos completos (índice de búsqueda)
+  que no pasa por el LRU
+"""
+import csv
+import hashlib
+import os
+from array import array
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from src.core.file_store import parse_counts
+from src.models.question import DifficultyLevel, Question, intern_str, shared_tags
+
+
+QuestionBody = namedtuple('QuestionBody', 'question_text options correct_answer explanation')
+
+# Columnas del cuerpo que entran en la huella de contenido (no incluye métricas)
+CONTENT_FIELDS = ('section', 'question', 'options', 'correct', 'notas', 'second_explanation')
+
+
+# ==== Parseo de filas (compartido con la carga completa) ====
+
+def parse_options(options_str: str) -> List[str]:
+    """Opciones separadas por ';'"""
+    if not options_str:
+        return []
+    return [opt.strip() for opt in options_str.split(';') if opt.strip()]
+
+
+def parse_correct(correct_str: str) -> int:
+    """Respuesta correcta 1-based (si hay varias "1;2;3" se toma la primera) -> índice 0-based"""
+    if ';' in correct_str:
+        val = int(correct_str.split(';')[0])
+    else:
+        val = int(correct_str) if correct_str.strip().isdigit() else 1
+    return max(0, val - 1)
+
+
+def parse_difficulty(diff_str: str) -> DifficultyLevel:
+    diff_lower = diff_str.lower()
+    if 'hard' in diff_lower or 'difícil' in diff_lower:
+        return DifficultyLevel.HARD
+    if 'easy' in diff_lower or 'fácil' in diff_lower:
+        return DifficultyLevel.EASY
+    return DifficultyLevel.MEDIUM
+
+
+def parse_body(row: dict) -> QuestionBody:
+    """Campos pesados de una fila (como dict de csv.DictReader)"""
+    return QuestionBody(
+        question_text=row.get('question', ''),
+        options=tuple(parse_options(row.get('options', ''))),
+        # Default a 1 si vacío para evitar crash
+        correct_answer=parse_correct(row.get('correct', '1') or '1'),
+        explanation=row.get('notas', row.get('second_explanation', '')),
+    )
+
+
+def iter_records(f) -> Iterator[Tuple[int, bytes]]:
+    """
+    Registros CSV crudos de un archivo binario: (offset, bytes).
+    Un registro termina en un salto de línea fuera de comillas.
+    """
+    offset = f.tell()
+    pending = b''
+    for line in f:
+        pending += line
+        if pending.count(b'"') % 2 == 0:
+            yield offset, pending
+            offset += len(pending)
+            pending = b''
+    if pending:
+        yield offset, pending
+
+
+def _decode_row(raw: bytes) -> List[str]:
+    return next(csv.reader([raw.decode('utf-8')]), [])
+
+
+# ==== Índice ====
+
+def _stat_key(st: os.stat_result) -> Tuple[int, int]:
+    return st.st_mtime_ns, st.st_size
+
+
+class QuestionIndex:
+    """
+    Índice columnar de un CSV de preguntas (sin materializar el texto).
+    Mantiene abierto un manejador de lectura que solo se reabre cuando cambia
+    `file_stat` (el archivo se reescribió).
+    """
+
+    DIFFICULTIES = (DifficultyLevel.EASY, DifficultyLevel.MEDIUM, DifficultyLevel.HARD)
+
+    def __init__(self, csv_path: Path, bodies: 'BodyStore'):
+        csv_path = Path(csv_path)
+        self.path = intern_str(str(csv_path))
+        self.stem = csv_path.stem
+        self.module = intern_str(self.stem.replace('dp700_', '').replace('_', ' ').title())
+        self.bodies = bodies
+        self._file = None
+        self.scan()
+
+    def scan(self):
+        """Un recorrido del archivo: offsets, secciones y métricas de cada fila"""
+        self.header: List[str] = []
+        self.sections: List[str] = []
+        section_codes: Dict[str, int] = {}
+        self.offsets = array('Q')
+        self.lengths = array('I')
+        self.section_code = array('H')
+        self.difficulty_code = array('B')
+        self.correct = array('I')
+        self.incorrect = array('I')
+        self.seen = array('I')
+        digest = hashlib.sha1()
+
+        # El manejador del recorrido queda abierto para las lecturas de cuerpos
+        self.close()
+        f = open(self.path, 'rb')
+        try:
+            self.file_stat = _stat_key(os.fstat(f.fileno()))
+            records = iter_records(f)
+            for _, raw in records:
+                self.header = _decode_row(raw)
+                break
+            col = {name: i for i, name in enumerate(self.header)}
+            section_col = col.get('section')
+            metrics_col = col.get('metrics')
+            difficulty_col = col.get('difficulty')
+            content_cols = [col[name] for name in CONTENT_FIELDS if name in col]
+
+            for offset, raw in records:
+                if not raw.strip():
+                    continue  # csv.DictReader también omite las filas vacías
+                values = _decode_row(raw)
+                if not values:
+                    continue
+
+                section = values[section_col] if section_col is not None and section_col < len(values) else ''
+                section = section or 'General'
+                code = section_codes.get(section)
+                if code is None:
+                    code = section_codes[section] = len(self.sections)
+                    self.sections.append(intern_str(section))
+
+                metrics = values[metrics_col] if metrics_col is not None and metrics_col < len(values) else ''
+                times_correct, times_incorrect = parse_counts(metrics)
+                difficulty = values[difficulty_col] if difficulty_col is not None and difficulty_col < len(values) else 'medium'
+
+                self.offsets.append(offset)
+                self.lengths.append(len(raw))
+                self.section_code.append(code)
+                self.difficulty_code.append(self.DIFFICULTIES.index(parse_difficulty(difficulty)))
+                self.correct.append(times_correct)
+                self.incorrect.append(times_incorrect)
+                self.seen.append(times_correct + times_incorrect)
+                for i in content_cols:
+                    if i < len(values):
+                        digest.update(values[i].encode('utf-8'))
+                    digest.update(b'\x1f')
+                digest.update(b'\x1e')
+        except Exception:
+            f.close()
+            raise
+        self._file = f
+        self.content_hash = digest.hexdigest()
+
+    def rescan_offsets(self):
+        """
+        Tras reescribir el archivo: nuevos offsets, conservando las métricas en
+        memoria (pueden incluir respuestas aún no escritas)
+        """
+        metrics = (self.correct, self.incorrect, self.seen)
+        self.scan()
+        if len(metrics[0]) == len(self.offsets):
+            self.correct, self.incorrect, self.seen = metrics
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def questions(self) -> List['IndexedQuestion']:
+        return [IndexedQuestion(self, row) for row in range(len(self.offsets))]
+
+    def _reader(self):
+        """Manejador de lectura; si el archivo cambió se reindexa (y se reabre) antes de leer"""
+        if self._file is None or _stat_key(os.stat(self.path)) != self.file_stat:
+            # Reescrito fuera del índice: los offsets ya no valen
+            self.rescan_offsets()
+        return self._file
+
+    def close(self):
+        """Libera el manejador de lectura (se reabre en el siguiente recorrido)"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def read_row(self, row: int) -> dict:
+        """Lee una sola fila con seek a su offset"""
+        f = self._reader()
+        f.seek(self.offsets[row])
+        raw = f.read(self.lengths[row])
+        return dict(zip(self.header, _decode_row(raw)))
+
+    def read_bodies(self) -> List[QuestionBody]:
+        """Todos los cuerpos en una lectura secuencial del archivo (sin pasar por el BodyStore)"""
+        if not self.offsets:
+            return []
+        f = self._reader()
+        base = self.offsets[0]
+        f.seek(base)
+        data = f.read()
+        return [
+            parse_body(dict(zip(self.header, _decode_row(data[offset - base:offset - base + length]))))
+            for offset, length in zip(self.offsets, self.lengths)
+        ]
+
+    def body(self, row: int) -> QuestionBody:
+        return self.bodies.get(self, row)
+
+
+class BodyStore:
+    """LRU de cuerpos de pregunta leídos bajo demanda"""
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self._cache: 'OrderedDict[Tuple[str, int], QuestionBody]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, index: QuestionIndex, row: int) -> QuestionBody:
+        key = (index.path, row)
+        body = self._cache.get(key)
+        if body is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return body
+        self.misses += 1
+        try:
+            body = parse_body(index.read_row(row))
+        except Exception as e:
+            print(f"Error reading question {row + 1} from {index.path}: {e}")
+            return QuestionBody('', (), 0, '')
+        self._cache[key] = body
+        if len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+        return body
+
+    def clear(self):
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class IndexedQuestion:
+    """
+    Pregunta respaldada por el índice (misma interfaz que Question).
+    Métricas, módulo y sección salen de las columnas; el texto, del BodyStore.
+    """
+    __slots__ = ('_index', '_row', 'average_time_seconds')
+
+    last_seen = None
+
+    def __init__(self, index: QuestionIndex, row: int):
+        self._index = index
+        self._row = row
+        # Media de los tiempos de respuesta del perfil (PersistenceService.apply_question_times)
+        self.average_time_seconds = 0.0
+
+    # ==== Campos ligeros (índice) ====
+
+    @property
+    def id(self) -> str:
+        return f"{self._index.stem}_q{self._row + 1}"
+
+    @property
+    def module(self) -> str:
+        return self._index.module
+
+    @property
+    def section(self) -> str:
+        return self._index.sections[self._index.section_code[self._row]]
+
+    @property
+    def tags(self) -> Tuple[str, ...]:
+        return shared_tags(self.section.split(','))
+
+    @property
+    def difficulty(self) -> DifficultyLevel:
+        return QuestionIndex.DIFFICULTIES[self._index.difficulty_code[self._row]]
+
+    @property
+    def source_file(self) -> str:
+        return self._index.path
+
+    @property
+    def times_correct(self) -> int:
+        return self._index.correct[self._row]
+
+    @times_correct.setter
+    def times_correct(self, value: int):
+        self._index.correct[self._row] = value
+
+    @property
+    def times_incorrect(self) -> int:
+        return self._index.incorrect[self._row]
+
+    @times_incorrect.setter
+    def times_incorrect(self, value: int):
+        self._index.incorrect[self._row] = value
+
+    @property
+    def times_seen(self) -> int:
+        return self._index.seen[self._row]
+
+    @times_seen.setter
+    def times_seen(self, value: int):
+        self._index.seen[self._row] = value
+
+    # ==== Campos pesados (bajo demanda) ====
+
+    @property
+    def question_text(self) -> str:
+        return self._index.body(self._row).question_text
+
+    @property
+    def options(self) -> Tuple[str, ...]:
+        return self._index.body(self._row).options
+
+    @property
+    def correct_answer(self) -> int:
+        return self._index.body(self._row).correct_answer
+
+    @property
+    def explanation(self) -> str:
+        return self._index.body(self._row).explanation
+
+    # Misma lógica derivada que Question
+    accuracy = Question.accuracy
+    mastery_level = Question.mastery_level
+    to_dict = Question.to_dict
+
+    def __repr__(self) -> str:
+        return f"IndexedQuestion(id={self.id!r}, module={self.module!r}, section={self.section!r})"
+
+
+def iter_bodies(questions: Iterable[Union[Question, IndexedQuestion]]) -> Iterator:
+    """
+    Cuerpos de `questions` en orden, para recorridos completos: cada CSV indexado
+    se lee una sola vez de forma secuencial, sin desalojar el LRU del BodyStore.
+    Las preguntas ya materializadas (carga completa) se retornan tal cual.
+    """
+    bodies_by_index: Dict[int, List[QuestionBody]] = {}
+    for question in questions:
+        if not isinstance(question, IndexedQuestion):
+            yield question
+            continue
+        index = question._index
+        bodies = bodies_by_index.get(id(index))
+        if bodies is None:
+            bodies = bodies_by_index[id(index)] = index.read_bodies()
+        yield bodies[question._row]
@@ -0,0 +1,120 @@
+"""
+Tiempos de respuesta por pregunta, sección y comando (histogramas logarítmicos)
+storage/profiles/<id>/response_times.json:
+
+    {"question": {"dp700_m1_q3": {"n": 4, "s": 51.2, "min": 6.1, "max": 22.0, "b": {"19": 2, ...}}},
+     "section":  {"Módulo 1 / Ingesta": {...}},
+     "command":  {"12": {...}},
+     "total":    {"quiz": {...}, "sql": {...}}}
+
+Cada elemento guarda un histograma de tamaño fijo (src/core/histogram.py), no
+las muestras. Las respuestas nuevas se acumulan en histogramas pendientes y se
+suman al archivo bajo bloqueo en flush(): dos apps del mismo perfil no pierden
+muestras.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.core.file_store import locked_json, read_json
+from src.core.histogram import LogHistogram
+
+
+QUESTION = 'question'
+SECTION = 'section'
+COMMAND = 'command'
+TOTAL = 'total'
+KINDS = (QUESTION, SECTION, COMMAND, TOTAL)
+
+TOTAL_QUIZ = 'quiz'
+TOTAL_SQL = 'sql'
+
+
+def section_key(module: str, section: str) -> str:
+    return f"{module} / {section}"
+
+
+class ResponseTimes:
+    """Histogramas de un perfil: en memoria (archivo + pendientes) y escritura por lotes"""
+
+    # Respuestas más largas se descartan (la ventana quedó abierta)
+    MAX_SECONDS = 30 * 60
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._histograms: Optional[Dict[str, Dict[str, LogHistogram]]] = None
+        self._pending: Dict[str, Dict[str, LogHistogram]] = {}
+
+    @staticmethod
+    def _parse(data: dict) -> Dict[str, Dict[str, LogHistogram]]:
+        return {kind: {key: LogHistogram.from_dict(h) for key, h in data.get(kind, {}).items()}
+                for kind in KINDS}
+
+    @property
+    def histograms(self) -> Dict[str, Dict[str, LogHistogram]]:
+        """Archivo + pendientes (se lee de disco solo la primera vez)"""
+        if self._histograms is None:
+            try:
+                data = read_json(self.path)
+            except Exception as e:
+                print(f"Error loading response times: {e}")
+                data = {}
+            self._histograms = self._parse(data)
+            for kind, pending in self._pending.items():
+                for key, hist in pending.items():
+                    self._histograms[kind].setdefault(key, LogHistogram()).merge(hist)
+        return self._histograms
+
+    def _record(self, seconds: float, keys: List[Tuple[str, str]]) -> bool:
+        if seconds is None or not 0 <= seconds <= self.MAX_SECONDS:
+            return False
+        histograms = self.histograms
+        for kind, key in keys:
+            histograms[kind].setdefault(key, LogHistogram()).record(seconds)
+            self._pending.setdefault(kind, {}).setdefault(key, LogHistogram()).record(seconds)
+        return True
+
+    def record_question(self, question, seconds: float) -> bool:
+        """Tiempo desde que se mostró la pregunta hasta la respuesta"""
+        return self._record(seconds, [(QUESTION, question.id),
+                                      (SECTION, section_key(question.module, question.section)),
+                                      (TOTAL, TOTAL_QUIZ)])
+
+    def record_command(self, command_id: str, seconds: float) -> bool:
+        """Tiempo de un intento del SQL Trainer (desde el intento anterior o la carga)"""
+        return self._record(seconds, [(COMMAND, str(command_id)), (TOTAL, TOTAL_SQL)])
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def flush(self):
+        """Suma los histogramas pendientes al archivo (releído bajo bloqueo)"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            with locked_json(self.path, separators=(',', ':')) as data:
+                for kind, histograms in pending.items():
+                    stored = data.setdefault(kind, {})
+                    for key, hist in histograms.items():
+                        merged = LogHistogram.from_dict(stored[key]) if key in stored else LogHistogram()
+                        merged.merge(hist)
+                        stored[key] = merged.to_dict()
+                # Lo escrito por otros procesos entra en la vista en memoria
+                self._histograms = self._parse(data)
+        except Exception as e:
+            print(f"Error saving response times: {e}")
+            for kind, histograms in pending.items():
+                for key, hist in histograms.items():
+                    self._pending.setdefault(kind, {}).setdefault(key, LogHistogram()).merge(hist)
+
+    # ==== Consultas ====
+
+    def get(self, kind: str, key: str) -> Optional[LogHistogram]:
+        return self.histograms[kind].get(str(key))
+
+    def slowest(self, kind: str, limit: int = 5, min_samples: int = 3) -> List[Tuple[str, LogHistogram]]:
+        """Elementos con mayor p50 (solo los que tienen muestras suficientes)"""
+        candidates = [(key, hist) for key, hist in self.histograms[kind].items() if hist.count >= min_samples]
+        candidates.sort(key=lambda item: item[1].p50, reverse=True)
+        return candidates[:limit]
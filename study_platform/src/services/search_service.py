@@ -0,0 +1,215 @@
+"""
+Búsqueda de texto completo sobre preguntas y comandos SQL/KQL
+Índice invertido en memoria con ranking BM25, persistido en la caché de datos
+"""
+import heapq
+import math
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+from src.models.question import Question, SQLCommand
+from src.services.data_cache import DataCache
+from src.services.question_index import iter_bodies
+
+
+KIND_QUESTION = 'question'
+KIND_COMMAND = 'command'
+
+_TOKEN_RE = re.compile(r'[a-z0-9_]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Minúsculas, sin acentos y dividido en palabras alfanuméricas"""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return _TOKEN_RE.findall(text)
+
+
+@dataclass
+class SearchHit:
+    """Resultado de búsqueda ya resuelto a su objeto"""
+    kind: str
+    score: float
+    item: Union[Question, SQLCommand]
+
+    @property
+    def title(self) -> str:
+        if self.kind == KIND_COMMAND:
+            return self.item.title
+        return self.item.question_text
+
+    @property
+    def subtitle(self) -> str:
+        if self.kind == KIND_COMMAND:
+            return self.item.category
+        return f"{self.item.module} · {self.item.section}"
+
+
+class SearchService:
+    """
+    Índice invertido BM25.
+    - Preguntas: enunciado (peso doble), opciones y explicación
+    - Comandos: título (peso doble), descripción y comando completo
+    La última palabra de la consulta se trata como prefijo (búsqueda mientras se escribe).
+    """
+
+    CACHE_NAME = 'search_index'
+    K1 = 1.2
+    B = 0.75
+    MAX_PREFIX_EXPANSIONS = 30
+
+    def __init__(self, questions: List[Question], commands: List[SQLCommand], index: Optional[dict] = None):
+        self.questions = questions
+        self.commands = commands
+        self._set_index(index if index is not None else self._build_index())
+
+    # ==== Construcción ====
+
+    @staticmethod
+    def _question_text(q: Question) -> List[str]:
+        return [q.question_text, q.question_text, ' '.join(q.options), q.explanation or '']
+
+    @staticmethod
+    def _command_text(c: SQLCommand) -> List[str]:
+        return [c.title, c.title, c.description or '', c.full_command or '']
+
+    def _documents(self):
+        """Genera el texto de cada documento en orden: preguntas y después comandos"""
+        # Lectura secuencial de los CSV indexados (no pasa por el LRU de cuerpos)
+        for body in iter_bodies(self.questions):
+            yield ' '.join(self._question_text(body))
+        for c in self.commands:
+            yield ' '.join(self._command_text(c))
+
+    def _build_index(self) -> dict:
+        postings: Dict[str, Dict[int, int]] = {}
+        doc_lengths = array('I')
+        for doc_id, text in enumerate(self._documents()):
+            tokens = tokenize(text)
+            doc_lengths.append(len(tokens))
+            for token in tokens:
+                docs = postings.get(token)
+                if docs is None:
+                    docs = postings[token] = {}
+                docs[doc_id] = docs.get(doc_id, 0) + 1
+
+        # Listas compactas: ids de documento y frecuencias en arrays paralelos
+        compact = {}
+        for term, docs in postings.items():
+            compact[term] = (array('I', docs.keys()), array('I', docs.values()))
+        return {
+            'postings': compact,
+            'doc_lengths': doc_lengths,
+            'question_count': len(self.questions),
+        }
+
+    def _set_index(self, index: dict):
+        self._postings = index['postings']
+        self._doc_lengths = index['doc_lengths']
+        self._question_count = index['question_count']
+        self._vocabulary = sorted(self._postings)
+
+        n_docs = len(self._doc_lengths)
+        avg_len = (sum(self._doc_lengths) / n_docs) if n_docs else 0.0
+        # Normalización de longitud precalculada por documento
+        self._norms = [
+            self.K1 * (1 - self.B + self.B * (length / avg_len if avg_len else 0.0))
+            for length in self._doc_lengths
+        ]
+        self._n_docs = n_docs
+
+    def export_index(self) -> dict:
+        return {
+            'postings': self._postings,
+            'doc_lengths': self._doc_lengths,
+            'question_count': self._question_count,
+        }
+
+    @classmethod
+    def load_or_build(cls, questions: List[Question], commands: List[SQLCommand],
+                      cache: Optional[DataCache] = None,
+                      question_fingerprint: Optional[str] = None) -> 'SearchService':
+        """
+        Reutiliza el índice cacheado si el contenido indexado no cambió.
+        `question_fingerprint` (DataLoader.content_fingerprint: CSV, packs y orden de ids)
+        evita leer el texto de cada pregunta.
+        """
+        cache = cache or DataCache()
+        if question_fingerprint is not None:
+            texts = [question_fingerprint]
+        else:
+            texts = [' '.join(cls._question_text(body)) for body in iter_bodies(questions)]
+        texts += [' '.join(cls._command_text(c)) for c in commands]
+        fingerprint = DataCache.fingerprint_texts(texts)
+
+        index = cache.load(cls.CACHE_NAME, fingerprint)
+        if index is not None and (index['question_count'] != len(questions)
+                                  or len(index['doc_lengths']) != len(questions) + len(commands)):
+            index = None  # Índice de otro contenido: las posiciones no corresponden
+        service = cls(questions, commands, index=index)
+        if index is None:
+            cache.save(cls.CACHE_NAME, fingerprint, service.export_index())
+        return service
+
+    # ==== Consulta ====
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        """Términos del vocabulario que empiezan por `prefix` (los más frecuentes)"""
+        start = bisect_left(self._vocabulary, prefix)
+        matches = []
+        for term in self._vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        if len(matches) > self.MAX_PREFIX_EXPANSIONS:
+            matches.sort(key=lambda t: len(self._postings[t][0]), reverse=True)
+            matches = matches[:self.MAX_PREFIX_EXPANSIONS]
+        return matches
+
+    def search(self, query: str, k: int = 20, kind: Optional[str] = None) -> List[SearchHit]:
+        """Top-k documentos por BM25. `kind` filtra por KIND_QUESTION o KIND_COMMAND"""
+        tokens = tokenize(query)
+        if not tokens or not self._n_docs:
+            return []
+
+        # Términos exactos + expansión por prefijo de la última palabra
+        term_groups = [[t] for t in tokens[:-1]]
+        last = tokens[-1]
+        expansions = self._expand_prefix(last)
+        if last in self._postings and last not in expansions:
+            expansions.append(last)
+        term_groups.append(expansions)
+
+        scores: Dict[int, float] = {}
+        k1_plus = self.K1 + 1
+        norms = self._norms
+        for group in term_groups:
+            for term in group:
+                posting = self._postings.get(term)
+                if posting is None:
+                    continue
+                doc_ids, freqs = posting
+                df = len(doc_ids)
+                idf = math.log(1 + (self._n_docs - df + 0.5) / (df + 0.5))
+                for doc_id, tf in zip(doc_ids, freqs):
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * k1_plus / (tf + norms[doc_id])
+
+        if kind == KIND_QUESTION:
+            candidates = ((s, d) for d, s in scores.items() if d < self._question_count)
+        elif kind == KIND_COMMAND:
+            candidates = ((s, d) for d, s in scores.items() if d >= self._question_count)
+        else:
+            candidates = ((s, d) for d, s in scores.items())
+
+        return [self._resolve(doc_id, score) for score, doc_id in heapq.nlargest(k, candidates)]
+
+    def _resolve(self, doc_id: int, score: float) -> SearchHit:
+        if doc_id < self._question_count:
+            return SearchHit(KIND_QUESTION, score, self.questions[doc_id])
+        return SearchHit(KIND_COMMAND, score, self.commands[doc_id - self._question_count])
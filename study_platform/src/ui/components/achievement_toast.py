@@ -0,0 +1,65 @@
+"""
+Aviso flotante de logro desbloqueado
+Se muestra unos segundos en la esquina inferior derecha de la ventana; los logros
+desbloqueados a la vez se muestran uno tras otro.
+"""
+from collections import deque
+
+from PyQt5.QtWidgets import QFrame, QVBoxLayout, QLabel
+from PyQt5.QtCore import Qt, QTimer
+
+from ..themes.colors import Spacing
+
+
+class AchievementToast(QFrame):
+    """Toast no interactivo con el título y la descripción del logro"""
+
+    SHOW_MS = 4000
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setProperty("frameType", "toast")
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(Spacing.MD, Spacing.SM, Spacing.MD, Spacing.SM)
+        self.title = QLabel()
+        self.title.setProperty("labelType", "toastTitle")
+        self.description = QLabel()
+        self.description.setWordWrap(True)
+        layout.addWidget(self.title)
+        layout.addWidget(self.description)
+
+        self._queue = deque()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.SHOW_MS)
+        self.timer.timeout.connect(self._next)
+        self.hide()
+
+    def notify(self, title: str, description: str):
+        """Encola un logro; si no hay otro en pantalla se muestra ya"""
+        self._queue.append((title, description))
+        if not self.timer.isActive():
+            self._next()
+
+    def _next(self):
+        if not self._queue:
+            self.hide()
+            return
+        title, description = self._queue.popleft()
+        self.title.setText(f"🏆 {title}")
+        self.description.setText(description)
+        self.show()
+        self.raise_()
+        self.reposition()
+        self.timer.start()
+
+    def reposition(self):
+        """Esquina inferior derecha del padre (llamar desde su resizeEvent)"""
+        parent = self.parentWidget()
+        if parent is None:
+            return
+        self.setFixedWidth(min(320, parent.width() - 2 * Spacing.LG))
+        self.adjustSize()
+        self.move(parent.width() - self.width() - Spacing.LG, parent.height() - self.height() - Spacing.LG)
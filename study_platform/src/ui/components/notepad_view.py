@@ -1,70 +1,139 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, 
-    QPushButton, QLabel, QScrollArea, QFrame,
-    QGraphicsDropShadowEffect
+    QPushButton, QLabel, QFrame, QListView,
+    QStyledItemDelegate, QStyle, QAbstractItemView
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QSize
-from PyQt5.QtGui import QColor, QFont
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
 
-from ..themes.colors import ModernColors, Typography, Spacing, BorderRadius
-from ...services.notes_service import NotesService
+from ..themes.colors import Typography, Spacing, BorderRadius
+from ..themes.theme_manager import palette
 from datetime import datetime
 
-class NoteCard(QFrame):
-    """Tarjeta individual para una nota"""
-    def __init__(self, timestamp: str, content: str):
-        super().__init__()
-        self.setProperty("frameType", "card")
-        
-        layout = QVBoxLayout()
-        layout.setSpacing(Spacing.SM)
-        layout.setContentsMargins(Spacing.MD, Spacing.MD, Spacing.MD, Spacing.MD)
-        
+
+def format_note_time(timestamp: str) -> str:
+    try:
+        # Parse ISO if needed or simplify display
+        display_time = datetime.fromisoformat(timestamp).strftime("%d %b %Y - %H:%M")
+    except Exception:
+        display_time = timestamp
+    return f"🕒 {display_time}"
+
+
+class NotesListModel(QAbstractListModel):
+    """Modelo de notas (más recientes primero) que se carga por páginas al hacer scroll"""
+
+    PAGE_SIZE = 50
+
+    def __init__(self, notes_service, parent=None):
+        super().__init__(parent)
+        self.notes_service = notes_service
+        self.notes = self.notes_service.get_notes(self.PAGE_SIZE)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.notes)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        note = self.notes[index.row()]
+        if role == Qt.DisplayRole:
+            return note.get('content', '')
+        if role == Qt.UserRole:
+            return format_note_time(note.get('timestamp', ''))
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self.notes) < self.notes_service.count()
+
+    def fetchMore(self, parent=QModelIndex()):
+        page = self.notes_service.get_notes(self.PAGE_SIZE, start=len(self.notes))
+        if not page:
+            return
+        first = len(self.notes)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self.notes.extend(page)
+        self.endInsertRows()
+
+    def prepend_note(self, note):
+        """Inserta una nota nueva arriba sin recargar el resto"""
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self.notes.insert(0, note)
+        self.endInsertRows()
+
+
+class NoteDelegate(QStyledItemDelegate):
+    """Pinta cada nota como tarjeta; solo se dibujan las filas visibles"""
+
+    PADDING = Spacing.MD
+    GAP = Spacing.MD
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.time_font = QFont()
+        self.time_font.setPixelSize(Typography.SIZE_XS)
+        self.time_font.setBold(True)
+        self.content_font = QFont()
+        self.content_font.setPixelSize(Typography.SIZE_SM)
+
+    def _content_rect(self, width):
+        return QRect(0, 0, max(width - 2 * self.PADDING, 1), 100000)
+
+    def sizeHint(self, option, index):
+        # El ancho de la fila es el del viewport (option.rect aún no está calculado)
+        view = self.parent()
+        width = view.viewport().width() if view is not None else option.rect.width()
+        width = width or 360
+        time_height = QFontMetrics(self.time_font).height()
+        content = QFontMetrics(self.content_font).boundingRect(
+            self._content_rect(width), Qt.TextWordWrap, index.data(Qt.DisplayRole) or ""
+        )
+        height = self.PADDING * 2 + time_height + Spacing.SM + content.height() + self.GAP
+        return QSize(width, height)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Colores del tema actual (el stylesheet no llega al pintado manual)
+        colors = palette()
+        card = option.rect.adjusted(0, 0, -1, -self.GAP)
+        border = colors['primary'] if option.state & QStyle.State_MouseOver else colors['border']
+        painter.setPen(QPen(QColor(border), 1))
+        painter.setBrush(QColor(colors['surface']))
+        painter.drawRoundedRect(card, BorderRadius.MD, BorderRadius.MD)
+
+        inner = card.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+
         # Timestamp (Pastel accent)
-        try:
-            # Parse ISO if needed or simplify display
-            display_time = datetime.fromisoformat(timestamp).strftime("%d %b %Y - %H:%M")
-        except:
-            display_time = timestamp
-            
-        lbl_time = QLabel(f"🕒 {display_time}")
-        lbl_time.setStyleSheet(f"color: {ModernColors.LIGHT['secondary']}; font-weight: {Typography.WEIGHT_BOLD}; font-size: {Typography.SIZE_XS}px;")
-        layout.addWidget(lbl_time)
-        
+        painter.setFont(self.time_font)
+        painter.setPen(QColor(colors['secondary']))
+        time_height = QFontMetrics(self.time_font).height()
+        painter.drawText(QRect(inner.left(), inner.top(), inner.width(), time_height),
+                         Qt.AlignLeft | Qt.AlignVCenter, index.data(Qt.UserRole) or "")
+
         # Content
-        lbl_content = QLabel(content)
-        lbl_content.setWordWrap(True)
-        lbl_content.setStyleSheet(f"color: {ModernColors.LIGHT['text_primary']}; font-size: {Typography.SIZE_SM}px;")
-        layout.addWidget(lbl_content)
-        
-        self.setLayout(layout)
-        
-        # Style override for cards
-        self.setStyleSheet(f"""
-            NoteCard {{
-                background-color: {ModernColors.LIGHT['surface']};
-                border: 1px solid {ModernColors.LIGHT['border']};
-                border-radius: {BorderRadius.MD}px;
-            }}
-        """)
+        painter.setFont(self.content_font)
+        painter.setPen(QColor(colors['text_primary']))
+        content_rect = inner.adjusted(0, time_height + Spacing.SM, 0, 0)
+        painter.drawText(content_rect, Qt.TextWordWrap, index.data(Qt.DisplayRole) or "")
+
+        painter.restore()
+
 
 class NotepadView(QWidget):
     """Vista de Notas flotante integrada"""
     
-    def __init__(self, parent=None):
+    def __init__(self, notes_service, parent=None):
         super().__init__(parent)
-        self.notes_service = NotesService()
+        self.notes_service = notes_service
         
         # Configuración de ventana flotante
         self.setWindowFlags(Qt.Window | Qt.WindowStaysOnTopHint)
         self.setWindowTitle("📝 Notas Rápidas")
         self.resize(400, 600)
         
-        # Estilo base
-        self.setStyleSheet(f"background-color: {ModernColors.LIGHT['bg_primary']};")
-        
         self.setup_ui()
-        self.load_notes()
 
     def setup_ui(self):
         main_layout = QVBoxLayout()
@@ -75,22 +144,12 @@ class NotepadView(QWidget):
         header_layout = QHBoxLayout()
         title = QLabel("Mis Anotaciones")
         title.setProperty("labelType", "subtitle")
-        title.setStyleSheet(f"color: {ModernColors.LIGHT['primary']}; font-weight: bold;")
+        title.setProperty("tone", "accent")
         header_layout.addWidget(title)
         
         btn_close = QPushButton("✕")
         btn_close.setFixedSize(30, 30)
-        btn_close.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {ModernColors.LIGHT['text_secondary']};
-                border: none;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                color: {ModernColors.LIGHT['error']};
-            }}
-        """)
+        btn_close.setProperty("buttonType", "close")
         btn_close.clicked.connect(self.hide)
         header_layout.addWidget(btn_close)
         
@@ -98,81 +157,48 @@ class NotepadView(QWidget):
         
         # Área de entrada
         input_frame = QFrame()
-        input_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: {ModernColors.LIGHT['bg_secondary']};
-                border-radius: {BorderRadius.MD}px;
-                padding: {Spacing.SM}px;
-            }}
-        """)
+        input_frame.setProperty("frameType", "inset")
         input_layout = QVBoxLayout(input_frame)
         
         self.txt_input = QTextEdit()
         self.txt_input.setPlaceholderText("Escribe una nota aquí...")
         self.txt_input.setFixedHeight(80)
-        self.txt_input.setStyleSheet(f"""
-            QTextEdit {{
-                background-color: {ModernColors.LIGHT['bg_tertiary']};
-                color: {ModernColors.LIGHT['text_primary']};
-                border: none;
-                border-radius: {BorderRadius.SM}px;
-                padding: {Spacing.SM}px;
-                font-family: {Typography.FONT_FAMILY_PRIMARY};
-            }}
-        """)
+        self.txt_input.setProperty("editorType", "note")
         input_layout.addWidget(self.txt_input)
         
         btn_add = QPushButton("Agregar Nota")
-        btn_add.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {ModernColors.LIGHT['primary']};
-                color: {ModernColors.LIGHT['text_inverse']};
-                border-radius: {BorderRadius.SM}px;
-                padding: 8px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {ModernColors.LIGHT['primary_hover']};
-            }}
-        """)
+        btn_add.setProperty("buttonType", "compact")
         btn_add.clicked.connect(self.add_note)
         input_layout.addWidget(btn_add)
         
         main_layout.addWidget(input_frame)
         
-        # Lista de notas (Scroll Area)
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("background-color: transparent; border: none;")
-        
-        self.notes_container = QWidget()
-        self.notes_container.setStyleSheet("background-color: transparent;")
-        self.notes_layout = QVBoxLayout(self.notes_container)
-        self.notes_layout.setSpacing(Spacing.MD)
-        self.notes_layout.addStretch() # Empujar notas hacia arriba
-        
-        self.scroll_area.setWidget(self.notes_container)
-        main_layout.addWidget(self.scroll_area)
+        # Lista de notas virtualizada (solo se crean/pintan las filas visibles)
+        self.notes_model = NotesListModel(self.notes_service, self)
+        self.notes_list = QListView()
+        self.notes_list.setModel(self.notes_model)
+        self.notes_list.setItemDelegate(NoteDelegate(self.notes_list))
+        self.notes_list.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.notes_list.setResizeMode(QListView.Adjust)
+        self.notes_list.setSelectionMode(QAbstractItemView.NoSelection)
+        self.notes_list.setMouseTracking(True)
+        self.notes_list.setStyleSheet("background-color: transparent; border: none;")
+        main_layout.addWidget(self.notes_list)
         
         self.setLayout(main_layout)
 
-    def load_notes(self):
-        # Limpiar layout (excepto stretch)
-        while self.notes_layout.count() > 1:
-            item = self.notes_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-                
-        notes = self.notes_service.get_notes()
-        
-        for note in notes:
-            card = NoteCard(note['timestamp'], note['content'])
-            self.notes_layout.insertWidget(self.notes_layout.count() - 1, card)
+    def use_notes(self, notes_service):
+        """Cambia a las notas de otro perfil (solo se leen las primeras páginas)"""
+        self.notes_service = notes_service
+        previous = self.notes_model
+        self.notes_model = NotesListModel(self.notes_service, self)
+        self.notes_list.setModel(self.notes_model)
+        previous.deleteLater()
 
     def add_note(self):
         content = self.txt_input.toPlainText().strip()
         if content:
-            self.notes_service.add_note(content)
+            note = self.notes_service.add_note(content)
             self.txt_input.clear()
-            self.load_notes()
+            self.notes_model.prepend_note(note)
+            self.notes_list.scrollToTop()
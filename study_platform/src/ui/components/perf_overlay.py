@@ -0,0 +1,143 @@
+"""
+Panel superpuesto con métricas de rendimiento en vivo
+Latencia del event loop (latido de QTimer), tiempos de carga y guardado,
+escrituras pendientes, widgets vivos y memoria residente del proceso.
+"""
+import os
+import sys
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from PyQt5.QtWidgets import QFrame, QVBoxLayout, QLabel
+from PyQt5.QtCore import Qt, QTimer
+
+from ..themes.colors import Spacing
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Memoria residente actual (psutil si está instalado, /proc o pico vía resource)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        return None
+
+
+def _fmt_ms(value: Optional[float]) -> str:
+    return "—" if value is None else f"{value:.1f} ms"
+
+
+class PerfOverlay(QFrame):
+    """
+    Overlay no interactivo anclado a la esquina superior derecha de la ventana.
+    `snapshot` retorna las métricas de la app: {'load_ms', 'pending_writes',
+    'flush_ms', 'save_ms', 'widgets'}. Los timers solo corren mientras es visible.
+    """
+
+    HEARTBEAT_MS = 100
+    REFRESH_MS = 1000
+    WINDOW = 50  # Latidos considerados (≈5 s)
+
+    def __init__(self, parent, snapshot: Callable[[], Dict]):
+        super().__init__(parent)
+        self.snapshot = snapshot
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setProperty("frameType", "overlay")
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(Spacing.MD, Spacing.SM, Spacing.MD, Spacing.SM)
+        self.label = QLabel()
+        self.label.setTextFormat(Qt.PlainText)
+        layout.addWidget(self.label)
+
+        self._lags = deque(maxlen=self.WINDOW)
+        self._last_beat = None
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setTimerType(Qt.PreciseTimer)
+        self.heartbeat.setInterval(self.HEARTBEAT_MS)
+        self.heartbeat.timeout.connect(self._on_heartbeat)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.hide()
+
+    # ==== Latido ====
+
+    def _on_heartbeat(self):
+        """El retraso sobre el intervalo esperado es el tiempo que el event loop estuvo ocupado"""
+        now = time.perf_counter()
+        if self._last_beat is not None:
+            lag = (now - self._last_beat) * 1000 - self.HEARTBEAT_MS
+            self._lags.append(max(0.0, lag))
+        self._last_beat = now
+
+    def loop_latency(self) -> Dict[str, Optional[float]]:
+        if not self._lags:
+            return {'avg': None, 'max': None}
+        return {'avg': sum(self._lags) / len(self._lags), 'max': max(self._lags)}
+
+    # ==== Visibilidad ====
+
+    def toggle(self):
+        if self.isVisible():
+            self.hide()
+        else:
+            self.show()
+
+    def showEvent(self, event):
+        self._lags.clear()
+        self._last_beat = None
+        self.heartbeat.start()
+        self.refresh_timer.start()
+        self.refresh()
+        self.reposition()
+        self.raise_()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.heartbeat.stop()
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def reposition(self):
+        """Esquina superior derecha del padre (llamar desde su resizeEvent)"""
+        parent = self.parentWidget()
+        if parent is None:
+            return
+        self.adjustSize()
+        self.move(parent.width() - self.width() - Spacing.LG, 70)
+
+    # ==== Contenido ====
+
+    def refresh(self):
+        try:
+            data = self.snapshot() or {}
+        except Exception as e:
+            data = {}
+            print(f"Error reading performance snapshot: {e}")
+        latency = self.loop_latency()
+        rss = process_rss_bytes()
+        lines = [
+            f"Event loop   avg {_fmt_ms(latency['avg'])}  max {_fmt_ms(latency['max'])}",
+            f"Carga datos  {_fmt_ms(data.get('load_ms'))}",
+            f"Pendientes   {data.get('pending_writes', 0)} métricas",
+            f"Flush CSV    {_fmt_ms(data.get('flush_ms'))}",
+            f"Guardado     {_fmt_ms(data.get('save_ms'))}",
+            f"Widgets      {data.get('widgets', '—')}",
+            f"RSS          {'—' if rss is None else f'{rss / 1048576:.1f} MB'}",
+        ]
+        self.label.setText("\n".join(lines))
+        self.adjustSize()
@@ -3,7 +3,8 @@ Widget visual del Reloj Pomodoro
 """
 from PyQt5.QtWidgets import QFrame, QHBoxLayout, QLabel, QPushButton, QVBoxLayout
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal
-from ..themes.colors import ModernColors, Typography, Spacing, BorderRadius
+from ..themes.colors import Spacing
+from ..themes.theme_manager import set_style_state
 import datetime
 
 class PomodoroWidget(QFrame):
@@ -24,15 +25,7 @@ class PomodoroWidget(QFrame):
         self.connect_signals()
         
     def setup_ui(self):
-        self.setProperty("frameType", "pomodoro") # Estilo especial
-        self.setStyleSheet(f"""
-            QFrame[frameType="pomodoro"] {{
-                background-color: {ModernColors.LIGHT['bg_secondary']};
-                border: 2px solid {ModernColors.LIGHT['primary']};
-                border-radius: {BorderRadius.LG}px;
-                padding: {Spacing.MD}px;
-            }}
-        """)
+        self.setProperty("frameType", "pomodoro") # Estilo especial (stylesheet global)
         
         layout = QHBoxLayout()
         layout.setSpacing(Spacing.LG)
@@ -43,12 +36,7 @@ class PomodoroWidget(QFrame):
         
         # Tiempo (Grande)
         self.time_label = QLabel("27:00")
-        self.time_label.setStyleSheet(f"""
-            font-size: {Typography.SIZE_4XL}px;
-            font-weight: {Typography.WEIGHT_BOLD};
-            color: {ModernColors.LIGHT['primary']};
-            font-family: monospace;
-        """)
+        self.time_label.setProperty("labelType", "timer")
         self.time_label.setAlignment(Qt.AlignCenter)
         
         # Botones de control
@@ -56,23 +44,13 @@ class PomodoroWidget(QFrame):
         controls_layout.setSpacing(Spacing.SM)
         
         self.btn_play = QPushButton("▶ Iniciar")
-        self.btn_play.setStyleSheet(f"""
-            background-color: {ModernColors.LIGHT['success']};
-            color: white;
-            font-weight: bold;
-            padding: 8px 16px;
-            border-radius: 4px;
-        """)
+        self.btn_play.setProperty("buttonType", "pomodoro")
+        self.btn_play.setProperty("tone", "success")
         self.btn_play.clicked.connect(self.on_play)
         
         self.btn_pause = QPushButton("⏸ Pausar")
-        self.btn_pause.setStyleSheet(f"""
-            background-color: {ModernColors.LIGHT['warning']};
-            color: white;
-            font-weight: bold;
-            padding: 8px 16px;
-            border-radius: 4px;
-        """)
+        self.btn_pause.setProperty("buttonType", "pomodoro")
+        self.btn_pause.setProperty("tone", "warning")
         self.btn_pause.clicked.connect(self.on_pause)
         self.btn_pause.setVisible(False)
         
@@ -108,27 +86,7 @@ class PomodoroWidget(QFrame):
         self.time_label.setText(f"{minutes:02d}:{seconds:02d}")
         
     def update_state(self, state):
-        if state == "working":
-            self.icon_label.setText("🍅 TRABAJO")
-            self.setStyleSheet(f"""
-                QFrame[frameType="pomodoro"] {{
-                    background-color: {ModernColors.LIGHT['bg_secondary']};
-                    border: 2px solid {ModernColors.LIGHT['success']};
-                }}
-            """)
-        elif state == "break":
-            self.icon_label.setText("☕ DESCANSO")
-            self.setStyleSheet(f"""
-                QFrame[frameType="pomodoro"] {{
-                    background-color: {ModernColors.LIGHT['info_light']};
-                    border: 2px solid {ModernColors.LIGHT['info']};
-                }}
-            """)
-        elif state == "paused":
-            self.icon_label.setText("⏸ PAUSA")
-            self.setStyleSheet(f"""
-                QFrame[frameType="pomodoro"] {{
-                    background-color: {ModernColors.LIGHT['warning_light']};
-                    border: 2px solid {ModernColors.LIGHT['warning']};
-                }}
-            """)
+        labels = {"working": "🍅 TRABAJO", "break": "☕ DESCANSO", "paused": "⏸ PAUSA"}
+        if state in labels:
+            self.icon_label.setText(labels[state])
+            set_style_state(self, "pomodoroState", state)
@@ -0,0 +1,85 @@
+"""
+Diálogo con los spans más lentos de la traza en curso
+"""
+from datetime import datetime
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PyQt5.QtCore import Qt
+
+from config import Config
+from ..themes.colors import Spacing
+from ...utils import tracing
+
+
+class TraceSummaryDialog(QDialog):
+    """Tabla de spans agregados por nombre (máximo, media, total y llamadas)"""
+
+    COLUMNS = ["Span", "Categoría", "Llamadas", "Máx (ms)", "Media (ms)", "Total (ms)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Trazas de rendimiento")
+        self.resize(820, 480)
+        self.setup_ui()
+        self.populate()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(Spacing.MD)
+
+        self.lbl_status = QLabel()
+        self.lbl_status.setProperty("labelType", "caption")
+        layout.addWidget(self.lbl_status)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        btn_refresh = QPushButton("Actualizar")
+        btn_refresh.setProperty("buttonType", "secondary")
+        btn_refresh.clicked.connect(self.populate)
+        btn_clear = QPushButton("Limpiar")
+        btn_clear.setProperty("buttonType", "secondary")
+        btn_clear.clicked.connect(self.clear)
+        btn_export = QPushButton("Exportar traza")
+        btn_export.clicked.connect(self.export)
+        buttons.addWidget(btn_refresh)
+        buttons.addWidget(btn_clear)
+        buttons.addStretch()
+        buttons.addWidget(btn_export)
+        layout.addLayout(buttons)
+
+    def populate(self):
+        rows = tracing.slowest_spans(limit=50)
+        self.table.setRowCount(len(rows))
+        for r, entry in enumerate(rows):
+            values = [
+                entry['name'], entry['cat'], str(entry['count']),
+                f"{entry['max_ms']:.2f}", f"{entry['avg_ms']:.2f}", f"{entry['total_ms']:.1f}",
+            ]
+            for c, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if c >= 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(r, c, item)
+        state = "activas" if tracing.is_enabled() else "desactivadas (usa --trace)"
+        self.lbl_status.setText(f"Trazas {state} · {tracing.event_count()} eventos")
+
+    def clear(self):
+        tracing.clear()
+        self.populate()
+
+    def export(self):
+        path = Config.STORAGE_DIR / 'traces' / f"trace_{datetime.now():%Y%m%d_%H%M%S}.json"
+        written = tracing.export_chrome_trace(path)
+        if written:
+            self.lbl_status.setText(f"Traza exportada a {written} (abrir en chrome://tracing o Perfetto)")
+        else:
+            self.lbl_status.setText("No hay eventos para exportar")
@@ -58,8 +58,25 @@ class ModernColors:
         'shadow_lg': 'rgba(0, 0, 0, 0.9)',
     }
     
-    # Referencia Dark (opcional)
-    DARK = LIGHT.copy()
+    # Variante Dark: fondos neutros (Zinc) casi negros, mismos acentos pastel
+    DARK = {
+        **LIGHT,
+        'bg_primary': '#09090B',      # Zinc 950
+        'bg_secondary': '#09090B',
+        'bg_tertiary': '#18181B',     # Zinc 900
+        'surface': '#18181B',
+        'surface_elevated': '#27272A', # Zinc 800
+        'surface_variant': '#27272A',
+        'primary_light': '#1E3A8A',   # Blue 900
+        'border': '#27272A',
+        'border_hover': '#3F3F46',    # Zinc 700
+        'text_primary': '#F4F4F5',    # Zinc 100
+        'text_secondary': '#A1A1AA',  # Zinc 400
+        'text_tertiary': '#71717A',   # Zinc 500
+        'text_inverse': '#09090B',
+    }
+    
+    THEMES = {'light': LIGHT, 'dark': DARK}
 
 
 class Typography:
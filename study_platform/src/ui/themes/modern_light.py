@@ -6,8 +6,8 @@ from .colors import ModernColors, Typography, Spacing, BorderRadius
 class ModernLightTheme:
     """Tema claro moderno con excelente legibilidad"""
     
-    def __init__(self):
-        self.colors = ModernColors.LIGHT
+    def __init__(self, colors=None):
+        self.colors = colors or ModernColors.LIGHT
         
     def get_stylesheet(self) -> str:
         """Retorna el stylesheet completo de PyQt5"""
@@ -235,6 +235,346 @@ class ModernLightTheme:
             border-color: {c['primary']};
         }}
         
+        /* ===== ESTADOS DINÁMICOS (propiedades + polish, sin setStyleSheet) ===== */
+        QFrame[frameType="card"]:disabled {{
+            background-color: {c['bg_tertiary']};
+            color: {c['text_tertiary']};
+        }}
+        
+        QFrame[frameType="card"][selected="true"] {{
+            border: 2px solid {c['primary']};
+            background-color: {c['primary_light']};
+        }}
+        
+        QFrame[frameType="pomodoro"] {{
+            background-color: {c['bg_secondary']};
+            border: 2px solid {c['primary']};
+            border-radius: {BorderRadius.LG}px;
+            padding: {Spacing.MD}px;
+        }}
+        
+        QFrame[frameType="pomodoro"][pomodoroState="working"] {{
+            border-color: {c['success']};
+        }}
+        
+        QFrame[frameType="pomodoro"][pomodoroState="break"] {{
+            background-color: {c['info_light']};
+            border-color: {c['info']};
+        }}
+        
+        QFrame[frameType="pomodoro"][pomodoroState="paused"] {{
+            background-color: {c['warning_light']};
+            border-color: {c['warning']};
+        }}
+        
+        QFrame[feedbackState="success"] {{
+            background-color: {c['success_light']};
+            border-left: 4px solid {c['success']};
+            border-radius: {BorderRadius.SM}px;
+            padding: {Spacing.MD}px;
+        }}
+        
+        QFrame[feedbackState="error"] {{
+            background-color: {c['error_light']};
+            border-left: 4px solid {c['error']};
+            border-radius: {BorderRadius.SM}px;
+            padding: {Spacing.MD}px;
+        }}
+        
+        QFrame[feedbackState="warning"] {{
+            background-color: {c['warning_light']};
+            border-left: 4px solid {c['warning']};
+            border-radius: {BorderRadius.SM}px;
+            padding: {Spacing.MD}px;
+        }}
+        
+        QLabel[feedbackState="success"] {{
+            background-color: transparent;
+            border: none;
+            padding: 0px;
+            color: {c['success']};
+            font-weight: {Typography.WEIGHT_BOLD};
+        }}
+        
+        QLabel[feedbackState="error"] {{
+            background-color: transparent;
+            border: none;
+            padding: 0px;
+            color: {c['error']};
+            font-weight: {Typography.WEIGHT_BOLD};
+        }}
+        
+        /* ===== QUIZ ===== */
+        QLabel[labelType="accentCaption"] {{
+            font-size: {Typography.SIZE_SM}px;
+            color: {c['primary']};
+        }}
+        
+        QLabel[labelType="metric"] {{
+            background-color: {c['bg_tertiary']};
+            border-radius: {Spacing.SM}px;
+            padding: 4px 8px;
+            font-size: {Typography.SIZE_SM}px;
+        }}
+        
+        QLabel[labelType="metric"][tone="success"] {{
+            color: {c['success']};
+        }}
+        
+        QLabel[labelType="metric"][tone="error"] {{
+            color: {c['error']};
+        }}
+        
+        QLabel[labelType="metric"][tone="strong"] {{
+            font-weight: {Typography.WEIGHT_BOLD};
+        }}
+        
+        QLabel[labelType="question"] {{
+            font-size: {Typography.SIZE_LG}px;
+            font-weight: {Typography.WEIGHT_MEDIUM};
+            padding: {Spacing.MD}px 0;
+            color: {c['text_primary']};
+        }}
+        
+        QLabel[labelType="display"] {{
+            font-size: {Typography.SIZE_5XL}px;
+            font-weight: {Typography.WEIGHT_BOLD};
+            color: {c['primary']};
+        }}
+        
+        QRadioButton[radioType="option"] {{
+            padding: {Spacing.MD}px;
+            font-size: {Typography.SIZE_BASE}px;
+        }}
+        
+        QPushButton[buttonType="badge"] {{
+            background-color: {c['bg_tertiary']};
+            color: {c['accent_1']};
+            border: 1px solid {c['accent_1']};
+            border-radius: 15px;
+            font-weight: bold;
+            font-size: 13px;
+            margin-left: 10px;
+        }}
+        
+        QPushButton[buttonType="badge"]:hover {{
+            background-color: {c['accent_1']};
+            color: {c['text_inverse']};
+        }}
+        
+        QPushButton[buttonType="counter"] {{
+            background-color: transparent;
+            color: {c['text_secondary']};
+            border: 1px solid {c['border']};
+            border-radius: 14px;
+            font-weight: bold;
+            font-size: 11px;
+        }}
+        
+        QPushButton[buttonType="counter"]:hover {{
+            background-color: {c['primary_light']};
+            color: {c['primary']};
+            border-color: {c['primary']};
+        }}
+        
+        /* ===== LISTAS DE ESTADÍSTICAS ===== */
+        QFrame[frameType="listRow"] {{
+            background-color: {c['bg_secondary']};
+            border-radius: {BorderRadius.SM}px;
+            padding: {Spacing.SM}px;
+        }}
+        
+        QLabel[labelType="empty"] {{
+            color: {c['text_secondary']};
+            font-style: italic;
+        }}
+        
+        QLabel[labelType="rowValue"] {{
+            font-weight: {Typography.WEIGHT_SEMIBOLD};
+        }}
+        
+        QLabel[labelType="rowValue"][tone="error"] {{
+            color: {c['error']};
+        }}
+        
+        QLabel[labelType="rowValue"][tone="muted"] {{
+            color: {c['text_secondary']};
+        }}
+        
+        QLabel[labelType="statValue"] {{
+            font-size: {Typography.SIZE_3XL}px;
+            font-weight: {Typography.WEIGHT_BOLD};
+            color: {c['primary']};
+        }}
+        
+        QLabel[labelType="statValueLarge"] {{
+            font-size: {Typography.SIZE_4XL}px;
+            font-weight: {Typography.WEIGHT_BOLD};
+            color: {c['primary']};
+        }}
+        
+        /* Banda de puntuación (tone = success | warning | error) */
+        QLabel[labelType="score"] {{
+            font-size: {Typography.SIZE_XL}px;
+            font-weight: {Typography.WEIGHT_BOLD};
+        }}
+        
+        QLabel[labelType="score"][tone="success"] {{ color: {c['success']}; }}
+        QLabel[labelType="score"][tone="warning"] {{ color: {c['warning']}; }}
+        QLabel[labelType="score"][tone="error"] {{ color: {c['error']}; }}
+        
+        QProgressBar[barType="score"] {{
+            background-color: {c['bg_tertiary']};
+            border-radius: 5px;
+        }}
+        
+        QProgressBar[barType="score"]::chunk {{
+            border-radius: 5px;
+        }}
+        
+        QProgressBar[barType="score"][tone="success"]::chunk {{ background: {c['success']}; }}
+        QProgressBar[barType="score"][tone="warning"]::chunk {{ background: {c['warning']}; }}
+        QProgressBar[barType="score"][tone="error"]::chunk {{ background: {c['error']}; }}
+        
+        /* ===== BARRA SUPERIOR ===== */
+        QFrame[frameType="header"] {{
+            background-color: {c['bg_primary']};
+            border: none;
+            border-bottom: 1px solid {c['border']};
+        }}
+        
+        QLabel[labelType="appTitle"] {{
+            color: {c['primary']};
+            font-weight: {Typography.WEIGHT_BOLD};
+            font-size: 18px;
+        }}
+        
+        QPushButton[buttonType="header"] {{
+            background-color: {c['surface']};
+            color: {c['text_primary']};
+            border: 1px solid {c['border']};
+            border-radius: {BorderRadius.MD}px;
+            padding: 8px 16px;
+            font-weight: {Typography.WEIGHT_BOLD};
+            min-height: 0px;
+        }}
+        
+        QPushButton[buttonType="header"]:hover {{
+            background-color: {c['surface_elevated']};
+            border-color: {c['primary']};
+            color: {c['primary']};
+        }}
+        
+        /* ===== NOTAS ===== */
+        QLabel[labelType="subtitle"][tone="accent"] {{
+            color: {c['primary']};
+            font-weight: {Typography.WEIGHT_BOLD};
+        }}
+        
+        QFrame[frameType="inset"] {{
+            background-color: {c['bg_secondary']};
+            border-radius: {BorderRadius.MD}px;
+            padding: {Spacing.SM}px;
+        }}
+        
+        QTextEdit[editorType="note"] {{
+            background-color: {c['bg_tertiary']};
+            border: none;
+            border-radius: {BorderRadius.SM}px;
+            padding: {Spacing.SM}px;
+            font-family: {Typography.FONT_FAMILY_PRIMARY};
+        }}
+        
+        QPushButton[buttonType="compact"] {{
+            border-radius: {BorderRadius.SM}px;
+            padding: 8px;
+            font-weight: {Typography.WEIGHT_BOLD};
+            min-height: 0px;
+        }}
+        
+        QPushButton[buttonType="close"] {{
+            background-color: transparent;
+            color: {c['text_secondary']};
+            border: none;
+            padding: 0px;
+            font-weight: {Typography.WEIGHT_BOLD};
+            min-height: 0px;
+        }}
+        
+        QPushButton[buttonType="close"]:hover {{
+            color: {c['error']};
+        }}
+        
+        /* ===== POMODORO ===== */
+        QLabel[labelType="timer"] {{
+            font-size: {Typography.SIZE_4XL}px;
+            font-weight: {Typography.WEIGHT_BOLD};
+            color: {c['primary']};
+            font-family: monospace;
+        }}
+        
+        QPushButton[buttonType="pomodoro"] {{
+            color: white;
+            font-weight: {Typography.WEIGHT_BOLD};
+            padding: 8px 16px;
+            border-radius: 4px;
+        }}
+        
+        QPushButton[buttonType="pomodoro"][tone="success"] {{ background-color: {c['success']}; }}
+        QPushButton[buttonType="pomodoro"][tone="warning"] {{ background-color: {c['warning']}; }}
+        
+        /* ===== SQL TRAINER ===== */
+        QTextEdit[editorType="sql"] {{
+            background-color: {c['bg_secondary']};
+            border: 1px solid {c['border']};
+            font-family: {Typography.FONT_FAMILY_MONO};
+        }}
+        
+        QTextEdit[editorType="sqlReadOnly"] {{
+            background-color: {c['bg_tertiary']};
+            border: none;
+            border-radius: {BorderRadius.SM}px;
+            padding: {Spacing.SM}px;
+            font-family: {Typography.FONT_FAMILY_MONO};
+        }}
+        
+        QPushButton[buttonType="info"] {{
+            background-color: {c['info']};
+            color: white;
+            font-weight: {Typography.WEIGHT_BOLD};
+        }}
+        
+        /* ===== OVERLAY DE RENDIMIENTO ===== */
+        QFrame[frameType="overlay"] {{
+            background-color: {c['bg_tertiary']};
+            border: 1px solid {c['border_hover']};
+            border-radius: {BorderRadius.MD}px;
+        }}
+        
+        QFrame[frameType="overlay"] QLabel {{
+            border: none;
+            font-family: {Typography.FONT_FAMILY_MONO};
+            font-size: {Typography.SIZE_XS}px;
+        }}
+        
+        QFrame[frameType="toast"] {{
+            background-color: {c['surface_elevated']};
+            border: 1px solid {c['warning']};
+            border-left: 4px solid {c['warning']};
+            border-radius: {BorderRadius.MD}px;
+        }}
+        
+        QFrame[frameType="toast"] QLabel {{
+            border: none;
+            color: {c['text_secondary']};
+            font-size: {Typography.SIZE_SM}px;
+        }}
+        
+        QFrame[frameType="toast"] QLabel[labelType="toastTitle"] {{
+            color: {c['text_primary']};
+            font-weight: {Typography.WEIGHT_SEMIBOLD};
+        }}
+        
         /* ===== TOOLTIPS ===== */
         QToolTip {{
             background-color: {c['text_primary']};
@@ -0,0 +1,67 @@
+"""
+Gestión de temas: stylesheets compilados una vez por tema y aplicados a la QApplication
+Los estados visuales (feedback, selección, fase Pomodoro...) se expresan con
+propiedades dinámicas cubiertas por el stylesheet global, no con setStyleSheet.
+"""
+from typing import Dict, Optional
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from config import Config
+from .colors import ModernColors
+from .modern_light import ModernLightTheme
+
+
+_compiled: Dict[str, str] = {}
+_current_theme: Optional[str] = None
+
+
+def compiled_stylesheet(theme: str) -> str:
+    """Stylesheet del tema (se formatea solo la primera vez)"""
+    sheet = _compiled.get(theme)
+    if sheet is None:
+        colors = ModernColors.THEMES.get(theme, ModernColors.LIGHT)
+        sheet = _compiled[theme] = ModernLightTheme(colors).get_stylesheet()
+    return sheet
+
+
+def current_theme() -> str:
+    return _current_theme or Config.DEFAULT_THEME
+
+
+def palette() -> dict:
+    """Colores del tema actual, para lo que el stylesheet no cubre (HTML, QPainter)"""
+    return ModernColors.THEMES.get(current_theme(), ModernColors.LIGHT)
+
+
+def apply_theme(theme: Optional[str] = None, app: Optional[QApplication] = None) -> str:
+    """Aplica el tema a toda la aplicación (un único repulido de los widgets)"""
+    global _current_theme
+    theme = theme or current_theme()
+    if theme not in ModernColors.THEMES:
+        print(f"Unknown theme '{theme}', using '{Config.DEFAULT_THEME}'")
+        theme = Config.DEFAULT_THEME
+    app = app or QApplication.instance()
+    if app is not None and theme != _current_theme:
+        app.setStyleSheet(compiled_stylesheet(theme))
+        _current_theme = theme
+    return theme
+
+
+def toggle_theme() -> str:
+    return apply_theme('dark' if current_theme() == 'light' else 'light')
+
+
+def set_style_state(widget: QWidget, name: str, value) -> bool:
+    """
+    Cambia una propiedad de estilo y repule solo ese widget.
+    Retorna False si el valor no cambió (no se recalcula nada).
+    """
+    if widget.property(name) == value:
+        return False
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+    return True
@@ -0,0 +1,92 @@
+"""
+Gestor del ciclo de vida de las vistas del QStackedWidget principal
+- Vistas reutilizables: se construyen una vez y se refrescan al volver a ellas
+- Vistas desechables (quiz, SQL trainer): se eliminan al navegar fuera
+"""
+from typing import Callable, Dict, Optional
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtWidgets import QApplication, QStackedWidget, QWidget
+
+
+class ViewManager(QObject):
+    """Navegación sobre un QStackedWidget sin acumular árboles de widgets"""
+
+    def __init__(self, stack: QStackedWidget):
+        super().__init__(stack)
+        self.stack = stack
+        self._cached: Dict[str, QWidget] = {}
+        self._refresh_hooks: Dict[str, Callable[[QWidget], None]] = {}
+        self._disposable = set()
+
+    def register(self, key: str, widget: QWidget, refresh: Optional[Callable[[QWidget], None]] = None):
+        """Registra una vista ya construida como reutilizable"""
+        if self.stack.indexOf(widget) == -1:
+            self.stack.addWidget(widget)
+        self._cached[key] = widget
+        if refresh:
+            self._refresh_hooks[key] = refresh
+
+    def get(self, key: str) -> Optional[QWidget]:
+        return self._cached.get(key)
+
+    def show(self, key: str) -> Optional[QWidget]:
+        """Muestra una vista reutilizable ya registrada, refrescándola"""
+        widget = self._cached.get(key)
+        if widget is None:
+            return None
+        hook = self._refresh_hooks.get(key)
+        if hook:
+            hook(widget)
+        self._switch_to(widget)
+        return widget
+
+    def show_cached(self, key: str, factory: Callable[[], QWidget],
+                    refresh: Optional[Callable[[QWidget], None]] = None) -> QWidget:
+        """Muestra la vista `key`; la construye con `factory` solo la primera vez"""
+        if key not in self._cached:
+            self.register(key, factory(), refresh)
+            self._switch_to(self._cached[key])
+            return self._cached[key]
+        if refresh and key not in self._refresh_hooks:
+            self._refresh_hooks[key] = refresh
+        return self.show(key)
+
+    def show_disposable(self, widget: QWidget) -> QWidget:
+        """Muestra una vista de un solo uso; se eliminará al navegar a otra"""
+        self._disposable.add(widget)
+        self.stack.addWidget(widget)
+        self._switch_to(widget)
+        return widget
+
+    def invalidate(self, key: str):
+        """Descarta una vista reutilizable para que se reconstruya en el próximo acceso"""
+        widget = self._cached.pop(key, None)
+        self._refresh_hooks.pop(key, None)
+        if widget is not None and widget is not self.stack.currentWidget():
+            self._dispose(widget)
+        elif widget is not None:
+            self._disposable.add(widget)  # Se elimina al salir de ella
+
+    def _switch_to(self, widget: QWidget):
+        previous = self.stack.currentWidget()
+        self.stack.setCurrentWidget(widget)
+        if previous is not None and previous is not widget and previous in self._disposable:
+            self._dispose(previous)
+
+    def _dispose(self, widget: QWidget):
+        self._disposable.discard(widget)
+        self.stack.removeWidget(widget)
+        widget.deleteLater()
+
+    def widget_counts(self) -> dict:
+        """Contadores de widgets vivos para diagnóstico"""
+        return {
+            'stack_pages': self.stack.count(),
+            'cached_views': {
+                key: len(widget.findChildren(QWidget)) + 1
+                for key, widget in self._cached.items()
+            },
+            'disposable_views': len(self._disposable),
+            'app_widgets': len(QApplication.allWidgets()),
+        }
@@ -2,22 +2,22 @@
 Dashboard principal - CON ESTADÍSTICAS REALES DEL CSV
 """
 import sys
+import time
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QFrame, QScrollArea, QGridLayout, QStackedWidget
 )
 from PyQt5.QtCore import Qt
 
-from ..themes.colors import ModernColors, Typography, Spacing
+from ..themes.colors import Typography, Spacing
 from ...services.data_loader import DataLoader
 from ...services.persistence import PersistenceService
+from ...services.search_service import SearchService
+from ...services.profiles import ProfileRegistry
+from ...core.event_bus import event_bus, QuestionAnswered, SessionEnded, ProfileSwitched
 from ...utils.pomodoro_timer import PomodoroTimer
 from ..components.pomodoro_widget import PomodoroWidget
 
-class StatCard(QFrame):
-    """Tarjeta de estadística moderna y legible"""
-from .quiz_view import QuizView
-
 
 class StatCard(QFrame):
     """Tarjeta de estadística moderna y legible"""
@@ -41,24 +41,29 @@ class StatCard(QFrame):
         
         # Valor principal (grande y prominente)
         value_label = QLabel(value)
-        value_label.setStyleSheet(f"""
-            font-size: {Typography.SIZE_3XL}px;
-            font-weight: {Typography.WEIGHT_BOLD};
-            color: {ModernColors.LIGHT['primary']};
-        """)
+        self.value_label = value_label
+        value_label.setProperty("labelType", "statValue")
         
         layout.addWidget(title_label)
         layout.addWidget(value_label)
         
+        self.subtitle_label = None
         if subtitle:
-            subtitle_label = QLabel(subtitle)
-            subtitle_label.setProperty("labelType", "caption")
-            subtitle_label.setWordWrap(True)
-            layout.addWidget(subtitle_label)
+            self.subtitle_label = QLabel(subtitle)
+            self.subtitle_label.setProperty("labelType", "caption")
+            self.subtitle_label.setWordWrap(True)
+            layout.addWidget(self.subtitle_label)
         
         layout.addStretch()
         self.setLayout(layout)
         self.setMinimumHeight(120)
+    
+    def set_value(self, value: str, subtitle: str = ""):
+        """Actualiza el valor en sitio (sin reconstruir la tarjeta)"""
+        if self.value_label.text() != value:
+            self.value_label.setText(value)
+        if self.subtitle_label is not None and subtitle and self.subtitle_label.text() != subtitle:
+            self.subtitle_label.setText(subtitle)
 
 
 class ModeCard(QFrame):
@@ -122,39 +127,46 @@ class DashboardView(QWidget):
         super().__init__()
         # Inicializarservicios
         self.data_loader = DataLoader()
-        self.persistence = PersistenceService()
-        self.user_stats = self.persistence.load_user_stats()
+        # Progreso por perfil: estadísticas y métricas en storage/profiles/<id>
+        self.profiles = ProfileRegistry()
+        self.persistence = PersistenceService(self.profiles.path(self.profiles.active_id),
+                                              self.profiles.stats_sources(self.profiles.active_id))
+        self.user_stats = self.persistence.get_user_stats()
         
         # Referencia a ventana padre (será seteada por MainWindow)
         self.parent_window = None
+        self._search_service = None
         
         # Cargar datos
         self.load_data()
         
         # Inicializar Pomodoro
-        self.pomodoro_timer = PomodoroTimer()
+        self.pomodoro_timer = PomodoroTimer(self.persistence)
         self.pomodoro_ui = PomodoroWidget(self.pomodoro_timer)
         self.mode_cards = [] # Para guardarlos y deshabilitarlos
         
         self.setup_ui()
         self.update_access(False) # Bloquear acceso inicialmente
+        
+        event_bus.subscribe(QuestionAnswered, self.on_question_answered)
+        event_bus.subscribe(SessionEnded, self.on_session_ended)
+        event_bus.subscribe(ProfileSwitched, self.on_profile_switched)
     
     def load_data(self):
         """Carga datos de comandos y preguntas CON MÉTRICAS"""
+        started = time.perf_counter()
         try:
             self.commands = self.data_loader.load_all_commands()
             self.questions = self.data_loader.load_all_questions()
+            self._activate_profile_metrics(self.profiles.active_id)
             self.modules_summary = self.data_loader.get_modules_summary()
             
-            # Calcular estadísticas agregadas de las métricas del CSV
-            self.questions_stats = self.data_loader.calculate_questions_stats(self.questions)
+            # Agregados materializados (caché) en lugar de recorrer todas las preguntas
+            self.aggregates = self.data_loader.load_aggregates(self.questions)
+            self.questions_stats = self._questions_stats()
             
             # Calcular precisión global real del CSV
-            total_attempts = self.questions_stats['total_correct'] + self.questions_stats['total_incorrect']
-            if total_attempts > 0:
-                self.global_accuracy = (self.questions_stats['total_correct'] / total_attempts) * 100
-            else:
-                self.global_accuracy = 0.0
+            self.global_accuracy = self._global_accuracy()
             
             print(f"✅ Cargados: {len(self.commands)} comandos, {len(self.questions)} preguntas")
             print(f"📊 Estadísticas del CSV:")
@@ -176,6 +188,82 @@ class DashboardView(QWidget):
                 'seen': 0, 'total_correct': 0, 'total_incorrect': 0
             }
             self.global_accuracy = 0.0
+            self.aggregates = None
+        self.last_load_ms = (time.perf_counter() - started) * 1000
+    
+    def _activate_profile_metrics(self, profile_id: str):
+        profile = self.profiles.profiles[profile_id]
+        self.data_loader.use_profile(profile_id, self.profiles.shards(profile_id), self.questions,
+                                     seed=profile.seed_from_content)
+        self.profiles.mark_seeded(profile_id)
+
+    def switch_profile(self, profile_id: str):
+        """
+        Cambia de estudiante sin recargar el contenido: escribe lo pendiente del
+        perfil actual, aplica las métricas del nuevo y recarga sus estadísticas
+        """
+        if profile_id == self.profiles.active_id:
+            return
+        self.pomodoro_timer.pause()
+        self.profiles.set_active(profile_id)
+        self._activate_profile_metrics(profile_id)
+        self.aggregates = self.data_loader.aggregates
+        self.persistence.use_profile(self.profiles.path(profile_id), self.profiles.stats_sources(profile_id))
+        # Las vistas suscritas (también este dashboard) se actualizan con el evento
+        event_bus.publish(ProfileSwitched(profile_id, self.persistence.get_user_stats()))
+
+    @property
+    def search_service(self):
+        """Índice de búsqueda, construido (o leído de la caché) en el primer uso"""
+        if self._search_service is None and self.questions:
+            try:
+                self._search_service = SearchService.load_or_build(
+                    self.questions, self.commands,
+                    question_fingerprint=self.data_loader.content_fingerprint(self.questions)
+                )
+            except Exception as e:
+                print(f"Error building search index: {e}")
+        return self._search_service
+    
+    def _global_accuracy(self) -> float:
+        total_attempts = self.questions_stats['total_correct'] + self.questions_stats['total_incorrect']
+        if total_attempts > 0:
+            return (self.questions_stats['total_correct'] / total_attempts) * 100
+        return 0.0
+    
+    def _questions_stats(self) -> dict:
+        """Estadísticas globales leídas de los contadores agregados"""
+        totals = self.aggregates.totals
+        return {
+            'total': totals.total,
+            'mastered': totals.mastered,
+            'learning': totals.learning,
+            'new': totals.new,
+            'seen': totals.seen,
+            'total_correct': totals.correct,
+            'total_incorrect': totals.incorrect,
+        }
+    
+    def refresh(self):
+        """Relee los contadores agregados y actualiza solo las tarjetas que cambiaron"""
+        if self.aggregates is None:
+            return
+        self.questions_stats = self._questions_stats()
+        self.global_accuracy = self._global_accuracy()
+        for key, (_, value, subtitle) in self.stat_card_values().items():
+            self.stat_cards[key].set_value(value, subtitle)
+    
+    def stat_card_values(self) -> dict:
+        """Valores de las tarjetas de estadísticas: {clave: (título, valor, subtítulo)}"""
+        total_questions = str(len(self.questions))
+        return {
+            'total': ("Total Preguntas", total_questions, "En la biblioteca"),
+            'seen': ("Preguntas Vistas", str(self.questions_stats['seen']), f"de {total_questions}"),
+            'mastered': ("✅ Masterizadas", str(self.questions_stats['mastered']), "≥ 80% precisión"),
+            'learning': ("📚 En Aprendizaje", str(self.questions_stats['learning']), "50-79% precisión"),
+            'new': ("⭐ Nuevas/Practicar", str(self.questions_stats['new']), "< 50% precisión"),
+            'accuracy': ("Precisión Global", f"{self.global_accuracy:.0f}%", "De tus respuestas"),
+        }
     
     def setup_ui(self):
         """Configura la interfaz"""
@@ -254,28 +342,11 @@ class DashboardView(QWidget):
         grid = QGridLayout()
         grid.setSpacing(Spacing.MD)
         
-        # VALORES REALES DEL CSV
-        total_questions = str(len(self.questions))
-        questions_seen = str(self.questions_stats['seen'])
-        questions_mastered = str(self.questions_stats['mastered'])
-        questions_learning = str(self.questions_stats['learning'])
-        questions_new = str(self.questions_stats['new'])
-        
-        # Precisión REAL del CSV
-        accuracy = f"{self.global_accuracy:.0f}%"
-        
-        # Tarjetas con valores REALES
-        stats = [
-            ("Total Preguntas", total_questions, "En la biblioteca"),
-            ("Preguntas Vistas", questions_seen, f"de {total_questions}"),
-            ("✅ Masterizadas", questions_mastered, "≥ 80% precisión"),
-            ("📚 En Aprendizaje", questions_learning, "50-79% precisión"),
-            ("⭐ Nuevas/Practicar", questions_new, "< 50% precisión"),
-            ("Precisión Global", accuracy, "De tus respuestas"),
-        ]
-        
-        for i, (title, value, subtitle) in enumerate(stats):
+        # Tarjetas con valores REALES del CSV (se guardan para refrescarlas en sitio)
+        self.stat_cards = {}
+        for i, (key, (title, value, subtitle)) in enumerate(self.stat_card_values().items()):
             card = StatCard(title, value, subtitle)
+            self.stat_cards[key] = card
             row = i // 3
             col = i % 3
             grid.addWidget(card, row, col)
@@ -318,23 +389,24 @@ class DashboardView(QWidget):
         section.setLayout(layout)
         return section
     
+    def on_question_answered(self, event):
+        self.refresh()
+
+    def on_session_ended(self, event):
+        """Mantiene las estadísticas en memoria al día con el ledger de sesiones"""
+        self.user_stats = event.stats
+
+    def on_profile_switched(self, event):
+        """Estadísticas y tarjetas del nuevo perfil"""
+        self.user_stats = event.stats
+        self.refresh()
+
     def update_access(self, enabled):
         """Habilita o deshabilita los modos de estudio según el Pomodoro"""
         for card in self.mode_cards:
+            # El estilo deshabilitado lo aplica el stylesheet global (:disabled)
             card.setEnabled(enabled)
-            # Aplicar estilo visual de deshabilitado
-            if enabled:
-                card.setStyleSheet("")
-                card.setCursor(Qt.PointingHandCursor)
-            else:
-                card.setStyleSheet(f"""
-                    QFrame[frameType="card"] {{
-                        background-color: {ModernColors.LIGHT['bg_tertiary']};
-                        opacity: 0.6;
-                        color: {ModernColors.LIGHT['text_tertiary']};
-                    }}
-                """)
-                card.setCursor(Qt.ForbiddenCursor)
+            card.setCursor(Qt.PointingHandCursor if enabled else Qt.ForbiddenCursor)
 
     def open_study_selection(self):
         """Abre la vista de config de estudio"""
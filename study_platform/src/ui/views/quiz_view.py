@@ -9,8 +9,11 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont
 import random
+import time
 
-from ..themes.colors import ModernColors, Typography, Spacing, BorderRadius
+from ..themes.colors import Spacing
+from ..themes.theme_manager import set_style_state
+from ...utils.tracing import traced
 from ...models.question import Question
 
 
@@ -120,6 +123,7 @@ class QuizView(QWidget):
         header.setLayout(layout)
         return header
     
+    @traced(cat='ui')
     def show_question(self):
         """Muestra la pregunta actual"""
         # Limpiar layout anterior
@@ -147,42 +151,29 @@ class QuizView(QWidget):
         
         # Módulo y sección
         module_label = QLabel(f"📁 {question.module} → {question.section}")
-        module_label.setProperty("labelType", "caption")
-        module_label.setStyleSheet(f"color: {ModernColors.LIGHT['primary']};")
+        module_label.setProperty("labelType", "accentCaption")
         card_layout.addWidget(module_label)
         
         # --- NUEVO: Barra de Métricas de la Pregunta ---
         metrics_layout = QHBoxLayout()
         metrics_layout.setSpacing(Spacing.MD)
         
-        # Estilo para las etiquetas de métricas
-        metric_style = f"""
-            background-color: {ModernColors.LIGHT['bg_tertiary']};
-            border-radius: {Spacing.SM}px;
-            padding: 4px 8px;
-            font-size: {Typography.SIZE_SM}px;
-        """
-        
         # Datos
         total_attempts = question.times_correct + question.times_incorrect
         accuracy = (question.times_correct / total_attempts * 100) if total_attempts > 0 else 0
         
-        lbl_seen = QLabel(f"👁️ Vistas: {question.times_seen}")
-        lbl_seen.setStyleSheet(metric_style)
-        
-        lbl_correct = QLabel(f"✅ Aciertos: {question.times_correct}")
-        lbl_correct.setStyleSheet(metric_style + f"color: {ModernColors.LIGHT['success']};")
-        
-        lbl_incorrect = QLabel(f"❌ Fallos: {question.times_incorrect}")
-        lbl_incorrect.setStyleSheet(metric_style + f"color: {ModernColors.LIGHT['error']};")
-        
-        lbl_acc = QLabel(f"📊 Precisión: {accuracy:.1f}%")
-        lbl_acc.setStyleSheet(metric_style + f"font-weight: bold;")
-        
-        metrics_layout.addWidget(lbl_seen)
-        metrics_layout.addWidget(lbl_correct)
-        metrics_layout.addWidget(lbl_incorrect)
-        metrics_layout.addWidget(lbl_acc)
+        # Etiquetas de métricas: estilo por propiedades del stylesheet global
+        for text, tone in (
+            (f"👁️ Vistas: {question.times_seen}", None),
+            (f"✅ Aciertos: {question.times_correct}", "success"),
+            (f"❌ Fallos: {question.times_incorrect}", "error"),
+            (f"📊 Precisión: {accuracy:.1f}%", "strong"),
+        ):
+            lbl_metric = QLabel(text)
+            lbl_metric.setProperty("labelType", "metric")
+            if tone:
+                lbl_metric.setProperty("tone", tone)
+            metrics_layout.addWidget(lbl_metric)
         metrics_layout.addStretch() # Empujar a la izquierda
         
         card_layout.addLayout(metrics_layout)
@@ -195,33 +186,14 @@ class QuizView(QWidget):
         
         q_text = QLabel(question.question_text)
         q_text.setWordWrap(True)
-        q_text.setStyleSheet(f"""
-            font-size: {Typography.SIZE_LG}px;
-            font-weight: {Typography.WEIGHT_MEDIUM};
-            padding: {Spacing.MD}px 0;
-            color: {ModernColors.LIGHT['text_primary']};
-        """)
+        q_text.setProperty("labelType", "question")
         q_layout.addWidget(q_text, 1) # Expandir texto
         
         # Botón Contador para la Pregunta (Estilo Badge)
         q_counter_btn = QPushButton("0")
         q_counter_btn.setFixedSize(30, 30)
         q_counter_btn.setCursor(Qt.PointingHandCursor)
-        q_counter_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {ModernColors.LIGHT['bg_tertiary']};
-                color: {ModernColors.LIGHT['accent_1']};
-                border: 1px solid {ModernColors.LIGHT['accent_1']};
-                border-radius: 15px; /* Circular */
-                font-weight: bold;
-                font-size: 13px;
-                margin-left: 10px;
-            }}
-            QPushButton:hover {{
-                background-color: {ModernColors.LIGHT['accent_1']};
-                color: {ModernColors.LIGHT['text_inverse']};
-            }}
-        """)
+        q_counter_btn.setProperty("buttonType", "badge")
         q_counter_btn.clicked.connect(lambda checked, b=q_counter_btn: self.increment_counter(b))
         q_layout.addWidget(q_counter_btn)
         
@@ -253,12 +225,7 @@ class QuizView(QWidget):
             
             # Opción (Radio Button)
             radio = QRadioButton(opt_data['text'])
-            radio.setStyleSheet(f"""
-                QRadioButton {{
-                    padding: {Spacing.MD}px;
-                    font-size: {Typography.SIZE_BASE}px;
-                }}
-            """)
+            radio.setProperty("radioType", "option")
             self.options_group.addButton(radio, i)
             row_layout.addWidget(radio, 1) # Expandir para ocupar espacio
             
@@ -266,23 +233,7 @@ class QuizView(QWidget):
             counter_btn = QPushButton("0")
             counter_btn.setFixedSize(28, 28)
             counter_btn.setCursor(Qt.PointingHandCursor)
-            
-            # Estilo del contador
-            counter_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {ModernColors.LIGHT['text_secondary']};
-                    border: 1px solid {ModernColors.LIGHT['border']};
-                    border-radius: 14px;
-                    font-weight: bold;
-                    font-size: 11px;
-                }}
-                QPushButton:hover {{
-                    background-color: {ModernColors.LIGHT['primary_light']};
-                    color: {ModernColors.LIGHT['primary']};
-                    border-color: {ModernColors.LIGHT['primary']};
-                }}
-            """)
+            counter_btn.setProperty("buttonType", "counter")
             
             # Conectar clic para incrementar
             counter_btn.clicked.connect(lambda checked, b=counter_btn: self.increment_counter(b))
@@ -317,7 +268,10 @@ class QuizView(QWidget):
         self.check_btn.setVisible(True)
         self.next_btn.setVisible(False)
         self.progress_bar.setValue(self.current_index)
+        # Tiempo de respuesta: desde que la pregunta está en pantalla (reloj monótono)
+        self.question_shown_at = time.monotonic()
     
+    @traced(cat='ui')
     def check_answer(self):
         """Verifica la respuesta basada en opciones mezcladas"""
         selected_id = self.options_group.checkedId()
@@ -325,6 +279,7 @@ class QuizView(QWidget):
         if selected_id == -1: return
         
         question = self.quiz_questions[self.current_index]
+        seconds = time.monotonic() - self.question_shown_at
         
         # Validar contra nuestras opciones mezcladas
         user_choice = self.current_shuffled_options[selected_id]
@@ -333,44 +288,35 @@ class QuizView(QWidget):
         # Actualizar métricas
         if is_correct:
             self.answered_correctly += 1
-            question.times_correct += 1
         else:
             self.answered_incorrectly += 1
-            question.times_incorrect += 1
-        question.times_seen += 1
         
-        # GUARDAR EN TIEMPO REAL
+        # GUARDAR EN TIEMPO REAL (pregunta, agregados y CSV)
         if self.data_loader:
-            self.data_loader.update_question_stats(question)
+            self.data_loader.record_answer(question, is_correct)
+        else:
+            if is_correct:
+                question.times_correct += 1
+            else:
+                question.times_incorrect += 1
+            question.times_seen += 1
+        # Estadísticas del perfil (compartidas con las apps clásicas); se guardan al terminar
+        if self.persistence:
+            self.persistence.record_question_answer(question, is_correct, seconds, save=False)
         
         # Buscar texto de respuesta correcta para feedback
         correct_text = next((opt['text'] for opt in self.current_shuffled_options if opt['is_correct']), "Desconocida")
 
 
         
-        # Mostrar feedback
+        # Mostrar feedback (estado por propiedad: un repulido, sin recompilar estilos)
+        state = "success" if is_correct else "error"
+        set_style_state(self.feedback_frame, "feedbackState", state)
+        set_style_state(self.feedback_label, "feedbackState", state)
         if is_correct:
-            self.feedback_frame.setStyleSheet(f"""
-                QFrame {{
-                    background-color: {ModernColors.LIGHT['success_light']};
-                    border-left: 4px solid {ModernColors.LIGHT['success']};
-                    border-radius: {Spacing.SM}px;
-                    padding: {Spacing.MD}px;
-                }}
-            """)
             self.feedback_label.setText("✅ ¡Correcto!")
-            self.feedback_label.setStyleSheet(f"color: {ModernColors.LIGHT['success']}; font-weight: {Typography.WEIGHT_BOLD};")
         else:
-            self.feedback_frame.setStyleSheet(f"""
-                QFrame {{
-                    background-color: {ModernColors.LIGHT['error_light']};
-                    border-left: 4px solid {ModernColors.LIGHT['error']};
-                    border-radius: {Spacing.SM}px;
-                    padding: {Spacing.MD}px;
-                }}
-            """)
             self.feedback_label.setText(f"❌ Incorrecto. La respuesta correcta es: {correct_text}")
-            self.feedback_label.setStyleSheet(f"color: {ModernColors.LIGHT['error']}; font-weight: {Typography.WEIGHT_BOLD};")
         
         if question.explanation:
             self.explanation_label.setText(f"💡 {question.explanation}")
@@ -393,6 +339,12 @@ class QuizView(QWidget):
     
     def show_results(self):
         """Muestra los resultados finales"""
+        # Fin del quiz: escribir las métricas pendientes a los CSV
+        if self.data_loader:
+            self.data_loader.flush_pending()
+        if self.persistence:
+            self.persistence.commit()
+
         # Limpiar layout
         while self.content_layout.count():
             child = self.content_layout.takeAt(0)
@@ -417,11 +369,7 @@ class QuizView(QWidget):
         accuracy = (self.answered_correctly / total * 100) if total > 0 else 0
         
         accuracy_label = QLabel(f"{accuracy:.0f}%")
-        accuracy_label.setStyleSheet(f"""
-            font-size: {Typography.SIZE_5XL}px;
-            font-weight: {Typography.WEIGHT_BOLD};
-            color: {ModernColors.LIGHT['primary']};
-        """)
+        accuracy_label.setProperty("labelType", "display")
         accuracy_label.setAlignment(Qt.AlignCenter)
         results_layout.addWidget(accuracy_label)
         
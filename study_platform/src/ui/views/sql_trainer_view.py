@@ -2,6 +2,7 @@
 Vista de SQL Trainer - Práctica de escritura de consultas
 """
 import difflib
+import time
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QTextEdit, QPushButton, QFrame, QMessageBox, QSplitter,
@@ -10,7 +11,11 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, pyqtSignal, QRegExp
 from PyQt5.QtGui import QFont, QSyntaxHighlighter, QTextCharFormat, QColor
 
-from ..themes.colors import ModernColors, Typography, Spacing, BorderRadius
+from ..themes.colors import Typography, Spacing
+from ..themes.theme_manager import palette, set_style_state
+from ...utils.tracing import traced
+from ...core.event_bus import event_bus, CommandAttempted
+from ...services.response_times import COMMAND
 
 class SQLHighlighter(QSyntaxHighlighter):
     """Resaltador de sintaxis simple para SQL"""
@@ -19,7 +24,7 @@ class SQLHighlighter(QSyntaxHighlighter):
         self.highlightingRules = []
 
         keywordFormat = QTextCharFormat()
-        keywordFormat.setForeground(QColor(ModernColors.LIGHT['primary']))
+        keywordFormat.setForeground(QColor(palette()['primary']))
         keywordFormat.setFontWeight(Typography.WEIGHT_BOLD)
         
         keywords = [
@@ -33,6 +38,7 @@ class SQLHighlighter(QSyntaxHighlighter):
             pattern = QRegExp(f"\\b{word}\\b", Qt.CaseInsensitive)
             self.highlightingRules.append((pattern, keywordFormat))
 
+    @traced(cat='highlight')
     def highlightBlock(self, text):
         for pattern, format in self.highlightingRules:
             expression = QRegExp(pattern)
@@ -61,6 +67,7 @@ class SQLTrainerView(QWidget):
         self.extract_categories()
         
         self.setup_ui()
+        event_bus.subscribe(CommandAttempted, self.on_command_attempted)
         if self.commands:
             self.load_command()
         else:
@@ -135,16 +142,7 @@ class SQLTrainerView(QWidget):
         
         self.editor = QTextEdit()
         self.editor.setFont(QFont("Monospace", 14))
-        self.editor.setStyleSheet(f"""
-            QTextEdit {{
-                background-color: {ModernColors.LIGHT['bg_secondary']};
-                color: {ModernColors.LIGHT['text_primary']};
-                border: 1px solid {ModernColors.LIGHT['border']};
-                border-radius: {BorderRadius.MD}px;
-                padding: {Spacing.MD}px;
-                font-family: {Typography.FONT_FAMILY_MONO};
-            }}
-        """)
+        self.editor.setProperty("editorType", "sql")
         self.highlighter = SQLHighlighter(self.editor.document())
         left_layout.addWidget(self.editor)
         
@@ -160,8 +158,7 @@ class SQLTrainerView(QWidget):
         self.btn_hint.clicked.connect(self.show_hint)
 
         self.btn_explain = QPushButton("📘 Explicación")
-        self.btn_explain.setProperty("buttonType", "info") # Assuming 'info' type exists or just secondary
-        self.btn_explain.setStyleSheet(f"background-color: {ModernColors.LIGHT['info']}; color: white; font-weight: bold;")
+        self.btn_explain.setProperty("buttonType", "info")
         self.btn_explain.setMinimumHeight(45)
         self.btn_explain.clicked.connect(self.show_explanation)
         
@@ -208,16 +205,7 @@ class SQLTrainerView(QWidget):
         self.txt_expected = QTextEdit()
         self.txt_expected.setReadOnly(True)
         self.txt_expected.setFont(QFont("Monospace", 12))
-        self.txt_expected.setStyleSheet(f"""
-            QTextEdit {{
-                background-color: {ModernColors.LIGHT['bg_tertiary']};
-                color: {ModernColors.LIGHT['text_primary']};
-                border: none;
-                border-radius: {BorderRadius.SM}px;
-                padding: {Spacing.SM}px;
-                font-family: {Typography.FONT_FAMILY_MONO};
-            }}
-        """)
+        self.txt_expected.setProperty("editorType", "sqlReadOnly")
         self.expected_highlighter = SQLHighlighter(self.txt_expected.document())
         
         feedback_inner.addWidget(self.txt_expected)
@@ -250,13 +238,14 @@ class SQLTrainerView(QWidget):
         
         # Stats Label
         self.lbl_cmd_stats = QLabel("")
-        self.lbl_cmd_stats.setStyleSheet(f"color: {ModernColors.LIGHT['text_secondary']}; font-size: {Typography.SIZE_SM}px; margin-right: {Spacing.LG}px;")
+        self.lbl_cmd_stats.setProperty("labelType", "caption")
 
         layout.addWidget(back_btn)
         layout.addStretch()
         layout.addWidget(title)
         layout.addStretch()
         layout.addWidget(self.lbl_cmd_stats)
+        layout.addSpacing(Spacing.LG)
         layout.addWidget(self.lbl_progress)
         
         header.setLayout(layout)
@@ -296,10 +285,15 @@ class SQLTrainerView(QWidget):
             self.lbl_title.setText("-")
             self.lbl_description.setText("-")
 
-    def update_stats_display(self):
+    def on_command_attempted(self, event):
+        """Actualiza el historial si el intento corresponde al comando en pantalla"""
+        if self.commands and event.command_id == str(self.commands[self.current_index].id):
+            self.update_stats_display(event.stats)
+
+    def update_stats_display(self, stats=None):
         """Actualiza la etiqueta de estadísticas con los datos actuales"""
         if hasattr(self, 'lbl_cmd_stats') and self.persistence:
-            stats = self.persistence.load_user_stats()
+            stats = stats or self.persistence.get_user_stats()
             cmd = self.commands[self.current_index]
             cmd_id = str(cmd.id)
             metrics = stats.sql_command_metrics.get(cmd_id, {'attempts': 0, 'correct': 0, 'errors': 0})
@@ -309,7 +303,11 @@ class SQLTrainerView(QWidget):
             err = metrics['errors']
             rate = int((ok / att * 100)) if att > 0 else 0
             
-            self.lbl_cmd_stats.setText(f"📊 Historial: {att} intentos | ✅ {ok} | ❌ {err} ({rate}%)")
+            text = f"📊 Historial: {att} intentos | ✅ {ok} | ❌ {err} ({rate}%)"
+            times = self.persistence.response_times.get(COMMAND, cmd_id)
+            if times is not None and times.count:
+                text += f" | ⏱ p50 {times.p50:.0f}s · p90 {times.p90:.0f}s"
+            self.lbl_cmd_stats.setText(text)
 
     def load_command(self):
         if self.current_index >= len(self.commands):
@@ -328,7 +326,9 @@ class SQLTrainerView(QWidget):
         
         if hasattr(self, 'lbl_progress'):
             self.lbl_progress.setText(f"Ejercicio {self.current_index + 1}/{len(self.commands)}")
-            
+        
+        # Cada intento se cronometra desde la carga o el intento anterior (reloj monótono)
+        self.attempt_started_at = time.monotonic()
         self.update_stats_display()
 
     def normalize_sql(self, sql):
@@ -339,6 +339,7 @@ class SQLTrainerView(QWidget):
         sql = sql.replace(';', '').replace('[', '').replace(']', '')
         return sql
 
+    @traced(cat='ui')
     def check_solution(self):
         user_sql = self.editor.toPlainText()
         cmd = self.commands[self.current_index]
@@ -347,48 +348,19 @@ class SQLTrainerView(QWidget):
         normalized_user = self.normalize_sql(user_sql)
         normalized_target = self.normalize_sql(target_sql)
         
-        # Cargar estadísticas para actualizar
-        stats = None
+        is_correct = normalized_user == normalized_target
+        
+        # Registrar intento (el historial se actualiza vía CommandAttempted)
+        now = time.monotonic()
+        seconds, self.attempt_started_at = now - self.attempt_started_at, now
         if self.persistence:
-            stats = self.persistence.load_user_stats()
-            stats.sql_total_attempts += 1
-            
-            # --- METRICS PER COMMAND ---
-            cmd_id = str(cmd.id) # Ensure string key
-            if cmd_id not in stats.sql_command_metrics:
-                stats.sql_command_metrics[cmd_id] = {'attempts': 0, 'correct': 0, 'errors': 0}
-            
-            stats.sql_command_metrics[cmd_id]['attempts'] += 1
+            self.persistence.record_command_attempt(cmd.id, is_correct, seconds=seconds)
         
         # Comparación directa
-        if normalized_user == normalized_target:
-            if stats:
-                stats.sql_commands_completed += 1
-                stats.sql_command_metrics[cmd_id]['correct'] += 1
-                
-                # Usar el nombre del comando como ID único
-                if cmd_id not in stats.sql_completed_ids:
-                    stats.sql_completed_ids.append(cmd_id)
-                
-                # Manejo de racha (simple)
-                stats.sql_current_streak += 1
-                if stats.sql_current_streak > stats.sql_best_streak:
-                    stats.sql_best_streak = stats.sql_current_streak
-                    
-                self.persistence.save_user_stats(stats)
-                self.update_stats_display() # New
-                
+        if is_correct:
             self.show_success(target_sql)
             return
 
-        # Si falló, registrar error y resetear racha
-        if stats:
-            stats.sql_total_errors += 1
-            stats.sql_command_metrics[cmd_id]['errors'] += 1
-            stats.sql_current_streak = 0
-            self.persistence.save_user_stats(stats)
-            self.update_stats_display() # New
-
         # Verificar keywords
         missing = []
         if cmd.keywords:
@@ -421,21 +393,22 @@ class SQLTrainerView(QWidget):
         import difflib
         diff = difflib.ndiff(user_sql, target_sql)
         
+        colors = palette()
         html = "<pre style='font-family: monospace; font-size: 14px;'>"
         for part in diff:
             code = part[0]
             char = part[2:]
             if code == ' ':
-                html += f"<span style='color: {ModernColors.LIGHT['text_primary']}'>{char}</span>"
+                html += f"<span style='color: {colors['text_primary']}'>{char}</span>"
             elif code == '-':
-                html += f"<span style='background-color: {ModernColors.LIGHT['error_light']}; color: {ModernColors.LIGHT['error']}; text-decoration: line-through;'>{char}</span>"
+                html += f"<span style='background-color: {colors['error_light']}; color: {colors['error']}; text-decoration: line-through;'>{char}</span>"
             elif code == '+':
-                html += f"<span style='background-color: {ModernColors.LIGHT['success_light']}; color: {ModernColors.LIGHT['success']}; font-weight: bold;'>{char}</span>"
+                html += f"<span style='background-color: {colors['success_light']}; color: {colors['success']}; font-weight: bold;'>{char}</span>"
         html += "</pre>"
         
         msg = QMessageBox(self)
         msg.setWindowTitle("Diferencias Detalladas")
-        msg.setText("Leyenda: <span style='color:#F87171; text-decoration: line-through;'>Sobra</span> | <span style='color:#34D399; font-weight:bold;'>Falta</span>")
+        msg.setText(f"Leyenda: <span style='color:{colors['error']}; text-decoration: line-through;'>Sobra</span> | <span style='color:{colors['success']}; font-weight:bold;'>Falta</span>")
         msg.setInformativeText(html)
         # Hack para hacer el QMessageBox más ancho
         layout = msg.layout()
@@ -446,14 +419,7 @@ class SQLTrainerView(QWidget):
 
     def show_success(self, target_sql):
         self.feedback_frame.setVisible(True)
-        self.feedback_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: {ModernColors.LIGHT['success_light']};
-                border-left: 4px solid {ModernColors.LIGHT['success']};
-                border-radius: {BorderRadius.SM}px;
-                padding: {Spacing.MD}px;
-            }}
-        """)
+        set_style_state(self.feedback_frame, "feedbackState", "success")
         self.lbl_feedback.setText("✅ ¡Correcto! Has construido la consulta perfectamente.")
         self.lbl_expected_title.setText("Tu solución:")
         self.txt_expected.setPlainText(target_sql)
@@ -467,17 +433,7 @@ class SQLTrainerView(QWidget):
 
     def show_error(self, message, target_sql, is_hint=False):
         self.feedback_frame.setVisible(True)
-        color_bg = ModernColors.LIGHT['warning_light'] if is_hint else ModernColors.LIGHT['error_light']
-        color_border = ModernColors.LIGHT['warning'] if is_hint else ModernColors.LIGHT['error']
-        
-        self.feedback_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: {color_bg};
-                border-left: 4px solid {color_border};
-                border-radius: {BorderRadius.SM}px;
-                padding: {Spacing.MD}px;
-            }}
-        """)
+        set_style_state(self.feedback_frame, "feedbackState", "warning" if is_hint else "error")
         self.lbl_feedback.setText(f"{'⚠️' if is_hint else '❌'} {message}")
         self.lbl_expected_title.setText("Solución Esperada:")
         self.txt_expected.setPlainText(target_sql)
@@ -502,13 +458,14 @@ class SQLTrainerView(QWidget):
             QMessageBox.information(self, "Sin Explicación", "No hay desglose detallado disponible para este comando.")
             return
 
-        # Construir tabla HTML
+        # Construir tabla HTML (colores del tema actual)
+        colors = palette()
         html = f"""
-        <h3 style='font-family: {Typography.FONT_FAMILY_PRIMARY}; color: {ModernColors.LIGHT['primary']}'>Desglose del Comando</h3>
+        <h3 style='font-family: {Typography.FONT_FAMILY_PRIMARY}; color: {colors['primary']}'>Desglose del Comando</h3>
         <p style='font-family: {Typography.FONT_FAMILY_PRIMARY}; margin-bottom: 10px;'>Entiende cada parte de la consulta:</p>
         <table border='0' cellspacing='0' cellpadding='8' width='100%' style='border-collapse: collapse; font-family: {Typography.FONT_FAMILY_PRIMARY};'>
             <thead>
-                <tr style='background-color: {ModernColors.LIGHT['bg_secondary']}; color: {ModernColors.LIGHT['text_primary']}; border-bottom: 2px solid {ModernColors.LIGHT['border']}'>
+                <tr style='background-color: {colors['bg_secondary']}; color: {colors['text_primary']}; border-bottom: 2px solid {colors['border']}'>
                     <th align='left' width='40%'>Fragmento de Código</th>
                     <th align='left'>Explicación</th>
                 </tr>
@@ -517,14 +474,14 @@ class SQLTrainerView(QWidget):
         """
         
         for i, part in enumerate(parts):
-            bg_color = ModernColors.LIGHT['bg_primary'] if i % 2 == 0 else ModernColors.LIGHT['bg_secondary']
+            bg_color = colors['bg_primary'] if i % 2 == 0 else colors['bg_secondary']
             frag = part.get('fragment', '')
             expl = part.get('explanation', '')
             
             html += f"""
-            <tr style='background-color: {bg_color}; border-bottom: 1px solid {ModernColors.LIGHT['border']}'>
-                <td style='font-family: {Typography.FONT_FAMILY_MONO}; color: {ModernColors.LIGHT['info']}; font-weight: bold;'>{frag}</td>
-                <td style='color: {ModernColors.LIGHT['text_secondary']}'>{expl}</td>
+            <tr style='background-color: {bg_color}; border-bottom: 1px solid {colors['border']}'>
+                <td style='font-family: {Typography.FONT_FAMILY_MONO}; color: {colors['info']}; font-weight: bold;'>{frag}</td>
+                <td style='color: {colors['text_secondary']}'>{expl}</td>
             </tr>
             """
             
@@ -7,7 +7,18 @@ from PyQt5.QtWidgets import (
     QPushButton
 )
 from PyQt5.QtCore import Qt, pyqtSignal
-from ..themes.colors import ModernColors, Typography, Spacing, BorderRadius
+from ..themes.colors import Spacing
+from ..themes.theme_manager import set_style_state
+from ...core.event_bus import event_bus, QuestionAnswered, CommandAttempted, SessionEnded
+from ...services.aggregates import AggregatesService
+from ...services.response_times import COMMAND, SECTION, TOTAL, TOTAL_QUIZ, TOTAL_SQL
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    return f"{int(seconds // 60)}m {int(seconds % 60):02d}s"
+
 
 class ModuleProgressCard(QFrame):
     """Tarjeta de progreso para un módulo específico"""
@@ -15,6 +26,7 @@ class ModuleProgressCard(QFrame):
         super().__init__()
         self.setProperty("frameType", "card")
         self.setup_ui(module_name, stats)
+        self.update_stats(stats)
 
     def setup_ui(self, module_name, stats):
         layout = QVBoxLayout()
@@ -26,88 +38,79 @@ class ModuleProgressCard(QFrame):
         title.setProperty("labelType", "subtitle")
         title.setWordWrap(True)
         
-        percent_val = stats['accuracy']
-        percent = QLabel(f"{percent_val:.1f}%")
-        percent.setStyleSheet(f"""
-            font-size: {Typography.SIZE_XL}px;
-            font-weight: bold;
-            color: {self.get_color_by_score(percent_val)};
-        """)
+        self.percent = QLabel()
+        self.percent.setProperty("labelType", "score")
         
         header_layout.addWidget(title, 1)
-        header_layout.addWidget(percent)
+        header_layout.addWidget(self.percent)
         layout.addLayout(header_layout)
         
         # Barra de progreso visual
-        progress = QProgressBar()
-        progress.setMaximum(100)
-        progress.setValue(int(percent_val))
-        progress.setTextVisible(False)
-        progress.setFixedHeight(10)
-        progress.setStyleSheet(f"""
-            QProgressBar {{
-                border: none;
-                background-color: {ModernColors.LIGHT['bg_tertiary']};
-                border-radius: 5px;
-            }}
-            QProgressBar::chunk {{
-                background-color: {self.get_color_by_score(percent_val)};
-                border-radius: 5px;
-            }}
-        """)
-        layout.addWidget(progress)
+        self.progress = QProgressBar()
+        self.progress.setMaximum(100)
+        self.progress.setTextVisible(False)
+        self.progress.setFixedHeight(10)
+        self.progress.setProperty("barType", "score")
+        layout.addWidget(self.progress)
         
         # Detalles numéricos
-        details = QLabel(f"Vistas: {stats['seen']}/{stats['total']} | Masterizadas: {stats['mastered']}")
-        details.setProperty("labelType", "caption")
-        layout.addWidget(details)
+        self.details = QLabel()
+        self.details.setProperty("labelType", "caption")
+        layout.addWidget(self.details)
         
         self.setLayout(layout)
 
-    def get_color_by_score(self, score):
-        if score >= 80: return ModernColors.LIGHT['success']
-        if score >= 50: return ModernColors.LIGHT['warning']
-        return ModernColors.LIGHT['error']
+    def update_stats(self, stats):
+        """Actualiza valores (y el tono solo si cambia la banda)"""
+        percent_val = stats['accuracy']
+        self.percent.setText(f"{percent_val:.1f}%")
+        self.progress.setValue(int(percent_val))
+        self.details.setText(f"Vistas: {stats['seen']}/{stats['total']} | Masterizadas: {stats['mastered']}")
+        
+        # Solo se repulen los widgets si cambia la banda
+        tone = self.get_tone_by_score(percent_val)
+        set_style_state(self.percent, "tone", tone)
+        set_style_state(self.progress, "tone", tone)
+
+    def get_tone_by_score(self, score):
+        if score >= 80: return "success"
+        if score >= 50: return "warning"
+        return "error"
 
 class StatisticsView(QWidget):
     """Vista principal de estadísticas"""
     
     back_to_dashboard = pyqtSignal()
+    
+    # Un elemento es lento si su mediana supera este factor de la mediana global
+    SLOW_FACTOR = 1.5
 
-    def __init__(self, questions, user_stats, persistence, commands=None):
+    def __init__(self, questions, user_stats, persistence, commands=None, aggregates=None):
         super().__init__()
         self.questions = questions
         self.user_stats = user_stats
         self.persistence = persistence
         self.commands = commands or []
+        self.aggregates = aggregates or AggregatesService(questions)
         
         self.calculate_stats()
         self.setup_ui()
+        
+        # Actualizaciones puntuales a partir de los eventos de los servicios
+        event_bus.subscribe(QuestionAnswered, self.on_question_answered)
+        event_bus.subscribe(CommandAttempted, self.on_command_attempted)
+        event_bus.subscribe(SessionEnded, self.on_session_ended)
 
     def calculate_stats(self):
-        """Calcula estadísticas desglosadas por módulo"""
-        self.module_stats = {}
-        
-        for q in self.questions:
-            if q.module not in self.module_stats:
-                self.module_stats[q.module] = {
-                    'total': 0, 'seen': 0, 'mastered': 0, 
-                    'correct': 0, 'incorrect': 0
-                }
-            
-            m = self.module_stats[q.module]
-            m['total'] += 1
-            if q.times_seen > 0:
-                m['seen'] += 1
-                m['correct'] += q.times_correct
-                m['incorrect'] += q.times_incorrect
-                if q.accuracy >= 80:
-                    m['mastered'] += 1
-
-        # Calcular porcentajes finales
-        for m in self.module_stats.values():
-            total_attempts = m['correct'] + m['incorrect']
-            m['accuracy'] = (m['correct'] / total_attempts * 100) if total_attempts > 0 else 0.0
+        """Estadísticas desglosadas por módulo (leídas de los agregados, sin recorrer preguntas)"""
+        self.module_stats = {
+            module: counters.to_dict()
+            for module, counters in self.aggregates.modules().items()
+        }
+        if self.persistence:
+            # Tiempo medio por pregunta; intentos, errores medios y mejor tiempo por comando (del perfil)
+            self.persistence.apply_question_times(self.questions)
+            self.persistence.apply_command_metrics(self.commands)
 
     def setup_ui(self):
         main_layout = QVBoxLayout()
@@ -131,32 +134,12 @@ class StatisticsView(QWidget):
         summary_layout = QHBoxLayout()
         summary_layout.setSpacing(Spacing.LG)
         
-        # Calcular totales globales para mostrar (basados en preguntas reales)
-        total_questions = len(self.questions)
-        total_seen = sum(1 for q in self.questions if q.times_seen > 0)
-        total_mastered = sum(1 for q in self.questions if q.accuracy >= 80 and q.times_seen > 0)
-        
-        # Tarjeta 1: Cobertura
-        card_coverage = self.create_stat_card("Cobertura del Curso", 
-                                            f"{total_seen}/{total_questions}", 
-                                            f"{int(total_seen/total_questions*100)}% Completado")
-        summary_layout.addWidget(card_coverage)
-        
-        # Tarjeta 2: Dominio
-        mastery_pct = int(total_mastered/total_seen * 100) if total_seen > 0 else 0
-        card_mastery = self.create_stat_card("Nivel de Maestría", 
-                                           f"{total_mastered}", 
-                                           f"{mastery_pct}% de lo estudiado es Master")
-        summary_layout.addWidget(card_mastery)
-        
-        # Tarjeta 3: Tiempo (Fake por ahora o real de user_stats)
-        # Asumimos que user_stats tiene el dato real acumulado
-        hours = int(self.user_stats.total_study_time_minutes // 60)
-        mins = int(self.user_stats.total_study_time_minutes % 60)
-        card_time = self.create_stat_card("Tiempo Total", 
-                                        f"{hours}h {mins}m", 
-                                        "Invertido estudiando")
-        summary_layout.addWidget(card_time)
+        # Tarjetas de resumen (se guardan para refrescarlas en sitio)
+        self.summary_cards = {}
+        for key, (title, value, subtitle) in self.summary_values().items():
+            card = self.create_stat_card(title, value, subtitle)
+            self.summary_cards[key] = card
+            summary_layout.addWidget(card)
         
         content_layout.addLayout(summary_layout)
         
@@ -170,31 +153,10 @@ class StatisticsView(QWidget):
             sql_layout = QHBoxLayout()
             sql_layout.setSpacing(Spacing.LG)
             
-            # Datos de SQL
-            total_cmds = len(self.commands)
-            completed_unique = len(self.user_stats.sql_completed_ids)
-            pct_completed = int((completed_unique / total_cmds * 100)) if total_cmds > 0 else 0
-            
-            # Tarjeta Progreso Comandos
-            card_sql_prog = self.create_stat_card("Progreso Comandos",
-                                                f"{completed_unique}/{total_cmds}",
-                                                f"{pct_completed}% Completado")
-            
-            # Tarjeta Precisión SQL
-            accuracy = self.user_stats.sql_accuracy
-            card_sql_acc = self.create_stat_card("Precisión SQL",
-                                               f"{accuracy:.1f}%",
-                                               f"En {self.user_stats.sql_total_attempts} intentos")
-            
-            # Tarjeta Racha
-            streak = self.user_stats.sql_best_streak
-            card_sql_streak = self.create_stat_card("Mejor Racha",
-                                                  f"{streak} 🔥",
-                                                  "Comandos seguidos sin error")
-            
-            sql_layout.addWidget(card_sql_prog)
-            sql_layout.addWidget(card_sql_acc)
-            sql_layout.addWidget(card_sql_streak)
+            for key, (title, value, subtitle) in self.sql_summary_values().items():
+                card = self.create_stat_card(title, value, subtitle)
+                self.summary_cards[key] = card
+                sql_layout.addWidget(card)
             
             content_layout.addLayout(sql_layout)
             
@@ -203,54 +165,11 @@ class StatisticsView(QWidget):
             lbl_weak.setProperty("labelType", "subtitle")
             content_layout.addWidget(lbl_weak)
             
-            weak_layout = QVBoxLayout()
-            weak_layout.setSpacing(Spacing.SM)
-            
-            # Helper to get command by ID
-            cmd_map = {str(c.id): c for c in self.commands}
-            
-            # Calculate metrics list
-            metrics_list = []
-            for cmd_id, m in self.user_stats.sql_command_metrics.items():
-                if m['attempts'] > 0:
-                    acc = (m['correct'] / m['attempts']) * 100
-                    cmd_obj = cmd_map.get(str(cmd_id))
-                    title = cmd_obj.title if cmd_obj else f"Command {cmd_id}"
-                    metrics_list.append({
-                        'id': cmd_id,
-                        'title': title,
-                        'accuracy': acc,
-                        'attempts': m['attempts'],
-                        'correct': m['correct']
-                    })
-            
-            # Sort: lowest accuracy first, then highest attempts (prioritize identifying consistent failures)
-            metrics_list.sort(key=lambda x: (x['accuracy'], -x['attempts']))
+            self.weak_layout = QVBoxLayout()
+            self.weak_layout.setSpacing(Spacing.SM)
+            self.populate_weak_commands()
             
-            top_weak = metrics_list[:5]
-            
-            if not top_weak:
-                lbl_no_data = QLabel("No hay suficientes datos. ¡Sigue practicando!")
-                lbl_no_data.setStyleSheet(f"color: {ModernColors.LIGHT['text_secondary']}; font-style: italic;")
-                weak_layout.addWidget(lbl_no_data)
-            else:
-                for item in top_weak:
-                    row_frame = QFrame()
-                    row_frame.setStyleSheet(f"""
-                        background-color: {ModernColors.LIGHT['bg_secondary']};
-                        border-radius: {BorderRadius.SM}px;
-                        padding: {Spacing.SM}px;
-                    """)
-                    row_layout = QHBoxLayout(row_frame)
-                    
-                    lbl_name = QLabel(f"<b>{item['title']}</b>")
-                    lbl_stats = QLabel(f"Precisión: <span style='color:{ModernColors.LIGHT['error']}'>{item['accuracy']:.1f}%</span> ({item['correct']}/{item['attempts']})")
-                    
-                    row_layout.addWidget(lbl_name, 1)
-                    row_layout.addWidget(lbl_stats)
-                    weak_layout.addWidget(row_frame)
-            
-            content_layout.addLayout(weak_layout)
+            content_layout.addLayout(self.weak_layout)
         # ---------------------------------------------------------
 
         # 3. Desglose por Módulo
@@ -261,9 +180,11 @@ class StatisticsView(QWidget):
         modules_grid = QGridLayout()
         modules_grid.setSpacing(Spacing.LG)
         
+        self.module_cards = {}
         row, col = 0, 0
         for module_name, stats in self.module_stats.items():
             card = ModuleProgressCard(module_name, stats)
+            self.module_cards[module_name] = card
             modules_grid.addWidget(card, row, col)
             col += 1
             if col > 1: # 2 columnas
@@ -271,6 +192,26 @@ class StatisticsView(QWidget):
                 row += 1
         
         content_layout.addLayout(modules_grid)
+        
+        # 4. Tiempos de respuesta (histogramas por sección y comando)
+        if self.persistence:
+            lbl_times = QLabel("⏱ Tiempos de Respuesta")
+            lbl_times.setProperty("labelType", "subtitle")
+            content_layout.addWidget(lbl_times)
+            
+            times_layout = QHBoxLayout()
+            times_layout.setSpacing(Spacing.LG)
+            for key, (title, value, subtitle) in self.timing_values().items():
+                card = self.create_stat_card(title, value, subtitle)
+                self.summary_cards[key] = card
+                times_layout.addWidget(card)
+            content_layout.addLayout(times_layout)
+            
+            self.slow_layout = QVBoxLayout()
+            self.slow_layout.setSpacing(Spacing.SM)
+            self.populate_slow_items()
+            content_layout.addLayout(self.slow_layout)
+        
         content_layout.addStretch()
         
         content.setLayout(content_layout)
@@ -310,11 +251,7 @@ class StatisticsView(QWidget):
         lbl_title.setProperty("labelType", "caption")
         
         lbl_val = QLabel(value)
-        lbl_val.setStyleSheet(f"""
-            font-size: {Typography.SIZE_4XL}px;
-            font-weight: bold;
-            color: {ModernColors.LIGHT['primary']};
-        """)
+        lbl_val.setProperty("labelType", "statValueLarge")
         
         lbl_sub = QLabel(subtitle)
         lbl_sub.setProperty("labelType", "caption")
@@ -323,4 +260,218 @@ class StatisticsView(QWidget):
         layout.addWidget(lbl_val)
         layout.addWidget(lbl_sub)
         frame.setLayout(layout)
+        frame.value_label = lbl_val
+        frame.subtitle_label = lbl_sub
         return frame
+
+    def create_list_row(self, title, value, detail, tone):
+        """Fila de las listas de estadísticas (colores del tema vía propiedades)"""
+        row_frame = QFrame()
+        row_frame.setProperty("frameType", "listRow")
+        row_layout = QHBoxLayout(row_frame)
+        
+        lbl_value = QLabel(value)
+        lbl_value.setProperty("labelType", "rowValue")
+        set_style_state(lbl_value, "tone", tone)
+        
+        row_layout.addWidget(QLabel(title), 1)
+        row_layout.addWidget(lbl_value)
+        row_layout.addWidget(QLabel(detail))
+        return row_frame
+
+    def summary_values(self) -> dict:
+        """Resumen global: {clave: (título, valor, subtítulo)}"""
+        # Calcular totales globales para mostrar (basados en preguntas reales)
+        totals = self.aggregates.totals
+        total_questions = totals.total
+        total_seen = totals.seen
+        total_mastered = totals.mastered
+        coverage_pct = int(total_seen / total_questions * 100) if total_questions > 0 else 0
+        mastery_pct = int(total_mastered / total_seen * 100) if total_seen > 0 else 0
+        
+        # Tiempo real acumulado por el Pomodoro
+        hours = int(self.user_stats.total_study_time_minutes // 60)
+        mins = int(self.user_stats.total_study_time_minutes % 60)
+        return {
+            'coverage': ("Cobertura del Curso", f"{total_seen}/{total_questions}", f"{coverage_pct}% Completado"),
+            'mastery': ("Nivel de Maestría", f"{total_mastered}", f"{mastery_pct}% de lo estudiado es Master"),
+            'time': ("Tiempo Total", f"{hours}h {mins}m", "Invertido estudiando"),
+        }
+
+    def sql_summary_values(self) -> dict:
+        """Resumen del entrenamiento SQL/KQL: {clave: (título, valor, subtítulo)}"""
+        total_cmds = len(self.commands)
+        completed_unique = len(self.user_stats.sql_completed_ids)
+        pct_completed = int((completed_unique / total_cmds * 100)) if total_cmds > 0 else 0
+        return {
+            'sql_progress': ("Progreso Comandos", f"{completed_unique}/{total_cmds}", f"{pct_completed}% Completado"),
+            'sql_accuracy': ("Precisión SQL", f"{self.user_stats.sql_accuracy:.1f}%",
+                             f"En {self.user_stats.sql_total_attempts} intentos"),
+            'sql_streak': ("Mejor Racha", f"{self.user_stats.sql_best_streak} 🔥", "Comandos seguidos sin error"),
+        }
+
+    def weakest_commands(self, limit=5) -> list:
+        """Comandos con menor precisión (a igualdad, los de más intentos)"""
+        # Helper to get command by ID
+        cmd_map = {str(c.id): c for c in self.commands}
+        
+        # Calculate metrics list
+        metrics_list = []
+        for cmd_id, m in self.user_stats.sql_command_metrics.items():
+            if m['attempts'] > 0:
+                acc = (m['correct'] / m['attempts']) * 100
+                cmd_obj = cmd_map.get(str(cmd_id))
+                title = cmd_obj.title if cmd_obj else f"Command {cmd_id}"
+                metrics_list.append({
+                    'id': cmd_id,
+                    'title': title,
+                    'accuracy': acc,
+                    'attempts': m['attempts'],
+                    'correct': m['correct']
+                })
+        
+        # Sort: lowest accuracy first, then highest attempts (prioritize identifying consistent failures)
+        metrics_list.sort(key=lambda x: (x['accuracy'], -x['attempts']))
+        return metrics_list[:limit]
+
+    def populate_weak_commands(self):
+        """(Re)construye solo la lista de comandos débiles"""
+        while self.weak_layout.count():
+            item = self.weak_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+        
+        top_weak = self.weakest_commands()
+        self._weak_signature = [(w['id'], w['attempts'], w['correct']) for w in top_weak]
+        
+        if not top_weak:
+            lbl_no_data = QLabel("No hay suficientes datos. ¡Sigue practicando!")
+            lbl_no_data.setProperty("labelType", "empty")
+            self.weak_layout.addWidget(lbl_no_data)
+            return
+        
+        for item in top_weak:
+            self.weak_layout.addWidget(self.create_list_row(
+                f"<b>{item['title']}</b>",
+                f"Precisión: {item['accuracy']:.1f}%",
+                f"({item['correct']}/{item['attempts']})",
+                "error"))
+
+    def timing_values(self) -> dict:
+        """Medianas globales de respuesta: {clave: (título, valor, subtítulo)}"""
+        values = {}
+        for key, total, title in (('quiz_time', TOTAL_QUIZ, "Tiempo por Pregunta"),
+                                  ('sql_time', TOTAL_SQL, "Tiempo por Intento SQL")):
+            hist = self.persistence.response_times.get(TOTAL, total)
+            if hist is None or not hist.count:
+                values[key] = (title, "-", "Sin datos todavía")
+            else:
+                values[key] = (title, f"{format_seconds(hist.p50)} p50",
+                               f"p90 {format_seconds(hist.p90)} · {hist.count} respuestas")
+        return values
+
+    def slow_items(self, limit=5) -> list:
+        """Secciones y comandos más lentos (por mediana), marcando los que superan SLOW_FACTOR × la global"""
+        times = self.persistence.response_times
+        cmd_map = {str(c.id): c for c in self.commands}
+        items = []
+        for kind, total in ((SECTION, TOTAL_QUIZ), (COMMAND, TOTAL_SQL)):
+            overall = times.get(TOTAL, total)
+            for key, hist in times.slowest(kind, limit):
+                title = key if kind == SECTION else (cmd_map[key].title if key in cmd_map else f"Command {key}")
+                items.append({
+                    'id': f"{kind}:{key}",
+                    'title': title,
+                    'p50': hist.p50,
+                    'p90': hist.p90,
+                    'count': hist.count,
+                    'slow': overall is not None and hist.p50 > overall.p50 * self.SLOW_FACTOR,
+                })
+        return items
+
+    def populate_slow_items(self):
+        """(Re)construye solo la lista de elementos lentos"""
+        while self.slow_layout.count():
+            item = self.slow_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+        
+        items = self.slow_items()
+        self._slow_signature = [(i['id'], i['count']) for i in items]
+        
+        if not items:
+            lbl_no_data = QLabel("Aún no hay tiempos suficientes (3+ respuestas por sección o comando).")
+            lbl_no_data.setProperty("labelType", "empty")
+            self.slow_layout.addWidget(lbl_no_data)
+            return
+        
+        for item in items:
+            flag = "🐢 " if item['slow'] else ""
+            self.slow_layout.addWidget(self.create_list_row(
+                f"{flag}<b>{item['title']}</b>",
+                f"p50 {format_seconds(item['p50'])}",
+                f"· p90 {format_seconds(item['p90'])} ({item['count']})",
+                "error" if item['slow'] else "muted"))
+
+    def _refresh_timings(self):
+        if not self.persistence:
+            return
+        self._set_summary_cards(self.timing_values())
+        if [(i['id'], i['count']) for i in self.slow_items()] != self._slow_signature:
+            self.populate_slow_items()
+
+    def _set_summary_cards(self, values: dict):
+        for key, (_, value, subtitle) in values.items():
+            card = self.summary_cards.get(key)
+            if card is None:
+                continue
+            if card.value_label.text() != value:
+                card.value_label.setText(value)
+            if card.subtitle_label.text() != subtitle:
+                card.subtitle_label.setText(subtitle)
+
+    def _refresh_weak_commands(self):
+        top_weak = self.weakest_commands()
+        if [(w['id'], w['attempts'], w['correct']) for w in top_weak] != self._weak_signature:
+            self.populate_weak_commands()
+
+    def on_question_answered(self, event):
+        """Solo cambian la tarjeta del módulo de la pregunta y el resumen global"""
+        module_name = event.question.module
+        stats = self.aggregates.module(module_name).to_dict()
+        self.module_stats[module_name] = stats
+        card = self.module_cards.get(module_name)
+        if card is not None:
+            card.update_stats(stats)
+        self._set_summary_cards(self.summary_values())
+
+    def on_command_attempted(self, event):
+        self.user_stats = event.stats
+        if self.commands:
+            self._set_summary_cards(self.sql_summary_values())
+            self._refresh_weak_commands()
+
+    def on_session_ended(self, event):
+        self.user_stats = event.stats
+        self._set_summary_cards(self.summary_values())
+
+    def refresh(self, user_stats=None):
+        """Actualiza en sitio solo lo que cambió desde la última visita"""
+        if user_stats is not None:
+            self.user_stats = user_stats
+        
+        previous = self.module_stats
+        self.calculate_stats()
+        for module_name, stats in self.module_stats.items():
+            card = self.module_cards.get(module_name)
+            if card is not None and stats != previous.get(module_name):
+                card.update_stats(stats)
+        
+        values = self.summary_values()
+        if self.commands:
+            values.update(self.sql_summary_values())
+        self._set_summary_cards(values)
+        
+        if self.commands:
+            self._refresh_weak_commands()
+        self._refresh_timings()
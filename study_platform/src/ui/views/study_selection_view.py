@@ -4,10 +4,14 @@ Vista de Selección de Estudio - Submenú para elegir modo de Quiz
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QPushButton, QFrame, QGridLayout, QComboBox, 
-    QButtonGroup, QRadioButton
+    QButtonGroup, QRadioButton, QLineEdit, QListWidget, QListWidgetItem
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+import time
 from ..themes.colors import ModernColors, Typography, Spacing, BorderRadius
+from ..themes.theme_manager import set_style_state
+from ...services.search_service import SearchService, KIND_QUESTION
+from ...services.question_filters import filter_questions, MODE_RANDOM, MODE_TOPIC, MODE_WEAK
 
 class StudyOptionCard(QFrame):
     """Tarjeta seleccionable para opciones de estudio"""
@@ -47,17 +51,9 @@ class StudyOptionCard(QFrame):
 
     def mousePressEvent(self, event):
         self.parent_view.select_mode(self.mode_id)
-        # Efecto visual de selección
-        self.setStyleSheet(f"""
-            QFrame[frameType="card"] {{
-                border: 2px solid {ModernColors.LIGHT['primary']};
-                background-color: {ModernColors.LIGHT['primary_light']};
-            }}
-        """)
-        # Resetear otros
+        # Efecto visual de selección (propiedad "selected" del stylesheet global)
         for card in self.parent_view.option_cards:
-            if card != self:
-                card.setStyleSheet("")  # Volver al estilo por defecto del tema
+            set_style_state(card, "selected", card is self)
 
 
 class StudySelectionView(QWidget):
@@ -67,15 +63,27 @@ class StudySelectionView(QWidget):
     start_quiz_signal = pyqtSignal(list, str) 
     back_to_dashboard = pyqtSignal()
 
-    def __init__(self, questions, data_loader, persistence):
+    SEARCH_RESULTS = 50       # Máximo de resultados mostrados / usados en el quiz
+    SEARCH_DEBOUNCE_MS = 150  # Espera tras la última tecla antes de buscar
+
+    def __init__(self, questions, data_loader, persistence, search_service=None):
         super().__init__()
         self.all_questions = questions
         self.data_loader = data_loader
         self.persistence = persistence
+        self.search_service = search_service
         self.course_structure = self.data_loader.get_course_structure(questions)
         
         self.selected_mode = "random" # Default
         self.option_cards = []
+        self.search_hits = []
+        self.search_query = ""
+        
+        # Búsqueda mientras se escribe (con debounce)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.run_search)
         
         self.setup_ui()
 
@@ -123,6 +131,15 @@ class StudySelectionView(QWidget):
         self.option_cards.append(card_smart)
         cards_layout.addWidget(card_smart)
 
+        # Opción 4: Búsqueda de texto
+        card_search = StudyOptionCard(
+            "Buscar", 
+            "Encuentra preguntas por tema (ej: OneLake shortcuts, COPY INTO).", 
+            "🔍", "search", self
+        )
+        self.option_cards.append(card_search)
+        cards_layout.addWidget(card_search)
+
         main_layout.addLayout(cards_layout)
 
         # 2. Configuración Específica (Panel Dinámico)
@@ -170,6 +187,15 @@ class StudySelectionView(QWidget):
         header.setLayout(layout)
         return header
 
+    def refresh(self, questions, search_service=None):
+        """Al volver a la vista: solo se recalcula la estructura si cambió el banco"""
+        if search_service is not None:
+            self.search_service = search_service
+        if questions is not self.all_questions:
+            self.all_questions = questions
+            self.course_structure = self.data_loader.get_course_structure(questions)
+            self.update_config_panel()
+
     def select_mode(self, mode):
         self.selected_mode = mode
         self.update_config_panel()
@@ -232,6 +258,63 @@ class StudySelectionView(QWidget):
             lbl.setWordWrap(True)
             self.config_layout.addWidget(lbl)
 
+        elif self.selected_mode == "search":
+            self.search_input = QLineEdit()
+            self.search_input.setPlaceholderText("Buscar en preguntas, explicaciones y comandos...")
+            self.search_input.setClearButtonEnabled(True)
+            self.search_input.setText(self.search_query)
+            self.search_input.textChanged.connect(lambda _: self.search_timer.start())
+            self.config_layout.addWidget(self.search_input)
+            
+            self.search_status = QLabel("")
+            self.search_status.setProperty("labelType", "caption")
+            self.config_layout.addWidget(self.search_status)
+            
+            self.search_results = QListWidget()
+            self.search_results.setMinimumHeight(220)
+            self.search_results.setWordWrap(True)
+            self.config_layout.addWidget(self.search_results)
+            
+            self.search_input.setFocus()
+            self.run_search()
+
+    def get_search_service(self):
+        """El índice normalmente llega del Dashboard; si no, se construye (o carga de caché) aquí"""
+        if self.search_service is None:
+            self.search_service = SearchService.load_or_build(self.all_questions, [])
+        return self.search_service
+
+    def run_search(self):
+        """Ejecuta la búsqueda y pinta los resultados"""
+        if self.selected_mode != "search":
+            return
+        self.search_query = self.search_input.text().strip()
+        self.search_results.clear()
+        if not self.search_query:
+            self.search_hits = []
+            self.search_status.setText("Escribe para buscar.")
+            return
+        
+        start = time.perf_counter()
+        self.search_hits = self.get_search_service().search(self.search_query, k=self.SEARCH_RESULTS)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        question_hits = 0
+        for hit in self.search_hits:
+            if hit.kind == KIND_QUESTION:
+                question_hits += 1
+                text = f"❓ {hit.title}\n     {hit.subtitle}"
+            else:
+                text = f"💻 {hit.title}\n     {hit.subtitle} (SQL Trainer)"
+            item = QListWidgetItem(text)
+            if hit.kind != KIND_QUESTION:
+                item.setForeground(Qt.gray)
+            self.search_results.addItem(item)
+        
+        self.search_status.setText(
+            f"{len(self.search_hits)} resultados ({question_hits} preguntas) en {elapsed_ms:.1f} ms"
+        )
+
     def update_sections(self):
         module_data = self.combo_module.currentData()
         self.combo_section.clear()
@@ -248,40 +331,18 @@ class StudySelectionView(QWidget):
     def start_study(self):
         filtered_questions = []
         
-        if self.selected_mode == "random":
-            filtered_questions = self.all_questions.copy()
-            
-        elif self.selected_mode == "topic":
-            mod = self.combo_module.currentData()
-            sec = self.combo_section.currentData()
-            
-            for q in self.all_questions:
-                match_mod = (mod == "all" or q.module == mod)
-                match_sec = (sec == "all" or q.section == sec)
-                
-                if match_mod and match_sec:
-                    filtered_questions.append(q)
-                    
-        elif self.selected_mode == "weak":
-            # Estrategia Escalona:
-            # 1. Prioridad Máxima: Nuevas o Críticas (< 50%)
-            critical = [q for q in self.all_questions if q.times_seen == 0 or q.accuracy < 50]
-            
-            # 2. Prioridad Media: En aprendizaje (50-79%)
-            learning = [q for q in self.all_questions if 50 <= q.accuracy < 80 and q.times_seen > 0]
-            
-            # Combinar: Primero críticas, luego aprendizaje
-            filtered_questions = critical + learning
+        if self.selected_mode in (MODE_RANDOM, MODE_TOPIC, MODE_WEAK):
+            filtered_questions = filter_questions(
+                self.all_questions, self.selected_mode,
+                module=self.combo_module.currentData() or "all",
+                section=self.combo_section.currentData() or "all",
+            )
             
-            # Si aún así no hay NINGUNA pregunta débil (todo masterizado al 100%)
+        elif self.selected_mode == "search":
+            filtered_questions = [hit.item for hit in self.search_hits if hit.kind == KIND_QUESTION]
             if not filtered_questions:
-                # Fallback suave: Tomar algunas aleatorias de las masterizadas para repaso
-                import random
-                passed = [q for q in self.all_questions if q.accuracy >= 80]
-                filtered_questions = random.sample(passed, min(len(passed), 10))
-                # O si no hay nada de nada (banco vacío), fallback total
-                if not filtered_questions:
-                    filtered_questions = self.all_questions.copy()
+                print("No matching questions found!")
+                return
 
         if not filtered_questions:
             # Fallback final de seguridad
@@ -297,7 +358,8 @@ class StudySelectionView(QWidget):
         mode_title = {
             "random": "🎲 Modo Aleatorio",
             "topic": f"📁 {self.combo_module.currentText() if self.selected_mode == 'topic' else ''}",
-            "weak": "🧠 Áreas Débiles"
+            "weak": "🧠 Áreas Débiles",
+            "search": f"🔍 {self.search_query}"
         }.get(self.selected_mode, "Quiz")
         
         self.start_quiz_signal.emit(filtered_questions, mode_title)
@@ -1,9 +1,10 @@
 """
 Controlador de Reloj Pomodoro con Detección de Foco
 """
-from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSignal
 from PyQt5.QtWidgets import QApplication
-import datetime
+import math
+import time
 
 class PomodoroState:
     INACTIVE = "inactive"
@@ -16,26 +17,55 @@ class PomodoroTimer(QObject):
     Temporizador Pomodoro que solo cuenta cuando la app tiene el foco.
     - Trabajo: 27 min
     - Descanso: 9 min
+
+    El tiempo se mide con time.monotonic(): cada tick suma el delta real
+    transcurrido, por lo que un QTimer retrasado no acumula deriva.
+    El foco se sigue con QApplication.applicationStateChanged.
     """
-    
+
     # Señales: (minutos, segundos, estado)
-    tick = pyqtSignal(int, int, str) 
+    tick = pyqtSignal(int, int, str)
     state_changed = pyqtSignal(str)
     session_finished = pyqtSignal(str) # "work" o "break" terminados
-    
+
     WORK_TIME = 27 * 60  # 27 minutos en segundos
     BREAK_TIME = 9 * 60  # 9 minutos en segundos
 
-    def __init__(self):
+    # Margen tras cruzar el segundo para que el display nunca se adelante
+    TICK_MARGIN_MS = 20
+
+    def __init__(self, persistence=None):
         super().__init__()
+        self.persistence = persistence
         self.state = PomodoroState.INACTIVE
-        self.remaining_seconds = self.WORK_TIME
+        self.previous_state = None
         self.total_sessions = 0
-        
-        # Timer principal (1 segundo)
+
+        # Tiempo de la fase actual
+        self.phase_duration = self.WORK_TIME
+        self.elapsed = 0.0           # Segundos contados (solo con foco)
+        self.recorded = 0.0          # Segundos ya registrados en el ledger
+        self._last_mark = None       # time.monotonic() desde el que se cuenta
+        self._last_shown = None
+
+        # Timer de un disparo reprogramado en cada tick hacia el próximo segundo
         self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.CoarseTimer)
         self.timer.timeout.connect(self._on_timeout)
-        self.timer.setInterval(1000)
+
+        app = QApplication.instance()
+        self.has_focus = app is None or app.applicationState() == Qt.ApplicationActive
+        if app is not None:
+            app.applicationStateChanged.connect(self._on_focus_changed)
+
+    @property
+    def remaining_seconds(self) -> int:
+        return max(0, math.ceil(self.phase_duration - self._current_elapsed()))
+
+    @property
+    def is_running(self) -> bool:
+        return self.state in (PomodoroState.WORKING, PomodoroState.BREAK)
 
     def start_work(self):
         """Inicia sesión de trabajo"""
@@ -45,73 +75,137 @@ class PomodoroTimer(QObject):
         else:
             # Nuevo inicio
             self.state = PomodoroState.WORKING
-            self.remaining_seconds = self.WORK_TIME
-        
+            self._reset_phase(self.WORK_TIME)
+
         self.state_changed.emit(self.state)
-        self.timer.start()
+        self._resume_counting()
 
     def start_break(self):
         """Inicia descanso"""
-        self.state = PomodoroState.BREAK
-        self.remaining_seconds = self.BREAK_TIME
+        if self.state == PomodoroState.PAUSED and self.previous_state == PomodoroState.BREAK:
+            self.state = PomodoroState.BREAK
+        else:
+            self.state = PomodoroState.BREAK
+            self._reset_phase(self.BREAK_TIME)
         self.state_changed.emit(self.state)
-        self.timer.start()
+        self._resume_counting()
 
     def pause(self):
         """Pausa el reloj y guarda estado"""
-        if self.state in [PomodoroState.WORKING, PomodoroState.BREAK]:
+        if self.is_running:
+            self._stop_counting()
+            self.save_session_data(completed=False)
             self.previous_state = self.state
             self.state = PomodoroState.PAUSED
-            self.timer.stop()
             self.state_changed.emit(self.state)
-            self.save_session_data()
 
     def reset(self):
         """Reinicia todo"""
+        if self.is_running:
+            self._stop_counting()
+            self.save_session_data(completed=False)
         self.stop()
         self.state = PomodoroState.INACTIVE
-        self.remaining_seconds = self.WORK_TIME
+        self.previous_state = None
+        self._reset_phase(self.WORK_TIME)
         self.state_changed.emit(self.state)
         # Emitir tick inicial
-        m, s = divmod(self.remaining_seconds, 60)
-        self.tick.emit(m, s, self.state)
+        self._emit_tick(force=True)
 
     def stop(self):
         self.timer.stop()
-        
-    def _on_timeout(self):
-        # Verificar si la ventana tiene el foco
-        app = QApplication.instance()
-        active_window = app.activeWindow()
-        
-        # Si no hay ventana activa o no es nuestra app, NO contar
-        if not active_window:
+        self._last_mark = None
+
+    def _reset_phase(self, duration):
+        self.phase_duration = duration
+        self.elapsed = 0.0
+        self.recorded = 0.0
+        self._last_shown = None
+
+    def _current_elapsed(self) -> float:
+        if self._last_mark is None:
+            return self.elapsed
+        return self.elapsed + (time.monotonic() - self._last_mark)
+
+    def _resume_counting(self):
+        """Empieza a acumular tiempo si la app tiene el foco"""
+        if self.is_running and self.has_focus and self._last_mark is None:
+            self._last_mark = time.monotonic()
+        self._emit_tick(force=True)
+        self._schedule_next_tick()
+
+    def _stop_counting(self):
+        """Consolida el delta transcurrido y deja de contar"""
+        if self._last_mark is not None:
+            self.elapsed += time.monotonic() - self._last_mark
+            self._last_mark = None
+        self.timer.stop()
+
+    def _schedule_next_tick(self):
+        """Programa el próximo disparo justo después del siguiente cambio de segundo"""
+        if self._last_mark is None:
+            return
+        remaining = self.phase_duration - self._current_elapsed()
+        if remaining <= 0:
+            self.timer.start(0)
             return
+        to_next_second = remaining - math.floor(remaining)
+        if to_next_second <= 0:
+            to_next_second = 1.0
+        self.timer.start(int(to_next_second * 1000) + self.TICK_MARGIN_MS)
 
-        # Decrementar tiempo
+    def _on_focus_changed(self, app_state):
+        self.has_focus = app_state == Qt.ApplicationActive
+        if not self.is_running:
+            return
+        if self.has_focus:
+            self._resume_counting()
+        else:
+            self._stop_counting()
+            self._emit_tick(force=True)
+
+    def _on_timeout(self):
         if self.remaining_seconds > 0:
-            self.remaining_seconds -= 1
-            m, s = divmod(self.remaining_seconds, 60)
-            self.tick.emit(m, s, self.state)
+            self._emit_tick()
+            self._schedule_next_tick()
         else:
             self._finish_phase()
 
+    def _emit_tick(self, force=False):
+        remaining = self.remaining_seconds
+        if force or remaining != self._last_shown:
+            self._last_shown = remaining
+            m, s = divmod(remaining, 60)
+            self.tick.emit(m, s, self.state)
+
     def _finish_phase(self):
-        self.timer.stop()
+        self._stop_counting()
+        self.elapsed = self.phase_duration
         if self.state == PomodoroState.WORKING:
             self.total_sessions += 1
-            self.save_session_data() # Guardar sesión completada
+            self.save_session_data(completed=True) # Guardar sesión completada
             self.session_finished.emit("work")
             # Auto-iniciar descanso? O esperar usuario?
             # Según requerimiento: "si decidimos pausarlo...". Asumiré que espera confirmación o inicia descanso.
             # Por ahora, emitimos señal y pasamos a Pausa/Esperando Descanso
-            self.start_break() 
-            
+            self.start_break()
+
         elif self.state == PomodoroState.BREAK:
+            self.save_session_data(completed=True)
             self.session_finished.emit("break")
             self.start_work() # Auto-loop o esperar? Loop de estudio sugiere continuidad.
 
-    def save_session_data(self):
-        """Guarda progreso (simulado por ahora, conectar a PersistenceService despues)"""
-        print(f"💾 Sesión guardada: {datetime.datetime.now()} | Estado: {self.state} | Restante: {self.remaining_seconds}s")
-        # Aquí llamarías a PersistenceService.save_session(duration, date...)
+    def save_session_data(self, completed=False):
+        """Registra en el ledger el tiempo de la fase aún no guardado"""
+        seconds = self.elapsed - self.recorded
+        if seconds < 1 and not completed:
+            return
+        self.recorded = self.elapsed
+        if self.persistence is None:
+            return
+        phase = "work" if self._phase_kind() == PomodoroState.WORKING else "break"
+        # La persistencia publica SessionEnded para las vistas interesadas
+        self.persistence.record_study_session(phase, seconds, completed)
+
+    def _phase_kind(self):
+        return self.previous_state if self.state == PomodoroState.PAUSED else self.state
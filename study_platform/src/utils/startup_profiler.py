@@ -0,0 +1,114 @@
+"""
+Perfilado del arranque en frío (--profile-startup)
+Relanza la aplicación con `-X importtime`, espera al primer pintado de la ventana
+y muestra el desglose de imports más costosos junto con las marcas de arranque.
+"""
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+CHILD_FLAG = '--startup-child'
+MARK_PREFIX = 'STARTUP_MARK'
+
+# Referencia común: el proceso hijo la fija lo antes posible en main.py
+_t0 = time.perf_counter()
+_marks: List[Tuple[str, float]] = []
+
+
+def set_origin(t0: float):
+    global _t0
+    _t0 = t0
+
+
+def mark(name: str):
+    """Registra una marca de arranque (ms desde el origen)"""
+    _marks.append((name, (time.perf_counter() - _t0) * 1000))
+
+
+def emit_marks():
+    """El hijo imprime sus marcas en stdout para que las lea el proceso padre"""
+    for name, ms in _marks:
+        print(f"{MARK_PREFIX} {name} {ms:.1f}", flush=True)
+
+
+def watch_first_paint(widget, on_paint):
+    """Llama a `on_paint` una sola vez, tras el primer evento Paint de `widget`"""
+    from PyQt5.QtCore import QEvent, QObject
+
+    class _FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                obj.removeEventFilter(self)
+                mark('first_paint')
+                on_paint()
+            return False
+
+    probe = _FirstPaintFilter(widget)
+    widget.installEventFilter(probe)
+    return probe
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, int, str]]:
+    """Líneas `import time: self | cumulative | module` -> [(self_us, cumulative_us, módulo)]"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Cabecera
+        entries.append((int(parts[0]), int(parts[1]), parts[2].rstrip()))
+    return entries
+
+
+def _parse_marks(stdout: str) -> Dict[str, float]:
+    marks = {}
+    for line in stdout.splitlines():
+        if line.startswith(MARK_PREFIX):
+            _, name, ms = line.split()
+            marks[name] = float(ms)
+    return marks
+
+
+def print_report(entries: List[Tuple[int, int, str]], marks: Dict[str, float], top: int = 25):
+    total_us = sum(e[0] for e in entries)
+    print(f"\n=== Imports ({len(entries)} módulos, {total_us / 1000:.1f} ms en total) ===")
+    print(f"{'acumulado ms':>13} {'propio ms':>10}  módulo")
+    for self_us, cumulative_us, module in sorted(entries, key=lambda e: e[1], reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>13.1f} {self_us / 1000:>10.1f}  {module}")
+
+    # Agrupado por paquete de primer nivel (solo el tiempo propio, sin duplicar)
+    packages: Dict[str, int] = {}
+    for self_us, _, module in entries:
+        root = module.strip().split('.')[0]
+        packages[root] = packages.get(root, 0) + self_us
+    print("\n=== Por paquete ===")
+    for root, us in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:10]:
+        print(f"{us / 1000:>10.1f} ms  {root}")
+
+    print("\n=== Arranque ===")
+    for name, ms in marks.items():
+        print(f"{ms:>10.1f} ms  {name}")
+    if 'first_paint' in marks:
+        print(f"\nTiempo hasta el primer pintado: {marks['first_paint']:.1f} ms")
+
+
+def run_profiled(script: str, extra_args: Optional[List[str]] = None, timeout: int = 120) -> int:
+    """Lanza `script` con -X importtime en modo hijo y muestra el informe"""
+    cmd = [sys.executable, '-X', 'importtime', script, CHILD_FLAG] + (extra_args or [])
+    started = time.perf_counter()
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        print(f"❌ La aplicación no llegó al primer pintado en {timeout}s")
+        return 1
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    marks = _parse_marks(result.stdout)
+    if result.returncode != 0 and 'first_paint' not in marks:
+        print(result.stderr[-2000:])
+        return result.returncode or 1
+    print_report(parse_importtime(result.stderr), marks)
+    print(f"Proceso completo (incluye intérprete y cierre): {wall_ms:.1f} ms")
+    return 0
@@ -0,0 +1,148 @@
+"""
+Trazas de rendimiento de los caminos calientes (CSV, JSON, XML, resaltado, vistas)
+Desactivadas por defecto con coste casi nulo; se activan con --trace o DP700_TRACE=1
+y se exportan en formato Chrome trace-event (chrome://tracing, Perfetto).
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Límite de eventos en memoria (los más antiguos se descartan)
+MAX_EVENTS = 200_000
+
+_enabled = os.environ.get('DP700_TRACE', '') not in ('', '0')
+_events: deque = deque(maxlen=MAX_EVENTS)
+_origin_ns = time.perf_counter_ns()
+_pid = os.getpid()
+
+
+class _NullSpan:
+    """Context manager vacío compartido cuando las trazas están desactivadas"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def clear():
+    _events.clear()
+
+
+def _record(name: str, cat: str, start_ns: int, end_ns: int, args: Optional[dict]):
+    _events.append((name, cat, start_ns, end_ns - start_ns, threading.get_ident(), args))
+
+
+@contextmanager
+def _span(name: str, cat: str, args: Optional[dict]):
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _record(name, cat, start, time.perf_counter_ns(), args)
+
+
+def span(name: str, cat: str = 'app', **args):
+    """
+    Mide un bloque:  with span('csv.parse', file=name): ...
+    Desactivado retorna un context manager compartido que no hace nada.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _span(name, cat, args or None)
+
+
+def traced(name: Optional[str] = None, cat: str = 'app'):
+    """Decorador equivalente a span(); el nombre por defecto es Clase.método"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(span_name, cat, start, time.perf_counter_ns(), None)
+        return wrapper
+    return decorator
+
+
+# ==== Exportación y resumen ====
+
+def chrome_trace() -> dict:
+    """Eventos completos ('X') con timestamps en microsegundos"""
+    events = []
+    for name, cat, start_ns, dur_ns, tid, args in list(_events):
+        event = {
+            'name': name, 'cat': cat, 'ph': 'X',
+            'ts': (start_ns - _origin_ns) / 1000, 'dur': dur_ns / 1000,
+            'pid': _pid, 'tid': tid,
+        }
+        if args:
+            event['args'] = {k: str(v) for k, v in args.items()}
+        events.append(event)
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def export_chrome_trace(path: Path) -> Optional[Path]:
+    """Escribe la traza a `path`; retorna la ruta o None si no hay eventos"""
+    if not _events:
+        return None
+    path = Path(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(chrome_trace(), f)
+        return path
+    except Exception as e:
+        print(f"Error exporting trace: {e}")
+        return None
+
+
+def slowest_spans(limit: int = 20) -> List[dict]:
+    """Resumen por nombre de span ordenado por duración máxima (ms)"""
+    summary: Dict[str, dict] = {}
+    for name, cat, _, dur_ns, _, _ in list(_events):
+        entry = summary.get(name)
+        if entry is None:
+            entry = summary[name] = {'name': name, 'cat': cat, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+        ms = dur_ns / 1e6
+        entry['count'] += 1
+        entry['total_ms'] += ms
+        if ms > entry['max_ms']:
+            entry['max_ms'] = ms
+    for entry in summary.values():
+        entry['avg_ms'] = entry['total_ms'] / entry['count']
+    return sorted(summary.values(), key=lambda e: e['max_ms'], reverse=True)[:limit]
+
+
+def event_count() -> int:
+    return len(_events)
@@ -0,0 +1,77 @@
+"""Motor de logros: cada regla se desbloquea una sola vez"""
+from config import Config
+from src.core.achievement_system import AchievementEngine, AchievementRule
+from src.core.event_bus import event_bus, AchievementUnlocked
+from src.services.persistence import PersistenceService
+from stats_manager import StatsManager
+
+
+RULES = (
+    AchievementRule.at_least('first', 'count', 1, 'Primero', ''),
+    AchievementRule.at_least('ten', 'count', 10, 'Diez', ''),
+    AchievementRule.at_least('hour', 'minutes', 60, 'Una hora', ''),
+)
+
+
+def ids(rules):
+    return [rule.id for rule in rules]
+
+
+def test_rule_unlocks_once():
+    engine = AchievementEngine(RULES)
+    assert ids(engine.evaluate({'count': 1, 'minutes': 0}, ['count'])) == ['first']
+    assert engine.evaluate({'count': 2, 'minutes': 0}, ['count']) == []
+    assert ids(engine.evaluate({'count': 10, 'minutes': 0}, ['count'])) == ['ten']
+    assert engine.evaluate_all({'count': 50, 'minutes': 0}) == []
+    assert engine.unlocked == {'first', 'ten'}
+
+
+def test_only_rules_of_changed_metrics_are_evaluated():
+    engine = AchievementEngine(RULES)
+    assert engine.evaluate({'count': 0, 'minutes': 90}, ['count']) == []
+    assert ids(engine.evaluate({'count': 0, 'minutes': 90}, ['minutes'])) == ['hour']
+
+
+def test_already_unlocked_ids_leave_the_index():
+    engine = AchievementEngine(RULES, unlocked=['first', 'unknown_id'])
+    assert ids(engine.evaluate_all({'count': 10, 'minutes': 0})) == ['ten']
+    # Desbloqueado por otro proceso entre medias
+    engine.mark_unlocked('hour')
+    engine.mark_unlocked('hour')
+    assert engine.evaluate({'count': 10, 'minutes': 600}, ['minutes']) == []
+
+
+def test_stats_manager_stores_each_achievement_once(tmp_path):
+    path = str(tmp_path / 'user_stats.json')
+    first = StatsManager(path)
+    first.record_matrix_command('SELECT', attempts=1, errors=0, time_seconds=12, completed=True)
+    unlocked = [a['id'] for a in first.get_achievements()]
+    assert {'first_command', 'speed_demon'} <= set(unlocked)
+
+    # Otra instancia (otra app) sobre el mismo archivo no los repite
+    second = StatsManager(path)
+    second.record_matrix_command('JOIN', attempts=2, errors=1, time_seconds=5, completed=True)
+    first.record_matrix_command('WHERE', attempts=1, errors=0, time_seconds=8, completed=True)
+
+    achievements = [a['id'] for a in StatsManager(path).get_achievements()]
+    assert len(achievements) == len(set(achievements))
+    assert achievements.count('first_command') == 1
+
+
+def test_persistence_publishes_each_unlock_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'STORAGE_DIR', tmp_path)
+    received = []
+
+    class Listener:
+        def on_unlocked(self, event):
+            received.append(event.achievement_id)
+
+    listener = Listener()
+    event_bus.subscribe(AchievementUnlocked, listener.on_unlocked)
+    persistence = PersistenceService(tmp_path)
+    persistence.record_command_attempt('select_1', success=True)
+    persistence.record_command_attempt('select_2', success=True)
+
+    assert received == ['first_command']
+    assert persistence.get_user_stats().achievements_unlocked == ['first_command']
+    assert PersistenceService(tmp_path).get_user_stats().achievements_unlocked == ['first_command']
@@ -0,0 +1,76 @@
+"""Agregados por módulo y sección: deltas O(1) y caché por huella de los CSV"""
+import os
+
+from src.models.question import DifficultyLevel, Question
+from src.services.aggregates import AggregatesService, Counters
+from src.services.data_cache import DataCache
+
+
+def question(qid, module, section, correct=0, incorrect=0, source_file=''):
+    return Question(id=qid, module=module, section=section, difficulty=DifficultyLevel.MEDIUM,
+                    question_text=qid, options=['A', 'B'], correct_answer=0, explanation='',
+                    times_correct=correct, times_incorrect=incorrect, source_file=source_file)
+
+
+def bank():
+    return [
+        question('q1', 'M1', 'Ingesta'),
+        question('q2', 'M1', 'Ingesta', correct=4, incorrect=1),
+        question('q3', 'M1', 'SQL', correct=1, incorrect=1),
+        question('q4', 'M2', 'KQL', correct=0, incorrect=2),
+    ]
+
+
+def snapshot(service):
+    return (service.totals, service.modules(), {m: service.sections_of(m) for m in service.modules()})
+
+
+def test_counters_group_questions_by_module_and_section():
+    service = AggregatesService(bank())
+    assert service.totals == Counters(total=4, seen=3, mastered=1, learning=1, new=2, correct=5, incorrect=4)
+    assert service.module('M1').total == 3
+    assert service.section('M1', 'SQL') == Counters(total=1, seen=1, learning=1, correct=1, incorrect=1)
+    assert list(service.sections_of('M1')) == ['Ingesta', 'SQL']
+    assert service.module('M9') == Counters()
+
+
+def test_answers_match_a_full_rebuild():
+    questions = bank()
+    service = AggregatesService(questions)
+    for q, correct in [(questions[0], True), (questions[1], False), (questions[1], False),
+                       (questions[3], True), (questions[3], True), (questions[3], True)]:
+        service.record_answer(q, correct)
+        assert snapshot(service) == snapshot(AggregatesService(questions))
+
+    assert questions[0].times_seen == 1
+    assert service.module('M2').learning == 1
+    assert service.dirty
+
+
+def test_apply_change_moves_a_question_between_buckets():
+    questions = bank()
+    service = AggregatesService(questions)
+    q = questions[2]
+    old = (q.times_correct, q.times_incorrect)
+    q.times_correct, q.times_incorrect = 9, 1  # Métricas escritas por otro proceso
+    service.apply_change(q, *old)
+    assert service.section('M1', 'SQL').mastered == 1
+    assert service.totals.correct == 13
+
+
+def test_cached_state_is_used_until_a_source_file_changes(tmp_path):
+    csv_path = tmp_path / 'module.csv'
+    csv_path.write_text('x', encoding='utf-8')
+    cache = DataCache(tmp_path / 'cache')
+    questions = [question('q1', 'M1', 'Ingesta', correct=1, source_file=str(csv_path))]
+
+    assert AggregatesService.load_or_build(questions, cache).dirty is False
+    cached = AggregatesService.load_or_build(questions, cache)
+    assert cached.totals.correct == 1
+
+    # Estado guardado obsoleto: solo se descarta si el CSV cambia
+    questions[0].times_correct = 5
+    assert AggregatesService.load_or_build(questions, cache).totals.correct == 1
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert AggregatesService.load_or_build(questions, cache).totals.correct == 5
@@ -0,0 +1,155 @@
+"""Servidor JSON: endpoints, errores, contrapresión y persistencia por lotes"""
+import asyncio
+import csv
+import json
+
+import pytest
+
+from benchmarks.load_test import Client
+from config import Config
+from src.services.api_server import StudyAPIServer
+from src.services.profiles import DEFAULT_PROFILE, ProfileRegistry
+
+FIELDS = ['section', 'question', 'options', 'correct', 'notas', 'difficulty', 'metrics']
+
+
+@pytest.fixture
+def content(tmp_path, monkeypatch):
+    """Contenido y progreso temporales: una pregunta (correcta la opción 2) y un comando"""
+    data_dir = tmp_path / 'data'
+    module = data_dir / 'questions' / 'dp700_modulo_1.csv'
+    module.parent.mkdir(parents=True)
+    with open(module, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerow({'section': 'Lakehouse', 'question': '¿Qué es Delta?', 'options': 'Motor;Formato',
+                         'correct': '2', 'notas': 'Parquet + log', 'difficulty': 'easy', 'metrics': '0;0'})
+    command = data_dir / 'commands' / 'KQL' / 'take.xml'
+    command.parent.mkdir(parents=True)
+    command.write_text('<command><title>Take</title><part text="T | take 10"/></command>', encoding='utf-8')
+
+    monkeypatch.setattr(Config, 'DATA_DIR', data_dir)
+    monkeypatch.setattr(Config, 'PACKS_DIR', data_dir / 'packs')
+    monkeypatch.setattr(Config, 'STORAGE_DIR', tmp_path / 'storage')
+    monkeypatch.setattr(Config, 'CACHE_DIR', tmp_path / 'storage' / 'cache')
+    monkeypatch.setattr(Config, 'PROFILES_DIR', tmp_path / 'storage' / 'profiles')
+    return module
+
+
+def run(scenario, persist=True, **limits):
+    """Arranca el servidor en un puerto libre, ejecuta el escenario y lo detiene (flush final)"""
+    async def main():
+        server = StudyAPIServer(persist=persist)
+        for name, value in limits.items():
+            setattr(server, name, value)
+        await server.start('127.0.0.1', 0)
+        try:
+            return await scenario(server)
+        finally:
+            await server.stop()
+    return asyncio.run(main())
+
+
+def read_metrics(module):
+    with open(module, encoding='utf-8', newline='') as f:
+        return [row['metrics'] for row in csv.DictReader(f)]
+
+
+def profile_metrics(module):
+    """Contadores del fragmento del perfil activo (sin --profile, el servidor escribe ahí)"""
+    shard = ProfileRegistry().path(DEFAULT_PROFILE) / 'metrics' / f'{module.stem}.json'
+    if not shard.exists():
+        return []
+    return list(json.loads(shard.read_text(encoding='utf-8')).values())
+
+
+def test_study_flow_and_batched_persistence(content):
+    async def scenario(server):
+        client = Client('127.0.0.1', server.port)
+        status, health = await client.request('GET', '/api/health')
+        assert status == 200 and (health['questions'], health['commands']) == (1, 1)
+
+        _, data = await client.request('POST', '/api/sessions', {})
+        session = data['session']
+        _, data = await client.request('GET', f'/api/questions/next?session={session}&count=1')
+        (question,) = data['questions']
+        assert question['options'] == ['Motor', 'Formato']
+
+        _, wrong = await client.request('POST', '/api/answers',
+                                        {'session': session, 'question_id': question['id'], 'choice': 0})
+        _, right = await client.request('POST', '/api/answers',
+                                        {'session': session, 'question_id': question['id'], 'choice': 1})
+        assert (wrong['correct'], right['correct'], right['correct_answer']) == (False, True, 1)
+        assert right['session']['accuracy'] == 50.0
+
+        # Las respuestas esperan al flush por lotes
+        assert profile_metrics(content) == []
+        _, stats = await client.request('GET', f'/api/stats?session={session}')
+        assert stats['session']['answered'] == 2
+
+        _, modules = await client.request('GET', '/api/modules')
+        _, commands = await client.request('GET', '/api/commands')
+        client.close()
+        return modules, commands
+
+    modules, commands = run(scenario)
+    assert modules == {'Modulo 1': ['Lakehouse']}
+    assert [c['title'] for c in commands['commands']] == ['Take']
+    assert profile_metrics(content) == [[1, 1]]
+    # El contenido compartido queda de solo lectura
+    assert read_metrics(content) == ['0;0']
+
+
+def test_no_persist_keeps_answers_in_memory(content):
+    async def scenario(server):
+        client = Client('127.0.0.1', server.port)
+        _, data = await client.request('POST', '/api/sessions', {})
+        await client.request('POST', '/api/answers',
+                             {'session': data['session'], 'question_id': server.questions[0].id, 'choice': 1})
+        client.close()
+
+    run(scenario, persist=False)
+    assert read_metrics(content) == ['0;0'] and profile_metrics(content) == []
+
+
+def test_request_errors(content):
+    async def scenario(server):
+        client = Client('127.0.0.1', server.port)
+        results = [
+            await client.request('GET', '/api/questions/next?session=nope'),
+            await client.request('GET', '/api/sessions'),
+            await client.request('GET', '/api/missing'),
+        ]
+        _, data = await client.request('POST', '/api/sessions', {})
+        results.append(await client.request('POST', '/api/answers',
+                                            {'session': data['session'], 'question_id': server.questions[0].id,
+                                             'choice': 7}))
+        results.append(await client.request('GET', f"/api/questions/next?session={data['session']}&mode=hard"))
+        client.close()
+        return [(status, body['error']) for status, body in results]
+
+    assert run(scenario) == [
+        (404, 'unknown session'),
+        (405, 'method not allowed'),
+        (404, 'not found'),
+        (400, 'choice must be an option index'),
+        (400, 'mode must be one of random, topic, weak'),
+    ]
+
+
+def test_backpressure_limits(content):
+    async def scenario(server):
+        first = Client('127.0.0.1', server.port)
+        await first.request('GET', '/api/health')          # Ocupa la única conexión
+        second = Client('127.0.0.1', server.port)
+        busy = await second.request('GET', '/api/health')
+        first.close()
+
+        third = Client('127.0.0.1', server.port)
+        await asyncio.sleep(0.05)
+        too_large = await third.request('POST', '/api/sessions', {'padding': 'x' * 2048})
+        return busy, too_large
+
+    busy, too_large = run(scenario, MAX_CONNECTIONS=1, MAX_BODY_BYTES=1024)
+    assert busy == (503, {'error': 'server busy'})
+    assert too_large == (413, {'error': 'body too large'})
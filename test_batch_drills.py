@@ -0,0 +1,91 @@
+"""Modo batch de los drills de consola: parseo de respuestas y reporte JSON"""
+import csv
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from consola_estudio import build_batch_parser, batch_main, iter_answer_stream, parse_answer_line, run_batch
+
+
+ROOT = Path(__file__).resolve().parent
+
+
+def write_drill(path):
+    rows = [
+        {'section': 'Ingesta', 'id': '1', 'question': 'Q1', 'options': 'A;B;C', 'correct': '2',
+         'multi': 'false', 'second_question': 'V1', 'second_options': 'Si;No', 'second_correct': '1',
+         'second_explanation': '', 'metrics': ''},
+        {'section': 'SQL', 'id': '2', 'question': 'Q2', 'options': 'A;B;C;D', 'correct': '1;3',
+         'multi': 'true', 'second_question': '', 'second_options': '', 'second_correct': '',
+         'second_explanation': '', 'metrics': ''},
+    ]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_answer_lines_accept_both_separators_and_verification():
+    assert parse_answer_line('2') == ((2,), ())
+    assert parse_answer_line('1,3') == ((1, 3), ())
+    assert parse_answer_line('1;3|2') == ((1, 3), (2,))
+    assert parse_answer_line(' x ') == ((), ())
+
+
+def test_answer_stream_skips_blank_lines_and_comments():
+    stream = io.StringIO('# respuestas\n2\n\n  1;3 \n# fin\n')
+    assert list(iter_answer_stream(stream)) == [((2,), ()), ((1, 3), ())]
+
+
+def test_answers_are_scored_in_csv_order(tmp_path):
+    drill = write_drill(tmp_path / 'drill.csv')
+    report = run_batch([drill], answers=[((2,), (2,)), ((3, 1), ())], shuffle=False, verification=True)
+
+    summary = report['summary']
+    assert (summary['answered'], summary['correct'], summary['accuracy']) == (2, 2, 100.0)
+    assert (summary['multi_answered'], summary['multi_correct']) == (1, 1)
+    assert (summary['verification_answered'], summary['verification_correct']) == (1, 0)
+    assert report['per_section']['SQL'] == {'answered': 1, 'correct': 1, 'accuracy': 100.0}
+    assert [r['id'] for r in report['results']] == ['1', '2']
+
+
+def test_running_out_of_answers_stops_the_drill(tmp_path):
+    drill = write_drill(tmp_path / 'drill.csv')
+    report = run_batch([drill], repetitions=3, answers=[((1,), ())], shuffle=False, details=False)
+    assert report['summary']['answered'] == 1
+    assert report['summary']['answers_exhausted']
+    assert 'results' not in report
+
+
+def test_simulation_is_reproducible_with_a_seed(tmp_path):
+    drill = write_drill(tmp_path / 'drill.csv')
+    perfect = run_batch([drill], repetitions=5, simulate=1.0, seed=3)
+    assert perfect['summary']['accuracy'] == 100.0
+    first = run_batch([drill], repetitions=20, simulate=0.5, seed=7)
+    second = run_batch([drill], repetitions=20, simulate=0.5, seed=7)
+    def answers(report):
+        return [(r['id'], r['answer'], r['correct']) for r in report['results']]
+    assert answers(first) == answers(second)
+    assert 0 < first['summary']['accuracy'] < 100
+
+
+def test_batch_main_writes_json_and_honours_fail_under(tmp_path):
+    drill = write_drill(tmp_path / 'drill.csv')
+    answers = tmp_path / 'answers.txt'
+    answers.write_text('1\n1\n', encoding='utf-8')
+    output = tmp_path / 'report.json'
+    parser = build_batch_parser('test', [drill])
+
+    code = batch_main(parser.parse_args(['--batch', '--answers', str(answers), '--no-shuffle',
+                                         '--output', str(output), '--fail-under', '50']))
+    assert code == 1
+    assert json.loads(output.read_text(encoding='utf-8'))['summary']['correct'] == 0
+    assert batch_main(parser.parse_args(['--batch', '--files', str(tmp_path / 'missing.csv')])) == 2
+
+
+def test_interactive_mode_does_not_import_the_question_bank():
+    code = "import sys, consola_estudio; sys.exit('question_bank' in sys.modules)"
+    assert subprocess.run([sys.executable, '-c', code], cwd=ROOT).returncode == 0
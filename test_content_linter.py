@@ -0,0 +1,143 @@
+"""Validación del contenido: reglas CSV/XML, caché por hash y línea base"""
+import csv
+import io
+
+import lint
+from src.services import content_linter
+from src.services.content_linter import (
+    ERROR, WARNING, apply_baseline, lint_csv_text, lint_paths, lint_xml_bytes, load_baseline, save_baseline,
+)
+from src.services.data_cache import DataCache
+
+FIELDS = ['section', 'question', 'options', 'correct', 'multi', 'metrics']
+GOOD_ROW = {'section': 'Lakehouse', 'options': 'Formato;Motor',
+            'correct': '1', 'multi': 'false', 'metrics': '2;1'}
+
+
+def csv_text(*rows, fields=FIELDS):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=fields)
+    writer.writeheader()
+    for n, row in enumerate(rows, 1):
+        writer.writerow({**GOOD_ROW, 'question': f'¿Pregunta {n}?', **row})
+    return out.getvalue()
+
+
+def codes(issues):
+    return [(issue.line, issue.severity, issue.code) for issue in issues]
+
+
+def test_valid_row_has_no_issues():
+    assert lint_csv_text(csv_text({}), 'm.csv') == []
+
+
+def test_csv_answer_rules():
+    issues = lint_csv_text(csv_text(
+        {'options': 'Única'},
+        {'correct': '3'},
+        {'correct': '1;2', 'multi': 'false'},
+        {'multi': 'true'},
+        {'metrics': '3-1'},
+        {'question': '   '},
+    ), 'm.csv')
+    assert codes(issues) == [
+        (2, ERROR, 'options'),
+        (3, ERROR, 'correct'),
+        (4, ERROR, 'multi'),
+        (5, ERROR, 'multi'),
+        (6, ERROR, 'metrics'),
+        (7, ERROR, 'question'),
+    ]
+    assert issues[1].message == 'correct index 3 out of range 1..2'
+
+
+def test_csv_structure_rules():
+    assert codes(lint_csv_text('question,options\n¿?,a;b\n', 'm.csv')) == [(1, ERROR, 'header')]
+    extra = csv_text({}).rstrip('\r\n') + ',sobra\r\n'
+    assert codes(lint_csv_text(extra, 'm.csv')) == [(2, ERROR, 'columns')]
+    same = {'question': '¿Qué es Delta?'}
+    assert codes(lint_csv_text(csv_text(same, same), 'm.csv')) == [(3, WARNING, 'duplicate')]
+
+
+def command_xml(full, *parts):
+    body = ''.join(f'<part text="{text}" description="d"/>' for text in parts)
+    return f'<command><title>T</title><full>{full}</full>{body}</command>'.encode('utf-8')
+
+
+def test_xml_parts_must_appear_in_full_in_order():
+    full = 'SELECT a, b FROM t WHERE a > 1'
+    assert lint_xml_bytes(command_xml(full, 'select a, b', 'FROM t', 'WHERE a>1'), 'c.xml') == []
+    assert lint_xml_bytes(command_xml(full, 'SELECT ... FROM t'), 'c.xml') == []
+    issues = lint_xml_bytes(command_xml(full, 'FROM t', 'SELECT a'), 'c.xml')
+    assert [i.message for i in issues] == ["part 2 'SELECT a' out of order in <full>"]
+    issues = lint_xml_bytes(command_xml(full, 'GROUP BY a'), 'c.xml')
+    assert [i.message for i in issues] == ["part 1 'GROUP BY a' not found in <full>"]
+    assert codes(lint_xml_bytes(b'<command><title>', 'c.xml'))[0][1:] == (ERROR, 'xml')
+
+
+def test_clean_files_are_skipped_until_their_content_changes(tmp_path, monkeypatch):
+    good = tmp_path / 'good.csv'
+    good.write_text(csv_text({'question': '¿Igual?'}, {'question': '¿Igual?'}), encoding='utf-8')  # Con un aviso
+    bad = tmp_path / 'bad.csv'
+    bad.write_text(csv_text({'options': 'Única'}), encoding='utf-8')
+    cache = DataCache(tmp_path / 'cache')
+
+    first = lint_paths([good, bad], jobs=1, cache=cache)
+    assert (first.checked, first.skipped, first.errors, first.warnings) == (2, 0, 1, 1)
+
+    linted = []
+    real_lint_file = content_linter.lint_file
+    monkeypatch.setattr(content_linter, 'lint_file', lambda path: linted.append(path) or real_lint_file(path))
+    second = lint_paths([good, bad], jobs=1, cache=cache)
+    assert linted == [str(bad)]
+    assert (second.checked, second.skipped, second.warnings) == (1, 1, 1)
+
+    good.write_text(csv_text({}), encoding='utf-8')
+    third = lint_paths([good, bad], jobs=1, cache=cache)
+    assert third.checked == 2 and third.warnings == 0
+
+
+def test_parallel_run_matches_serial(tmp_path):
+    paths = []
+    for n in range(4):
+        path = tmp_path / f'm{n}.csv'
+        path.write_text(csv_text({'correct': str(n)}), encoding='utf-8')
+        paths.append(path)
+    serial = lint_paths(paths, jobs=1)
+    parallel = lint_paths(paths, jobs=2)
+    assert [i.format() for i in parallel.issues] == [i.format() for i in serial.issues]
+    assert serial.errors == 2
+
+
+def test_baseline_ignores_line_numbers_and_counts(tmp_path):
+    data = tmp_path / 'data'
+    data.mkdir()
+    module = data / 'm.csv'
+    module.write_text(csv_text({'options': 'Única'}), encoding='utf-8')
+    baseline_path = tmp_path / 'lint_baseline.json'
+    save_baseline(baseline_path, lint_paths([module], jobs=1).issues, tmp_path)
+    assert load_baseline(baseline_path) == {'data/m.csv|error|options|needs at least 2 options, found 1': 1}
+
+    # Filas insertadas antes: el problema conocido cambia de línea pero sigue en la línea base
+    module.write_text(csv_text({}, {'question': 'Otra'}, {'options': 'Única'}), encoding='utf-8')
+    report = apply_baseline(lint_paths([module], jobs=1), load_baseline(baseline_path), tmp_path)
+    assert report.errors == 0 and len(report.baselined) == 1
+
+    # Un segundo caso del mismo problema es nuevo
+    module.write_text(csv_text({'options': 'Única'}, {'question': 'Otra', 'options': 'Sola'}), encoding='utf-8')
+    report = apply_baseline(lint_paths([module], jobs=1), load_baseline(baseline_path), tmp_path)
+    assert report.errors == 1 and report.issues[0].line == 3
+
+
+def test_cli_exit_codes_with_baseline(tmp_path, capsys):
+    module = tmp_path / 'm.csv'
+    module.write_text(csv_text({'options': 'Única'}, {'question': 'Otra'}, {'question': 'Otra'}), encoding='utf-8')
+    baseline = tmp_path / 'baseline.json'
+    args = [str(module), '--no-cache', '--jobs', '1', '--baseline', str(baseline)]
+
+    assert lint.main(args) == 1
+    assert lint.main(args + ['--update-baseline']) == 0
+    assert lint.main(args) == 0
+    assert lint.main(args + ['--strict']) == 0        # El aviso también está en la línea base
+    assert lint.main(args + ['--no-baseline']) == 1
+    assert 'conocidos en la línea base' in capsys.readouterr().out
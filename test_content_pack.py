@@ -0,0 +1,109 @@
+"""Paquetes .dp700pack: lectura sin extraer, caché por hash y métricas fuera del zip"""
+import csv
+import json
+
+import pytest
+
+from config import Config
+from src.services import content_pack
+from src.services.content_pack import ContentPack, build_pack, metrics_path
+from src.services.data_cache import DataCache
+from src.services.data_loader import DataLoader
+
+FIELDS = ['section', 'question', 'options', 'correct', 'notas', 'difficulty', 'metrics']
+
+
+def write_module(path, questions, metrics='0;0'):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for text in questions:
+            writer.writerow({'section': 'Lakehouse', 'question': text, 'options': 'Sí;No',
+                             'correct': '1', 'notas': '', 'difficulty': 'easy', 'metrics': metrics})
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Caché y métricas de packs en un storage temporal"""
+    monkeypatch.setattr(Config, 'STORAGE_DIR', tmp_path / 'storage')
+    monkeypatch.setattr(Config, 'CACHE_DIR', tmp_path / 'storage' / 'cache')
+    return tmp_path / 'storage'
+
+
+@pytest.fixture
+def pack(tmp_path):
+    source = tmp_path / 'source'
+    write_module(source / 'questions' / 'dp700_pack_module.csv', ['¿Uno?', '¿Dos?'], metrics='1;1')
+    command = source / 'commands' / 'KQL' / 'take.xml'
+    command.parent.mkdir(parents=True)
+    command.write_text('<command><title>Take</title><part text="T | take 10"/></command>', encoding='utf-8')
+    return build_pack(source, tmp_path / 'packs' / 'core.dp700pack', 'core', '1.0')
+
+
+@pytest.fixture
+def make_loader(tmp_path):
+    loaders = []
+
+    def make():
+        loader = DataLoader()
+        loader.questions_dir = tmp_path / 'questions'
+        loader.commands_dir = tmp_path / 'commands'
+        loader.packs_dir = tmp_path / 'packs'
+        loaders.append(loader)
+        return loader
+    yield make
+    for loader in loaders:
+        loader.close()
+
+
+def test_pack_is_read_from_the_zip(storage, pack):
+    questions, commands = ContentPack(pack).load(DataLoader())
+    assert [q.question_text for q in questions] == ['¿Uno?', '¿Dos?']
+    assert questions[0].id == 'dp700_pack_module_q1'
+    assert questions[0].source_file == f"{pack}!questions/dp700_pack_module.csv"
+    assert [c.full_command for c in commands] == ['T | take 10']
+
+
+def test_unchanged_pack_is_served_from_the_cache(storage, pack, monkeypatch):
+    ContentPack(pack).load(DataLoader())
+    monkeypatch.setattr(ContentPack, '_parse', lambda self, loader: pytest.fail("zip reopened"))
+    questions, _ = ContentPack(pack).load(DataLoader(), DataCache())
+    assert len(questions) == 2
+
+
+def test_pack_metrics_are_written_beside_the_pack_and_layered_on_load(storage, make_loader, pack):
+    archive = pack.read_bytes()
+    loader = make_loader()
+    first = loader.load_all_questions(lazy=True)[0]
+    loader.record_answer(first, True)
+    loader.flush_pending()
+
+    assert pack.read_bytes() == archive
+    assert json.loads(metrics_path(pack).read_text(encoding='utf-8')) == {first.id: [2, 1]}
+    assert metrics_path(pack).parent == storage / 'pack_metrics'
+
+    reloaded = make_loader().load_all_questions(lazy=True)
+    assert (reloaded[0].times_correct, reloaded[0].times_incorrect, reloaded[0].times_seen) == (2, 1, 3)
+    assert (reloaded[1].times_correct, reloaded[1].times_incorrect) == (1, 1)
+
+
+def test_loose_files_take_priority_over_pack_items(storage, tmp_path, make_loader, pack):
+    write_module(tmp_path / 'questions' / 'dp700_pack_module.csv', ['¿Local?'])
+    questions = make_loader().load_all_questions(lazy=True)
+    assert [q.id for q in questions] == ['dp700_pack_module_q1', 'dp700_pack_module_q2']
+    assert questions[0].question_text == '¿Local?'
+    assert content_pack.is_pack_member(questions[1].source_file)
+
+
+def test_fingerprint_changes_when_a_pack_is_added(storage, tmp_path, make_loader):
+    write_module(tmp_path / 'questions' / 'dp700_local.csv', ['¿Local?'])
+    loader = make_loader()
+    before = loader.content_fingerprint(loader.load_all_questions(lazy=True))
+
+    source = tmp_path / 'source'
+    write_module(source / 'questions' / 'dp700_extra.csv', ['¿Extra?'])
+    build_pack(source, tmp_path / 'packs' / 'extra.dp700pack', 'extra')
+    loader = make_loader()
+    after = loader.content_fingerprint(loader.load_all_questions(lazy=True))
+    assert before != after
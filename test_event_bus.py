@@ -0,0 +1,68 @@
+"""Bus de eventos: despacho por tipo y suscriptores débiles"""
+import gc
+
+from src.core.event_bus import EventBus, MetricsFlushed, QuestionAnswered
+
+
+class View:
+    def __init__(self):
+        self.events = []
+
+    def on_event(self, event):
+        self.events.append(event)
+
+
+def test_events_reach_only_subscribers_of_their_type():
+    bus = EventBus()
+    answered, flushed = View(), View()
+    bus.subscribe(QuestionAnswered, answered.on_event)
+    bus.subscribe(MetricsFlushed, flushed.on_event)
+
+    bus.publish(QuestionAnswered('q1', True))
+    assert answered.events == [QuestionAnswered('q1', True)]
+    assert flushed.events == []
+    assert bus.published == {'QuestionAnswered': 1}
+
+
+def test_destroyed_views_stop_receiving_events():
+    bus = EventBus()
+    view = View()
+    bus.subscribe(QuestionAnswered, view.on_event)
+    assert bus.subscriber_count() == 1
+
+    del view
+    gc.collect()
+    bus.publish(QuestionAnswered('q1', False))
+    assert bus.subscriber_count() == 0
+
+
+def test_plain_functions_are_kept_until_unsubscribed():
+    bus = EventBus()
+    received = []
+    unsubscribe = bus.subscribe(MetricsFlushed, received.append)
+    bus.publish(MetricsFlushed(('a.csv',), 2))
+    unsubscribe()
+    bus.publish(MetricsFlushed(('a.csv',), 3))
+    assert [e.questions for e in received] == [2]
+    assert bus.subscriber_count() == 0
+
+
+def test_failing_handler_does_not_stop_the_others(capsys):
+    bus = EventBus()
+    view = View()
+
+    def broken(event):
+        raise ValueError('boom')
+
+    def deleted_widget(event):
+        raise RuntimeError('wrapped C/C++ object of type QLabel has been deleted')
+
+    bus.subscribe(QuestionAnswered, broken)
+    bus.subscribe(QuestionAnswered, deleted_widget)
+    bus.subscribe(QuestionAnswered, view.on_event)
+    bus.publish(QuestionAnswered('q1', True))
+
+    assert len(view.events) == 1
+    assert 'boom' in capsys.readouterr().out
+    # El widget destruido se descarta; el handler con error sigue suscrito
+    assert bus.subscriber_count() == 2
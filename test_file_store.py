@@ -0,0 +1,103 @@
+"""Escrituras entre procesos: bloqueo, escritura atómica y fusión de contadores"""
+import csv
+import multiprocessing
+import threading
+import time
+
+from platform_bridge import CounterDelta, file_lock, locked_update_csv, parse_counts
+from src.core.file_store import atomic_write_text, lock_path, merge_counters
+
+PROCESSES = 4
+INCREMENTS = 25
+
+
+def write_counter_csv(path, rows=3):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['id', 'metrics'])
+        writer.writeheader()
+        for n in range(1, rows + 1):
+            writer.writerow({'id': str(n), 'metrics': '0;0'})
+
+
+def read_counter_csv(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return [parse_counts(row['metrics']) for row in csv.DictReader(f)]
+
+
+def increment_worker(path, number):
+    """Un proceso: suma un acierto a la fila `number % 3` en cada escritura"""
+    target = number % 3
+
+    def update(fieldnames, rows):
+        correct, incorrect = parse_counts(rows[target]['metrics'])
+        rows[target]['metrics'] = f'{correct + 1};{incorrect}'
+
+    for _ in range(INCREMENTS):
+        locked_update_csv(path, update)
+
+
+def test_parse_counts_tolerates_bad_values():
+    assert parse_counts('3;1') == (3, 1)
+    assert parse_counts('') == (0, 0) and parse_counts(None) == (0, 0)
+    assert parse_counts('4') == (4, 0)
+    assert parse_counts('4;') == (4, 0)
+    assert parse_counts('x;1') == (0, 0)
+    assert parse_counts('-2;1') == (0, 1)
+
+
+def test_counter_delta_adds_only_this_session_increments():
+    delta = CounterDelta('q1', snapshot=(5, 2), baseline=(3, 2))
+    assert delta.merge((10, 4)) == (12, 4)      # Otro proceso sumó 7;2 entre medias
+    assert delta.merged == (12, 4)
+    assert CounterDelta('q1', (5, 2)).merge((10, 4)) == (5, 2)   # Sin referencia: absoluta
+    assert CounterDelta('q1', (0, 0), baseline=(3, 0)).merge((1, 0)) == (0, 0)
+
+
+def test_merge_counters_starts_missing_keys_from_the_baseline():
+    stored = {'q1': [4, 4]}
+    merge_counters(stored, [CounterDelta('q1', (1, 1), (0, 0)), CounterDelta('q2', (2, 1), (1, 1))])
+    assert stored == {'q1': [5, 5], 'q2': [2, 1]}
+
+
+def test_file_lock_is_exclusive_between_threads(tmp_path):
+    path = tmp_path / 'stats.json'
+    events = []
+
+    def hold(name):
+        with file_lock(path):
+            events.append(f'{name}+')
+            time.sleep(0.05)
+            events.append(f'{name}-')
+
+    threads = [threading.Thread(target=hold, args=(n,)) for n in 'ab']
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert events in (['a+', 'a-', 'b+', 'b-'], ['b+', 'b-', 'a+', 'a-'])
+    assert lock_path(path).exists() and not path.exists()
+
+
+def test_atomic_write_leaves_no_temporary_files(tmp_path):
+    path = tmp_path / 'data.json'
+    atomic_write_text(path, 'uno')
+    atomic_write_text(path, 'dos')
+    assert path.read_text(encoding='utf-8') == 'dos'
+    assert [p.name for p in tmp_path.iterdir()] == ['data.json']
+
+
+def test_locked_update_csv_loses_no_increments_across_processes(tmp_path):
+    path = tmp_path / 'dp700_m1.csv'
+    write_counter_csv(path)
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=increment_worker, args=(str(path), n)) for n in range(PROCESSES)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+    assert [worker.exitcode for worker in workers] == [0] * PROCESSES
+
+    expected = [0, 0, 0]
+    for n in range(PROCESSES):
+        expected[n % 3] += INCREMENTS
+    assert read_counter_csv(path) == [(count, 0) for count in expected]
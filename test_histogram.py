@@ -0,0 +1,95 @@
+"""Histogramas logarítmicos de tiempos de respuesta: cubetas, cuantiles y fusión"""
+import random
+
+import pytest
+
+from src.core.histogram import (
+    BASE_SECONDS, BUCKETS, BUCKETS_PER_DOUBLING, LogHistogram, bucket_index, bucket_value,
+)
+
+
+STEP = 2 ** (1 / BUCKETS_PER_DOUBLING)
+
+
+def test_values_below_base_go_to_the_first_bucket():
+    assert bucket_index(0) == 0
+    assert bucket_index(BASE_SECONDS * 0.9999) == 0
+    assert bucket_index(BASE_SECONDS) == 1
+
+
+def test_bucket_edges_grow_by_a_fixed_factor():
+    # Se evitan los bordes exactos (redondeo de log2)
+    for index in (1, 10, 30):
+        edge = BASE_SECONDS * STEP ** index
+        assert bucket_index(edge * 0.9999) == index
+        assert bucket_index(edge * 1.0001) == index + 1
+
+
+def test_huge_values_go_to_the_last_bucket():
+    assert bucket_index(10 ** 6) == BUCKETS - 1
+    assert bucket_index(float('1e300')) == BUCKETS - 1
+
+
+def test_bucket_value_lies_inside_its_bucket():
+    for index in range(BUCKETS):
+        assert bucket_index(bucket_value(index)) == index
+
+
+def test_empty_histogram_has_no_quantiles():
+    hist = LogHistogram()
+    assert hist.quantile(0.5) is None
+    assert hist.p90 is None
+    assert hist.mean == 0.0
+
+
+def test_single_sample_is_returned_exactly():
+    hist = LogHistogram()
+    hist.record(7.3)
+    assert hist.p50 == 7.3
+    assert hist.p90 == 7.3
+
+
+def test_quantiles_have_bounded_relative_error():
+    samples = [n / 4 for n in range(1, 801)]  # 0.25 s .. 200 s
+    hist = LogHistogram()
+    for seconds in samples:
+        hist.record(seconds)
+    assert hist.p50 == pytest.approx(100, rel=0.1)
+    assert hist.p90 == pytest.approx(180, rel=0.1)
+    assert hist.p90 >= hist.p50
+    assert hist.mean == pytest.approx(sum(samples) / len(samples))
+
+
+def test_merge_equals_recording_everything_in_one_histogram():
+    rng = random.Random(700)
+    samples = [rng.lognormvariate(2.5, 1.0) for _ in range(300)]
+    left, right, whole = LogHistogram(), LogHistogram(), LogHistogram()
+    for n, seconds in enumerate(samples):
+        (left if n % 3 else right).record(seconds)
+        whole.record(seconds)
+
+    left.merge(right)
+    assert left.counts == whole.counts
+    assert (left.count, left.min, left.max) == (whole.count, whole.min, whole.max)
+    assert left.total == pytest.approx(whole.total)
+    assert left.p50 == whole.p50 and left.p90 == whole.p90
+
+
+def test_merge_into_empty_histogram():
+    source = LogHistogram()
+    source.record(3.0)
+    target = LogHistogram()
+    target.merge(source)
+    target.merge(LogHistogram())
+    assert (target.count, target.min, target.max) == (1, 3.0, 3.0)
+
+
+def test_dict_round_trip():
+    hist = LogHistogram()
+    for seconds in (0.1, 2.0, 2.1, 45.0):
+        hist.record(seconds)
+    restored = LogHistogram.from_dict(hist.to_dict())
+    assert restored.counts == hist.counts
+    assert (restored.count, restored.min, restored.max) == (4, 0.1, 45.0)
+    assert restored.total == pytest.approx(hist.total, abs=0.01)
+    assert restored.p50 == hist.p50
@@ -0,0 +1,60 @@
+"""Modelos compactos: strings internados, tuplas compartidas y formato JSON compatible"""
+from src.models.question import CommandPart, DifficultyLevel, MasteryLevel, Question, SQLCommand
+from src.services.data_loader import DataLoader
+
+
+def make_question(qid, section='Lakehouse', **metrics):
+    return Question(
+        id=qid, module=''.join(['mod', 'ule_1']), section=''.join(section),
+        difficulty=DifficultyLevel.EASY, question_text='¿?', options=['a', 'b'],
+        correct_answer=0, explanation='', tags=[section], **metrics,
+    )
+
+
+def test_categorical_strings_and_tags_are_shared():
+    first, second = make_question('1'), make_question('2')
+    assert first.module is second.module
+    assert first.tags is second.tags == ('Lakehouse',)
+    assert first.options == ('a', 'b')
+
+
+def test_question_round_trip_and_mastery():
+    question = make_question('1', times_seen=5, times_correct=4, times_incorrect=1)
+    data = question.to_dict()
+    assert data['options'] == ['a', 'b'] and data['tags'] == ['Lakehouse']
+    restored = Question.from_dict(data)
+    assert restored == question
+    assert restored.mastery_level is MasteryLevel.MASTERED
+
+
+def command(**extra):
+    return {'id': 'c1', 'title': 'Crear', 'description': '', 'category': 'DDL',
+            'difficulty': 'hard', 'full_command': 'CREATE TABLE t', **extra}
+
+
+def test_command_derives_hints_and_keywords_from_parts():
+    cmd = SQLCommand.from_dict(command(explanation_parts=[
+        {'fragment': 'CREATE TABLE', 'explanation': 'Crea la tabla'},
+        {'fragment': 't', 'explanation': ''},
+    ]))
+    assert cmd.keywords == ['CREATE TABLE', 't']
+    assert cmd.hints == ['Crea la tabla']
+    assert SQLCommand.from_dict(cmd.to_dict()) == cmd
+
+
+def test_command_accepts_legacy_hints_and_keywords():
+    cmd = SQLCommand.from_dict(command(keywords=['CREATE TABLE'], hints=['Crea la tabla', 'Extra']))
+    assert cmd.parts == (CommandPart('CREATE TABLE', 'Crea la tabla'), CommandPart('', 'Extra'))
+    assert cmd.difficulty is DifficultyLevel.HARD
+
+
+def test_xml_parts_become_command_parts(tmp_path):
+    xml = tmp_path / 'DDL' / 'create.xml'
+    xml.parent.mkdir()
+    xml.write_text(
+        '<command id="c1"><title>Crear</title>'
+        '<part text="CREATE TABLE" description="Crea la tabla"/>'
+        '<part><text>t</text></part></command>', encoding='utf-8')
+    cmd = DataLoader().load_command_from_xml(xml)
+    assert cmd.full_command == 'CREATE TABLE t'
+    assert cmd.parts == (CommandPart('CREATE TABLE', 'Crea la tabla'), CommandPart('t', ''))
@@ -0,0 +1,49 @@
+"""Notas rápidas: JSONL de solo anexado con índice de offsets"""
+import json
+
+from src.services.notes_service import NotesService
+
+
+def test_notes_are_read_newest_first_in_pages(tmp_path):
+    notes = NotesService(tmp_path)
+    for n in range(5):
+        notes.add_note(f'nota {n}')
+
+    assert notes.count() == 5
+    assert [n['content'] for n in notes.get_notes()] == ['nota 4', 'nota 3', 'nota 2', 'nota 1', 'nota 0']
+    assert [n['content'] for n in notes.get_notes(2, start=1)] == ['nota 3', 'nota 2']
+    assert notes.get_notes(2, start=5) == []
+
+
+def test_index_is_reused_and_rebuilt_when_stale(tmp_path):
+    NotesService(tmp_path).add_note('primera')
+    NotesService(tmp_path).add_note('segunda')
+    # Línea escrita sin actualizar el índice (otra versión, copia manual...)
+    with open(tmp_path / 'user_notes.jsonl', 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'timestamp': '2026-01-01T00:00:00', 'content': 'externa'}) + '\n')
+
+    notes = NotesService(tmp_path)
+    assert [n['content'] for n in notes.get_notes()] == ['externa', 'segunda', 'primera']
+    assert (tmp_path / 'user_notes.idx').stat().st_size == 3 * 8
+
+
+def test_legacy_json_list_is_imported_once(tmp_path):
+    legacy = tmp_path / 'data' / 'user_notes.json'
+    legacy.parent.mkdir()
+    legacy.write_text(json.dumps([
+        {'timestamp': '2026-02-01T10:00:00', 'content': 'b'},
+        {'timestamp': '2026-01-01T10:00:00', 'content': 'a'},
+    ]), encoding='utf-8')
+
+    notes = NotesService(tmp_path / 'storage', [legacy])
+    assert [n['content'] for n in notes.get_notes()] == ['b', 'a']
+    notes.clear_notes()
+    # Ya existe el JSONL: el archivo anterior no se vuelve a importar
+    assert NotesService(tmp_path / 'storage', [legacy]).count() == 0
+
+
+def test_legacy_jsonl_is_copied(tmp_path):
+    previous = NotesService(tmp_path / 'old')
+    previous.add_note('anterior')
+    notes = NotesService(tmp_path / 'new', [tmp_path / 'missing.jsonl', previous.notes_file])
+    assert [n['content'] for n in notes.get_notes()] == ['anterior']
@@ -0,0 +1,133 @@
+"""Perfiles de estudiante: registro, fragmentos de métricas y contenido de solo lectura"""
+import csv
+import json
+
+import pytest
+
+from config import Config
+from question_bank import ModuleBank
+from src.core.file_store import CounterDelta
+from src.services.data_loader import DataLoader
+from src.services.profiles import DEFAULT_PROFILE, MetricsShards, ProfileRegistry, slugify
+
+FIELDS = ['section', 'id', 'question', 'options', 'correct', 'multi', 'notas', 'metrics']
+
+
+def write_module(path, metrics):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for n, value in enumerate(metrics, 1):
+            writer.writerow({'section': 'Ingesta', 'id': str(n), 'question': f'Pregunta {n}',
+                             'options': 'A;B;C', 'correct': '2', 'multi': 'false',
+                             'notas': '', 'metrics': value})
+    return path
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Storage temporal con el progreso global anterior a los perfiles"""
+    storage = tmp_path / 'storage'
+    monkeypatch.setattr(Config, 'STORAGE_DIR', storage)
+    monkeypatch.setattr(Config, 'CACHE_DIR', storage / 'cache')
+    monkeypatch.setattr(Config, 'PROFILES_DIR', storage / 'profiles')
+    monkeypatch.setattr(Config, 'DATA_DIR', tmp_path / 'data')
+    storage.mkdir()
+    (storage / 'user_progress.json').write_text('{"total_study_time": 90}', encoding='utf-8')
+    return storage
+
+
+def test_first_run_migrates_global_progress_to_default_profile(storage):
+    profiles = ProfileRegistry()
+    assert profiles.active_id == DEFAULT_PROFILE and profiles.active.seed_from_content
+    migrated = profiles.path(DEFAULT_PROFILE) / 'user_progress.json'
+    assert json.loads(migrated.read_text(encoding='utf-8')) == {'total_study_time': 90}
+
+    profiles.mark_seeded(DEFAULT_PROFILE)
+    assert not ProfileRegistry().active.seed_from_content
+
+
+def test_create_and_switch_are_persisted(storage):
+    profiles = ProfileRegistry()
+    first = profiles.create('Ana Pérez')
+    second = profiles.create('Ana Pérez')
+    assert (first.id, second.id) == ('ana-perez', 'ana-perez-2')
+    assert not first.seed_from_content
+
+    profiles.set_active(second.id)
+    reloaded = ProfileRegistry()
+    assert reloaded.active_id == 'ana-perez-2' and reloaded.active.name == 'Ana Pérez'
+    with pytest.raises(KeyError):
+        reloaded.set_active('nadie')
+    assert slugify('  ¡Aula 3! ') == 'aula-3'
+
+
+def test_only_default_profile_inherits_global_notes(storage):
+    profiles = ProfileRegistry()
+    other = profiles.create('Luis')
+    assert storage / 'user_notes.jsonl' in profiles.notes_sources(DEFAULT_PROFILE)
+    assert profiles.notes_sources(other.id) == []
+
+
+def test_shards_round_trip_and_reload_after_external_write(tmp_path):
+    shards = MetricsShards(tmp_path / 'metrics')
+    assert shards.write('data/questions/dp700_m1.csv', [CounterDelta('dp700_m1_q1', (2, 1))])
+    assert shards.counts('dp700_m1.csv', 'dp700_m1_q1') == (2, 1)
+    assert shards.counts('dp700_m1.csv', 'dp700_m1_q9') == (0, 0)
+
+    # Otro proceso del mismo perfil reescribe el fragmento
+    MetricsShards(tmp_path / 'metrics').write('dp700_m1.csv', [CounterDelta('dp700_m1_q1', (5, 1))])
+    assert shards.counts('dp700_m1.csv', 'dp700_m1_q1') == (5, 1)
+
+
+def test_seed_skips_sources_that_already_have_a_shard(tmp_path):
+    shards = MetricsShards(tmp_path / 'metrics')
+    assert shards.seed_source('dp700_m1.csv', {'dp700_m1_q1': (1, 0), 'dp700_m1_q2': (0, 0)})
+    assert [p.name for p in shards.paths()] == ['dp700_m1.json']
+    assert not shards.seed_source('dp700_m1.csv', {'dp700_m1_q1': (9, 9)})
+    assert shards.counts('dp700_m1.csv', 'dp700_m1_q1') == (1, 0)
+    assert not shards.seed_source('dp700_m2.csv', {'dp700_m2_q1': (0, 0)})  # Sin intentos
+
+
+def test_profile_answers_leave_the_content_csv_untouched(storage, tmp_path):
+    questions_dir = tmp_path / 'questions'
+    questions_dir.mkdir()
+    csv_path = write_module(questions_dir / 'dp700_m1.csv', ['1;1', ''])
+    original = csv_path.read_bytes()
+    profiles = ProfileRegistry()
+    loader = DataLoader()
+    loader.questions_dir = questions_dir
+    loader.packs_dir = tmp_path / 'packs'
+    questions = loader.load_all_questions(lazy=True)
+
+    loader.use_profile(DEFAULT_PROFILE, profiles.shards(DEFAULT_PROFILE), questions, seed=True)
+    loader.record_answer(questions[1], True)
+    loader.flush_pending()
+    assert csv_path.read_bytes() == original
+    shards = profiles.shards(DEFAULT_PROFILE)
+    assert [shards.get(q) for q in questions] == [(1, 1), (1, 0)]
+
+    # Un perfil nuevo empieza de cero sobre las mismas preguntas
+    other = profiles.create('Luis')
+    loader.use_profile(other.id, profiles.shards(other.id), questions)
+    assert [q.times_seen for q in questions] == [0, 0]
+    loader.close()
+
+
+def test_module_study_writes_to_the_same_shard_as_study_platform(storage, tmp_path):
+    csv_path = write_module(tmp_path / 'dp700_m1.csv', ['2;0', ''])
+    original = csv_path.read_bytes()
+    profiles = ProfileRegistry()
+    shards = profiles.shards(DEFAULT_PROFILE)
+
+    bank = ModuleBank.from_csv(str(csv_path), shards, seed=True)
+    assert [q.platform_id for q in bank.questions] == ['dp700_m1_q1', 'dp700_m1_q2']
+    bank.record_answer(bank.questions[1], False)
+    assert bank.flush() == 1
+    assert csv_path.read_bytes() == original
+
+    other_app = profiles.shards(DEFAULT_PROFILE)
+    assert other_app.counts(str(csv_path), 'dp700_m1_q1') == (2, 0)
+    assert other_app.counts(str(csv_path), 'dp700_m1_q2') == (0, 1)
+    reloaded = ModuleBank.from_csv(str(csv_path), other_app, seed=True)
+    assert [q.metrics for q in reloaded.questions] == ['2;0', '0;1']
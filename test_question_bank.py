@@ -0,0 +1,105 @@
+"""Banco de preguntas de los módulos: parseo único y contadores de dominio"""
+import csv
+
+from question_bank import (
+    BUCKET_MASTERED, BUCKET_NEW, BUCKET_PRACTICE, BUCKETS, ModuleBank, classify,
+)
+
+
+FIELDS = ['section', 'id', 'question', 'options', 'correct', 'multi', 'notas', 'metrics']
+
+
+def write_module(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for n, (section, metrics) in enumerate(rows, 1):
+            writer.writerow({'section': section, 'id': str(n), 'question': f'Pregunta {n}',
+                             'options': 'A;B;C', 'correct': '2', 'multi': 'false',
+                             'notas': '', 'metrics': metrics})
+    return str(path)
+
+
+def recount(bank):
+    counts = {bucket: 0 for bucket in BUCKETS}
+    for q in bank.questions:
+        counts[q.bucket] += 1
+    return counts
+
+
+def test_classify_thresholds():
+    assert classify(0, 0) == BUCKET_NEW
+    assert classify(4, 1) == BUCKET_MASTERED
+    assert classify(2, 3) == BUCKET_PRACTICE
+    assert classify(1, 4) == BUCKET_NEW
+
+
+def test_rows_are_parsed_once_into_typed_questions(tmp_path):
+    bank = ModuleBank.from_csv(write_module(tmp_path / 'dp700_m1.csv', [('Ingesta', '8;2'), ('SQL', '')]))
+    first = bank.questions[0]
+    assert (first.times_correct, first.times_incorrect) == (8, 2)
+    assert first.correct == (2,) and first.options == ['A', 'B', 'C'] and not first.multi
+    assert first.is_correct_answer(2) and not first.is_correct_answer(1)
+    assert bank.sections == ['Ingesta', 'SQL']
+    assert [q.id for q in bank.questions_in_section('SQL')] == ['2']
+
+
+def test_record_answer_keeps_bucket_counters_in_sync(tmp_path):
+    bank = ModuleBank.from_csv(write_module(tmp_path / 'dp700_m1.csv', [
+        ('Ingesta', '4;1'), ('Ingesta', '1;1'), ('SQL', ''), ('SQL', '0;3')]))
+    assert {b: bank.count(b) for b in BUCKETS} == recount(bank)
+
+    mastered, practice, new, failed = bank.questions
+    for question, answer in [(mastered, False), (mastered, False), (practice, True), (new, True),
+                             (failed, True), (failed, True), (failed, True)]:
+        bank.record_answer(question, answer)
+        assert {b: bank.count(b) for b in BUCKETS} == recount(bank)
+
+    assert mastered.bucket == BUCKET_PRACTICE
+    assert new.bucket == BUCKET_MASTERED
+    assert [q.id for q in bank.questions_in(BUCKET_MASTERED)] == ['3']
+    stats = bank.stats()
+    assert (stats.total, stats.mastered, stats.practice, stats.new) == (4, 1, 3, 0)
+    assert stats.domain_percentage == int(bank.total_correct / bank.total_attempts * 100)
+
+
+def test_answers_are_written_in_one_batched_flush(tmp_path):
+    path = write_module(tmp_path / 'dp700_m1.csv', [('Ingesta', '1;0'), ('SQL', ''), ('SQL', '2;2')])
+    bank = ModuleBank.from_csv(path)
+    first, second, _ = bank.questions
+    bank.record_answer(first, True)
+    bank.record_answer(first, False)
+    bank.record_answer(second, True)
+
+    assert bank.pending_writes == 2
+    assert ModuleBank.from_csv(path).questions[0].metrics == '1;0'  # Aún no escrito
+
+    assert bank.flush() == 2
+    assert bank.pending_writes == 0 and bank.flush() == 0
+    reloaded = ModuleBank.from_csv(path)
+    assert [q.metrics for q in reloaded.questions] == ['2;1', '1;0', '2;2']
+    assert reloaded.questions[0].question == 'Pregunta 1'
+
+
+def test_full_batch_requests_a_flush(tmp_path):
+    path = write_module(tmp_path / 'dp700_m1.csv', [('Ingesta', '')] * (ModuleBank.FLUSH_BATCH_SIZE + 1))
+    bank = ModuleBank.from_csv(path)
+    for question in bank.questions[:-2]:
+        bank.record_answer(question, True)
+    assert not bank.should_flush()
+    bank.record_answer(bank.questions[-2], True)
+    assert bank.should_flush()
+
+
+def test_flush_merges_answers_written_by_another_app(tmp_path):
+    path = write_module(tmp_path / 'dp700_m1.csv', [('Ingesta', '1;0'), ('SQL', '')])
+    first_app, second_app = ModuleBank.from_csv(path), ModuleBank.from_csv(path)
+    first_app.record_answer(first_app.questions[0], True)
+    second_app.record_answer(second_app.questions[0], False)
+    second_app.record_answer(second_app.questions[1], True)
+
+    assert first_app.flush() == 1 and second_app.flush() == 2
+    assert [q.metrics for q in ModuleBank.from_csv(path).questions] == ['2;1', '1;0']
+    # La segunda app ya incorpora la respuesta de la primera
+    assert second_app.questions[0].metrics == '2;1'
+    assert second_app.total_attempts == 4 and second_app.count(BUCKET_MASTERED) == 1
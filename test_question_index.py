@@ -0,0 +1,115 @@
+"""Índice columnar de los CSV: offsets, lectura de cuerpos bajo demanda y reescrituras"""
+import csv
+import os
+
+import pytest
+
+from src.services.data_loader import DataLoader
+from src.services.question_index import BodyStore, QuestionIndex, iter_bodies
+from src.services.search_service import KIND_QUESTION, SearchService
+
+FIELDS = ['section', 'question', 'options', 'correct', 'notas', 'difficulty', 'metrics']
+ROWS = [
+    {'section': 'Lakehouse', 'question': '¿Qué es Delta?', 'options': 'Formato;Motor', 'correct': '1',
+     'notas': 'Parquet + log', 'difficulty': 'easy', 'metrics': '1;0'},
+    {'section': 'Ingesta', 'question': 'Pregunta\nen dos líneas', 'options': 'A;B;C', 'correct': '3',
+     'notas': 'Con "comillas"', 'difficulty': 'hard', 'metrics': ''},
+    {'section': '', 'question': '¿Eventstream?', 'options': 'Sí;No', 'correct': '2',
+     'notas': '', 'difficulty': 'medium', 'metrics': '2;5'},
+]
+
+
+def write_csv(path, rows=ROWS):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = QuestionIndex(write_csv(tmp_path / 'dp700_modulo_1.csv'), BodyStore())
+    yield idx
+    idx.close()
+
+
+def test_scan_builds_columns_without_bodies(index):
+    assert len(index) == 3
+    assert index.module == 'Modulo 1'
+    assert [q.section for q in index.questions()] == ['Lakehouse', 'Ingesta', 'General']
+    assert list(index.correct) == [1, 0, 2] and list(index.seen) == [1, 0, 7]
+    assert len(index.bodies) == 0
+
+
+def test_read_row_handles_multiline_quoted_records(index):
+    assert index.read_row(1)['question'] == 'Pregunta\nen dos líneas'
+    body = index.body(1)
+    assert body.options == ('A', 'B', 'C') and body.correct_answer == 2
+    assert body.explanation == 'Con "comillas"'
+
+
+def test_read_handle_is_kept_between_reads(index):
+    handle = index._reader()
+    index.read_row(0)
+    index.read_row(2)
+    assert index._reader() is handle and not handle.closed
+
+
+def test_metric_rewrite_refreshes_offsets_and_keeps_counters(tmp_path):
+    loader = DataLoader()
+    loader.questions_dir = tmp_path
+    loader.packs_dir = tmp_path / 'packs'
+    write_csv(tmp_path / 'dp700_modulo_1.csv')
+    questions = loader.load_all_questions(lazy=True)
+    first, second = questions[0], questions[1]
+    for _ in range(120):
+        loader.record_answer(first, False)   # "1;0" -> "1;120": la fila crece
+    loader.record_answer(second, True)
+    loader.flush_pending()
+
+    index = loader.indexes[first.source_file]
+    assert index.read_row(0)['metrics'] == '1;120'
+    assert second.question_text == 'Pregunta\nen dos líneas'
+    assert questions[2].explanation == ''
+    assert (second.times_correct, second.times_seen) == (1, 1)
+    loader.close()
+
+
+def test_external_rewrite_is_detected_by_file_stat(index):
+    handle = index._reader()
+    rows = [dict(row) for row in ROWS]
+    rows[0]['question'] = '¿Qué es una tabla Delta en OneLake?'
+    write_csv(index.path, rows)
+    st = os.stat(index.path)
+    os.utime(index.path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert index.read_row(1)['question'] == 'Pregunta\nen dos líneas'
+    assert index.read_row(0)['question'] == '¿Qué es una tabla Delta en OneLake?'
+    assert handle.closed and index._reader() is not handle
+
+
+def test_body_store_is_a_bounded_lru(index):
+    store = BodyStore(capacity=2)
+    index.bodies = store
+    index.body(0)
+    index.body(1)
+    index.body(0)            # 0 pasa a ser el más reciente
+    index.body(2)            # desaloja 1
+    assert len(store) == 2 and (store.hits, store.misses) == (1, 3)
+    index.body(1)
+    assert store.misses == 4
+    index.body(2)
+    assert store.hits == 2
+
+
+def test_bulk_reads_bypass_the_body_store(index):
+    questions = index.questions()
+    bodies = list(iter_bodies(questions))
+    assert [b.question_text for b in bodies] == [q.question_text for q in questions]
+    index.bodies.clear()
+    index.bodies.misses = 0
+
+    search = SearchService(index.questions(), [])
+    assert [hit.item.id for hit in search.search('eventstream', kind=KIND_QUESTION)] == ['dp700_modulo_1_q3']
+    assert index.bodies.misses == 0 and len(index.bodies) == 0
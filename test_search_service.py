@@ -0,0 +1,72 @@
+"""Búsqueda BM25 sobre preguntas y comandos, con índice cacheado por huella"""
+from src.models.question import DifficultyLevel, Question, SQLCommand
+from src.services.data_cache import DataCache
+from src.services.search_service import KIND_COMMAND, KIND_QUESTION, SearchService, tokenize
+
+
+def question(qid, text, explanation='', options=('Sí', 'No')):
+    return Question(id=qid, module='Módulo 1', section='Ingesta', difficulty=DifficultyLevel.MEDIUM,
+                    question_text=text, options=list(options), correct_answer=0, explanation=explanation)
+
+
+def command(cid, title, full_command, description=''):
+    return SQLCommand(id=cid, title=title, description=description, category='DDL',
+                      difficulty=DifficultyLevel.EASY, full_command=full_command)
+
+
+QUESTIONS = [
+    question('q1', '¿Qué formato usa una tabla Delta en el Lakehouse?', 'Parquet con registro de transacciones'),
+    question('q2', '¿Cómo se programa un pipeline?', 'Con un desencadenador; Delta no interviene'),
+    question('q3', '¿Qué es un Eventstream?', 'Ingesta en tiempo real'),
+]
+COMMANDS = [
+    command('c1', 'Crear tabla Delta', 'CREATE TABLE ventas USING DELTA'),
+    command('c2', 'Consultar historial', 'DESCRIBE HISTORY ventas'),
+]
+
+
+def ids(hits):
+    return [hit.item.id for hit in hits]
+
+
+def test_tokenize_ignores_case_and_accents():
+    assert tokenize('¿Qué ÍNDICE usa_Delta?') == ['que', 'indice', 'usa_delta']
+    assert tokenize('') == []
+
+
+def test_title_matches_rank_above_explanation_matches():
+    search = SearchService(QUESTIONS, COMMANDS)
+    assert ids(search.search('delta', kind=KIND_QUESTION)) == ['q1', 'q2']
+    assert ids(search.search('delta'))[0] in ('q1', 'c1')
+    assert ids(search.search('delta', kind=KIND_COMMAND)) == ['c1']
+
+
+def test_last_word_is_a_prefix():
+    search = SearchService(QUESTIONS, COMMANDS)
+    assert ids(search.search('lakeh')) == ['q1']
+    assert ids(search.search('event')) == ['q3']
+    assert search.search('') == [] and search.search('zzz') == []
+
+
+def test_hits_resolve_to_their_items():
+    hit = SearchService(QUESTIONS, COMMANDS).search('historial')[0]
+    assert (hit.kind, hit.title, hit.subtitle) == (KIND_COMMAND, 'Consultar historial', 'DDL')
+    hit = SearchService(QUESTIONS, COMMANDS).search('eventstream')[0]
+    assert (hit.kind, hit.subtitle) == (KIND_QUESTION, 'Módulo 1 · Ingesta')
+    assert hit.score > 0
+
+
+def test_cached_index_is_reused_until_the_text_changes(tmp_path, monkeypatch):
+    cache = DataCache(tmp_path)
+    built = SearchService.load_or_build(QUESTIONS, COMMANDS, cache)
+    assert (tmp_path / f'{SearchService.CACHE_NAME}.pickle').exists()
+
+    def no_rebuild(self):
+        raise AssertionError('index rebuilt')
+    with monkeypatch.context() as patch:
+        patch.setattr(SearchService, '_build_index', no_rebuild)
+        loaded = SearchService.load_or_build(QUESTIONS, COMMANDS, cache)
+    assert ids(loaded.search('delta')) == ids(built.search('delta'))
+
+    changed = QUESTIONS[:2] + [question('q3', '¿Qué es un KQL queryset?')]
+    assert ids(SearchService.load_or_build(changed, COMMANDS, cache).search('queryset')) == ['q3']
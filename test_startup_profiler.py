@@ -0,0 +1,26 @@
+"""Perfilado del arranque: lectura de -X importtime y de las marcas del hijo"""
+from src.utils import startup_profiler
+from src.utils.startup_profiler import MARK_PREFIX, _parse_marks, parse_importtime
+
+
+def test_parse_importtime_skips_header_and_foreign_lines():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |   _io",
+        "import time:      3400 |      15200 | PyQt5.QtWidgets",
+        "Warning: something else",
+    ])
+    assert parse_importtime(stderr) == [(120, 120, '   _io'), (3400, 15200, ' PyQt5.QtWidgets')]
+
+
+def test_marks_round_trip_through_stdout(capsys):
+    startup_profiler._marks.clear()
+    startup_profiler.set_origin(0.0)
+    startup_profiler.mark('window')
+    startup_profiler.emit_marks()
+    out = capsys.readouterr().out
+    startup_profiler._marks.clear()
+
+    assert out.startswith(f"{MARK_PREFIX} window ")
+    marks = _parse_marks(out + "otra salida\n")
+    assert list(marks) == ['window'] and marks['window'] > 0
@@ -0,0 +1,97 @@
+"""Archivo mensual de estadísticas: cambio de mes y ventanas móviles"""
+import json
+from datetime import datetime, timedelta
+
+from src.core.stats_archive import COMMANDS, DAILY_KEEP, MONTHLY_KEEP, SESSIONS, StatsArchive, add_to_aggregates
+from stats_manager import StatsManager
+
+
+def session(session_id, start):
+    return {'id': session_id, 'type': 'module_study', 'start_time': start,
+            'end_time': start, 'duration_minutes': 5, 'stats': {}}
+
+
+def test_records_roll_over_to_the_next_month_file(tmp_path):
+    archive = StatsArchive(tmp_path / 'stats_archive')
+    archive.append(SESSIONS, [session('a', '2026-01-31T23:59:00'),
+                              session('b', '2026-02-01T00:01:00')], 'start_time')
+    archive.append(SESSIONS, [session('c', '2026-02-14T10:00:00')], 'start_time')
+
+    assert (tmp_path / 'stats_archive' / 'sessions-2026-01.jsonl').exists()
+    assert archive.index()[SESSIONS] == {'2026-01': 1, '2026-02': 2}
+    assert archive.months(SESSIONS) == ['2026-02', '2026-01']
+    assert [(month, [r['id'] for r in records]) for month, records in archive.iter_months(SESSIONS)] == [
+        ('2026-02', ['b', 'c']), ('2026-01', ['a'])]
+    assert archive.months(COMMANDS) == []
+
+
+def test_truncated_line_is_skipped(tmp_path):
+    archive = StatsArchive(tmp_path)
+    archive.append(COMMANDS, [{'command': 'SELECT', 'timestamp': '2026-05-02T09:00:00'}], 'timestamp')
+    with open(tmp_path / 'commands-2026-05.jsonl', 'a', encoding='utf-8') as f:
+        f.write('{"command": "JO')
+    assert [len(records) for _, records in archive.iter_months(COMMANDS)] == [1]
+
+
+def test_monthly_window_evicts_the_oldest_month():
+    aggregates = {}
+    start = datetime(2024, 1, 15)
+    for n in range(MONTHLY_KEEP):
+        assert add_to_aggregates(aggregates, datetime(2024 + n // 12, n % 12 + 1, 15), answers=1) == {}
+    evicted = add_to_aggregates(aggregates, datetime(2026, 1, 3), answers=2, correct=1)
+
+    assert evicted == {start.strftime('%Y-%m'): {'answers': 1}}
+    assert len(aggregates['monthly']) == MONTHLY_KEEP
+    assert aggregates['monthly']['2026-01'] == {'answers': 2, 'correct': 1}
+    # Las ventanas diaria y semanal también quedan acotadas
+    assert len(aggregates['daily']) <= DAILY_KEEP
+
+
+def test_same_month_accumulates_without_eviction():
+    aggregates = {}
+    add_to_aggregates(aggregates, datetime(2026, 3, 1), sessions=1, minutes=10)
+    assert add_to_aggregates(aggregates, datetime(2026, 3, 31), sessions=1, minutes=5) == {}
+    assert aggregates['monthly']['2026-03'] == {'sessions': 2, 'minutes': 15}
+
+
+def test_daily_window_is_bounded():
+    aggregates = {}
+    day = datetime(2026, 1, 1)
+    for n in range(DAILY_KEEP + 10):
+        add_to_aggregates(aggregates, day + timedelta(days=n), answers=1)
+    assert len(aggregates['daily']) == DAILY_KEEP
+    assert min(aggregates['daily']) == (day + timedelta(days=10)).strftime('%Y-%m-%d')
+
+
+def test_month_totals_accumulate_in_the_index(tmp_path):
+    archive = StatsArchive(tmp_path)
+    archive.store_month_totals({'2024-01': {'answers': 3}})
+    archive.store_month_totals({'2024-01': {'answers': 2, 'correct': 1}, '2024-02': {'sessions': 1}})
+    assert archive.index()['months'] == {'2024-01': {'answers': 5, 'correct': 1}, '2024-02': {'sessions': 1}}
+
+
+def test_manager_moves_evicted_months_to_the_archive(tmp_path):
+    path = tmp_path / 'user_stats.json'
+    manager = StatsManager(str(path))
+    # Ventana llena con meses antiguos: la respuesta de hoy desplaza el más antiguo
+    manager.stats['aggregates']['monthly'] = {f'2000-{m:02d}': {'answers': m} for m in range(1, 13)}
+    manager.stats['aggregates']['monthly'].update({f'2001-{m:02d}': {'answers': 1} for m in range(1, 13)})
+    manager.save()
+
+    manager.record_module_answer('Módulo 1', 'q1', True)
+
+    monthly = json.loads(path.read_text(encoding='utf-8'))['aggregates']['monthly']
+    assert '2000-01' not in monthly and datetime.now().strftime('%Y-%m') in monthly
+    assert manager.archive.index()['months'] == {'2000-01': {'answers': 1}}
+
+
+def test_closed_sessions_leave_the_hot_file(tmp_path):
+    path = str(tmp_path / 'user_stats.json')
+    manager = StatsManager(path)
+    for _ in range(StatsManager.RECENT_SESSIONS + 3):
+        manager.end_session(manager.start_session('module_study'), {})
+
+    stored = StatsManager(path)
+    assert len(stored.stats['sessions']) == StatsManager.RECENT_SESSIONS
+    assert stored.get_total_sessions() == StatsManager.RECENT_SESSIONS + 3
+    assert sum(len(records) for _, records in stored.archive.iter_months(SESSIONS)) == StatsManager.RECENT_SESSIONS + 3
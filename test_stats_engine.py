@@ -0,0 +1,140 @@
+"""Motor de estadísticas: cadena de migración 2.0 -> 2.1 -> 3.0 y cambios pendientes"""
+import json
+from datetime import datetime, timedelta
+
+from config import Config
+from src.core.stats_archive import COMMANDS, SESSIONS
+from src.core.stats_tracker import STATS_VERSION, StatsEngine, default_stats
+
+
+def stats_2_0():
+    """user_stats.json de las apps clásicas: sesiones e historial sin archivar"""
+    stats = default_stats()
+    stats['version'] = '2.0'
+    for key in ('session_count', 'study_streak', 'aggregates'):
+        del stats[key]
+    for key in ('completed_ids', 'command_metrics'):
+        del stats['matrix_trainer'][key]
+    del stats['preferences']
+
+    start = datetime(2026, 1, 20, 9, 0)
+    # 25 días seguidos que cruzan de enero a febrero, más una sesión sin cerrar
+    for n in range(25):
+        begin = start + timedelta(days=n)
+        stats['sessions'].append({
+            'id': f's{n}', 'type': 'module_study', 'start_time': begin.isoformat(),
+            'end_time': (begin + timedelta(minutes=10)).isoformat(), 'duration_minutes': 10, 'stats': {}})
+    stats['sessions'].append({'id': 'open', 'type': 'matrix_trainer',
+                              'start_time': datetime(2026, 2, 14, 8, 0).isoformat(),
+                              'end_time': None, 'duration_minutes': 0, 'stats': {}})
+    stats['matrix_trainer']['command_history'] = [
+        {'command': f'cmd{n}', 'attempts': 1, 'errors': n % 2, 'completed': True,
+         'timestamp': (start + timedelta(hours=12 * n)).isoformat()}
+        for n in range(110)]
+    return stats
+
+
+def write_stats(path, stats):
+    path.write_text(json.dumps(stats), encoding='utf-8')
+
+
+def test_2_0_file_is_archived_and_upgraded_to_current(tmp_path):
+    path = tmp_path / 'user_stats.json'
+    write_stats(path, stats_2_0())
+
+    engine = StatsEngine(path)
+    stats = engine.stats
+
+    assert stats['version'] == STATS_VERSION
+    assert json.loads(path.read_text(encoding='utf-8'))['version'] == STATS_VERSION
+    # Todas las sesiones cerradas y todo el historial quedan en el archivo mensual
+    assert engine.archive.index()[SESSIONS] == {'2026-01': 12, '2026-02': 13}
+    assert sum(engine.archive.index()[COMMANDS].values()) == 110
+    # El archivo caliente conserva las recientes y la sesión abierta
+    assert len(stats['sessions']) == StatsEngine.RECENT_SESSIONS + 1
+    assert any(s['id'] == 'open' for s in stats['sessions'])
+    assert 's0' not in {s['id'] for s in stats['sessions']}
+    assert len(stats['matrix_trainer']['command_history']) == StatsEngine.COMMAND_HISTORY
+    assert stats['matrix_trainer']['command_history'][-1]['command'] == 'cmd109'
+    assert stats['session_count'] == 26
+    # La sesión abierta (día siguiente al último cerrado) también cuenta como día de estudio
+    assert stats['study_streak'] == {'current': 26, 'longest': 26, 'last_day': '2026-02-14'}
+    assert stats['aggregates']['monthly']['2026-01']['sessions'] == 12
+    assert stats['aggregates']['monthly']['2026-02']['minutes'] == 130
+    # Campos de 3.0 con sus valores por defecto
+    assert stats['matrix_trainer']['command_metrics'] == {}
+    assert stats['preferences'] == default_stats()['preferences']
+
+
+def test_2_1_file_only_gets_the_new_defaults(tmp_path):
+    path = tmp_path / 'user_stats.json'
+    stats = default_stats()
+    stats['version'] = '2.1'
+    stats['session_count'] = 7
+    stats['module_study']['questions_answered'] = 40
+    del stats['matrix_trainer']['command_metrics']
+    del stats['preferences']
+    write_stats(path, stats)
+
+    engine = StatsEngine(path)
+
+    assert engine.stats['version'] == STATS_VERSION
+    assert engine.stats['session_count'] == 7
+    assert engine.stats['module_study']['questions_answered'] == 40
+    assert engine.stats['matrix_trainer']['command_metrics'] == {}
+    assert engine.stats['preferences']['theme'] == 'matrix'
+    assert engine.archive.months(SESSIONS) == []
+
+
+def test_current_file_is_not_rewritten(tmp_path):
+    path = tmp_path / 'user_stats.json'
+    StatsEngine(path)
+    before = path.stat().st_mtime_ns
+
+    StatsEngine(path)
+    assert path.stat().st_mtime_ns == before
+
+
+def test_pending_changes_are_replayed_over_another_writer(tmp_path):
+    path = tmp_path / 'user_stats.json'
+    first = StatsEngine(path)
+    second = StatsEngine(path)
+
+    first.record_answer('Módulo 1', 'q1', True, save=False)
+    first.record_answer('Módulo 1', 'q2', False, save=False)
+    second.record_answer('Módulo 2', 'q9', True)
+    second.record_study_time(25, completed=True)
+    first.commit()
+
+    saved = json.loads(path.read_text(encoding='utf-8'))
+    assert saved['module_study']['questions_answered'] == 3
+    assert saved['module_study']['correct_answers'] == 2
+    assert saved['pomodoro']['completed_sessions'] == 1
+    assert saved['total_study_time_minutes'] == 25
+    assert first.stats['module_study']['questions_answered'] == 3
+
+    # El otro proceso ve lo guardado al releer
+    assert second.reload_if_changed()
+    assert second.stats['module_study']['questions_answered'] == 3
+
+
+def test_commit_without_pending_changes_does_not_write(tmp_path):
+    path = tmp_path / 'user_stats.json'
+    engine = StatsEngine(path)
+    before = path.stat().st_mtime_ns
+
+    engine.commit()
+    assert path.stat().st_mtime_ns == before
+
+
+def test_migrated_from_records_repo_relative_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'LEGACY_DIR', tmp_path)
+    write_stats(tmp_path / 'user_stats.json', stats_2_0())
+    outside = tmp_path.parent / f'{tmp_path.name}-progress.json'
+    outside.write_text(json.dumps({'sql_total_attempts': 4, 'sql_total_errors': 1}), encoding='utf-8')
+    try:
+        engine = StatsEngine(tmp_path / 'profiles' / 'default' / 'user_stats.json',
+                             [tmp_path / 'user_stats.json', outside, tmp_path / 'missing.json'])
+    finally:
+        outside.unlink()
+    assert engine.stats['migrated_from'] == ['user_stats.json', outside.name]
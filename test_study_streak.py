@@ -0,0 +1,79 @@
+"""Índice de sesiones y racha de días de estudio incremental (StatsManager)"""
+import json
+from datetime import date, datetime, timedelta
+
+from stats_manager import StatsManager
+
+
+def write_sessions(path, days):
+    """user_stats.json en formato 2.0 con una sesión por día (en el orden dado)"""
+    sessions = [
+        {'id': f'{day:%Y%m%d}_090000', 'type': 'module_study',
+         'start_time': datetime.combine(day, datetime.min.time()).replace(hour=9).isoformat(),
+         'end_time': None, 'duration_minutes': 0, 'stats': {}}
+        for day in days
+    ]
+    stats = StatsManager(str(path)).stats
+    for key in ('session_count', 'study_streak', 'aggregates'):
+        del stats[key]
+    stats.update(version='2.0', sessions=sessions)
+    path.write_text(json.dumps(stats), encoding='utf-8')
+    return str(path)
+
+
+def test_streaks_are_built_from_the_session_history(tmp_path):
+    start = date(2026, 3, 1)
+    days = [start, start + timedelta(days=1), start + timedelta(days=2),
+            start + timedelta(days=5), start + timedelta(days=6), start + timedelta(days=6)]
+    manager = StatsManager(write_sessions(tmp_path / 'user_stats.json', reversed(days)))
+    assert manager.get_study_streak_days() == 2
+    assert manager.get_longest_study_streak_days() == 3
+
+
+def test_month_boundary_is_consecutive(tmp_path):
+    manager = StatsManager(write_sessions(tmp_path / 'user_stats.json', [date(2026, 1, 31), date(2026, 2, 1)]))
+    assert manager.get_study_streak_days() == 2
+
+
+def test_new_session_extends_or_restarts_the_streak(tmp_path):
+    today = date.today()
+    path = write_sessions(tmp_path / 'user_stats.json', [today - timedelta(days=2), today - timedelta(days=1)])
+    manager = StatsManager(path)
+    manager.start_session('module_study')
+    manager.start_session('matrix_trainer')  # Mismo día: no vuelve a sumar
+    assert (manager.get_study_streak_days(), manager.get_longest_study_streak_days()) == (3, 3)
+
+    gap = StatsManager(write_sessions(tmp_path / 'gap.json', [today - timedelta(days=3)]))
+    gap.start_session('module_study')
+    assert (gap.get_study_streak_days(), gap.get_longest_study_streak_days()) == (1, 1)
+
+
+def test_incremental_streak_matches_a_migration_of_the_same_history(tmp_path):
+    today = date.today()
+    days = [today - timedelta(days=n) for n in (9, 4, 1)]
+    manager = StatsManager(write_sessions(tmp_path / 'user_stats.json', days))
+    manager.start_session('module_study')
+    rebuilt = StatsManager(write_sessions(tmp_path / 'rebuilt.json', days + [today]))
+    assert manager.stats['study_streak'] == rebuilt.stats['study_streak']
+    assert StatsManager(str(tmp_path / 'user_stats.json')).stats['study_streak'] == manager.stats['study_streak']
+
+
+def test_sessions_started_in_the_same_second_get_distinct_ids(tmp_path):
+    path = str(tmp_path / 'user_stats.json')
+    first_app, second_app = StatsManager(path), StatsManager(path)
+    ids = {first_app.start_session('module_study'), second_app.start_session('matrix_trainer'),
+           first_app.start_session('module_study')}
+    assert len(ids) == 3
+    assert StatsManager(path).get_total_sessions() == 3
+
+
+def test_end_session_finds_a_session_started_by_another_app(tmp_path):
+    path = str(tmp_path / 'user_stats.json')
+    first_app, second_app = StatsManager(path), StatsManager(path)
+    session_id = first_app.start_session('module_study')
+    second_app.record_module_answer('m1', 'q1', True)   # Relee el archivo del otro proceso
+    first_app.end_session(session_id, {'answered': 1})
+
+    stored = StatsManager(path)
+    assert stored.stats['module_study']['questions_answered'] == 1
+    assert stored._sessions_by_id[session_id]['stats'] == {'answered': 1}
@@ -0,0 +1,61 @@
+"""Trazas: spans desactivados sin coste, resumen y exportación Chrome trace-event"""
+import json
+
+import pytest
+
+from src.utils import tracing
+
+
+@pytest.fixture
+def trace():
+    was_enabled = tracing.is_enabled()
+    tracing.clear()
+    tracing.enable()
+    yield tracing
+    tracing.clear()
+    if not was_enabled:
+        tracing.disable()
+
+
+def test_disabled_span_is_shared_noop():
+    tracing.disable()
+    tracing.clear()
+    assert tracing.span('a') is tracing.span('b')
+    with tracing.span('a'):
+        pass
+    assert tracing.event_count() == 0
+
+
+def test_traced_records_qualname_and_keeps_return_value(trace):
+    class Loader:
+        @tracing.traced(cat='csv')
+        def load(self, n):
+            return n * 2
+
+    assert Loader().load(21) == 42
+    (summary,) = trace.slowest_spans()
+    assert summary['name'].endswith('Loader.load')
+    assert summary['cat'] == 'csv' and summary['count'] == 1
+
+
+def test_slowest_spans_aggregates_by_name(trace):
+    for _ in range(3):
+        with trace.span('csv.parse', cat='csv'):
+            pass
+    with trace.span('json.save'):
+        pass
+    summary = {entry['name']: entry for entry in trace.slowest_spans()}
+    assert summary['csv.parse']['count'] == 3
+    assert summary['csv.parse']['avg_ms'] == pytest.approx(summary['csv.parse']['total_ms'] / 3)
+    assert summary['json.save']['count'] == 1
+
+
+def test_export_writes_complete_events(trace, tmp_path):
+    assert trace.export_chrome_trace(tmp_path / 'empty.json') is None
+    with trace.span('xml.load', cat='xml', file='cmd.xml'):
+        pass
+    path = trace.export_chrome_trace(tmp_path / 'traces' / 'trace.json')
+    data = json.loads(path.read_text(encoding='utf-8'))
+    (event,) = data['traceEvents']
+    assert event['ph'] == 'X' and event['name'] == 'xml.load'
+    assert event['args'] == {'file': 'cmd.xml'} and event['dur'] >= 0